@@ -59,37 +59,37 @@ public:
     const std::string &caption() const { return m_caption; }
 
     /// Sets the caption of this Button.
-    void set_caption(const std::string &caption) { m_caption = caption; }
+    void set_caption(const std::string &caption) { m_caption = caption; invalidate_layer(); invalidate_layout(); }
 
     /// Returns the background color of this Button.
     const Color &background_color() const { return m_background_color; }
     /// Sets the background color of this Button.
-    void set_background_color(const Color &background_color) { m_background_color = background_color; }
+    void set_background_color(const Color &background_color) { m_background_color = background_color; invalidate_layer(); }
 
     /// Returns the text color of the caption of this Button.
     const Color &text_color() const { return m_text_color; }
     /// Sets the text color of the caption of this Button.
-    void set_text_color(const Color &text_color) { m_text_color = text_color; }
+    void set_text_color(const Color &text_color) { m_text_color = text_color; invalidate_layer(); }
 
     /// Returns the icon of this Button.  See \ref nanogui::Button::m_icon.
     int icon() const { return m_icon; }
     /// Sets the icon of this Button.  See \ref nanogui::Button::m_icon.
-    void set_icon(int icon) { m_icon = icon; }
+    void set_icon(int icon) { m_icon = icon; invalidate_layer(); invalidate_layout(); }
 
     /// The current flags of this Button (see \ref nanogui::Button::Flags for options).
     int flags() const { return m_flags; }
     /// Sets the flags of this Button (see \ref nanogui::Button::Flags for options).
-    void set_flags(int button_flags) { m_flags = button_flags; }
+    void set_flags(int button_flags) { m_flags = button_flags; invalidate_layer(); }
 
     /// The position of the icon for this Button.
     IconPosition icon_position() const { return m_icon_position; }
     /// Sets the position of the icon for this Button.
-    void set_icon_position(IconPosition icon_position) { m_icon_position = icon_position; }
+    void set_icon_position(IconPosition icon_position) { m_icon_position = icon_position; invalidate_layer(); invalidate_layout(); }
 
     /// Whether or not this Button is currently pushed.
     bool pushed() const { return m_pushed; }
     /// Sets whether or not this Button is currently pushed.
-    void set_pushed(bool pushed) { m_pushed = pushed; }
+    void set_pushed(bool pushed) { m_pushed = pushed; invalidate_layer(); }
 
     /// Return the push callback (for any type of button)
     const std::function<void()> &callback() const { return m_callback; }
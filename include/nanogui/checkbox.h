@@ -52,17 +52,17 @@ public:
    const std::string &caption() const { return m_caption; }
 
     /// Sets the caption of this CheckBox.
-    void set_caption(const std::string &caption) { m_caption = caption; }
+    void set_caption(const std::string &caption) { m_caption = caption; invalidate_layer(); invalidate_layout(); }
 
     /// Whether or not this CheckBox is currently checked.
     const bool &checked() const { return m_checked; }
 
     /// Sets whether or not this CheckBox is currently checked.
-    void set_checked(const bool &checked) { m_checked = checked; }
+    void set_checked(const bool &checked) { m_checked = checked; invalidate_layer(); }
 
     /// Whether or not this CheckBox is currently pushed.  See \ref nanogui::CheckBox::m_pushed.
     const bool &pushed() const { return m_pushed; }
-    void set_pushed(const bool &pushed) { m_pushed = pushed; }
+    void set_pushed(const bool &pushed) { m_pushed = pushed; invalidate_layer(); }
 
     /// Returns the current callback of this CheckBox.
     const std::function<void(bool)> &callback() const { return m_callback; }
@@ -164,11 +164,14 @@ class GLShader;
 class GridLayout;
 class GroupLayout;
 class ImagePanel;
+class ImageStats;
 class ImageView;
 class Label;
 class Layout;
 class MessageDialog;
 class Object;
+class PerfOverlay;
+class Plot;
 class Popup;
 class PopupButton;
 class ProgressBar;
@@ -183,7 +186,10 @@ class TextBox;
 class TextArea;
 class Texture;
 class Theme;
+class ThumbnailCache;
+class TiledImage;
 class ToolButton;
+class VirtualList;
 class VScrollPanel;
 class Widget;
 class Window;
@@ -200,8 +206,15 @@ class Window;
  * Refer to :ref:`nanogui_example_3` for how you might go about managing OpenGL
  * and GLFW on your own, while still using NanoGUI's classes.
  * \endrst
+ *
+ * \param headless
+ *     Initialize GLFW without connecting to a window system, which is
+ *     useful for rendering on servers without a display. Only headless
+ *     screens (see \ref Screen::Screen()) can be created in this case.
+ *     This requires GLFW's "null" platform (GLFW 3.4 or newer) and has
+ *     no effect otherwise.
  */
-extern NANOGUI_EXPORT void init();
+extern NANOGUI_EXPORT void init(bool headless = false);
 
 /// Static shutdown; should be called before the application terminates.
 extern NANOGUI_EXPORT void shutdown();
@@ -209,11 +222,18 @@ extern NANOGUI_EXPORT void shutdown();
 /**
  * \brief Enter the application main loop
  *
+ * The main loop sleeps until an keyboard/mouse/.. event is received or
+ * until the next redraw deadline requested via \ref Screen::schedule_redraw()
+ * expires, whichever comes first. When no screen is animating, the
+ * application therefore does not wake up at all. The frame rate of each
+ * screen can be limited using \ref Screen::set_target_fps().
+ *
  * \param refresh
  *     NanoGUI issues a redraw call whenever an keyboard/mouse/.. event is
  *     received. In the absence of any external events, it enforces a redraw
  *     once every ``refresh`` milliseconds. To disable the refresh timer,
- *     specify a negative value here.
+ *     specify a negative value here. Animations should preferably use
+ *     \ref Screen::schedule_redraw() instead.
  *
  * \param detach
  *     This parameter only exists in the Python bindings. When the active
@@ -332,6 +352,16 @@ extern NANOGUI_EXPORT void chdir_to_bundle_parent();
  */
 extern NANOGUI_EXPORT std::string utf8(uint32_t c);
 
+/**
+ * \brief List the PNG images in a directory without loading them
+ *
+ * Returns pairs of an empty image handle (\c 0) and the full filename, which
+ * can be passed to an ImagePanel with a \ref ThumbnailCache that decodes the
+ * images on demand.
+ */
+extern NANOGUI_EXPORT std::vector<std::pair<int, std::string>>
+    list_image_directory(const std::string &path);
+
 /// Load a directory of PNG images and upload them to the GPU (suitable for use with ImagePanel)
 extern NANOGUI_EXPORT std::vector<std::pair<int, std::string>>
     load_image_directory(NVGcontext *ctx, const std::string &path);
@@ -20,42 +20,95 @@ NAMESPACE_BEGIN(nanogui)
  * \class Graph graph.h nanogui/graph.h
  *
  * \brief Simple graph widget for showing a function plot.
+ *
+ * By default, the graph displays the array returned by \ref values(). In
+ * streaming mode (enabled via \ref set_capacity()), the graph instead
+ * retains the most recent \ref capacity() values that were appended using
+ * \ref push(). The values are then stored in a ring buffer (use \ref
+ * value() to access them in chronological order), and their minima and
+ * maxima are summarized in blocks as they arrive.
+ *
+ * When there are more values than horizontal pixels, the graph draws the
+ * range of values falling into each pixel column instead of the individual
+ * values, which (in streaming mode) uses the block summaries to avoid
+ * visiting every value.
  */
 class NANOGUI_EXPORT Graph : public Widget {
 public:
     Graph(Widget *parent, const std::string &caption = "Untitled");
 
     const std::string &caption() const { return m_caption; }
-    void set_caption(const std::string &caption) { m_caption = caption; }
+    void set_caption(const std::string &caption) { m_caption = caption; invalidate_layer(); }
 
     const std::string &header() const { return m_header; }
-    void set_header(const std::string &header) { m_header = header; }
+    void set_header(const std::string &header) { m_header = header; invalidate_layer(); }
 
     const std::string &footer() const { return m_footer; }
-    void set_footer(const std::string &footer) { m_footer = footer; }
+    void set_footer(const std::string &footer) { m_footer = footer; invalidate_layer(); }
 
     const Color &background_color() const { return m_background_color; }
-    void set_background_color(const Color &background_color) { m_background_color = background_color; }
+    void set_background_color(const Color &background_color) { m_background_color = background_color; invalidate_layer(); }
 
     const Color &stroke_color() const { return m_stroke_color; }
-    void set_stroke_color(const Color &stroke_color) { m_stroke_color = stroke_color; }
+    void set_stroke_color(const Color &stroke_color) { m_stroke_color = stroke_color; invalidate_layer(); }
 
     const Color &fill_color() const { return m_fill_color; }
-    void set_fill_color(const Color &fill_color) { m_fill_color = fill_color; }
+    void set_fill_color(const Color &fill_color) { m_fill_color = fill_color; invalidate_layer(); }
 
     const Color &text_color() const { return m_text_color; }
-    void set_text_color(const Color &text_color) { m_text_color = text_color; }
+    void set_text_color(const Color &text_color) { m_text_color = text_color; invalidate_layer(); }
 
+    /// Return the underlying storage (in streaming mode, use \ref value() and \ref size() instead)
     const std::vector<float> &values() const { return m_values; }
+    /// Return the underlying storage (in streaming mode, use \ref value() and \ref size() instead)
     std::vector<float> &values() { return m_values; }
-    void set_values(const std::vector<float> &values) { m_values = values; }
+    /// Replace the values that are displayed
+    void set_values(const std::vector<float> &values);
+
+    /// Return the number of values that are retained in streaming mode (0: streaming mode is disabled)
+    size_t capacity() const { return m_capacity; }
+
+    /**
+     * \brief Enable streaming mode and retain the most recent \c capacity
+     * values, or disable it when \c capacity is zero.
+     *
+     * The most recent values that fit are preserved in either case.
+     */
+    void set_capacity(size_t capacity);
+
+    /// Return the number of values that are displayed
+    size_t size() const {
+        return m_capacity ? std::min(m_total, m_capacity) : m_values.size();
+    }
+
+    /// Return the value with the given index (in chronological order) among the \ref size() values that are displayed
+    float value(size_t index) const {
+        return m_capacity ? m_values[(m_total - size() + index) % m_capacity]
+                          : m_values[index];
+    }
+
+    /// Append \c count values (dropping the oldest ones in streaming mode)
+    void push(const float *values, size_t count);
+
+    /// Append a single value (dropping the oldest one in streaming mode)
+    void push(float value) { push(&value, 1); }
 
     virtual Vector2i preferred_size(NVGcontext *ctx) const override;
     virtual void draw(NVGcontext *ctx) override;
+protected:
+    /// Return the minimum and maximum of the values <tt>value(first..last-1)</tt>
+    Vector2f value_range(size_t first, size_t last) const;
+
 protected:
     std::string m_caption, m_header, m_footer;
     Color m_background_color, m_fill_color, m_stroke_color, m_text_color;
     std::vector<float> m_values;
+    /// Streaming mode: capacity and total number of values pushed so far
+    /// (the value pushed at time \c t is stored at <tt>m_values[t % m_capacity]</tt>)
+    size_t m_capacity = 0;
+    size_t m_total = 0;
+    /// Streaming mode: minimum and maximum of each block of values (ring buffer)
+    std::vector<Vector2f> m_blocks;
 };
 
 NAMESPACE_END(nanogui)
@@ -14,6 +14,7 @@
 #pragma once
 
 #include <nanogui/widget.h>
+#include <nanogui/thumbnailcache.h>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -21,6 +22,11 @@ NAMESPACE_BEGIN(nanogui)
  * \class ImagePanel imagepanel.h nanogui/imagepanel.h
  *
  * \brief Image panel widget which shows a number of square-shaped icons.
+ *
+ * When a \ref ThumbnailCache is specified, entries whose image handle is
+ * \c 0 are interpreted as filenames (e.g. as returned by
+ * \ref list_image_directory()), whose thumbnails are decoded in the
+ * background once they become visible. A placeholder is drawn until then.
  */
 class NANOGUI_EXPORT ImagePanel : public Widget {
 public:
@@ -28,9 +34,16 @@ public:
 public:
     ImagePanel(Widget *parent);
 
-    void set_images(const Images &data) { m_images = data; }
+    void set_images(const Images &data) { m_images = data; invalidate_layer(); invalidate_layout(); }
     const Images& images() const { return m_images; }
 
+    /// Return the cache that provides thumbnails for entries without an image handle
+    ThumbnailCache *thumbnail_cache() { return m_thumbnail_cache.get(); }
+    /// Return the cache that provides thumbnails for entries without an image handle
+    const ThumbnailCache *thumbnail_cache() const { return m_thumbnail_cache.get(); }
+    /// Set the cache that provides thumbnails for entries without an image handle
+    void set_thumbnail_cache(ThumbnailCache *cache) { m_thumbnail_cache = cache; invalidate_layer(); }
+
     const std::function<void(int)> &callback() const { return m_callback; }
     void set_callback(const std::function<void(int)> &callback) { m_callback = callback; }
 
@@ -47,6 +60,7 @@ protected:
 protected:
     Images m_images;
     std::function<void(int)> m_callback;
+    ref<ThumbnailCache> m_thumbnail_cache;
     int m_thumb_size;
     int m_spacing;
     int m_margin;
@@ -0,0 +1,145 @@
+/*
+    nanogui/imagestats.h -- GPU reductions computing the luminance range,
+    mean, and histogram of a texture
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+/** \file */
+
+#pragma once
+
+#include <nanogui/texture.h>
+#include <nanogui/shader.h>
+#include <nanogui/renderpass.h>
+#include <vector>
+
+NAMESPACE_BEGIN(nanogui)
+
+/**
+ * \class ImageStats imagestats.h nanogui/imagestats.h
+ *
+ * \brief Computes the luminance range, mean, and histogram of a texture on
+ * the GPU
+ *
+ * \ref compute() reduces the texture by a sequence of render passes that
+ * each shrink the image by a factor of 4 along both axes, keeping track of
+ * the minimum, maximum, sum, and number of finite luminance values (or of
+ * the first channel for textures with fewer than three channels). The
+ * histogram of the luminance of the individual pixels is computed in two
+ * more passes. Only the final statistics and the histogram (a few hundred bytes)
+ * are transferred back to the CPU, asynchronously where supported.
+ *
+ * The intermediate textures use the \c Float32 format, hence rendering to
+ * such textures must be supported (this excludes GLES 2). Since render
+ * passes cannot be nested, \ref compute() must be called outside of any
+ * other render pass.
+ *
+ * \sa TexturedQuad::set_auto_exposure()
+ */
+class NANOGUI_EXPORT ImageStats : public Object {
+public:
+    /**
+     * \brief Create the reduction state
+     *
+     * \param bins
+     *     Number of histogram bins (a positive multiple of 4)
+     *
+     * \param log_histogram
+     *     Space the bins uniformly in terms of the base-2 logarithm of the
+     *     luminance (as appropriate for HDR images) instead of linearly
+     */
+    ImageStats(size_t bins = 64, bool log_histogram = true);
+
+    /// Return the number of histogram bins
+    size_t bins() const { return m_bins; }
+
+    /// Return whether the bins are spaced uniformly in log2(luminance)
+    bool log_histogram() const { return m_log_histogram; }
+
+    /**
+     * \brief Issue the GPU passes computing the statistics of \c texture
+     *
+     * The results become available via \ref fetch(). Raises an exception if
+     * the results of a previous call have not been fetched yet, or if the
+     * texture cannot be sampled as floating point values (32-bit integer
+     * component formats and depth textures). 8 and 16-bit integer formats
+     * are interpreted as normalized values in [0, 1] (or [-1, 1]).
+     */
+    void compute(Texture *texture);
+
+    /// Was \ref compute() called without fetching the results afterwards?
+    bool pending() const { return m_pending; }
+
+    /// Can the results of the last \ref compute() be fetched without stalling?
+    bool ready() const;
+
+    /**
+     * \brief Fetch the results of the last \ref compute()
+     *
+     * When \c wait is \c false and the results are not \ref ready() yet, the
+     * function returns immediately. Returns \c true if new results were
+     * fetched.
+     */
+    bool fetch(bool wait = true);
+
+    /// Return the smallest finite luminance value
+    float minimum() const { return m_minimum; }
+
+    /// Return the largest finite luminance value
+    float maximum() const { return m_maximum; }
+
+    /// Return the mean of the finite luminance values
+    float mean() const { return m_mean; }
+
+    /// Return the number of pixels (with a finite luminance) per histogram bin
+    const std::vector<float> &histogram() const { return m_histogram; }
+
+    /**
+     * \brief Return the interval covered by the histogram bins
+     *
+     * This is the range of the luminance, or of its base-2 logarithm if
+     * \ref log_histogram() is \c true.
+     */
+    Vector2f histogram_range() const;
+
+    /// Estimate a luminance percentile (\c q in [0, 1]) from the histogram
+    float percentile(float q) const;
+
+protected:
+    /// Render target, render pass, and shader of a reduction step
+    struct Pass {
+        ref<Texture> target;
+        ref<RenderPass> render_pass;
+        ref<Shader> shader;
+    };
+
+    /// Create the passes for a texture of the given size
+    void init(const Vector2i &size);
+
+    /// Create a render target of the given size along with a shader rendering into it
+    Pass create_pass(const Vector2i &size, const std::string &name,
+                     const char *fragment_shader);
+
+    /// Render a full-screen quad within a pass
+    static void run(Pass &pass);
+
+protected:
+    size_t m_bins;
+    bool m_log_histogram;
+    Vector2i m_size = 0;
+    /// Reduction steps, the last one has size 1x1
+    std::vector<Pass> m_levels;
+    /// Histograms of the rows, and their sum
+    Pass m_rows, m_histogram_pass;
+    ref<TextureDownload> m_stats_download, m_histogram_download;
+    bool m_pending = false;
+    float m_minimum = 0.f, m_maximum = 0.f, m_mean = 0.f;
+    std::vector<float> m_histogram;
+};
+
+NAMESPACE_END(nanogui)
@@ -13,6 +13,7 @@
 #pragma once
 
 #include <nanogui/canvas.h>
+#include <nanogui/tiledimage.h>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -21,6 +22,13 @@ NAMESPACE_BEGIN(nanogui)
  *
  * \brief A widget for displaying, panning, and zooming images. Numerical RGBA
  * pixel information is shown at large magnifications.
+ *
+ * Images that do not fit into a single texture can be displayed using a
+ * \ref TiledImage (see \ref set_tiled_image()). In this case, only the
+ * tiles that are visible at the current scale and offset are requested, at
+ * the coarsest level of detail that still provides at least one image pixel
+ * per screen pixel. Coarser tiles that are already available are shown in
+ * place of tiles that are still being produced.
  */
 class NANOGUI_EXPORT ImageView : public Canvas {
 public:
@@ -36,6 +44,16 @@ public:
     /// Set the currently active image
     void set_image(Texture *image);
 
+    /// Return the currently active tiled image
+    TiledImage *tiled_image() { return m_tiled_image; }
+    /// Return the currently active tiled image (const version)
+    const TiledImage *tiled_image() const { return m_tiled_image.get(); }
+    /// Display a tiled image instead of a single texture
+    void set_tiled_image(TiledImage *image);
+
+    /// Return the size of the active (regular or tiled) image in pixels
+    Vector2i image_size() const;
+
     /// Center the image on the screen
     void center();
 
@@ -71,9 +89,25 @@ public:
     virtual void draw(NVGcontext *ctx) override;
     virtual void draw_contents() override;
 
+protected:
+    /// Draw the visible tiles of the active tiled image
+    void draw_tiles(const Vector2i &viewport_size);
+
+    /**
+     * \brief Draw a texture covering the given region of the image (in image
+     * pixels)
+     *
+     * Only the fraction \c uv_extent of the texture (starting at its top
+     * left corner) is mapped onto the region.
+     */
+    void draw_texture(Texture *texture, const Vector2f &origin, const Vector2f &size,
+                      const Vector2i &viewport_size,
+                      const Vector2f &uv_extent = Vector2f(1.f));
+
 protected:
     nanogui::ref<Shader> m_image_shader;
     nanogui::ref<Texture> m_image;
+    nanogui::ref<TiledImage> m_tiled_image;
     float m_scale = 0;
     Vector2f m_offset = 0;
     bool m_draw_image_border;
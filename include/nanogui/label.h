@@ -32,17 +32,17 @@ public:
     /// Get the label's text caption
     const std::string &caption() const { return m_caption; }
     /// Set the label's text caption
-    void set_caption(const std::string &caption) { m_caption = caption; }
+    void set_caption(const std::string &caption) { m_caption = caption; invalidate_layer(); invalidate_layout(); }
 
     /// Set the currently active font (2 are available by default: 'sans' and 'sans-bold')
-    void set_font(const std::string &font) { m_font = font; }
+    void set_font(const std::string &font) { m_font = font; invalidate_layer(); invalidate_layout(); }
     /// Get the currently active font
     const std::string &font() const { return m_font; }
 
     /// Get the label color
     Color color() const { return m_color; }
     /// Set the label color
-    void set_color(const Color& color) { m_color = color; }
+    void set_color(const Color& color) { m_color = color; invalidate_layer(); }
 
     /// Set the \ref Theme used to draw this widget
     virtual void set_theme(Theme *theme) override;
@@ -32,13 +32,20 @@
 #include <nanogui/textarea.h>
 #include <nanogui/slider.h>
 #include <nanogui/imagepanel.h>
+#include <nanogui/thumbnailcache.h>
 #include <nanogui/vscrollpanel.h>
+#include <nanogui/virtuallist.h>
 #include <nanogui/colorwheel.h>
 #include <nanogui/graph.h>
+#include <nanogui/perfoverlay.h>
+#include <nanogui/textmetrics.h>
 #include <nanogui/formhelper.h>
 #include <nanogui/tabwidget.h>
 #include <nanogui/texture.h>
 #include <nanogui/shader.h>
 #include <nanogui/renderpass.h>
+#include <nanogui/imagestats.h>
 #include <nanogui/canvas.h>
+#include <nanogui/tiledimage.h>
 #include <nanogui/imageview.h>
+#include <nanogui/plot.h>
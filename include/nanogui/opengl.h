@@ -105,4 +105,31 @@ inline bool nvg_is_font_icon(int value) { return value >= 1024; }
 /// Check for OpenGL errors and warn if one is found (returns 'true' in that case')
 extern NANOGUI_EXPORT bool nanogui_check_glerror(const char *cmd);
 
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+/// Number of OpenGL state changes and queries issued to the driver or skipped by the state cache
+struct GLStateStats {
+    size_t issued = 0;
+    size_t skipped = 0;
+};
+
+/// Return the counters of the OpenGL state cache
+extern NANOGUI_EXPORT GLStateStats gl_state_stats();
+
+/// Reset the counters returned by \ref gl_state_stats()
+extern NANOGUI_EXPORT void reset_gl_state_stats();
+
+/**
+ * \brief Discard NanoGUI's cached copy of the OpenGL state
+ *
+ * NanoGUI skips redundant state changes (bound programs, vertex arrays,
+ * framebuffers and textures, blending, depth and culling modes, the
+ * viewport and scissor rectangle) by tracking the current state. Code that
+ * changes this state via raw OpenGL calls, e.g. in \ref
+ * Screen::draw_contents(), must call this function afterwards. The cached
+ * state belongs to the context that was current when it was recorded and is
+ * discarded automatically when another context becomes current.
+ */
+extern NANOGUI_EXPORT void invalidate_gl_state();
+#endif
+
 NAMESPACE_END(nanogui)
@@ -0,0 +1,52 @@
+/*
+    nanogui/perfoverlay.h -- Widget that displays frame time statistics
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+/** \file */
+
+#pragma once
+
+#include <nanogui/widget.h>
+
+NAMESPACE_BEGIN(nanogui)
+
+/**
+ * \class PerfOverlay perfoverlay.h nanogui/perfoverlay.h
+ *
+ * \brief Widget that displays frame time percentiles and a plot of recent
+ * frame times.
+ *
+ * The statistics are computed from the timings recorded by the enclosing
+ * \ref Screen, which must have profiling enabled (see \ref
+ * Screen::set_profiling()). The overlay shows the frames that were rendered
+ * before the current one and does not request any redraws by itself.
+ */
+class NANOGUI_EXPORT PerfOverlay : public Widget {
+public:
+    PerfOverlay(Widget *parent);
+
+    /// Return the number of recent frames used to compute the statistics
+    size_t frame_count() const { return m_frame_count; }
+    /// Set the number of recent frames used to compute the statistics
+    void set_frame_count(size_t frame_count) { m_frame_count = frame_count; }
+
+    const Color &background_color() const { return m_background_color; }
+    void set_background_color(const Color &background_color) { m_background_color = background_color; }
+
+    const Color &text_color() const { return m_text_color; }
+    void set_text_color(const Color &text_color) { m_text_color = text_color; }
+
+    virtual Vector2i preferred_size(NVGcontext *ctx) const override;
+    virtual void draw(NVGcontext *ctx) override;
+protected:
+    size_t m_frame_count;
+    Color m_background_color, m_text_color;
+};
+
+NAMESPACE_END(nanogui)
@@ -0,0 +1,154 @@
+/*
+    nanogui/plot.h -- Widget for plotting large data series on the GPU
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+/** \file */
+
+#pragma once
+
+#include <nanogui/canvas.h>
+#include <nanogui/shader.h>
+
+NAMESPACE_BEGIN(nanogui)
+
+/**
+ * \class Plot plot.h nanogui/plot.h
+ *
+ * \brief A widget for plotting, panning, and zooming large data series.
+ *
+ * Each series stores its points in a GPU vertex buffer that only grows by
+ * appending (\ref append()), and is rendered as a line strip or as points
+ * by a \ref Shader. Panning (mouse drag) and zooming (scroll wheel) only
+ * change the transformation passed to the shader as a uniform, hence the
+ * data is never uploaded again. Axes, tick labels, and the legend are drawn
+ * using NanoVG on top of the series. Pressing 'R' fits the view to the data.
+ */
+class NANOGUI_EXPORT Plot : public Canvas {
+public:
+    /// How the points of a series are rendered
+    enum class SeriesType {
+        /// Connect consecutive points by lines
+        Line,
+        /// Draw each point separately (see \ref set_point_size())
+        Scatter
+    };
+
+    /// Initialize the widget
+    Plot(Widget *parent);
+
+    /// Add a new (empty) series and return its index
+    size_t add_series(const std::string &name, const Color &color,
+                      SeriesType type = SeriesType::Line);
+
+    /// Return the number of series
+    size_t series_count() const { return m_series.size(); }
+
+    /// Remove all series
+    void clear();
+
+    /// Return the name of a series
+    const std::string &series_name(size_t index) const { return series(index).name; }
+
+    /// Return the color of a series
+    const Color &series_color(size_t index) const { return series(index).color; }
+    /// Set the color of a series
+    void set_series_color(size_t index, const Color &color) { series(index).color = color; }
+
+    /// Return how the points of a series are rendered
+    SeriesType series_type(size_t index) const { return series(index).type; }
+    /// Set how the points of a series are rendered
+    void set_series_type(size_t index, SeriesType type) { series(index).type = type; }
+
+    /// Return whether a series is drawn
+    bool series_visible(size_t index) const { return series(index).visible; }
+    /// Set whether a series is drawn
+    void set_series_visible(size_t index, bool visible) { series(index).visible = visible; }
+
+    /// Return the number of points of a series
+    size_t point_count(size_t index) const { return series(index).count; }
+
+    /**
+     * \brief Append \c count points to a series
+     *
+     * \c xy contains the interleaved coordinates of the points (i.e.
+     * <tt>2 * count</tt> values), which are copied into the vertex buffer of
+     * the series without re-uploading the existing points.
+     */
+    void append(size_t index, const float *xy, size_t count);
+
+    /// Remove the points of a series (its GPU storage is retained for reuse)
+    void clear_series(size_t index);
+
+    /// Return the size of scatter plot points in pixels
+    float point_size() const { return m_point_size; }
+    /// Set the size of scatter plot points in pixels
+    void set_point_size(float point_size) { m_point_size = point_size; }
+
+    /// Return the lower left corner of the displayed region in data coordinates
+    const Vector2f &view_min() const { return m_view_min; }
+    /// Return the upper right corner of the displayed region in data coordinates
+    const Vector2f &view_max() const { return m_view_max; }
+    /// Set the displayed region in data coordinates
+    void set_view(const Vector2f &view_min, const Vector2f &view_max);
+
+    /// Set the displayed region to the bounding box of all visible series
+    void fit();
+
+    /// Return the label of the horizontal axis
+    const std::string &x_label() const { return m_x_label; }
+    /// Set the label of the horizontal axis
+    void set_x_label(const std::string &label) { m_x_label = label; }
+
+    /// Return the label of the vertical axis
+    const std::string &y_label() const { return m_y_label; }
+    /// Set the label of the vertical axis
+    void set_y_label(const std::string &label) { m_y_label = label; }
+
+    /// Convert a position within the widget to data coordinates
+    Vector2f pos_to_data(const Vector2f &p) const;
+    /// Convert data coordinates to a position within the widget
+    Vector2f data_to_pos(const Vector2f &p) const;
+
+    // Widget implementation
+    virtual bool keyboard_event(int key, int scancode, int action, int modifiers) override;
+    virtual bool mouse_drag_event(const Vector2i &p, const Vector2i &rel, int button, int modifiers) override;
+    virtual bool scroll_event(const Vector2i &p, const Vector2f &rel) override;
+    virtual void draw(NVGcontext *ctx) override;
+    virtual void draw_contents() override;
+
+protected:
+    struct Series {
+        std::string name;
+        Color color;
+        SeriesType type;
+        bool visible = true;
+        ref<Shader> shader;
+        /// Number of points in the vertex buffer
+        size_t count = 0;
+        /// Bounding box of the points
+        Vector2f bbox_min, bbox_max;
+    };
+
+    /// Look up a series and check the index
+    Series &series(size_t index);
+    const Series &series(size_t index) const;
+
+    /// Draw the grid, ticks, and labels of both axes
+    void draw_axes(NVGcontext *ctx);
+
+protected:
+    std::vector<Series> m_series;
+    Vector2f m_view_min, m_view_max;
+    std::string m_x_label, m_y_label;
+    float m_point_size = 3.f;
+    Color m_axis_color;
+    Color m_grid_color;
+};
+
+NAMESPACE_END(nanogui)
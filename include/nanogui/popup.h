@@ -33,22 +33,22 @@ public:
     Popup(Widget *parent, Window *parent_window = nullptr);
 
     /// Return the anchor position in the parent window; the placement of the popup is relative to it
-    void set_anchor_pos(const Vector2i &anchor_pos) { m_anchor_pos = anchor_pos; }
+    void set_anchor_pos(const Vector2i &anchor_pos) { m_anchor_pos = anchor_pos; invalidate_layer(); }
     /// Set the anchor position in the parent window; the placement of the popup is relative to it
     const Vector2i &anchor_pos() const { return m_anchor_pos; }
 
     /// Set the anchor height; this determines the vertical shift relative to the anchor position
-    void set_anchor_offset(int anchor_offset) { m_anchor_offset = anchor_offset; }
+    void set_anchor_offset(int anchor_offset) { m_anchor_offset = anchor_offset; invalidate_layer(); }
     /// Return the anchor height; this determines the vertical shift relative to the anchor position
     int anchor_offset() const { return m_anchor_offset; }
 
     /// Set the anchor width
-    void set_anchor_size(int anchor_size) { m_anchor_size = anchor_size; }
+    void set_anchor_size(int anchor_size) { m_anchor_size = anchor_size; invalidate_layer(); }
     /// Return the anchor width
     int anchor_size() const { return m_anchor_size; }
 
     /// Set the side of the parent window at which popup will appear
-    void set_side(Side popup_side) { m_side = popup_side; }
+    void set_side(Side popup_side) { m_side = popup_side; invalidate_layer(); }
     /// Return the side of the parent window at which popup will appear
     Side side() const { return m_side; }
 
@@ -32,7 +32,7 @@ public:
     PopupButton(Widget *parent, const std::string &caption = "Untitled",
                 int button_icon = 0);
 
-    void set_chevron_icon(int icon) { m_chevron_icon = icon; }
+    void set_chevron_icon(int icon) { m_chevron_icon = icon; invalidate_layer(); }
     int chevron_icon() const { return m_chevron_icon; }
 
     void set_side(Popup::Side popup_side);
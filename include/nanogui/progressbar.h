@@ -26,7 +26,7 @@ public:
     ProgressBar(Widget *parent);
 
     float value() { return m_value; }
-    void set_value(float value) { m_value = value; }
+    void set_value(float value) { m_value = value; invalidate_layer(); }
 
     virtual Vector2i preferred_size(NVGcontext *ctx) const override;
     virtual void draw(NVGcontext* ctx) override;
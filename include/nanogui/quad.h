@@ -18,6 +18,7 @@
 #include <nanogui/shader.h>
 #include <nanogui/texture.h>
 #include <nanogui/vector.h>
+#include <nanogui/imagestats.h>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -100,9 +101,69 @@ public:
      */
     float texture_exposure() const { return m_texture_exposure; }
 
+    /**
+     * \brief Set whether the exposure is chosen automatically
+     *
+     * When enabled, \ref update_auto_exposure() computes the luminance
+     * statistics of the texture on the GPU and sets the exposure so that
+     * the luminance percentile \ref auto_exposure_percentile() maps to 1.
+     * Default is false.
+     *
+     * \param enabled
+     *     True to enable automatic exposure
+     */
+    void set_auto_exposure(bool enabled);
+
+    /**
+     * \brief Get whether the exposure is chosen automatically
+     *
+     * \return True if automatic exposure is enabled
+     */
+    bool auto_exposure() const { return m_auto_exposure; }
+
+    /**
+     * \brief Set the luminance percentile that auto-exposure maps to 1
+     *
+     * \param percentile
+     *     Percentile between 0 and 1 (default 0.95)
+     */
+    void set_auto_exposure_percentile(float percentile) {
+        m_auto_exposure_percentile = percentile;
+    }
+
+    /**
+     * \brief Get the luminance percentile that auto-exposure maps to 1
+     *
+     * \return Current percentile
+     */
+    float auto_exposure_percentile() const { return m_auto_exposure_percentile; }
+
+    /**
+     * \brief Update the automatic exposure
+     *
+     * Applies the statistics of the last computation (if they are available
+     * by now) to the exposure, and starts computing the statistics of the
+     * current texture. The results are fetched asynchronously, hence the
+     * exposure lags a frame or so behind. Does nothing unless auto-exposure
+     * is enabled. Must be called outside of any render pass, e.g. once per
+     * frame before rendering the quad.
+     */
+    void update_auto_exposure();
+
+    /**
+     * \brief Get the image statistics used by auto-exposure
+     *
+     * \return The statistics, or \c nullptr if auto-exposure is disabled
+     */
+    ImageStats *image_stats() { return m_image_stats; }
+
 private:
     bool m_texture_linear = false;
     float m_texture_exposure = 1.0f;
+    bool m_auto_exposure = false;
+    float m_auto_exposure_percentile = 0.95f;
+    ref<Texture> m_texture;
+    ref<ImageStats> m_image_stats;
 };
 
 NAMESPACE_END(nanogui)
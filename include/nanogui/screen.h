@@ -17,11 +17,43 @@
 #include <nanogui/widget.h>
 #include <nanogui/texture.h>
 #include <mutex>
+#include <atomic>
+#include <tuple>
 
 NAMESPACE_BEGIN(nanogui)
 
 class Texture;
 
+/**
+ * \brief CPU timings of the phases of a single frame rendered by \ref
+ * Screen::draw_all()
+ *
+ * All durations are specified in milliseconds. Since the GPU executes
+ * commands asynchronously, time spent waiting for the GPU (e.g. due to
+ * vertical synchronization) is mostly attributed to \c teardown, which
+ * presents the frame.
+ *
+ * \sa Screen::set_profiling()
+ */
+struct FrameStats {
+    /// Time at which the frame started (in the units of \c glfwGetTime())
+    double timestamp = 0.0;
+    /// Time spent in \ref Screen::draw_setup()
+    float setup = 0.f;
+    /// Time spent in \ref Screen::draw_contents()
+    float contents = 0.f;
+    /// Time spent drawing widgets and tooltips via NanoVG
+    float widgets = 0.f;
+    /// Time spent submitting the NanoVG geometry (\c nvgEndFrame())
+    float flush = 0.f;
+    /// Time spent in \ref Screen::draw_teardown()
+    float teardown = 0.f;
+    /// Total duration of the frame
+    float total = 0.f;
+    /// Number of widgets that were not drawn because they were clipped
+    uint32_t culled = 0;
+};
+
 /**
  * \class Screen screen.h nanogui/screen.h
  *
@@ -74,6 +106,16 @@ public:
      *     Requesting an invalid profile will result in no context (and
      *     therefore no GUI) being created. This attribute is ignored when
      *     targeting OpenGL ES 2 or Metal.
+     *
+     * \param headless
+     *     Create an offscreen screen that is never shown and never presents
+     *     its contents. Such screens are not drawn by \ref mainloop();
+     *     instead, the application renders frames on demand via \ref
+     *     draw_all() or \ref capture(). If no window system context can be
+     *     created, an OSMesa context is used instead. Combined with \ref
+     *     init() in headless mode, this makes it possible to render on
+     *     machines without display or GPU (e.g. using Mesa's llvmpipe
+     *     driver). Headless rendering is not supported by the Metal backend.
      */
     Screen(
         const Vector2i &size,
@@ -84,7 +126,8 @@ public:
         bool stencil_buffer = true,
         bool float_buffer = false,
         unsigned int gl_major = 3,
-        unsigned int gl_minor = 2
+        unsigned int gl_minor = 2,
+        bool headless = false
     );
 
     /// Release all resources
@@ -111,9 +154,157 @@ public:
     /// Return the framebuffer size (potentially larger than size() on high-DPI screens)
     const Vector2i &framebuffer_size() const { return m_fbsize; }
 
+    /// Is this an offscreen screen without a visible window?
+    bool headless() const { return m_headless; }
+
+    /**
+     * \brief Render a frame and return the contents of the framebuffer
+     *
+     * This function forces a full redraw via \ref draw_all() and reads
+     * back the resulting framebuffer before it is presented. The result
+     * has the shape <tt>framebuffer_size().y() x framebuffer_size().x() x
+     * 4</tt> (8-bit RGBA, top row first). This is mainly useful in
+     * combination with headless screens, e.g. for automated testing.
+     * Not supported by the Metal backend.
+     */
+    std::vector<uint8_t> capture();
+
     /// Send an event that will cause the screen to be redrawn at the next event loop iteration
     void redraw();
 
+    /**
+     * \brief Request that the screen is redrawn after \c delay seconds
+     *
+     * This schedules a deadline for the next frame. In contrast to \ref
+     * redraw(), the main loop does not wake up before the deadline expires.
+     * Multiple requests are merged, keeping the earliest deadline.
+     *
+     * Animated widgets should call <tt>screen()->schedule_redraw()</tt> from
+     * their \ref Widget::draw() implementation for as long as the animation
+     * is running. The resulting frame rate is limited by \ref
+     * set_target_fps(), and the application does not wake up at all once
+     * all animations have stopped. This function may be called from any
+     * thread.
+     */
+    void schedule_redraw(double delay = 0.0);
+
+    /// Return the maximum frame rate of this screen (0: unlimited)
+    float target_fps() const { return m_target_fps; }
+
+    /**
+     * \brief Limit the frame rate of this screen
+     *
+     * The main loop will not redraw the screen more than \c fps times per
+     * second, regardless of how frequently redraws are requested. A value
+     * of zero (the default) removes this limit, in which case the frame
+     * rate is only bounded by the display's vertical synchronization.
+     */
+    void set_target_fps(float fps);
+
+    /// Return whether mouse motion and scroll events are coalesced (see \ref set_event_coalescing())
+    bool event_coalescing() const { return m_event_coalescing; }
+
+    /**
+     * \brief Merge high-rate mouse motion, drag, and scroll events
+     *
+     * High-rate mice and trackpads can report hundreds of events per second,
+     * each of which is normally dispatched to the widget hierarchy right
+     * away. When coalescing is enabled, consecutive motion and drag events
+     * are merged into a single event (whose relative motion is the sum of the
+     * merged events), and scroll deltas are accumulated. The merged events
+     * are dispatched once per frame at the beginning of \ref draw_all(), or
+     * earlier when another kind of input event arrives, so that the relative
+     * order of events is preserved.
+     *
+     * Widgets that need every sample (e.g. a painting canvas) can opt out
+     * via \ref Widget::set_raw_input(), which affects events targeting them
+     * or their descendants.
+     */
+    void set_event_coalescing(bool value);
+
+    /// Dispatch mouse motion and scroll events held back by \ref set_event_coalescing()
+    void flush_events();
+
+    /**
+     * \brief Rasterize glyphs into NanoVG's font atlas ahead of time
+     *
+     * NanoVG rasterizes glyphs the first time that they are drawn, which
+     * causes frame time spikes when a large amount of new text appears,
+     * e.g. when a window opens. This function queues the code points
+     * <tt>[first, last]</tt> of the font face \c font to be rasterized at
+     * each of the specified font sizes at the beginning of the next frame.
+     * Any resulting growth of the atlas also takes place at that point.
+     *
+     * Typical usage right after creating the screen is
+     * <tt>prewarm_glyphs("sans", { 16, 20 })</tt>.
+     */
+    void prewarm_glyphs(const std::string &font, const std::vector<float> &sizes,
+                        uint32_t first = 32, uint32_t last = 126);
+
+    /**
+     * \brief Return the time (in the units of \c glfwGetTime()) at which
+     * the next frame should be drawn
+     *
+     * Returns zero if a redraw is pending and the frame rate limit permits
+     * drawing immediately, and infinity if no redraw is needed. This is used
+     * by \ref mainloop() to determine how long it can sleep.
+     */
+    double next_frame_time();
+
+    /**
+     * \brief Return the number of frames drawn so far
+     *
+     * The counter is incremented once per frame by \ref draw_all(). Caches
+     * that are updated from several widgets can use this value to perform
+     * per-frame work only once.
+     */
+    uint64_t frame_index() const { return m_frame_index; }
+
+    /**
+     * \brief Mark a rectangular region of the screen as needing to be redrawn
+     *
+     * The position and size are specified in screen coordinates. Damaged
+     * regions accumulate until the next call to \ref draw_all(). When partial
+     * redraws are enabled (see \ref set_partial_redraw()), only the affected
+     * portion of the framebuffer is repainted. Otherwise, this function is
+     * equivalent to \ref redraw().
+     */
+    void invalidate_rect(const Vector2i &pos, const Vector2i &size);
+
+    /// Return whether the screen only repaints damaged regions when possible
+    bool partial_redraw() const { return m_partial_redraw; }
+
+    /**
+     * \brief Only repaint damaged regions when possible?
+     *
+     * When enabled, frames that were requested exclusively via \ref
+     * invalidate_rect() or \ref Widget::mark_dirty() only repaint the affected
+     * part of the framebuffer, which is scissored accordingly. \ref
+     * draw_contents() is invoked once per damaged region in this case.
+     * Everything else (\ref redraw(), input events, resizing, tooltips)
+     * triggers a full redraw.
+     *
+     * This relies on the contents of the back buffer being retained between
+     * frames (see \ref set_buffer_age()). Partial redraws are not supported
+     * by the Metal backend and are disabled by default.
+     */
+    void set_partial_redraw(bool partial_redraw);
+
+    /// Return the assumed age of the back buffer (see \ref set_buffer_age())
+    int buffer_age() const { return m_buffer_age; }
+
+    /**
+     * \brief Set the assumed age of the back buffer
+     *
+     * This specifies how many frames ago the back buffer was last rendered
+     * when a new frame starts, which depends on the swap behavior of the
+     * windowing system. The default value of 2 corresponds to double
+     * buffering with page flipping, 1 indicates that the back buffer is
+     * preserved, and 0 that its contents are undefined (which disables
+     * partial redraws).
+     */
+    void set_buffer_age(int buffer_age);
+
     /**
      * \brief Redraw the screen if the redraw flag is set
      *
@@ -223,6 +414,26 @@ public:
     /// Flush all queued up NanoVG rendering commands
     void nvg_flush();
 
+    /**
+     * \brief Reset the NanoVG scissor region
+     *
+     * Unlike \c nvgResetScissor(), this keeps drawing operations confined to
+     * the region that is currently being repainted during partial redraws.
+     */
+    void nvg_reset_scissor();
+
+    /**
+     * \brief Create a NanoVG image that references the given texture
+     *
+     * The texture is not owned by the returned image handle and must outlive
+     * it. The image should be released using \c nvgDeleteImage(). This is
+     * currently only supported by the OpenGL and GLES backends.
+     *
+     * \param flags
+     *     A combination of NanoVG image flags (e.g. \c NVG_IMAGE_FLIPY)
+     */
+    int nvg_image_from_texture(const Texture *texture, int flags = 0);
+
     /// Shut down GLFW when the window is closed?
     void set_shutdown_glfw(bool v) { m_shutdown_glfw = v; }
     bool shutdown_glfw() { return m_shutdown_glfw; }
@@ -230,6 +441,45 @@ public:
     /// Is a tooltip currently fading in?
     bool tooltip_fade_in_progress() const;
 
+    /// Return whether frame timings are being recorded
+    bool profiling() const { return m_profiling; }
+
+    /**
+     * \brief Record the timings of recently rendered frames?
+     *
+     * When enabled, \ref draw_all() measures the duration of each phase of
+     * a frame and stores it in a ring buffer holding the \c history most
+     * recent frames, which can be queried using \ref frame_stats(). The
+     * overhead is negligible when profiling is disabled (the default).
+     */
+    void set_profiling(bool profiling, size_t history = 256);
+
+    /// Return whether per-widget timings are being recorded
+    bool widget_profiling() const { return m_widget_profiling; }
+
+    /**
+     * \brief Record the time spent in the \ref Widget::draw() and \ref
+     * Widget::perform_layout() methods of individual widgets?
+     *
+     * The results can be queried using \ref Widget::draw_time(), \ref
+     * Widget::layout_time(), and their exclusive counterparts. This adds
+     * a small overhead per widget and is disabled by default.
+     */
+    void set_widget_profiling(bool widget_profiling);
+
+    /// Return the timings of recently rendered frames (oldest frame first)
+    std::vector<FrameStats> frame_stats() const;
+
+    /**
+     * \brief Return the number of widgets that were skipped in the most
+     * recently rendered frame because they lay entirely outside of the clip
+     * region of their parent (e.g. a \ref VScrollPanel)
+     */
+    uint32_t culled_widgets() const { return m_culled_widgets_last; }
+
+    /// Discard all recorded frame timings
+    void clear_frame_stats();
+
     using Widget::perform_layout;
 
     /// Compute the layout of all widgets
@@ -267,6 +517,9 @@ public:
     void resize_callback_event(int width, int height);
 
     /* Internal helper functions */
+    void dispatch_cursor_pos(double x, double y);
+    void dispatch_scroll(double x, double y);
+    bool raw_input_target() const;
     void update_focus(Widget *widget);
     void dispose_window(Window *window);
     void center_window(Window *window);
@@ -295,8 +548,44 @@ protected:
     bool m_stencil_buffer;
     bool m_float_buffer;
     bool m_redraw;
+    bool m_headless = false;
+    std::vector<uint8_t> *m_capture_target = nullptr;
     std::mutex m_redraw_mutex;
+    std::atomic<double> m_redraw_deadline;
+    /* Read by next_frame_time(), which may be called from another thread */
+    std::atomic<double> m_last_frame{0.0};
+    uint64_t m_frame_index = 0;
+    std::atomic<float> m_target_fps{0.f};
+    bool m_partial_redraw = false;
+    int m_buffer_age = 2;
+    /* Damaged regions, stored as (x0, y0, x1, y1) in screen coordinates */
+    std::vector<Vector4i> m_damage;
+    std::vector<std::vector<Vector4i>> m_damage_history;
+    Vector2i m_damage_fbsize = 0;
+    Vector4i m_damage_clip = 0;
+    bool m_damage_clip_active = false;
+    bool m_tooltip_visible = false;
+    bool m_drawing_layer = false;
+    bool m_profiling = false;
+    bool m_widget_profiling = false;
+    /* Ring buffer of frame timings, 'm_frame_stats_pos' is the next entry */
+    std::vector<FrameStats> m_frame_stats;
+    size_t m_frame_stats_size = 0;
+    size_t m_frame_stats_pos = 0;
+    float m_flush_time = 0.f;
+    /* Clip rectangle of the widget being drawn, stored as (x0, y0, x1, y1) */
+    Vector4f m_draw_clip = 0;
+    uint32_t m_culled_widgets = 0, m_culled_widgets_last = 0;
+    /* Time spent in nested widgets, used to compute exclusive timings */
+    std::vector<double> m_profile_stack;
     std::function<void(Vector2i)> m_resize_callback;
+    /* Input events held back by event coalescing */
+    bool m_event_coalescing = false;
+    bool m_cursor_pending = false, m_scroll_pending = false;
+    Vector2f m_pending_cursor = 0, m_pending_scroll = 0;
+    bool m_hover_raw_input = false;
+    /* Pending glyph rasterization requests: (font, size, text) */
+    std::vector<std::tuple<std::string, float, std::string>> m_glyph_prewarm;
 #if defined(NANOGUI_USE_METAL)
     void *m_metal_texture = nullptr;
     void *m_metal_drawable = nullptr;
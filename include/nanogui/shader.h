@@ -39,6 +39,18 @@ public:
         AlphaBlend // alpha * new_color + (1 - alpha) * old_color
     };
 
+    /// Statistics of the on-disk program binary cache (see \ref set_program_cache_dir())
+    struct ProgramCacheStats {
+        /// Number of programs that were loaded from the cache
+        size_t hits = 0;
+        /// Number of programs that had to be compiled from source
+        size_t misses = 0;
+        /// Number of cache entries that were stale or rejected by the driver
+        size_t rejected = 0;
+        /// Number of program binaries that were written to the cache
+        size_t stores = 0;
+    };
+
     /**
      * \brief Initialize the shader using the specified source strings.
      *
@@ -54,16 +66,60 @@ public:
      *
      * \param fragment_shader
      *     The source of the fragment shader as a string.
+     *
+     * \param async_compile
+     *     Only submit the sources to the driver and return immediately
+     *     (OpenGL/GLES). Compilation and linking then proceed in the
+     *     background when the driver supports
+     *     <tt>GL_KHR_parallel_shader_compile</tt>, and errors are reported
+     *     upon first use. Any method that needs the program (\ref
+     *     set_buffer(), \ref begin(), etc.) waits for it to finish, hence
+     *     the benefit is greatest when all shaders are created up front.
+     *     Use \ref ready() to check without blocking.
      */
     Shader(RenderPass *render_pass,
            const std::string &name,
            const std::string &vertex_shader,
            const std::string &fragment_shader,
-           BlendMode blend_mode = BlendMode::None);
+           BlendMode blend_mode = BlendMode::None,
+           bool async_compile = false);
 
     /// Release all resources
     virtual ~Shader();
 
+    /**
+     * \brief Enable the on-disk cache of linked shader programs
+     *
+     * When set to a nonempty path, the OpenGL backend stores program
+     * binaries (via \c glGetProgramBinary) in this directory and reuses them
+     * when a shader with the same name and sources is created again on the
+     * same driver, which skips compilation and linking. Entries that the
+     * driver rejects (e.g. following a driver update) are recompiled and
+     * replaced automatically. The directory is created if needed. An empty
+     * string (the default) disables the cache. Has no effect on GLES 2 and
+     * Metal, where shaders are precompiled.
+     */
+    static void set_program_cache_dir(const std::string &dir);
+
+    /// Return the directory of the program binary cache (empty if disabled)
+    static const std::string &program_cache_dir();
+
+    /**
+     * \brief Return a suitable per-user cache directory for \ref
+     * set_program_cache_dir()
+     *
+     * This is <tt>%LOCALAPPDATA%\\nanogui</tt> on Windows,
+     * <tt>~/Library/Caches/nanogui</tt> on macOS, and
+     * <tt>$XDG_CACHE_HOME/nanogui</tt> or <tt>~/.cache/nanogui</tt> otherwise.
+     */
+    static std::string default_program_cache_dir();
+
+    /// Return hit/miss statistics of the program binary cache
+    static ProgramCacheStats program_cache_stats();
+
+    /// Reset the statistics returned by \ref program_cache_stats()
+    static void reset_program_cache_stats();
+
     /// Return the render pass associated with this shader
     RenderPass *render_pass() { return m_render_pass; }
 
@@ -73,6 +129,16 @@ public:
     /// Return the blending mode of this shader
     BlendMode blend_mode() const { return m_blend_mode; }
 
+    /**
+     * \brief Check whether the shader has finished compiling without blocking
+     *
+     * Always true unless the shader was created with \c async_compile. If
+     * the driver cannot report the compilation status in the background,
+     * this function waits for the compilation to finish and returns true.
+     * Compilation errors are raised as exceptions.
+     */
+    bool ready();
+
     /**
      * \brief Upload a buffer (e.g. vertex positions) that will be associated
      * with a named shader parameter.
@@ -81,7 +147,9 @@ public:
      * data---the implementation takes care of routing the data to the right
      * endpoint. Matrices should be specified in column-major order.
      *
-     * The buffer will be replaced if it is already present.
+     * The buffer will be replaced if it is already present. Vertex and index
+     * buffers keep their GPU storage when the new contents fit, and grow
+     * geometrically otherwise.
      */
     void set_buffer(const std::string &name, VariableType type, size_t ndim,
                     const size_t *shape, const void *data);
@@ -91,6 +159,44 @@ public:
         set_buffer(name, type, shape.end() - shape.begin(), shape.begin(), data);
     }
 
+    /**
+     * \brief Overwrite or append a range of rows of a vertex or index buffer
+     *
+     * Copies <tt>shape[0]</tt> rows to the buffer starting at row \c offset,
+     * leaving the remaining contents intact. The trailing dimensions and the
+     * dtype must match the current buffer. When <tt>offset + shape[0]</tt>
+     * exceeds the number of rows, the buffer is extended; its storage grows
+     * geometrically so that repeated appends take amortized constant time.
+     * \c offset may not exceed the current number of rows.
+     */
+    void update_buffer(const std::string &name, VariableType type, size_t offset,
+                       size_t ndim, const size_t *shape, const void *data);
+
+    void update_buffer(const std::string &name, VariableType type, size_t offset,
+                       std::initializer_list<size_t> shape, const void *data) {
+        update_buffer(name, type, offset, shape.end() - shape.begin(),
+                      shape.begin(), data);
+    }
+
+    /// Return the number of rows of the buffer associated with a named shader parameter
+    size_t buffer_rows(const std::string &name) const;
+
+    /**
+     * \brief Turn a vertex buffer into a per-instance attribute
+     *
+     * With a nonzero \c divisor, the attribute advances once per \c divisor
+     * instances instead of once per vertex when rendering with
+     * <tt>instance_count > 1</tt> (see \ref draw_array()). A divisor of zero
+     * restores per-vertex behavior. On Metal, which has no fixed-function
+     * vertex fetch in NanoGUI, the shader should instead index such buffers
+     * via <tt>[[instance_id]]</tt>; the divisor then only affects the clamping
+     * performed by \ref draw_array(). Requires GLES 3 on GLES.
+     */
+    void set_buffer_divisor(const std::string &name, size_t divisor);
+
+    /// Return the per-instance divisor of a vertex buffer (see \ref set_buffer_divisor())
+    size_t buffer_divisor(const std::string &name) const;
+
     /**
      * \brief Upload a uniform variable (e.g. a vector or matrix) that will be
      * associated with a named shader parameter.
@@ -174,18 +280,29 @@ public:
      *     First index to render. Must be a multiple of 2 or 3 for lines and
      *     triangles, respectively (unless specified using strips).
      *
-     * \param offset
+     * \param count
      *     Number of indices to render. Must be a multiple of 2 or 3 for lines
-     *     and triangles, respectively (unless specified using strips).
+     *     and triangles, respectively (unless specified using strips). The
+     *     count is clamped to the entries that have been uploaded to the index
+     *     buffer (if \c indexed is true) or, on OpenGL, to the rows of all
+     *     per-vertex buffers. Hence, <tt>(size_t) -1</tt> renders the complete
+     *     valid range.
      *
      * \param indexed
      *     Render indexed geometry? In this case, an
      *     \c uint32_t valued buffer with name \c indices
      *     must have been uploaded using \ref set().
+     *
+     * \param instance_count
+     *     Number of instances to render. Vertex buffers with a nonzero
+     *     divisor (see \ref set_buffer_divisor()) advance per instance. The
+     *     count is clamped to the instances covered by the rows of these
+     *     buffers (i.e. <tt>rows * divisor</tt>). Requires GLES 3 on GLES.
      */
     void draw_array(PrimitiveType primitive_type,
                     size_t offset, size_t count,
-                    bool indexed = false);
+                    bool indexed = false,
+                    size_t instance_count = 1);
 
 #if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
     uint32_t shader_handle() const { return m_shader_handle; }
@@ -218,11 +335,29 @@ protected:
         size_t ndim = 0;
         size_t shape[3] { 0, 0, 0 };
         size_t size = 0;
+        size_t capacity = 0;
+        size_t divisor = 0;
         bool dirty = false;
 
         std::string to_string() const;
     };
 
+    /// Look up a buffer and check that 'dtype' and the trailing dimensions of 'shape' match
+    Buffer &check_buffer(const char *method, const std::string &name,
+                         VariableType dtype, size_t ndim, const size_t *shape);
+
+    /// Clamp the arguments of \ref draw_array() to the valid range of the buffers
+    size_t clamp_count(size_t offset, size_t count, bool indexed) const;
+
+    /// Clamp the instance count of \ref draw_array() to the rows of the per-instance buffers
+    size_t clamp_instance_count(size_t instance_count) const;
+
+    /// Wait for asynchronous compilation to finish and query the shader interface
+    void finalize();
+
+    /// Check the compilation status and query the shader interface (OpenGL/GLES)
+    void init_program();
+
 protected:
     RenderPass* m_render_pass;
     std::string m_name;
@@ -231,6 +366,12 @@ protected:
 
     #if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
         uint32_t m_shader_handle = 0;
+        uint32_t m_pending_shaders[2] = { 0, 0 };
+        std::string m_cache_path;
+        bool m_pending = false;
+        bool m_compiling = false;
+        /// Error raised by finalize(), reported again on later uses
+        std::string m_error;
     #  if defined(NANOGUI_USE_OPENGL)
         uint32_t m_vertex_array_handle = 0;
         bool m_uses_point_size = false;
@@ -26,16 +26,16 @@ public:
     Slider(Widget *parent);
 
     float value() const { return m_value; }
-    void set_value(float value) { m_value = value; }
+    void set_value(float value) { m_value = value; invalidate_layer(); }
 
     const Color &highlight_color() const { return m_highlight_color; }
-    void set_highlight_color(const Color &highlight_color) { m_highlight_color = highlight_color; }
+    void set_highlight_color(const Color &highlight_color) { m_highlight_color = highlight_color; invalidate_layer(); }
 
     std::pair<float, float> range() const { return m_range; }
-    void set_range(std::pair<float, float> range) { m_range = range; }
+    void set_range(std::pair<float, float> range) { m_range = range; invalidate_layer(); }
 
     std::pair<float, float> highlighted_range() const { return m_highlighted_range; }
-    void set_highlighted_range(std::pair<float, float> highlighted_range) { m_highlighted_range = highlighted_range; }
+    void set_highlighted_range(std::pair<float, float> highlighted_range) { m_highlighted_range = highlighted_range; invalidate_layer(); }
 
     const std::function<void(float)> &callback() const { return m_callback; }
     void set_callback(const std::function<void(float)> &callback) { m_callback = callback; }
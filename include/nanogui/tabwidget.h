@@ -62,11 +62,11 @@ public:
     /// Return the caption of the tab with the given ID
     const std::string& tab_caption(int id) const { return m_tab_captions[tab_index(id)]; };
     /// Change the caption of the tab with the given ID
-    void set_tab_caption(int id, const std::string &caption) { m_tab_captions[tab_index(id)] = caption; };
+    void set_tab_caption(int id, const std::string &caption) { m_tab_captions[tab_index(id)] = caption; invalidate_layout(); invalidate_layer(); };
 
     /// Return whether tabs provide a close button
     bool tabs_closeable() const { return m_tabs_closeable; }
-    void set_tabs_closeable(bool value) { m_tabs_closeable = value; }
+    void set_tabs_closeable(bool value) { m_tabs_closeable = value; invalidate_layout(); invalidate_layer(); }
 
     /// Return whether tabs can be dragged to different positions
     bool tabs_draggable() const { return m_tabs_draggable; }
@@ -74,11 +74,12 @@ public:
 
     /// Return the padding between the tab widget boundary and child widgets
     int padding() const { return m_padding; }
-    void set_padding(int value) { m_padding = value; }
+    void set_padding(int value) { m_padding = value; invalidate_layout(); invalidate_layer(); }
 
     /// Set the widget's background color (a global property)
     void set_background_color(const Color &background_color) {
         m_background_color = background_color;
+        invalidate_layer();
     }
 
     /// Return the widget's background color (a global property)
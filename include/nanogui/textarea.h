@@ -15,6 +15,7 @@
 #include <nanogui/widget.h>
 #include <cstdio>
 #include <sstream>
+#include <deque>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -26,13 +27,18 @@ NAMESPACE_BEGIN(nanogui)
  *
  * Appended text can use different colors, but the font size is
  * fixed for the entire widget.
+ *
+ * When used as a live log viewer, call \ref set_max_lines() to bound the
+ * number of retained lines (see the documentation of this function for
+ * details), and prefer \ref append_lines() over repeated calls to \ref
+ * append_line().
  */
 class NANOGUI_EXPORT TextArea : public Widget {
 public:
     TextArea(Widget *parent);
 
     /// Set the used font
-    void set_font(const std::string &font) { m_font = font; }
+    void set_font(const std::string &font) { m_font = font; invalidate_layout(); invalidate_layer(); }
 
     /// Return the used font
     const std::string &font() const { return m_font; }
@@ -40,6 +46,7 @@ public:
     /// Set the foreground color (applies to all subsequently added text)
     void set_foreground_color(const Color &color) {
         m_foreground_color = color;
+        invalidate_layer();
     }
 
     /// Return the foreground color (applies to all subsequently added text)
@@ -50,6 +57,7 @@ public:
     /// Set the widget's background color (a global property)
     void set_background_color(const Color &background_color) {
         m_background_color = background_color;
+        invalidate_layer();
     }
 
     /// Return the widget's background color (a global property)
@@ -60,6 +68,7 @@ public:
     /// Set the widget's selection color (a global property)
     void set_selection_color(const Color &selection_color) {
         m_selection_color = selection_color;
+        invalidate_layer();
     }
 
     /// Return the widget's selection color (a global property)
@@ -68,7 +77,7 @@ public:
     }
 
     /// Set the amount of padding to add around the text
-    void set_padding(int padding) { m_padding = padding; }
+    void set_padding(int padding) { m_padding = padding; invalidate_layout(); invalidate_layer(); }
 
     /// Return the amount of padding that is added around the text
     int padding() const { return m_padding; }
@@ -87,6 +96,30 @@ public:
         append(text + "\n");
     }
 
+    /**
+     * \brief Append several lines of text at the bottom
+     *
+     * This is equivalent to calling \ref append_line() for each entry, but
+     * the enclosing \ref VScrollPanel (if any) is only laid out once.
+     */
+    void append_lines(const std::vector<std::string> &lines);
+
+    /// Return the maximum number of retained lines (0 means unlimited)
+    size_t max_lines() const { return m_max_lines; }
+
+    /**
+     * \brief Set the maximum number of retained lines (log mode)
+     *
+     * When nonzero, the oldest lines are discarded once the widget contains
+     * more than \c max_lines lines. Furthermore, text is then only measured
+     * when it is first displayed, hence the preferred width of the widget
+     * only accounts for lines that have already been visible.
+     */
+    void set_max_lines(size_t max_lines);
+
+    /// Return the number of lines currently stored in the widget
+    size_t line_count() const;
+
     /// Clear all current contents
     void clear();
 
@@ -100,23 +133,54 @@ public:
     virtual bool keyboard_event(int key, int scancode, int action, int modifiers) override;
 
 protected:
-    Vector2i position_to_block(const Vector2i &pos) const;
-    Vector2i block_to_position(const Vector2i &pos) const;
-
-protected:
+    /// A contiguous run of text with a single color (at most one line)
     struct Block {
-        Vector2i offset;
-        int width;
-        std::string text;
+        /// Index of the line containing this block (see \ref m_first_line)
+        size_t line;
+        /// Horizontal offset and width (-1 until the block is measured)
+        int x, width;
+        /// Position of the text in \ref m_text (offset by \ref m_text_base)
+        size_t text_offset;
+        uint32_t text_size;
         Color color;
     };
 
-    std::vector<Block> m_blocks;
+    Vector2i position_to_block(const Vector2i &pos) const;
+    Vector2i block_to_position(const Vector2i &pos) const;
+
+    /// Append text without updating the layout
+    void append_text(NVGcontext *ctx, const std::string &text);
+
+    /// Discard the oldest lines when exceeding \ref m_max_lines
+    void discard_lines();
+
+    /// Measure the blocks [begin, end) along with their predecessors on the same line
+    void measure_blocks(NVGcontext *ctx, size_t begin, size_t end);
+
+    /// Return the position of a block relative to the text origin
+    Vector2i block_offset(const Block &block) const {
+        return Vector2i(block.x, (int) (block.line - m_first_line) * font_size());
+    }
+
+    /// Return a pointer to the text of a block
+    const char *block_text(const Block &block) const {
+        return m_text.data() + (block.text_offset - m_text_base);
+    }
+
+protected:
+    std::deque<Block> m_blocks;
+    /// Storage for the text of all blocks
+    std::string m_text;
+    /// Number of characters that were discarded from the front of \ref m_text
+    size_t m_text_base;
+    /// Index of the first retained line, and of the line being appended to
+    size_t m_first_line, m_line;
+    size_t m_max_lines;
+    int m_max_width;
     Color m_foreground_color;
     Color m_background_color;
     Color m_selection_color;
     std::string m_font;
-    Vector2i m_offset, m_max_size;
     int m_padding;
     bool m_selectable;
     Vector2i m_selection_start;
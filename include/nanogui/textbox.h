@@ -46,22 +46,22 @@ public:
     void set_editable(bool editable);
 
     bool spinnable() const { return m_spinnable; }
-    void set_spinnable(bool spinnable) { m_spinnable = spinnable; }
+    void set_spinnable(bool spinnable) { m_spinnable = spinnable; invalidate_layout(); invalidate_layer(); }
 
     const std::string &value() const { return m_value; }
-    void set_value(const std::string &value) { m_value = value; }
+    void set_value(const std::string &value) { m_value = value; invalidate_layer(); invalidate_layout(); }
 
     const std::string &default_value() const { return m_default_value; }
     void set_default_value(const std::string &default_value) { m_default_value = default_value; }
 
     Alignment alignment() const { return m_alignment; }
-    void set_alignment(Alignment align) { m_alignment = align; }
+    void set_alignment(Alignment align) { m_alignment = align; invalidate_layer(); }
 
     const std::string &units() const { return m_units; }
-    void set_units(const std::string &units) { m_units = units; }
+    void set_units(const std::string &units) { m_units = units; invalidate_layout(); invalidate_layer(); }
 
     int units_image() const { return m_units_image; }
-    void set_units_image(int image) { m_units_image = image; }
+    void set_units_image(int image) { m_units_image = image; invalidate_layout(); invalidate_layer(); }
 
     /// Return the underlying regular expression specifying valid formats
     const std::string &format() const { return m_format; }
@@ -71,7 +71,7 @@ public:
     /// Return the placeholder text to be displayed while the text box is empty.
     const std::string &placeholder() const { return m_placeholder; }
     /// Specify a placeholder text to be displayed while the text box is empty.
-    void set_placeholder(const std::string &placeholder) { m_placeholder = placeholder; }
+    void set_placeholder(const std::string &placeholder) { m_placeholder = placeholder; invalidate_layer(); }
 
     /// Set the \ref Theme used to draw this widget
     virtual void set_theme(Theme *theme) override;
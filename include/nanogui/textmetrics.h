@@ -0,0 +1,90 @@
+/*
+    nanogui/textmetrics.h -- Cache of text measurements shared by all widgets
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+/**
+ * \file nanogui/textmetrics.h
+ *
+ * \brief Bounded LRU cache of text measurements.
+ *
+ * Measuring a string with NanoVG requires shaping it glyph by glyph, and
+ * widget layout measures the same captions over and over. The functions
+ * below remember the result of each measurement, keyed by the NanoVG
+ * context, font face, font size, letter spacing, alignment and string.
+ */
+
+#pragma once
+
+#include <nanogui/common.h>
+#include <string>
+
+NAMESPACE_BEGIN(nanogui)
+
+/// Hit/miss counters of the text metrics cache
+struct TextMetricsStats {
+    /// Number of measurements answered from the cache
+    size_t hits = 0;
+    /// Number of measurements that required shaping the string
+    size_t misses = 0;
+    /// Number of entries discarded because the cache was full
+    size_t evictions = 0;
+};
+
+/**
+ * \brief Cached version of ``nvgTextBounds()``
+ *
+ * Selects the given font face, size, alignment (a combination of
+ * ``NVGalign`` flags, where ``0`` corresponds to NanoVG's default) and
+ * letter spacing in ``ctx`` and returns the horizontal advance of ``text``.
+ * When ``bounds`` is specified, it receives the bounding box
+ * ``[xmin, ymin, xmax, ymax]`` of the text when drawn at the origin.
+ *
+ * The text state remains selected in ``ctx`` afterwards, so that the caller
+ * can go on to draw the string.
+ */
+extern NANOGUI_EXPORT float text_bounds(NVGcontext *ctx, const char *font,
+                                        float size, const std::string &text,
+                                        float *bounds = nullptr,
+                                        int align = 0, float spacing = 0.f);
+
+/**
+ * \brief Cached version of ``nvgTextBoxBounds()``
+ *
+ * Like \ref text_bounds(), but breaks ``text`` into rows that are at most
+ * ``break_width`` wide and stores the bounding box of the resulting
+ * paragraph (drawn at the origin) in ``bounds``.
+ */
+extern NANOGUI_EXPORT void text_box_bounds(NVGcontext *ctx, const char *font,
+                                           float size, float break_width,
+                                           const std::string &text,
+                                           float *bounds, int align = 0,
+                                           float spacing = 0.f);
+
+/**
+ * \brief Discard cached text measurements
+ *
+ * This must be called when fonts are added to a NanoVG context (including
+ * fallback fonts), or when its pixel ratio changes. When ``ctx`` is
+ * ``nullptr``, the measurements of all contexts are discarded.
+ */
+extern NANOGUI_EXPORT void invalidate_text_metrics(NVGcontext *ctx = nullptr);
+
+/// Return the maximum number of cached measurements (default: 4096)
+extern NANOGUI_EXPORT size_t text_metrics_capacity();
+
+/// Set the maximum number of cached measurements, evicting the least recently used ones
+extern NANOGUI_EXPORT void set_text_metrics_capacity(size_t capacity);
+
+/// Return the counters of the text metrics cache
+extern NANOGUI_EXPORT TextMetricsStats text_metrics_stats();
+
+/// Reset the counters returned by \ref text_metrics_stats()
+extern NANOGUI_EXPORT void reset_text_metrics_stats();
+
+NAMESPACE_END(nanogui)
@@ -22,7 +22,10 @@
 
 NAMESPACE_BEGIN(nanogui)
 
+class TextureDownload;
+
 class NANOGUI_EXPORT Texture : public Object {
+    friend class TextureDownload;
 public:
     /// Overall format of the texture (e.g. luminance-only or RGBA)
     enum class PixelFormat : uint8_t {
@@ -162,9 +165,50 @@ public:
     /// Upload packed pixel data to a rectangular sub-region of the texture from the CPU to the GPU
     void upload_sub_region(const uint8_t *data, const Vector2i& origin, const Vector2i& size);
 
+    /**
+     * \brief Map a staging buffer for streaming packed pixel data to the GPU
+     *
+     * Returns a pointer to \ref bytes_per_pixel() <tt>* size().x() *
+     * size().y()</tt> bytes of write-only memory that receives the next
+     * frame. Afterwards, \ref unmap_upload() must be called to update the
+     * texture from the staging buffer. This avoids the stall of \ref
+     * upload() and is intended for textures that change every frame (e.g.
+     * video). The staging buffers are organized as a ring, and the
+     * function only blocks if the GPU is still reading the buffer that
+     * was submitted three uploads ago.
+     *
+     * On OpenGL 4.4 and newer, the staging buffers are persistently mapped
+     * pixel buffer objects. Not supported on GLES.
+     *
+     * The memory must not be accessed after \ref unmap_upload(). In Python,
+     * this function returns an array that refers to the staging buffer, and
+     * \ref unmap_upload() raises an exception until this array and any views
+     * of it have been deleted.
+     */
+    uint8_t *map_upload();
+
+    /// Update the texture from the staging buffer returned by \ref map_upload()
+    void unmap_upload();
+
     /// Download packed pixel data from the GPU to the CPU
     void download(uint8_t *data);
 
+    /**
+     * \brief Start downloading packed pixel data from the GPU to the CPU
+     * without blocking
+     *
+     * This function issues a copy of the texture into one of two internal
+     * staging buffers (pixel buffer objects on OpenGL) and returns
+     * immediately. The returned handle can be used to check whether the copy
+     * has completed, and to retrieve the data. Since the staging buffers are
+     * used in alternation, the data of a download must be retrieved before
+     * the next-but-one call to this function, which is a natural fit for
+     * per-frame readback with one frame of latency.
+     *
+     * Not supported on GLES.
+     */
+    ref<TextureDownload> download_async();
+
     /// Resize the texture (discards the current contents)
     void resize(const Vector2i &size);
 
@@ -186,6 +230,9 @@ protected:
     /// Initialize the texture handle
     void init();
 
+    /// Release the staging buffers used by \ref map_upload()
+    void release_upload_buffers();
+
 protected:
     PixelFormat m_pixel_format;
     ComponentFormat m_component_format;
@@ -200,10 +247,83 @@ protected:
     #if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
         uint32_t m_texture_handle = 0;
         uint32_t m_renderbuffer_handle = 0;
+        /* Staging buffers and fences for download_async() */
+        uint32_t m_download_buffer[2] = { 0, 0 };
+        void *m_download_fence[2] = { nullptr, nullptr };
+        /* Staging buffers, fences, and persistent mappings for map_upload() */
+        uint32_t m_upload_buffer[3] = { 0, 0, 0 };
+        void *m_upload_fence[3] = { nullptr, nullptr, nullptr };
+        uint8_t *m_upload_ptr[3] = { nullptr, nullptr, nullptr };
+        bool m_upload_persistent = false;
     #elif defined(NANOGUI_USE_METAL)
         void *m_texture_handle = nullptr;
         void *m_sampler_state_handle = nullptr;
+        /* Staging buffers and command buffers for download_async() */
+        void *m_download_buffer[2] = { nullptr, nullptr };
+        void *m_download_command_buffer[2] = { nullptr, nullptr };
+        /* Staging buffers and command buffers for map_upload() */
+        void *m_upload_buffer[3] = { nullptr, nullptr, nullptr };
+        void *m_upload_command_buffer[3] = { nullptr, nullptr, nullptr };
     #endif
+    size_t m_download_size[2] = { 0, 0 };
+    uint64_t m_download_sequence[2] = { 0, 0 };
+    uint8_t m_download_slot = 0;
+    size_t m_upload_size = 0;
+    uint8_t m_upload_slot = 0;
+    bool m_upload_mapped = false;
+};
+
+/**
+ * \brief Handle to a pending asynchronous texture download
+ *
+ * \sa Texture::download_async()
+ */
+class NANOGUI_EXPORT TextureDownload : public Object {
+    friend class Texture;
+public:
+    /// Return the texture being downloaded
+    Texture *texture() { return m_texture; }
+
+    /// Return the size of the texture at the time when the download was issued
+    const Vector2i &texture_size() const { return m_size; }
+
+    /**
+     * \brief Return the number of bytes that will be written by \ref read()
+     *
+     * Like \ref ready() and \ref read(), this throws an exception if the
+     * staging buffer has already been reused.
+     */
+    size_t size() const;
+
+    /// Has the GPU finished copying the texture contents? (never blocks)
+    bool ready() const;
+
+    /**
+     * \brief Wait for the download to complete and copy the packed pixel
+     * data into \c data
+     *
+     * The destination buffer must hold \ref size() bytes and can be reused
+     * across downloads. Render targets are flipped vertically while
+     * copying, as in \ref Texture::download().
+     *
+     * Throws an exception if the staging buffer has already been reused by
+     * a subsequent call to \ref Texture::download_async().
+     */
+    void read(uint8_t *data);
+
+protected:
+    TextureDownload(Texture *texture, uint8_t slot, uint64_t sequence)
+        : m_texture(texture), m_size(texture->size()), m_slot(slot),
+          m_sequence(sequence) { }
+
+    /// Throw an exception if the staging buffer was reused
+    void check(const char *method) const;
+
+protected:
+    ref<Texture> m_texture;
+    Vector2i m_size;
+    uint8_t m_slot;
+    uint64_t m_sequence;
 };
 
 NAMESPACE_END(nanogui)
@@ -25,6 +25,12 @@ NAMESPACE_BEGIN(nanogui)
  * \class Theme theme.h nanogui/theme.h
  *
  * \brief Storage class for basic theme-related properties.
+ *
+ * Widgets memoize their preferred size, which depends on the font sizes and
+ * metrics stored here. After modifying the fields of a theme that is already
+ * in use, call \ref Widget::invalidate_layout() with \c recursive set to
+ * \c true on the screen (or on the affected widgets) before the next call to
+ * \ref Widget::perform_layout().
  */
 class NANOGUI_EXPORT Theme : public Object {
 public:
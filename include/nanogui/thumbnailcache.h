@@ -0,0 +1,154 @@
+/*
+    nanogui/thumbnailcache.h -- Asynchronously decoded image thumbnails
+    with a bounded cache of NanoVG images
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+/** \file */
+
+#pragma once
+
+#include <nanogui/object.h>
+#include <nanogui/vector.h>
+#include <condition_variable>
+#include <unordered_map>
+#include <thread>
+#include <mutex>
+#include <deque>
+#include <list>
+#include <string>
+#include <vector>
+
+NAMESPACE_BEGIN(nanogui)
+
+/**
+ * \class ThumbnailCache thumbnailcache.h nanogui/thumbnailcache.h
+ *
+ * \brief Asynchronously decoded image thumbnails with a bounded cache of
+ * NanoVG images.
+ *
+ * Requesting a thumbnail via \ref image() enqueues the file for decoding
+ * on a pool of worker threads, which downscale the image so that its
+ * shorter side matches \ref thumbnail_size(). The main thread periodically
+ * calls \ref upload() to turn a limited number of decoded thumbnails into
+ * NanoVG images, which are kept in a least recently used cache of bounded
+ * size. Requests that are not renewed for a few frames (e.g. because the
+ * thumbnail scrolled out of view before being decoded) are discarded.
+ *
+ * Evicted NanoVG images are released during the next frame, once the draw
+ * calls that may still refer to them have been submitted. The images are
+ * also released by \ref clear(), but not by the destructor (the NanoVG context may no longer exist at that
+ * point); they are otherwise released along with the NanoVG context.
+ *
+ * \sa ImagePanel::set_thumbnail_cache(), list_image_directory()
+ */
+class NANOGUI_EXPORT ThumbnailCache : public Object {
+public:
+    /**
+     * \brief Create a thumbnail cache
+     *
+     * \param thumbnail_size
+     *     Length of the shorter side of the thumbnails in pixels
+     *
+     * \param capacity
+     *     Maximum number of NanoVG images to keep around
+     *
+     * \param threads
+     *     Number of worker threads (0: use the number of hardware threads)
+     */
+    ThumbnailCache(int thumbnail_size = 128, size_t capacity = 1024,
+                   int threads = 0);
+
+    /// Return the length of the shorter side of the thumbnails in pixels
+    int thumbnail_size() const { return m_thumbnail_size; }
+
+    /// Return the maximum number of NanoVG images to keep around
+    size_t capacity() const { return m_capacity; }
+
+    /// Set the maximum number of NanoVG images to keep around
+    void set_capacity(size_t capacity) { m_capacity = capacity; }
+
+    /// Return the number of NanoVG images that are currently cached
+    size_t size() const;
+
+    /**
+     * \brief Return the NanoVG image containing the thumbnail of the given
+     * file
+     *
+     * Returns \c 0 when the thumbnail is not available yet, in which case it
+     * is scheduled for decoding, and \c -1 when the file could not be
+     * decoded.
+     */
+    int image(const std::string &filename);
+
+    /**
+     * \brief Create NanoVG images for up to \c max_count decoded thumbnails
+     * and evict the least recently used ones that exceed the capacity
+     *
+     * This function should be called by every widget drawing thumbnails of
+     * this cache (e.g. in its draw() method), passing \ref
+     * Screen::frame_index() as \c frame. Outdated requests are expired and
+     * evicted images are released once per frame, hence several widgets may
+     * share a cache. Returns \c true when thumbnails are still being
+     * decoded, in which case the screen should be redrawn again.
+     */
+    bool upload(NVGcontext *ctx, uint64_t frame, size_t max_count = 16);
+
+    /// Release all NanoVG images and discard pending requests
+    void clear(NVGcontext *ctx);
+
+    /**
+     * \brief Forget the files that could not be decoded, so that they are
+     * decoded again when requested (e.g. after they were modified)
+     */
+    void clear_failed();
+
+protected:
+    ~ThumbnailCache();
+
+    /// Body of the worker threads
+    void worker();
+
+    struct Entry {
+        enum class State { Queued, Decoding, Decoded, Ready, Failed };
+        State state = State::Queued;
+        /// Value of 'm_tick' when the thumbnail was last requested
+        uint64_t tick = 0;
+        /// NanoVG image (when ready)
+        int image = 0;
+        /// Decoded pixels awaiting upload
+        std::vector<uint8_t> data;
+        Vector2i size = 0;
+        /// Position in 'm_lru' (when ready)
+        std::list<const std::string *>::iterator lru;
+    };
+
+protected:
+    int m_thumbnail_size;
+    size_t m_capacity;
+    /// Number of frames in which upload() was called, used to discard outdated requests
+    uint64_t m_tick = 0;
+    /// Frame index passed to the last call of upload()
+    uint64_t m_frame = 0;
+    /// Evicted NanoVG images, released during the next frame
+    std::vector<int> m_released;
+    std::unordered_map<std::string, Entry> m_entries;
+    /// Requests, most recent first
+    std::deque<std::string> m_queue;
+    /// Decoded thumbnails awaiting upload
+    std::deque<std::string> m_decoded;
+    /// NanoVG images, most recently used first
+    std::list<const std::string *> m_lru;
+    size_t m_decoding = 0;
+    bool m_shutdown = false;
+    mutable std::mutex m_mutex;
+    std::condition_variable m_cond;
+    std::vector<std::thread> m_threads;
+};
+
+NAMESPACE_END(nanogui)
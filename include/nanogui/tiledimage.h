@@ -0,0 +1,226 @@
+/*
+    nanogui/tiledimage.h -- Very large images that are streamed to the GPU
+    in tiles at multiple levels of detail
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+/** \file */
+
+#pragma once
+
+#include <nanogui/texture.h>
+#include <condition_variable>
+#include <unordered_map>
+#include <functional>
+#include <thread>
+#include <mutex>
+#include <deque>
+#include <list>
+#include <memory>
+#include <vector>
+
+NAMESPACE_BEGIN(nanogui)
+
+/**
+ * \class TiledImage tiledimage.h nanogui/tiledimage.h
+ *
+ * \brief Very large image that is streamed to the GPU in tiles at multiple
+ * levels of detail.
+ *
+ * The image is organized as a pyramid: level \c 0 has the full resolution,
+ * and each subsequent level halves the resolution until the image fits into
+ * a single tile. The pixels of the tiles of level \c 0 are produced on
+ * demand by a \ref TileCallback that runs on a pool of worker threads (e.g.
+ * reading from a memory-mapped file, see \ref array_callback()). A tile of
+ * a coarser level is computed by averaging 2x2 blocks of the (up to) four
+ * tiles of the next finer level that it covers, which are produced first
+ * if they are not cached.
+ *
+ * Requesting a tile via \ref tile() enqueues it, and \ref upload() (called
+ * by the main thread once per frame) turns a limited number of finished
+ * tiles into textures. Tiles are kept in a least recently used cache of
+ * bounded size, except for those of the three coarsest levels, which are
+ * never evicted so that they are computed only once. Requests that are not
+ * renewed for a few frames are discarded.
+ *
+ * \sa ImageView::set_tiled_image()
+ */
+class NANOGUI_EXPORT TiledImage : public Object {
+public:
+    /**
+     * \brief Callback that fills the RGBA8 pixels of a full-resolution tile
+     *
+     * Receives the offset and size of the tile in pixels of level \c 0, and
+     * an output buffer for <tt>4 * size.x() * size.y()</tt> bytes in
+     * row-major order. Invoked concurrently on the worker threads.
+     */
+    using TileCallback = std::function<void(const Vector2i &, const Vector2i &, uint8_t *)>;
+
+    /**
+     * \brief Create a tiled image
+     *
+     * \param size
+     *     Size of the image (at level \c 0) in pixels
+     *
+     * \param callback
+     *     Callback that produces the pixels of a tile of level \c 0
+     *
+     * \param tile_size
+     *     Width and height of the tiles in pixels
+     *
+     * \param capacity
+     *     Maximum number of tiles (textures along with their pixels) to keep
+     *     around, not counting the tiles of the three coarsest levels
+     *
+     * \param threads
+     *     Number of worker threads (0: use the number of hardware threads)
+     */
+    TiledImage(const Vector2i &size, const TileCallback &callback,
+               int tile_size = 256, size_t capacity = 256, int threads = 0);
+
+    /**
+     * \brief Return a \ref TileCallback that reads from a strided 8-bit array
+     * with 1 (gray), 2 (gray + alpha), 3 (RGB), or 4 (RGBA) channels
+     *
+     * Strides are specified in bytes. The array must outlive the tiled image.
+     */
+    static TileCallback array_callback(const uint8_t *data, const Vector2i &size,
+                                       int channels, int64_t stride_x,
+                                       int64_t stride_y);
+
+    /// Return the size of the image (at level \c 0) in pixels
+    const Vector2i &size() const { return m_size; }
+
+    /// Return the width and height of the tiles in pixels
+    int tile_size() const { return m_tile_size; }
+
+    /// Return the number of levels of detail
+    int level_count() const { return m_level_count; }
+
+    /// Return the size of the image at the given level of detail
+    Vector2i level_size(int level) const;
+
+    /// Return the number of tiles along each axis at the given level of detail
+    Vector2i tile_count(int level) const;
+
+    /// Return the maximum number of tiles to keep around (see \ref TiledImage())
+    size_t capacity() const { return m_capacity; }
+
+    /// Set the maximum number of tiles to keep around (see \ref TiledImage())
+    void set_capacity(size_t capacity) { m_capacity = capacity; }
+
+    /// Return the number of tiles that are currently cached
+    size_t cached_tiles() const;
+
+    /**
+     * \brief Return the texture of a tile, or \c nullptr if it is not
+     * available yet
+     *
+     * Unless \c request is \c false, a missing tile is scheduled to be
+     * produced by the worker threads.
+     */
+    Texture *tile(int level, const Vector2i &index, bool request = true);
+
+    /**
+     * \brief Create textures for up to \c max_count finished tiles and evict
+     * the least recently used ones that exceed the capacity
+     *
+     * This function should be called once per frame with the rendering
+     * context active. Returns \c true when tiles are still being produced,
+     * in which case the screen should be redrawn again.
+     */
+    bool upload(size_t max_count = 8);
+
+    /// Release all tile textures and discard pending requests
+    void clear();
+
+protected:
+    ~TiledImage();
+
+    /// Body of the worker threads
+    void worker();
+
+    /// Compute a tile by averaging 2x2 blocks of the tiles of the next finer level
+    void reduce(uint64_t k, const std::shared_ptr<const std::vector<uint8_t>> *children,
+                uint8_t *out) const;
+
+    /// Are the tiles of the given level exempt from eviction?
+    bool pinned(int level) const;
+
+    /// Return the key of the tile of the next coarser level covering tile \c k
+    bool parent_key(uint64_t k, uint64_t &parent) const;
+
+    /// Return the largest request tick of a tile and of the tiles waiting for it
+    uint64_t request_tick(uint64_t k) const;
+
+    /// Discard (or mark as failed) a queued tile and the tiles waiting for it
+    void discard(uint64_t k, bool failed);
+
+    /// Evict the least recently used tiles that exceed the capacity
+    void evict();
+
+    struct Entry {
+        enum class State { Queued, Waiting, Loading, Loaded, Ready, Failed };
+        State state = State::Queued;
+        /// Value of 'm_tick' when the tile was last requested
+        uint64_t tick = 0;
+        /// Was the tile requested for display (and not just to compute a coarser one)?
+        bool display = false;
+        ref<Texture> texture;
+        /// Pixels (when loaded or ready), kept to compute the next coarser level
+        std::shared_ptr<const std::vector<uint8_t>> pixels;
+        /// Pixels of the tiles of the next finer level (while waiting for them)
+        std::shared_ptr<const std::vector<uint8_t>> children[4];
+        /// Number of tiles of the next finer level that are still being produced
+        int waiting = 0;
+        /// Position in 'm_lru' (when loaded or ready, unless pinned)
+        std::list<uint64_t>::iterator lru;
+    };
+
+    /// Pack a tile position into a key of 'm_entries'
+    static uint64_t key(int level, const Vector2i &index) {
+        return ((uint64_t) level << 56) | ((uint64_t) (uint32_t) index.y() << 28) |
+               (uint64_t) (uint32_t) index.x();
+    }
+
+    /// Return the level of detail of a key of 'm_entries'
+    static int key_level(uint64_t k) { return (int) (k >> 56); }
+
+    /// Return the tile index of a key of 'm_entries'
+    static Vector2i key_index(uint64_t k) {
+        const uint64_t mask = (1ull << 28) - 1;
+        return Vector2i((int) (k & mask), (int) ((k >> 28) & mask));
+    }
+
+protected:
+    Vector2i m_size;
+    TileCallback m_callback;
+    int m_tile_size;
+    int m_level_count;
+    size_t m_capacity;
+    /// Number of calls to upload(), used to discard outdated requests
+    uint64_t m_tick = 0;
+    std::unordered_map<uint64_t, Entry> m_entries;
+    /// Requests, most recent first
+    std::deque<uint64_t> m_queue;
+    /// Finished tiles awaiting upload
+    std::deque<uint64_t> m_loaded;
+    /// Loaded and ready tiles (except for pinned ones), most recently used first
+    std::list<uint64_t> m_lru;
+    /// Number of loaded and ready tiles of the pinned levels
+    size_t m_pinned = 0;
+    /// Textures evicted by the worker threads, released by upload()
+    std::vector<ref<Texture>> m_released;
+    size_t m_loading = 0;
+    bool m_shutdown = false;
+    mutable std::mutex m_mutex;
+    std::condition_variable m_cond;
+    std::vector<std::thread> m_threads;
+};
+
+NAMESPACE_END(nanogui)
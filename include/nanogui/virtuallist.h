@@ -0,0 +1,145 @@
+/*
+    nanogui/virtuallist.h -- List or grid of items that only instantiates
+    widgets for the visible items
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+/** \file */
+
+#pragma once
+
+#include <nanogui/widget.h>
+#include <functional>
+
+NAMESPACE_BEGIN(nanogui)
+
+/**
+ * \class VirtualList virtuallist.h nanogui/virtuallist.h
+ *
+ * \brief List or grid of items that only instantiates widgets for the
+ * visible items.
+ *
+ * A VirtualList does not store any items. Instead, it maintains a small
+ * pool of row widgets, which it obtains from the \ref create_callback(),
+ * and assigns them to the items that are currently visible by invoking the
+ * \ref bind_callback(). Widgets that scroll out of view are recycled for
+ * other items.
+ *
+ * The list is meant to be placed into a \ref VScrollPanel, which provides
+ * the scroll bar and determines the visible region:
+ *
+ * \code
+ * VScrollPanel *panel = new VScrollPanel(window);
+ * panel->set_fixed_size(Vector2i(300, 400));
+ * VirtualList *list = new VirtualList(panel);
+ * list->set_create_callback([](VirtualList *list) { return new Label(list, ""); });
+ * list->set_bind_callback([](Widget *w, size_t i) {
+ *     ((Label *) w)->set_caption("Item " + std::to_string(i));
+ * });
+ * list->set_item_count(100000);
+ * \endcode
+ *
+ * When \ref columns() is larger than one, consecutive items are arranged
+ * into rows of a grid with equally wide cells. Rows either have a fixed
+ * height (\ref set_row_height()), or a variable height specified by the
+ * \ref height_callback(). In the latter case, the row offsets are stored in
+ * a Fenwick tree, so that locating the rows visible at any scroll position
+ * takes logarithmic time.
+ */
+class NANOGUI_EXPORT VirtualList : public Widget {
+public:
+    /// Callback that creates a new row widget (whose parent must be the list)
+    using CreateCallback = std::function<Widget *(VirtualList *)>;
+    /// Callback that displays the given item in a row widget
+    using BindCallback = std::function<void(Widget *, size_t)>;
+    /// Callback that returns the height of the given row
+    using HeightCallback = std::function<int(size_t)>;
+
+    VirtualList(Widget *parent);
+
+    /// Return the number of items
+    size_t item_count() const { return m_item_count; }
+    /// Set the number of items (this also rebinds all visible items)
+    void set_item_count(size_t count);
+
+    /// Return the number of items per row (default: 1)
+    int columns() const { return m_columns; }
+    /// Set the number of items per row
+    void set_columns(int columns);
+
+    /// Return the number of rows
+    size_t row_count() const { return (m_item_count + m_columns - 1) / m_columns; }
+
+    /// Return the row height that is used when no \ref height_callback() is specified (default: 25)
+    int row_height() const { return m_row_height; }
+    /// Set the row height that is used when no \ref height_callback() is specified
+    void set_row_height(int height);
+
+    /// Return the height of the given row
+    int row_height(size_t row) const;
+
+    /// Return the vertical offset of the given row within the list
+    int row_offset(size_t row) const;
+
+    /// Return the row at the given vertical offset within the list
+    size_t row_at(int y) const;
+
+    /// Return the callback that creates row widgets
+    const CreateCallback &create_callback() const { return m_create_callback; }
+    /// Set the callback that creates row widgets
+    void set_create_callback(const CreateCallback &callback) { m_create_callback = callback; }
+
+    /// Return the callback that displays an item in a row widget
+    const BindCallback &bind_callback() const { return m_bind_callback; }
+    /// Set the callback that displays an item in a row widget
+    void set_bind_callback(const BindCallback &callback);
+
+    /// Return the callback that specifies variable row heights
+    const HeightCallback &height_callback() const { return m_height_callback; }
+    /// Set the callback that specifies variable row heights (queried for every row)
+    void set_height_callback(const HeightCallback &callback);
+
+    /// Query the \ref height_callback() again after the height of a row changed
+    void update_row_height(size_t row);
+
+    /// Rebind all visible items, e.g. after the underlying data changed
+    void refresh();
+
+    /// Scroll the parent \ref VScrollPanel so that the given item is at the top
+    void scroll_to(size_t index);
+
+    /// Return the range <tt>[first, last)</tt> of items that are currently displayed
+    std::pair<size_t, size_t> visible_range() const { return { m_visible_first, m_visible_last }; }
+
+    virtual Vector2i preferred_size(NVGcontext *ctx) const override;
+    virtual void perform_layout(NVGcontext *ctx) override;
+    virtual void draw(NVGcontext *ctx) override;
+
+protected:
+    /// Rebuild the Fenwick tree of row heights
+    void update_heights();
+
+    /// Assign the pooled row widgets to the visible items
+    void update_rows(NVGcontext *ctx);
+
+protected:
+    size_t m_item_count;
+    int m_columns;
+    int m_row_height;
+    CreateCallback m_create_callback;
+    BindCallback m_bind_callback;
+    HeightCallback m_height_callback;
+    /// Fenwick tree of row heights (only used with a height callback)
+    std::vector<int> m_heights;
+    /// Pool of row widgets, and the item displayed by each one
+    std::vector<Widget *> m_pool;
+    std::vector<size_t> m_pool_items;
+    size_t m_visible_first, m_visible_last;
+};
+
+NAMESPACE_END(nanogui)
@@ -37,7 +37,7 @@ public:
      * Set the scroll amount to a value between 0 and 1. 0 means scrolled to
      * the top and 1 to the bottom.
      */
-    void set_scroll(float scroll) { m_scroll = scroll; }
+    void set_scroll(float scroll) { m_scroll = scroll; invalidate_layer(); }
 
     virtual void perform_layout(NVGcontext *ctx) override;
     virtual Vector2i preferred_size(NVGcontext *ctx) const override;
@@ -15,6 +15,7 @@
 #include <nanogui/object.h>
 #include <nanogui/theme.h>
 #include <vector>
+#include <memory>
 #include <algorithm>
 
 NAMESPACE_BEGIN(nanogui)
@@ -43,26 +44,37 @@ public:
     /// Return the parent widget
     const Widget *parent() const { return m_parent; }
     /// Set the parent widget
-    void set_parent(Widget *parent) { m_parent = parent; }
+    void set_parent(Widget *parent);
 
     /// Return the used \ref Layout generator
     Layout *layout() { return m_layout; }
     /// Return the used \ref Layout generator
     const Layout *layout() const { return m_layout.get(); }
     /// Set the used \ref Layout generator
-    void set_layout(Layout *layout) { m_layout = layout; }
+    void set_layout(Layout *layout) { m_layout = layout; invalidate_layer(); invalidate_layout(); }
 
     /// Return the \ref Theme used to draw this widget
     Theme *theme() { return m_theme; }
     /// Return the \ref Theme used to draw this widget
     const Theme *theme() const { return m_theme.get(); }
-    /// Set the \ref Theme used to draw this widget
+    /**
+     * \brief Set the \ref Theme used to draw this widget and its children
+     *
+     * This invalidates the layout. Modifying the current theme in place
+     * does not, see \ref invalidate_layout().
+     */
     virtual void set_theme(Theme *theme);
 
     /// Return the position relative to the parent widget
     const Vector2i &position() const { return m_pos; }
     /// Set the position relative to the parent widget
-    void set_position(const Vector2i &pos) { m_pos = pos; }
+    void set_position(const Vector2i &pos) {
+        if (pos != m_pos && m_parent) {
+            m_parent->invalidate_layer();
+            m_parent->m_spatial_index_dirty = true;
+        }
+        m_pos = pos;
+    }
 
     /// Return the absolute position on screen
     Vector2i absolute_position() const {
@@ -73,17 +85,17 @@ public:
     /// Return the size of the widget
     const Vector2i &size() const { return m_size; }
     /// set the size of the widget
-    void set_size(const Vector2i &size) { m_size = size; }
+    void set_size(const Vector2i &size);
 
     /// Return the width of the widget
     int width() const { return m_size.x(); }
     /// Set the width of the widget
-    void set_width(int width) { m_size.x() = width; }
+    void set_width(int width) { set_size(Vector2i(width, m_size.y())); }
 
     /// Return the height of the widget
     int height() const { return m_size.y(); }
     /// Set the height of the widget
-    void set_height(int height) { m_size.y() = height; }
+    void set_height(int height) { set_size(Vector2i(m_size.x(), height)); }
 
     /**
      * \brief Set the fixed size of this widget
@@ -94,7 +106,11 @@ public:
      * size; this is done with a call to \ref set_size or a call to \ref perform_layout()
      * in the parent widget.
      */
-    void set_fixed_size(const Vector2i &fixed_size) { m_fixed_size = fixed_size; }
+    void set_fixed_size(const Vector2i &fixed_size) {
+        if (fixed_size != m_fixed_size)
+            invalidate_layout();
+        m_fixed_size = fixed_size;
+    }
 
     /// Return the fixed size (see \ref set_fixed_size())
     const Vector2i &fixed_size() const { return m_fixed_size; }
@@ -104,14 +120,20 @@ public:
     // Return the fixed height (see \ref set_fixed_size())
     int fixed_height() const { return m_fixed_size.y(); }
     /// Set the fixed width (see \ref set_fixed_size())
-    void set_fixed_width(int width) { m_fixed_size.x() = width; }
+    void set_fixed_width(int width) { set_fixed_size(Vector2i(width, m_fixed_size.y())); }
     /// Set the fixed height (see \ref set_fixed_size())
-    void set_fixed_height(int height) { m_fixed_size.y() = height; }
+    void set_fixed_height(int height) { set_fixed_size(Vector2i(m_fixed_size.x(), height)); }
 
     /// Return whether or not the widget is currently visible (assuming all parents are visible)
     bool visible() const { return m_visible; }
     /// Set whether or not the widget is currently visible (assuming all parents are visible)
-    void set_visible(bool visible) { m_visible = visible; }
+    void set_visible(bool visible) {
+        if (visible != m_visible && m_parent) {
+            m_parent->invalidate_layer();
+            m_parent->invalidate_layout();
+        }
+        m_visible = visible;
+    }
 
     /// Check if this widget is currently visible, taking parent widgets into account
     bool visible_recursive() const {
@@ -169,30 +191,100 @@ public:
     /// Walk up the hierarchy and return the parent window (const version)
     const Window *window() const;
 
-    /// Walk up the hierarchy and return the parent screen
-    Screen *screen();
-    /// Walk up the hierarchy and return the parent screen (const version)
-    const Screen *screen() const;
+    /// Return the screen containing this widget (or \c nullptr if it is not attached to one)
+    Screen *screen() { return m_screen; }
+    /// Return the screen containing this widget (const version)
+    const Screen *screen() const { return m_screen; }
 
     /// Return whether or not this widget is currently enabled
     bool enabled() const { return m_enabled; }
     /// Set whether or not this widget is currently enabled
-    void set_enabled(bool enabled) { m_enabled = enabled; }
+    void set_enabled(bool enabled) { m_enabled = enabled; invalidate_layer(); }
 
     /// Return whether or not this widget is currently focused
     bool focused() const { return m_focused; }
     /// Set whether or not this widget is currently focused
-    void set_focused(bool focused) { m_focused = focused; }
+    void set_focused(bool focused) { m_focused = focused; invalidate_layer(); }
     /// Request the focus to be moved to this widget
     void request_focus();
 
+    /**
+     * \brief Mark the region covered by this widget as needing to be redrawn
+     *
+     * This forwards the widget's bounding rectangle (in screen coordinates)
+     * to \ref Screen::invalidate_rect(). When the parent screen performs
+     * partial redraws, only the damaged portion of the framebuffer will be
+     * repainted during the next frame. Widgets that draw outside of their
+     * bounds should call \ref Screen::invalidate_rect() with a suitably
+     * enlarged region instead.
+     */
+    void mark_dirty();
+
+    /// Return whether this widget is rendered via a cached offscreen layer
+    bool layer() const { return m_layer; }
+
+    /**
+     * \brief Render this widget and its descendants via a cached offscreen layer
+     *
+     * When enabled, the widget subtree is rendered once into an offscreen
+     * texture, which is then composited as a single image until the layer is
+     * invalidated. This greatly reduces the per-frame cost of large static
+     * widget hierarchies (e.g. forms created using \ref FormHelper).
+     *
+     * The layer is invalidated automatically when descendants change their
+     * size, position, visibility, theme, or layout, when they handle input
+     * events, when they are marked via \ref mark_dirty(), and by the value
+     * setters of the standard widgets. Custom widgets whose appearance
+     * depends on other state should call \ref invalidate_layer().
+     *
+     * Layers take effect when the widget is drawn by the default \ref draw()
+     * implementation of its parent. Subtrees containing a \ref Canvas cannot
+     * be cached. This feature is currently only supported by the OpenGL and
+     * GLES backends; it has no effect when using Metal.
+     */
+    void set_layer(bool layer);
+
+    /// Discard the cached layer contents of this widget and of all ancestors that use layers
+    void invalidate_layer();
+
+    /**
+     * \brief Return the time (in milliseconds) spent in the most recent
+     * call to \ref draw(), including descendants
+     *
+     * Only available when per-widget profiling is enabled (see \ref
+     * Screen::set_widget_profiling()), and only for widgets that are
+     * drawn by the default \ref draw() implementation of their parent.
+     */
+    float draw_time() const { return m_draw_time; }
+
+    /// Return the time spent in the most recent call to \ref draw(), excluding descendants
+    float draw_time_exclusive() const { return m_draw_time_exclusive; }
+
+    /**
+     * \brief Return the time (in milliseconds) spent in the most recent
+     * call to \ref perform_layout(), including descendants
+     *
+     * Only available when per-widget profiling is enabled (see \ref
+     * Screen::set_widget_profiling()), and only for widgets whose \ref
+     * perform_layout() implementation invokes the one of this class.
+     */
+    float layout_time() const { return m_layout_time; }
+
+    /// Return the time spent in the most recent call to \ref perform_layout(), excluding descendants
+    float layout_time_exclusive() const { return m_layout_time_exclusive; }
+
     const std::string &tooltip() const { return m_tooltip; }
     void set_tooltip(const std::string &tooltip) { m_tooltip = tooltip; }
 
     /// Return current font size. If not set the default of the current theme will be returned
     int font_size() const;
     /// Set the font size of this widget
-    void set_font_size(int font_size) { m_font_size = font_size; }
+    void set_font_size(int font_size) {
+        if (font_size != m_font_size)
+            invalidate_layout();
+        m_font_size = font_size;
+        invalidate_layer();
+    }
     /// Return whether the font size is explicitly specified for this widget
     bool has_font_size() const { return m_font_size > 0; }
 
@@ -206,7 +298,12 @@ public:
      * Sets the amount of extra scaling applied to *icon* fonts.
      * See \ref nanogui::Widget::m_icon_extra_scale.
      */
-    void set_icon_extra_scale(float scale) { m_icon_extra_scale = scale; }
+    void set_icon_extra_scale(float scale) {
+        if (scale != m_icon_extra_scale)
+            invalidate_layout();
+        m_icon_extra_scale = scale;
+        invalidate_layer();
+    }
 
     /// Return a pointer to the cursor of the widget
     Cursor cursor() const { return m_cursor; }
@@ -224,6 +321,44 @@ public:
     Widget *find_widget(const Vector2i &p);
     const Widget *find_widget(const Vector2i &p) const;
 
+    /// Return whether this widget receives raw input events (see \ref set_raw_input())
+    bool raw_input() const { return m_raw_input; }
+
+    /**
+     * \brief Opt out of input event coalescing
+     *
+     * When event coalescing is enabled (see \ref
+     * Screen::set_event_coalescing()), mouse motion, drag, and scroll events
+     * targeting this widget or its descendants are nevertheless dispatched
+     * individually.
+     */
+    void set_raw_input(bool value) { m_raw_input = value; }
+
+    /// Return whether \ref find_widget() uses a spatial index of the children
+    bool spatial_index() const { return (bool) m_spatial_index; }
+
+    /**
+     * \brief Accelerate \ref find_widget() using a spatial index of the
+     * children of this widget
+     *
+     * By default, hit testing visits the children in reverse order until it
+     * encounters one that contains the cursor, which becomes slow for
+     * containers with thousands of children. When enabled, the children are
+     * additionally binned into a uniform grid, so that only the few children
+     * overlapping the cell below the cursor need to be tested. The result is
+     * identical (the topmost visible child wins).
+     *
+     * The grid is rebuilt lazily upon the next query whenever children are
+     * added, removed, moved, or resized (e.g. by \ref perform_layout()).
+     * Widgets that modify the position or size of their children without
+     * using \ref set_position() or \ref set_size() must call \ref
+     * invalidate_spatial_index().
+     */
+    void set_spatial_index(bool value);
+
+    /// Mark the spatial index (see \ref set_spatial_index()) as out of date
+    void invalidate_spatial_index() { m_spatial_index_dirty = true; }
+
     /// Handle a mouse button event (default implementation: propagate to children)
     virtual bool mouse_button_event(const Vector2i &p, int button, bool down, int modifiers);
 
@@ -251,9 +386,57 @@ public:
     /// Compute the preferred size of the widget
     virtual Vector2i preferred_size(NVGcontext *ctx) const;
 
+    /**
+     * \brief Return the preferred size of the widget, memoizing the result
+     * of \ref preferred_size() until \ref invalidate_layout() is called
+     *
+     * Layout generators and containers use this function to query the
+     * preferred size of their children.
+     */
+    Vector2i preferred_size_cached(NVGcontext *ctx) const;
+
     /// Invoke the associated layout generator to properly place child widgets, if any
     virtual void perform_layout(NVGcontext *ctx);
 
+    /**
+     * \brief Invoke \ref perform_layout() if the layout of this widget or of
+     * one of its descendants is out of date
+     *
+     * Layout generators call this function on their children, so that a
+     * relayout only touches the affected subtrees.
+     */
+    void update_layout(NVGcontext *ctx);
+
+    /**
+     * \brief Mark the layout of this widget as out of date
+     *
+     * This discards the memoized preferred size (see \ref
+     * preferred_size_cached()) of this widget and its ancestors, which will
+     * then be laid out again by the next call to \ref perform_layout() on any
+     * of them. This happens automatically when children are added or removed,
+     * and when the visibility, size, fixed size, font size, icon scale,
+     * theme, or layout generator of a widget change. The standard widgets also invalidate
+     * their layout when their caption or other content affecting their
+     * preferred size changes. Custom widgets should do the same.
+     *
+     * Invalidations issued while a layout is being computed only affect the
+     * widget itself, since the ancestor performing the layout accounts for
+     * them. When \c recursive is \c true, all descendants are invalidated as
+     * well. This is required after modifying the fields of a \ref Theme in
+     * place, e.g. via ``screen->invalidate_layout(true)``, since widgets
+     * cannot observe such changes and would keep using stale sizes.
+     */
+    void invalidate_layout(bool recursive = false);
+
+    /// Return whether the layout of this widget or of one of its descendants is out of date
+    bool layout_dirty() const { return m_layout_dirty; }
+
+    /// Return the number of \ref perform_layout() calls (of all widgets) since the last reset
+    static size_t layout_count();
+
+    /// Reset the counter returned by \ref layout_count()
+    static void reset_layout_count();
+
     /// Draw the widget (and all child widgets)
     virtual void draw(NVGcontext *ctx);
 
@@ -270,8 +453,40 @@ protected:
      */
     float icon_scale() const { return m_theme->m_icon_scale * m_icon_extra_scale; }
 
+    /// Render the widget into its offscreen layer (if needed) and composite it
+    void draw_layer(NVGcontext *ctx);
+
+    /// Release the resources associated with the offscreen layer
+    void release_layer(bool recursive);
+
+    /// Update the cached screen pointer of this widget and its descendants
+    void set_screen(Screen *screen);
+
+    /**
+     * \brief Invalidate the state derived from \ref m_children after
+     * children were added, removed, or reordered
+     *
+     * This marks the offscreen layer and the spatial index as out of date,
+     * and, unless \c layout is \c false (e.g. when only the order of the
+     * children changed), the layout as well.
+     */
+    void children_changed(bool layout = true);
+
+protected:
+    /// Return the topmost visible child containing the given position (relative to this widget)
+    Widget *topmost_child(const Vector2i &p) const;
+
+    /// Start timing a method of this widget (see \ref draw_time())
+    static double profile_begin(Screen *screen);
+
+    /// Stop timing and store the inclusive and exclusive durations in milliseconds
+    static void profile_end(Screen *screen, double start, float &inclusive,
+                            float &exclusive);
+
 protected:
     Widget *m_parent;
+    /// Screen containing this widget (cached, see \ref set_parent())
+    Screen *m_screen;
     ref<Theme> m_theme;
     ref<Layout> m_layout;
     Vector2i m_pos, m_size, m_fixed_size;
@@ -291,6 +506,7 @@ protected:
      */
     bool m_enabled;
     bool m_focused, m_mouse_focus;
+    bool m_raw_input;
     std::string m_tooltip;
     int m_font_size;
 
@@ -330,6 +546,28 @@ protected:
      */
     float m_icon_extra_scale;
     Cursor m_cursor;
+
+    /// Incremental layout state (see \ref invalidate_layout())
+    bool m_layout_dirty;
+    mutable bool m_preferred_size_valid;
+    mutable Vector2i m_preferred_size;
+
+    /// Spatial index of the children (see \ref set_spatial_index())
+    struct SpatialIndex;
+    std::unique_ptr<SpatialIndex> m_spatial_index;
+    mutable bool m_spatial_index_dirty;
+
+    /// Offscreen layer state (see \ref set_layer())
+    bool m_layer, m_layer_dirty;
+    ref<Texture> m_layer_texture;
+    ref<RenderPass> m_layer_pass;
+    int m_layer_image;
+    /// NanoVG context that owns 'm_layer_image'
+    NVGcontext *m_layer_ctx;
+
+    /// Timings of the most recent draw() and perform_layout() calls (see \ref draw_time())
+    float m_draw_time, m_draw_time_exclusive;
+    float m_layout_time, m_layout_time_exclusive;
 };
 
 NAMESPACE_END(nanogui)
@@ -29,7 +29,7 @@ public:
     /// Return the window title
     const std::string &title() const { return m_title; }
     /// Set the window title
-    void set_title(const std::string &title) { m_title = title; }
+    void set_title(const std::string &title) { m_title = title; invalidate_layer(); invalidate_layout(); }
 
     /// Is this a model dialog?
     bool modal() const { return m_modal; }
@@ -0,0 +1,12 @@
+#include <metal_stdlib>
+
+using namespace metal;
+
+struct VertexOut {
+    float4 position [[position]];
+};
+
+fragment float4 fragment_main(VertexOut vert [[stage_in]],
+                              constant float4 &color) {
+    return color;
+}
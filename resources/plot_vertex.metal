@@ -0,0 +1,18 @@
+#include <metal_stdlib>
+
+using namespace metal;
+
+struct VertexOut {
+    float4 position [[position]];
+    float point_size [[point_size]];
+};
+
+vertex VertexOut vertex_main(const device float2 *position,
+                             constant float4x4 &matrix,
+                             constant float &point_size,
+                             uint id [[vertex_id]]) {
+    VertexOut vert;
+    vert.position = matrix * float4(position[id], 0.f, 1.f);
+    vert.point_size = point_size;
+    return vert;
+}
@@ -13,6 +13,7 @@
 #include <nanogui/popupbutton.h>
 #include <nanogui/theme.h>
 #include <nanogui/opengl.h>
+#include <nanogui/textmetrics.h>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -24,17 +25,13 @@ Button::Button(Widget *parent, const std::string &caption, int icon)
 
 Vector2i Button::preferred_size(NVGcontext *ctx) const {
     int font_size = m_font_size == -1 ? m_theme->m_button_font_size : m_font_size;
-    nvgFontSize(ctx, font_size);
-    nvgFontFace(ctx, "sans-bold");
-    float tw = nvgTextBounds(ctx, 0,0, m_caption.c_str(), nullptr, nullptr);
+    float tw = text_bounds(ctx, "sans-bold", font_size, m_caption);
     float iw = 0.0f, ih = font_size;
 
     if (m_icon) {
         if (nvg_is_font_icon(m_icon)) {
             ih *= icon_scale();
-            nvgFontFace(ctx, "icons");
-            nvgFontSize(ctx, ih);
-            iw = nvgTextBounds(ctx, 0, 0, utf8(m_icon).data(), nullptr, nullptr)
+            iw = text_bounds(ctx, "icons", ih, utf8(m_icon).data())
                 + m_size.y() * 0.15f;
         } else {
             int w, h;
@@ -162,9 +159,7 @@ void Button::draw(NVGcontext *ctx) {
     nvgStroke(ctx);
 
     int font_size = m_font_size == -1 ? m_theme->m_button_font_size : m_font_size;
-    nvgFontSize(ctx, font_size);
-    nvgFontFace(ctx, "sans-bold");
-    float tw = nvgTextBounds(ctx, 0,0, m_caption.c_str(), nullptr, nullptr);
+    float tw = text_bounds(ctx, "sans-bold", font_size, m_caption);
 
     Vector2f center = Vector2f(m_pos) + Vector2f(m_size) * 0.5f;
     Vector2f text_pos(center.x() - tw * 0.5f, center.y() - 1);
@@ -179,9 +174,7 @@ void Button::draw(NVGcontext *ctx) {
         float iw, ih = font_size;
         if (nvg_is_font_icon(m_icon)) {
             ih *= icon_scale();
-            nvgFontSize(ctx, ih);
-            nvgFontFace(ctx, "icons");
-            iw = nvgTextBounds(ctx, 0, 0, icon.data(), nullptr, nullptr);
+            iw = text_bounds(ctx, "icons", ih, icon.data());
         } else {
             int w, h;
             ih *= 0.9f;
@@ -11,6 +11,7 @@
 
 #include <nanogui/checkbox.h>
 #include <nanogui/opengl.h>
+#include <nanogui/textmetrics.h>
 #include <nanogui/theme.h>
 
 NAMESPACE_BEGIN(nanogui)
@@ -47,11 +48,8 @@ bool CheckBox::mouse_button_event(const Vector2i &p, int button, bool down,
 Vector2i CheckBox::preferred_size(NVGcontext *ctx) const {
     if (m_fixed_size != Vector2i(0))
         return m_fixed_size;
-    nvgFontSize(ctx, font_size());
-    nvgFontFace(ctx, "sans");
     return Vector2i(
-        nvgTextBounds(ctx, 0, 0, m_caption.c_str(), nullptr, nullptr) +
-            1.8f * font_size(),
+        text_bounds(ctx, "sans", font_size(), m_caption) + 1.8f * font_size(),
         font_size() * 1.3f);
 }
 
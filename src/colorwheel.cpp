@@ -278,6 +278,7 @@ void ColorWheel::set_color(const Color &rgb) {
         m_black = (M + m2 + m*M2 - m - M*m2 - M2) / (m2 - M2);
         m_hue = h;
     }
+    invalidate_layer();
 }
 
 NAMESPACE_END(nanogui)
@@ -21,10 +21,9 @@
 #include <nanogui/opengl.h>
 #include <nanogui/metal.h>
 #include <map>
-#include <thread>
-#include <chrono>
 #include <mutex>
 #include <iostream>
+#include <limits>
 
 #if !defined(_WIN32)
 #  include <locale.h>
@@ -44,7 +43,7 @@ extern std::map<GLFWwindow *, Screen *> __nanogui_screens;
   extern void disable_saved_application_state_osx();
 #endif
 
-void init() {
+void init(bool headless) {
     #if !defined(_WIN32)
         /* Avoid locale-related number parsing issues */
         setlocale(LC_NUMERIC, "C");
@@ -63,6 +62,13 @@ void init() {
         }
     );
 
+#if defined(GLFW_PLATFORM_NULL)
+    if (headless)
+        glfwInitHint(GLFW_PLATFORM, GLFW_PLATFORM_NULL);
+#else
+    (void) headless;
+#endif
+
     if (!glfwInit())
         throw std::runtime_error("Could not initialize GLFW!");
 
@@ -87,15 +93,20 @@ void mainloop(float refresh) {
     if (mainloop_active)
         throw std::runtime_error("Main loop is already running!");
 
+    /* Time of the next periodic redraw requested via 'refresh' */
+    static double refresh_interval = 0.0,
+                  refresh_next = std::numeric_limits<double>::infinity();
+
     auto mainloop_iteration = []() {
         int num_screens = 0;
+        double now = glfwGetTime(),
+               wakeup = std::numeric_limits<double>::infinity();
 
         #if defined(EMSCRIPTEN)
-            double emscripten_now = glfwGetTime();
             bool emscripten_redraw = false;
-            if (float((emscripten_now - emscripten_last) * 1000) > emscripten_refresh) {
+            if (float((now - emscripten_last) * 1000) > emscripten_refresh) {
                 emscripten_redraw = true;
-                emscripten_last = emscripten_now;
+                emscripten_last = now;
             }
         #endif
 
@@ -106,6 +117,10 @@ void mainloop(float refresh) {
             m_async_functions.clear();
         }
 
+        bool refresh_all = now >= refresh_next;
+        if (refresh_all)
+            refresh_next = now + refresh_interval;
+
         for (auto kv : __nanogui_screens) {
             Screen *screen = kv.second;
             if (!screen->visible()) {
@@ -118,7 +133,13 @@ void mainloop(float refresh) {
                 if (emscripten_redraw || screen->tooltip_fade_in_progress())
                     screen->redraw();
             #endif
-            screen->draw_all();
+            if (refresh_all)
+                screen->redraw();
+
+            /* Only draw once the frame rate limit permits it */
+            if (screen->next_frame_time() <= now)
+                screen->draw_all();
+            wakeup = std::min(wakeup, screen->next_frame_time());
             num_screens++;
         }
 
@@ -129,11 +150,32 @@ void mainloop(float refresh) {
         }
 
         #if !defined(EMSCRIPTEN)
-            /* Wait for mouse/keyboard or empty refresh events */
-            glfwWaitEvents();
+            /* Sleep until the next mouse/keyboard/empty event, or
+               until the next redraw deadline of any screen */
+            wakeup = std::min(wakeup, refresh_next);
+            double timeout = wakeup - glfwGetTime();
+            if (wakeup == std::numeric_limits<double>::infinity())
+                glfwWaitEvents();
+            else if (timeout > 0)
+                glfwWaitEventsTimeout(timeout);
+            else
+                glfwPollEvents();
+        #else
+            (void) wakeup;
         #endif
     };
 
+#if !defined(EMSCRIPTEN)
+    /* If requested, redraw all screens every 'refresh' milliseconds
+       even in the absence of mouse/keyboard events */
+    if (refresh >= 0) {
+        refresh_interval = refresh / 1000.0;
+        refresh_next = glfwGetTime() + refresh_interval;
+    } else {
+        refresh_next = std::numeric_limits<double>::infinity();
+    }
+#endif
+
 #if defined(EMSCRIPTEN)
     emscripten_refresh = refresh;
     /* The following will throw an exception and enter the main
@@ -144,43 +186,6 @@ void mainloop(float refresh) {
 
     mainloop_active = true;
 
-    std::thread refresh_thread;
-    std::chrono::microseconds quantum;
-    size_t quantum_count = 1;
-    if (refresh >= 0) {
-        quantum = std::chrono::microseconds((int64_t)(refresh * 1'000));
-        while (quantum.count() > 50'000) {
-            quantum /= 2;
-            quantum_count *= 2;
-        }
-    } else {
-        quantum = std::chrono::microseconds(50'000);
-        quantum_count = std::numeric_limits<size_t>::max();
-    }
-
-    /* If there are no mouse/keyboard events, try to refresh the
-       view roughly every 50 ms (default); this is to support animations
-       such as progress bars while keeping the system load
-       reasonably low */
-    refresh_thread = std::thread(
-        [quantum, quantum_count]() {
-            while (true) {
-                for (size_t i = 0; i < quantum_count; ++i) {
-                    if (!mainloop_active)
-                        return;
-                    std::this_thread::sleep_for(quantum);
-                    for (auto kv : __nanogui_screens) {
-                        if (kv.second->tooltip_fade_in_progress())
-                            kv.second->redraw();
-                    }
-                }
-
-                for (auto kv : __nanogui_screens)
-                    kv.second->redraw();
-            }
-        }
-    );
-
     try {
         while (mainloop_active)
             mainloop_iteration();
@@ -191,17 +196,23 @@ void mainloop(float refresh) {
         std::cerr << "Caught exception in main loop: " << e.what() << std::endl;
         leave();
     }
-
-    refresh_thread.join();
 }
 
 void async(const std::function<void()> &func) {
     std::lock_guard<std::mutex> guard(m_async_mutex);
     m_async_functions.push_back(func);
+    #if !defined(EMSCRIPTEN)
+        /* Wake up the main loop */
+        if (mainloop_active)
+            glfwPostEmptyEvent();
+    #endif
 }
 
 void leave() {
     mainloop_active = false;
+    #if !defined(EMSCRIPTEN)
+        glfwPostEmptyEvent();
+    #endif
 }
 
 bool active() {
@@ -267,7 +278,7 @@ int __nanogui_get_image(NVGcontext *ctx, const std::string &name, uint8_t *data,
 }
 
 std::vector<std::pair<int, std::string>>
-load_image_directory(NVGcontext *ctx, const std::string &path) {
+list_image_directory(const std::string &path) {
     std::vector<std::pair<int, std::string> > result;
 #if !defined(_WIN32)
     DIR *dp = opendir(path.c_str());
@@ -287,12 +298,7 @@ load_image_directory(NVGcontext *ctx, const std::string &path) {
 #endif
         if (strstr(fname, "png") == nullptr)
             continue;
-        std::string full_name = path + "/" + std::string(fname);
-        int img = nvgCreateImage(ctx, full_name.c_str(), 0);
-        if (img == 0)
-            throw std::runtime_error("Could not open image data!");
-        result.push_back(
-            std::make_pair(img, full_name.substr(0, full_name.length() - 4)));
+        result.push_back(std::make_pair(0, path + "/" + std::string(fname)));
 #if !defined(_WIN32)
     }
     closedir(dp);
@@ -303,6 +309,18 @@ load_image_directory(NVGcontext *ctx, const std::string &path) {
     return result;
 }
 
+std::vector<std::pair<int, std::string>>
+load_image_directory(NVGcontext *ctx, const std::string &path) {
+    std::vector<std::pair<int, std::string> > result = list_image_directory(path);
+    for (auto &[img, full_name] : result) {
+        img = nvgCreateImage(ctx, full_name.c_str(), 0);
+        if (img == 0)
+            throw std::runtime_error("Could not open image data!");
+        full_name = full_name.substr(0, full_name.length() - 4);
+    }
+    return result;
+}
+
 std::string file_dialog(const std::vector<std::pair<std::string, std::string>> &filetypes, bool save) {
     auto result = file_dialog(filetypes, save, false);
     return result.empty() ? "" : result.front();
@@ -542,6 +542,9 @@ public:
         /* Animate the scrollbar */
         m_progress->set_value(std::fmod((float) glfwGetTime() / 10, 1.0f));
 
+        /* Request another frame to keep the animation running */
+        schedule_redraw();
+
         /* Draw the user interface */
         Screen::draw(ctx);
     }
@@ -581,7 +584,8 @@ int main(int /* argc */, char ** /* argv */) {
             app->dec_ref();
             app->draw_all();
             app->set_visible(true);
-            nanogui::mainloop(1 / 60.f * 1000);
+            app->set_target_fps(60.f);
+            nanogui::mainloop();
         }
 
         nanogui::shutdown();
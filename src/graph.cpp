@@ -11,7 +11,9 @@
 
 #include <nanogui/graph.h>
 #include <nanogui/theme.h>
+#include <nanogui/screen.h>
 #include <nanogui/opengl.h>
+#include <limits>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -23,6 +25,90 @@ Graph::Graph(Widget *parent, const std::string &caption)
     m_text_color = Color(240, 192);
 }
 
+/// Number of values summarized by each block in streaming mode
+static const size_t block_size = 64;
+
+void Graph::set_values(const std::vector<float> &values) {
+    if (m_capacity) {
+        m_total = 0;
+        push(values.data(), values.size());
+    } else {
+        m_values = values;
+        invalidate_layer();
+    }
+}
+
+void Graph::set_capacity(size_t capacity) {
+    std::vector<float> values(size());
+    for (size_t i = 0; i < values.size(); ++i)
+        values[i] = value(i);
+    m_capacity = capacity;
+    m_total = 0;
+    if (capacity) {
+        m_values.assign(capacity, 0.f);
+        /* Each block fully inside the window, plus the one being written */
+        m_blocks.assign(capacity / block_size + 2, Vector2f(0.f));
+        push(values.data(), values.size());
+    } else {
+        m_values = std::move(values);
+        m_blocks.clear();
+        invalidate_layer();
+    }
+}
+
+void Graph::push(const float *values, size_t count) {
+    if (m_capacity == 0) {
+        m_values.insert(m_values.end(), values, values + count);
+    } else {
+        if (count > m_capacity) {
+            values += count - m_capacity;
+            m_total += count - m_capacity;
+            count = m_capacity;
+        }
+
+        for (size_t i = 0; i < count; ++i, ++m_total) {
+            float value = values[i];
+            m_values[m_total % m_capacity] = value;
+
+            Vector2f &block = m_blocks[(m_total / block_size) % m_blocks.size()];
+            if (m_total % block_size == 0)
+                block = Vector2f(value);
+            else
+                block = Vector2f(std::min(block.x(), value), std::max(block.y(), value));
+        }
+    }
+    invalidate_layer();
+}
+
+Vector2f Graph::value_range(size_t first, size_t last) const {
+    Vector2f result(std::numeric_limits<float>::infinity(),
+                    -std::numeric_limits<float>::infinity());
+    auto scan = [&](size_t a, size_t b) {
+        for (; a < b; ++a) {
+            float v = value(a);
+            result = Vector2f(std::min(result.x(), v), std::max(result.y(), v));
+        }
+    };
+
+    if (m_capacity == 0 || last - first < 2 * block_size) {
+        scan(first, last);
+        return result;
+    }
+
+    /* Scan the partial blocks at both ends, use the summaries in between */
+    size_t offset = m_total - size(),
+           k0 = (offset + first + block_size - 1) / block_size,
+           k1 = (offset + last) / block_size;
+    scan(first, k0 * block_size - offset);
+    for (size_t k = k0; k < k1; ++k) {
+        const Vector2f &block = m_blocks[k % m_blocks.size()];
+        result = Vector2f(std::min(result.x(), block.x()),
+                          std::max(result.y(), block.y()));
+    }
+    scan(k1 * block_size - offset, last);
+    return result;
+}
+
 Vector2i Graph::preferred_size(NVGcontext *) const {
     return Vector2i(180, 45);
 }
@@ -35,16 +121,29 @@ void Graph::draw(NVGcontext *ctx) {
     nvgFillColor(ctx, m_background_color);
     nvgFill(ctx);
 
-    if (m_values.size() < 2)
+    size_t n = size();
+    if (n < 2)
         return;
 
+    size_t columns = (size_t) std::max(2.f, m_size.x() * screen()->pixel_ratio());
+
     nvgBeginPath(ctx);
     nvgMoveTo(ctx, m_pos.x(), m_pos.y()+m_size.y());
-    for (size_t i = 0; i < (size_t) m_values.size(); i++) {
-        float value = m_values[i];
-        float vx = m_pos.x() + i * m_size.x() / (float) (m_values.size() - 1);
-        float vy = m_pos.y() + (1-value) * m_size.y();
-        nvgLineTo(ctx, vx, vy);
+    if (n <= 2 * columns) {
+        for (size_t i = 0; i < n; i++) {
+            float value = this->value(i);
+            float vx = m_pos.x() + i * m_size.x() / (float) (n - 1);
+            float vy = m_pos.y() + (1-value) * m_size.y();
+            nvgLineTo(ctx, vx, vy);
+        }
+    } else {
+        /* More values than pixel columns: draw the range of values in each column */
+        for (size_t c = 0; c < columns; c++) {
+            Vector2f range = value_range(c * n / columns, (c + 1) * n / columns);
+            float vx = m_pos.x() + c * m_size.x() / (float) (columns - 1);
+            nvgLineTo(ctx, vx, m_pos.y() + (1-range.x()) * m_size.y());
+            nvgLineTo(ctx, vx, m_pos.y() + (1-range.y()) * m_size.y());
+        }
     }
 
     nvgLineTo(ctx, m_pos.x() + m_size.x(), m_pos.y() + m_size.y());
@@ -11,6 +11,7 @@
 */
 
 #include <nanogui/imagepanel.h>
+#include <nanogui/screen.h>
 #include <nanogui/opengl.h>
 
 NAMESPACE_BEGIN(nanogui)
@@ -64,13 +65,48 @@ Vector2i ImagePanel::preferred_size(NVGcontext *) const {
 
 void ImagePanel::draw(NVGcontext* ctx) {
     Vector2i grid = grid_size();
-
-    for (size_t i = 0; i < m_images.size(); ++i) {
+    if (grid.y() == 0)
+        return;
+
+    /* Only draw the rows that are visible through the ancestors (e.g. a VScrollPanel) */
+    Vector2i origin = absolute_position(),
+             clip_min = origin, clip_max = origin + m_size;
+    for (const Widget *w = m_parent; w; w = w->parent()) {
+        Vector2i p = w->absolute_position();
+        clip_min = max(clip_min, p);
+        clip_max = min(clip_max, p + w->size());
+    }
+    int pitch = m_thumb_size + m_spacing,
+        top = clip_min.y() - origin.y() - m_margin,
+        bottom = clip_max.y() - origin.y() - m_margin;
+    if (bottom <= top)
+        return;
+    size_t first = (size_t) std::clamp(top / pitch, 0, grid.y()) * grid.x(),
+           last = std::min((size_t) std::clamp(bottom / pitch + 1, 0, grid.y()) * grid.x(),
+                           m_images.size());
+
+    ThumbnailCache *cache = m_thumbnail_cache.get();
+    bool pending = cache && cache->upload(ctx, screen()->frame_index());
+
+    for (size_t i = first; i < last; ++i) {
         Vector2i p = m_pos + Vector2i(m_margin) +
             Vector2i((int) i % grid.x(), (int) i / grid.x()) * (m_thumb_size + m_spacing);
+        int image = m_images[i].first;
+        if (image == 0 && cache)
+            image = cache->image(m_images[i].second);
+
+        if (image <= 0) {
+            /* Placeholder for thumbnails that are still being decoded */
+            nvgBeginPath(ctx);
+            nvgRoundedRect(ctx, p.x(), p.y(), m_thumb_size, m_thumb_size, 5);
+            nvgFillColor(ctx, nvgRGBA(255, 255, 255, m_mouse_index == (int) i ? 40 : 20));
+            nvgFill(ctx);
+            continue;
+        }
+
         int imgw, imgh;
 
-        nvgImageSize(ctx, m_images[i].first, &imgw, &imgh);
+        nvgImageSize(ctx, image, &imgw, &imgh);
         float iw, ih, ix, iy;
         if (imgw < imgh) {
             iw = m_thumb_size;
@@ -85,7 +121,7 @@ void ImagePanel::draw(NVGcontext* ctx) {
         }
 
         NVGpaint img_paint = nvgImagePattern(
-            ctx, p.x() + ix, p.y()+ iy, iw, ih, 0, m_images[i].first,
+            ctx, p.x() + ix, p.y()+ iy, iw, ih, 0, image,
             m_mouse_index == (int)i ? 1.0 : 0.7);
 
         nvgBeginPath(ctx);
@@ -109,6 +145,9 @@ void ImagePanel::draw(NVGcontext* ctx) {
         nvgStrokeColor(ctx, nvgRGBA(255,255,255,80));
         nvgStroke(ctx);
     }
+
+    if (pending)
+        screen()->schedule_redraw(1.0 / 30.0);
 }
 
 NAMESPACE_END(nanogui)
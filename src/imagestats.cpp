@@ -0,0 +1,428 @@
+/*
+    src/imagestats.cpp -- GPU reductions computing the luminance range,
+    mean, and histogram of a texture
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+
+#include <nanogui/imagestats.h>
+#include <nanogui/opengl.h>
+#include <cmath>
+
+NAMESPACE_BEGIN(nanogui)
+
+/* Statistics are stored as (minimum, maximum, sum, count) in the channels of
+   RGBA textures. Every texel of a reduction step covers 4x4 texels of its
+   source, and texels without any finite value have a count of zero. */
+
+#if defined(NANOGUI_USE_OPENGL)
+#  define STATS_GLSL_HEADER "#version 330\n"
+#elif defined(NANOGUI_USE_GLES)
+#  define STATS_GLSL_HEADER "#version 300 es\n"                      \
+                            "precision highp float;\n"               \
+                            "precision highp int;\n"                 \
+                            "precision highp sampler2D;\n"
+#endif
+
+static const char *stats_vertex_shader =
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+    STATS_GLSL_HEADER R"(
+        in vec2 position;
+
+        void main() {
+            gl_Position = vec4(position, 0.0, 1.0);
+        }
+    )";
+#elif defined(NANOGUI_USE_METAL)
+    R"(
+        using namespace metal;
+
+        struct VertexOut {
+            float4 position [[position]];
+        };
+
+        vertex VertexOut vertex_main(const device float2 *position,
+                                     uint id [[vertex_id]]) {
+            VertexOut vert;
+            vert.position = float4(position[id], 0.f, 1.f);
+            return vert;
+        }
+    )";
+#endif
+
+/* 'mode' is 0 (luminance of an RGB(A) source), 1 (first channel of the
+   source), or 2 (source contains statistics of a previous step) */
+static const char *stats_reduce_shader =
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+    STATS_GLSL_HEADER R"(
+        uniform sampler2D source;
+        uniform ivec2 source_size;
+        uniform int mode;
+        out vec4 result;
+
+        void main() {
+            ivec2 base = ivec2(gl_FragCoord.xy) * 4;
+            vec4 r = vec4(3.0e38, -3.0e38, 0.0, 0.0);
+
+            for (int j = 0; j < 4; ++j) {
+                for (int i = 0; i < 4; ++i) {
+                    ivec2 p = base + ivec2(i, j);
+                    if (p.x >= source_size.x || p.y >= source_size.y)
+                        continue;
+                    vec4 v = texelFetch(source, p, 0);
+                    if (mode == 2) {
+                        if (v.w == 0.0)
+                            continue;
+                    } else {
+                        float l = mode == 0 ? dot(v.rgb, vec3(0.2126, 0.7152, 0.0722)) : v.r;
+                        if (isnan(l) || isinf(l))
+                            continue;
+                        v = vec4(l, l, l, 1.0);
+                    }
+                    r = vec4(min(r.x, v.x), max(r.y, v.y), r.z + v.z, r.w + v.w);
+                }
+            }
+
+            result = r;
+        }
+    )";
+#elif defined(NANOGUI_USE_METAL)
+    R"(
+        using namespace metal;
+
+        struct VertexOut {
+            float4 position [[position]];
+        };
+
+        fragment float4 fragment_main(VertexOut vert [[stage_in]],
+                                      texture2d<float, access::read> source,
+                                      constant int2 &source_size,
+                                      constant int &mode) {
+            int2 base = int2(vert.position.xy) * 4;
+            float4 r = float4(3.0e38f, -3.0e38f, 0.f, 0.f);
+
+            for (int j = 0; j < 4; ++j) {
+                for (int i = 0; i < 4; ++i) {
+                    int2 p = base + int2(i, j);
+                    if (p.x >= source_size.x || p.y >= source_size.y)
+                        continue;
+                    float4 v = source.read(uint2(p));
+                    if (mode == 2) {
+                        if (v.w == 0.f)
+                            continue;
+                    } else {
+                        float l = mode == 0 ? dot(v.rgb, float3(0.2126f, 0.7152f, 0.0722f)) : v.r;
+                        if (isnan(l) || isinf(l))
+                            continue;
+                        v = float4(l, l, l, 1.f);
+                    }
+                    r = float4(min(r.x, v.x), max(r.y, v.y), r.z + v.z, r.w + v.w);
+                }
+            }
+
+            return r;
+        }
+    )";
+#endif
+
+/* Histogram of each band of 4 rows of the source (matching the rows of the
+   first reduction step), binning the luminance of individual pixels. Texel
+   'x' holds the pixel counts of bins 4*x .. 4*x+3, and 'mode' is as above */
+static const char *stats_rows_shader =
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+    STATS_GLSL_HEADER R"(
+        uniform sampler2D source;
+        uniform sampler2D stats;
+        uniform ivec2 source_size;
+        uniform int mode;
+        uniform int bins;
+        uniform bool log_scale;
+        out vec4 result;
+
+        float to_domain(float v) {
+            return log_scale ? log2(max(v, 1e-6)) : v;
+        }
+
+        void main() {
+            ivec2 p = ivec2(gl_FragCoord.xy);
+            vec4 s = texelFetch(stats, ivec2(0), 0);
+            float lo = to_domain(s.x), hi = to_domain(s.y);
+            vec4 r = vec4(0.0);
+
+            for (int y = 4 * p.y; y < min(4 * p.y + 4, source_size.y); ++y) {
+                for (int x = 0; x < source_size.x; ++x) {
+                    vec4 v = texelFetch(source, ivec2(x, y), 0);
+                    float l = mode == 0 ? dot(v.rgb, vec3(0.2126, 0.7152, 0.0722)) : v.r;
+                    if (isnan(l) || isinf(l))
+                        continue;
+                    float t = hi > lo ? (to_domain(l) - lo) / (hi - lo) : 0.0;
+                    int bin = clamp(int(t * float(bins)), 0, bins - 1) - 4 * p.x;
+                    r += vec4(equal(ivec4(bin), ivec4(0, 1, 2, 3)));
+                }
+            }
+
+            result = r;
+        }
+    )";
+#elif defined(NANOGUI_USE_METAL)
+    R"(
+        using namespace metal;
+
+        struct VertexOut {
+            float4 position [[position]];
+        };
+
+        float to_domain(float v, bool log_scale) {
+            return log_scale ? log2(max(v, 1e-6f)) : v;
+        }
+
+        fragment float4 fragment_main(VertexOut vert [[stage_in]],
+                                      texture2d<float, access::read> source,
+                                      texture2d<float, access::read> stats,
+                                      constant int2 &source_size,
+                                      constant int &mode,
+                                      constant int &bins,
+                                      constant bool &log_scale) {
+            int2 p = int2(vert.position.xy);
+            float4 s = stats.read(uint2(0, 0));
+            float lo = to_domain(s.x, log_scale), hi = to_domain(s.y, log_scale);
+            float4 r = float4(0.f);
+
+            for (int y = 4 * p.y; y < min(4 * p.y + 4, source_size.y); ++y) {
+                for (int x = 0; x < source_size.x; ++x) {
+                    float4 v = source.read(uint2(x, y));
+                    float l = mode == 0 ? dot(v.rgb, float3(0.2126f, 0.7152f, 0.0722f)) : v.r;
+                    if (isnan(l) || isinf(l))
+                        continue;
+                    float t = hi > lo ? (to_domain(l, log_scale) - lo) / (hi - lo) : 0.f;
+                    int bin = clamp(int(t * float(bins)), 0, bins - 1) - 4 * p.x;
+                    r += float4(int4(bin) == int4(0, 1, 2, 3));
+                }
+            }
+
+            return r;
+        }
+    )";
+#endif
+
+/// Sum of the row histograms
+static const char *stats_columns_shader =
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+    STATS_GLSL_HEADER R"(
+        uniform sampler2D rows;
+        uniform int height;
+        out vec4 result;
+
+        void main() {
+            int x = int(gl_FragCoord.x);
+            vec4 r = vec4(0.0);
+            for (int y = 0; y < height; ++y)
+                r += texelFetch(rows, ivec2(x, y), 0);
+            result = r;
+        }
+    )";
+#elif defined(NANOGUI_USE_METAL)
+    R"(
+        using namespace metal;
+
+        struct VertexOut {
+            float4 position [[position]];
+        };
+
+        fragment float4 fragment_main(VertexOut vert [[stage_in]],
+                                      texture2d<float, access::read> rows,
+                                      constant int &height) {
+            int x = int(vert.position.x);
+            float4 r = float4(0.f);
+            for (int y = 0; y < height; ++y)
+                r += rows.read(uint2(x, y));
+            return r;
+        }
+    )";
+#endif
+
+/// Map a luminance value into the domain of the histogram bins
+static float to_domain(float value, bool log_scale) {
+    return log_scale ? std::log2(std::max(value, 1e-6f)) : value;
+}
+
+ImageStats::ImageStats(size_t bins, bool log_histogram)
+    : m_bins(bins), m_log_histogram(log_histogram), m_histogram(bins, 0.f) {
+#if defined(NANOGUI_USE_GLES) && NANOGUI_GLES_VERSION == 2
+    throw std::runtime_error("ImageStats::ImageStats(): rendering to floating point textures is not supported on GLES 2!");
+#endif
+    if (bins == 0 || bins % 4 != 0)
+        throw std::runtime_error("ImageStats::ImageStats(): the number of bins must be a positive multiple of 4!");
+}
+
+ImageStats::Pass ImageStats::create_pass(const Vector2i &size,
+                                         const std::string &name,
+                                         const char *fragment_shader) {
+    Pass pass;
+    pass.target = new Texture(
+        Texture::PixelFormat::RGBA,
+        Texture::ComponentFormat::Float32,
+        size,
+        Texture::InterpolationMode::Nearest,
+        Texture::InterpolationMode::Nearest,
+        Texture::WrapMode::ClampToEdge,
+        1,
+        Texture::TextureFlags::ShaderRead | Texture::TextureFlags::RenderTarget
+    );
+    pass.render_pass = new RenderPass({ pass.target.get() }, nullptr, nullptr,
+                                      nullptr, false);
+    pass.render_pass->set_cull_mode(RenderPass::CullMode::Disabled);
+    pass.shader = new Shader(pass.render_pass, name, stats_vertex_shader,
+                             fragment_shader);
+
+    float positions[] = {
+        -1.f, -1.f,  1.f, -1.f,  1.f, 1.f,
+        -1.f, -1.f,  1.f,  1.f, -1.f, 1.f
+    };
+    size_t shape[2] = { 6, 2 };
+    pass.shader->set_buffer("position", VariableType::Float32, 2, shape,
+                            positions);
+    return pass;
+}
+
+void ImageStats::init(const Vector2i &size) {
+    m_levels.clear();
+    Vector2i level_size = size;
+    do {
+        level_size = (level_size + Vector2i(3)) / 4;
+        m_levels.push_back(create_pass(level_size, "image_stats_reduce",
+                                       stats_reduce_shader));
+    } while (level_size != Vector2i(1));
+
+    Vector2i first = m_levels[0].target->size();
+    m_rows = create_pass(Vector2i((int) m_bins / 4, first.y()),
+                         "image_stats_rows", stats_rows_shader);
+    m_histogram_pass = create_pass(Vector2i((int) m_bins / 4, 1),
+                                   "image_stats_columns", stats_columns_shader);
+    m_size = size;
+}
+
+void ImageStats::run(Pass &pass) {
+    pass.render_pass->begin();
+    pass.shader->begin();
+    pass.shader->draw_array(Shader::PrimitiveType::Triangle, 0, 6, false);
+    pass.shader->end();
+    pass.render_pass->end();
+}
+
+void ImageStats::compute(Texture *texture) {
+    if (m_pending)
+        throw std::runtime_error("ImageStats::compute(): the results of the previous computation have not been fetched yet!");
+    if (texture->component_format() == Texture::ComponentFormat::UInt32 ||
+        texture->component_format() == Texture::ComponentFormat::Int32)
+        throw std::runtime_error("ImageStats::compute(): 32-bit integer textures are not supported, "
+                                 "use a floating point or normalized (8/16-bit) component format!");
+    if (texture->pixel_format() == Texture::PixelFormat::Depth ||
+        texture->pixel_format() == Texture::PixelFormat::DepthStencil)
+        throw std::runtime_error("ImageStats::compute(): depth textures are not supported!");
+    if (texture->size() != m_size)
+        init(texture->size());
+
+    Texture *source = texture;
+    int input_mode = texture->channels() >= 3 ? 0 : 1, mode = input_mode;
+    for (Pass &pass : m_levels) {
+        pass.shader->set_texture("source", source);
+        pass.shader->set_uniform("source_size", source->size());
+        pass.shader->set_uniform("mode", mode);
+        run(pass);
+        source = pass.target;
+        mode = 2;
+    }
+
+    m_rows.shader->set_texture("source", texture);
+    m_rows.shader->set_texture("stats", source);
+    m_rows.shader->set_uniform("source_size", texture->size());
+    m_rows.shader->set_uniform("mode", input_mode);
+    m_rows.shader->set_uniform("bins", (int) m_bins);
+    m_rows.shader->set_uniform("log_scale", m_log_histogram);
+    run(m_rows);
+
+    m_histogram_pass.shader->set_texture("rows", m_rows.target);
+    m_histogram_pass.shader->set_uniform("height", m_rows.target->size().y());
+    run(m_histogram_pass);
+
+#if !defined(NANOGUI_USE_GLES)
+    m_stats_download = source->download_async();
+    m_histogram_download = m_histogram_pass.target->download_async();
+#endif
+    m_pending = true;
+}
+
+bool ImageStats::ready() const {
+#if defined(NANOGUI_USE_GLES)
+    /* Asynchronous downloads are not supported, fetch() stalls */
+    return m_pending;
+#else
+    return m_pending && m_stats_download->ready() && m_histogram_download->ready();
+#endif
+}
+
+bool ImageStats::fetch(bool wait) {
+    if (!m_pending || (!wait && !ready()))
+        return false;
+
+    float stats[4];
+#if defined(NANOGUI_USE_GLES)
+    m_levels.back().target->download((uint8_t *) stats);
+    m_histogram_pass.target->download((uint8_t *) m_histogram.data());
+#else
+    m_stats_download->read((uint8_t *) stats);
+    m_histogram_download->read((uint8_t *) m_histogram.data());
+    m_stats_download = nullptr;
+    m_histogram_download = nullptr;
+#endif
+    m_pending = false;
+
+    if (stats[3] > 0.f) {
+        m_minimum = stats[0];
+        m_maximum = stats[1];
+        m_mean = stats[2] / stats[3];
+    } else {
+        /* No finite values */
+        m_minimum = m_maximum = m_mean = 0.f;
+    }
+    return true;
+}
+
+Vector2f ImageStats::histogram_range() const {
+    return Vector2f(to_domain(m_minimum, m_log_histogram),
+                    to_domain(m_maximum, m_log_histogram));
+}
+
+float ImageStats::percentile(float q) const {
+    float total = 0.f;
+    for (float count : m_histogram)
+        total += count;
+    if (!(total > 0.f))
+        return m_minimum;
+
+    Vector2f range = histogram_range();
+    float target = std::min(std::max(q, 0.f), 1.f) * total,
+          accum = 0.f;
+
+    for (size_t i = 0; i < m_bins; ++i) {
+        float count = m_histogram[i];
+        if (count > 0.f && accum + count >= target) {
+            /* Interpolate linearly within the bin */
+            float t = (i + (target - accum) / count) / m_bins,
+                  value = range.x() + t * (range.y() - range.x());
+            value = m_log_histogram ? std::exp2(value) : value;
+            return std::min(std::max(value, m_minimum), m_maximum);
+        }
+        accum += count;
+    }
+
+    return m_maximum;
+}
+
+NAMESPACE_END(nanogui)
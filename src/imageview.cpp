@@ -51,6 +51,18 @@ void ImageView::set_image(Texture *image) {
             "ImageView::set_image(): interpolation mode must be set to 'Nearest'!");
     m_image_shader->set_texture("image", image);
     m_image = image;
+    m_tiled_image = nullptr;
+}
+
+void ImageView::set_tiled_image(TiledImage *image) {
+    m_tiled_image = image;
+    m_image = nullptr;
+}
+
+Vector2i ImageView::image_size() const {
+    if (m_tiled_image)
+        return m_tiled_image->size();
+    return m_image ? m_image->size() : Vector2i(0);
 }
 
 float ImageView::scale() const {
@@ -62,9 +74,9 @@ void ImageView::set_scale(float scale) {
 }
 
 void ImageView::center() {
-    if (!m_image)
+    if (!m_image && !m_tiled_image)
         return;
-    m_offset = Vector2i(.5f * (Vector2f(m_size) * screen()->pixel_ratio() - Vector2f(m_image->size()) * scale()));
+    m_offset = Vector2i(.5f * (Vector2f(m_size) * screen()->pixel_ratio() - Vector2f(image_size()) * scale()));
 }
 
 void ImageView::reset() {
@@ -87,7 +99,7 @@ Vector2f ImageView::pixel_to_pos(const Vector2f &p) const {
 }
 
 bool ImageView::keyboard_event(int key, int /* scancode */, int action, int /* modifiers */) {
-    if (!m_enabled || !m_image)
+    if (!m_enabled || (!m_image && !m_tiled_image))
         return false;
 
     if (action == GLFW_PRESS) {
@@ -101,7 +113,7 @@ bool ImageView::keyboard_event(int key, int /* scancode */, int action, int /* m
 
 bool ImageView::mouse_drag_event(const Vector2i & /* p */, const Vector2i &rel,
                                  int /* button */, int /* modifiers */) {
-    if (!m_enabled || !m_image)
+    if (!m_enabled || (!m_image && !m_tiled_image))
         return false;
 
     m_offset += rel * screen()->pixel_ratio();
@@ -110,7 +122,7 @@ bool ImageView::mouse_drag_event(const Vector2i & /* p */, const Vector2i &rel,
 }
 
 bool ImageView::scroll_event(const Vector2i &p, const Vector2f &rel) {
-    if (!m_enabled || !m_image)
+    if (!m_enabled || (!m_image && !m_tiled_image))
         return false;
 
     Vector2f p1 = pos_to_pixel(p - m_pos);
@@ -118,8 +130,8 @@ bool ImageView::scroll_event(const Vector2i &p, const Vector2f &rel) {
 
     // Restrict scaling to a reasonable range
     m_scale = std::max(
-        m_scale, std::min(0.f, std::log2(40.f / std::max(m_image->size().x(),
-                                                         m_image->size().y())) * 5.f));
+        m_scale, std::min(0.f, std::log2(40.f / std::max(image_size().x(),
+                                                         image_size().y())) * 5.f));
     m_scale = std::min(m_scale, 45.f);
 
     Vector2f p2 = pos_to_pixel(p - m_pos);
@@ -128,13 +140,13 @@ bool ImageView::scroll_event(const Vector2i &p, const Vector2f &rel) {
 }
 
 void ImageView::draw(NVGcontext *ctx) {
-    if (!m_enabled || !m_image)
+    if (!m_enabled || (!m_image && !m_tiled_image))
         return;
 
     Canvas::draw(ctx);
 
     Vector2i top_left = Vector2i(pixel_to_pos(Vector2f(0.f, 0.f))),
-             size     = Vector2i(pixel_to_pos(Vector2f(m_image->size())) - Vector2f(top_left));
+             size     = Vector2i(pixel_to_pos(Vector2f(image_size())) - Vector2f(top_left));
 
     if (m_draw_image_border) {
         nvgBeginPath(ctx);
@@ -157,7 +169,7 @@ void ImageView::draw(NVGcontext *ctx) {
         nvgTextAlign(ctx, NVG_ALIGN_CENTER | NVG_ALIGN_MIDDLE);
 
         Vector2i start = max(Vector2i(0), Vector2i(pos_to_pixel(Vector2f(0.f, 0.f))) - 1),
-                 end   = min(Vector2i(pos_to_pixel(Vector2f(m_size))) + 1, m_image->size() - 1);
+                 end   = min(Vector2i(pos_to_pixel(Vector2f(m_size))) + 1, image_size() - 1);
 
         char text_buf[80],
             *text[4] = { text_buf, text_buf + 20, text_buf + 40, text_buf + 60 };
@@ -192,7 +204,7 @@ void ImageView::draw(NVGcontext *ctx) {
 }
 
 void ImageView::draw_contents() {
-    if (!m_image)
+    if (!m_image && !m_tiled_image)
         return;
 
     /* Ensure that 'offset' is a multiple of the pixel ratio */
@@ -200,7 +212,7 @@ void ImageView::draw_contents() {
     m_offset = (Vector2f(Vector2i(m_offset / pixel_ratio)) * pixel_ratio);
 
     Vector2f bound1 = Vector2f(m_size) * pixel_ratio,
-             bound2 = -Vector2f(m_image->size()) * scale();
+             bound2 = -Vector2f(image_size()) * scale();
 
     if ((m_offset.x() >= bound1.x()) != (m_offset.x() < bound2.x()))
         m_offset.x() = std::max(std::min(m_offset.x(), bound1.x()), bound2.x());
@@ -209,25 +221,100 @@ void ImageView::draw_contents() {
 
     Vector2i viewport_size = render_pass()->viewport().second;
 
+    if (m_tiled_image) {
+        draw_tiles(viewport_size);
+        return;
+    }
+
+    draw_texture(m_image, Vector2f(0.f), Vector2f(image_size()), viewport_size);
+}
+
+void ImageView::draw_texture(Texture *texture, const Vector2f &origin,
+                             const Vector2f &size, const Vector2i &viewport_size,
+                             const Vector2f &uv_extent) {
     float scale = std::pow(2.f, m_scale / 5.f);
 
     Matrix4f matrix_background =
-        Matrix4f::scale(Vector3f(m_image->size().x() * scale / 20.f,
-                                 m_image->size().y() * scale / 20.f, 1.f));
+        Matrix4f::translate(Vector3f(origin.x() * scale / 20.f,
+                                     origin.y() * scale / 20.f, 0.f)) *
+        Matrix4f::scale(Vector3f(size.x() * scale / 20.f,
+                                 size.y() * scale / 20.f, 1.f));
 
     Matrix4f matrix_image =
         Matrix4f::ortho(0.f, viewport_size.x(), viewport_size.y(), 0.f, -1.f, 1.f) *
-        Matrix4f::translate(Vector3f(m_offset.x(), (int) m_offset.y(), 0.f)) *
-        Matrix4f::scale(Vector3f(m_image->size().x() * scale,
-                                 m_image->size().y() * scale, 1.f));
+        Matrix4f::translate(Vector3f(m_offset.x() + origin.x() * scale,
+                                     (int) m_offset.y() + origin.y() * scale, 0.f)) *
+        Matrix4f::scale(Vector3f(size.x() * scale,
+                                 size.y() * scale, 1.f));
 
+    m_image_shader->set_texture("image", texture);
     m_image_shader->set_uniform("matrix_image",      matrix_image.T());
     m_image_shader->set_uniform("matrix_background", matrix_background.T());
     m_image_shader->set_uniform("background_color",  m_image_background_color);
+    m_image_shader->set_uniform("uv_extent",         uv_extent);
 
     m_image_shader->begin();
     m_image_shader->draw_array(Shader::PrimitiveType::Triangle, 0, 6, false);
     m_image_shader->end();
 }
 
+void ImageView::draw_tiles(const Vector2i &viewport_size) {
+    TiledImage *image = m_tiled_image;
+    bool pending = image->upload();
+
+    /* Coarsest level that provides at least one image pixel per screen pixel */
+    float scale = this->scale();
+    int top = image->level_count() - 1,
+        level = std::clamp((int) std::floor(-std::log2(scale)), 0, top);
+
+    /* Visible region in pixels of the chosen level */
+    float level_scale = (float) (1 << level);
+    Vector2f p0 = max(-m_offset / scale, Vector2f(0.f)) / level_scale,
+             p1 = min((Vector2f(viewport_size) - m_offset) / scale,
+                      Vector2f(image_size())) / level_scale;
+    Vector2f t = p1 / (float) image->tile_size();
+    Vector2i t0 = Vector2i(p0 / (float) image->tile_size()),
+             t1 = min(Vector2i((int) std::ceil(t.x()), (int) std::ceil(t.y())),
+                      image->tile_count(level));
+
+    /* Collect the tiles to draw, falling back to coarser levels for missing ones */
+    struct Tile { int level; Vector2i index; Texture *texture; };
+    std::vector<Tile> tiles;
+    image->tile(top, Vector2i(0)); // Always keep the coarsest level around (it is never evicted)
+    for (int y = t0.y(); y < t1.y(); ++y) {
+        for (int x = t0.x(); x < t1.x(); ++x) {
+            Vector2i index(x, y);
+            Texture *texture = image->tile(level, index);
+            int l = level;
+            while (!texture && l < top) {
+                l++;
+                index = index / 2;
+                texture = image->tile(l, index, false);
+            }
+            if (texture)
+                tiles.push_back({ l, index, texture });
+        }
+    }
+
+    /* Draw coarse tiles first so that finer ones cover them */
+    std::sort(tiles.begin(), tiles.end(), [](const Tile &a, const Tile &b) {
+        return a.level != b.level ? a.level > b.level : a.texture < b.texture;
+    });
+    tiles.erase(std::unique(tiles.begin(), tiles.end(), [](const Tile &a, const Tile &b) {
+        return a.texture == b.texture;
+    }), tiles.end());
+
+    for (const Tile &tile : tiles) {
+        /* The last pixel of a coarse level may extend past the image, clip it */
+        float extent = (float) (image->tile_size() << tile.level);
+        Vector2f origin = Vector2f(tile.index) * extent,
+                 size = Vector2f(tile.texture->size()) * (float) (1 << tile.level),
+                 clipped = min(size, Vector2f(image_size()) - origin);
+        draw_texture(tile.texture, origin, clipped, viewport_size, clipped / size);
+    }
+
+    if (pending)
+        screen()->schedule_redraw(1.0 / 30.0);
+}
+
 NAMESPACE_END(nanogui)
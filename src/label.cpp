@@ -12,6 +12,7 @@
 #include <nanogui/label.h>
 #include <nanogui/theme.h>
 #include <nanogui/opengl.h>
+#include <nanogui/textmetrics.h>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -27,25 +28,26 @@ Label::Label(Widget *parent, const std::string &caption, const std::string &font
 void Label::set_theme(Theme *theme) {
     Widget::set_theme(theme);
     if (m_theme) {
+        if (m_font_size != m_theme->m_standard_font_size)
+            invalidate_layout();
         m_font_size = m_theme->m_standard_font_size;
         m_color = m_theme->m_text_color;
+        invalidate_layer();
     }
 }
 
 Vector2i Label::preferred_size(NVGcontext *ctx) const {
     if (m_caption == "")
         return Vector2i(0);
-    nvgFontFace(ctx, m_font.c_str());
-    nvgFontSize(ctx, font_size());
     if (m_fixed_size.x() > 0) {
         float bounds[4];
-        nvgTextAlign(ctx, NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
-        nvgTextBoxBounds(ctx, m_pos.x(), m_pos.y(), m_fixed_size.x(), m_caption.c_str(), nullptr, bounds);
+        text_box_bounds(ctx, m_font.c_str(), font_size(), m_fixed_size.x(),
+                        m_caption, bounds, NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
         return Vector2i(m_fixed_size.x(), bounds[3] - bounds[1]);
     } else {
-        nvgTextAlign(ctx, NVG_ALIGN_LEFT | NVG_ALIGN_MIDDLE);
         return Vector2i(
-            nvgTextBounds(ctx, 0, 0, m_caption.c_str(), nullptr, nullptr) + 2,
+            text_bounds(ctx, m_font.c_str(), font_size(), m_caption, nullptr,
+                        NVG_ALIGN_LEFT | NVG_ALIGN_MIDDLE) + 2,
             font_size()
         );
     }
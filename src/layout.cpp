@@ -48,7 +48,7 @@ Vector2i BoxLayout::preferred_size(NVGcontext *ctx, const Widget *widget) const
         else
             size[axis1] += m_spacing;
 
-        Vector2i ps = w->preferred_size(ctx), fs = w->fixed_size();
+        Vector2i ps = w->preferred_size_cached(ctx), fs = w->fixed_size();
         Vector2i target_size(
             fs[0] ? fs[0] : ps[0],
             fs[1] ? fs[1] : ps[1]
@@ -91,7 +91,7 @@ void BoxLayout::perform_layout(NVGcontext *ctx, Widget *widget) const {
         else
             position += m_spacing;
 
-        Vector2i ps = w->preferred_size(ctx), fs = w->fixed_size();
+        Vector2i ps = w->preferred_size_cached(ctx), fs = w->fixed_size();
         Vector2i target_size(
             fs[0] ? fs[0] : ps[0],
             fs[1] ? fs[1] : ps[1]
@@ -118,7 +118,7 @@ void BoxLayout::perform_layout(NVGcontext *ctx, Widget *widget) const {
 
         w->set_position(pos);
         w->set_size(target_size);
-        w->perform_layout(ctx);
+        w->update_layout(ctx);
         position += target_size[axis1];
     }
 }
@@ -139,7 +139,7 @@ Vector2i GroupLayout::preferred_size(NVGcontext *ctx, const Widget *widget) cons
             height += (label == nullptr) ? m_spacing : m_group_spacing;
         first = false;
 
-        Vector2i ps = c->preferred_size(ctx), fs = c->fixed_size();
+        Vector2i ps = c->preferred_size_cached(ctx), fs = c->fixed_size();
         Vector2i target_size(
             fs[0] ? fs[0] : ps[0],
             fs[1] ? fs[1] : ps[1]
@@ -175,7 +175,7 @@ void GroupLayout::perform_layout(NVGcontext *ctx, Widget *widget) const {
 
         bool indent_cur = indent && label == nullptr;
         Vector2i ps = Vector2i(available_width - (indent_cur ? m_group_indent : 0),
-                               c->preferred_size(ctx).y());
+                               c->preferred_size_cached(ctx).y());
         Vector2i fs = c->fixed_size();
 
         Vector2i target_size(
@@ -185,7 +185,7 @@ void GroupLayout::perform_layout(NVGcontext *ctx, Widget *widget) const {
 
         c->set_position(Vector2i(m_margin + (indent_cur ? m_group_indent : 0), height));
         c->set_size(target_size);
-        c->perform_layout(ctx);
+        c->update_layout(ctx);
 
         height += target_size.y();
 
@@ -237,7 +237,7 @@ void GridLayout::compute_layout(NVGcontext *ctx, const Widget *widget, std::vect
                 w = widget->children()[child++];
             } while (!w->visible());
 
-            Vector2i ps = w->preferred_size(ctx);
+            Vector2i ps = w->preferred_size_cached(ctx);
             Vector2i fs = w->fixed_size();
             Vector2i target_size(
                 fs[0] ? fs[0] : ps[0],
@@ -305,7 +305,7 @@ void GridLayout::perform_layout(NVGcontext *ctx, Widget *widget) const {
                 w = widget->children()[child++];
             } while (!w->visible());
 
-            Vector2i ps = w->preferred_size(ctx);
+            Vector2i ps = w->preferred_size_cached(ctx);
             Vector2i fs = w->fixed_size();
             Vector2i target_size(
                 fs[0] ? fs[0] : ps[0],
@@ -334,7 +334,7 @@ void GridLayout::perform_layout(NVGcontext *ctx, Widget *widget) const {
             }
             w->set_position(item_pos);
             w->set_size(target_size);
-            w->perform_layout(ctx);
+            w->update_layout(ctx);
             pos[axis1] += grid[axis1][i1] + m_spacing[axis1];
         }
         pos[axis2] += grid[axis2][i2] + m_spacing[axis2];
@@ -386,7 +386,7 @@ void AdvancedGridLayout::perform_layout(NVGcontext *ctx, Widget *widget) const {
 
             int item_pos = grid[axis][anchor.pos[axis]];
             int cell_size  = grid[axis][anchor.pos[axis] + anchor.size[axis]] - item_pos;
-            int ps = w->preferred_size(ctx)[axis], fs = w->fixed_size()[axis];
+            int ps = w->preferred_size_cached(ctx)[axis], fs = w->fixed_size()[axis];
             int target_size = fs ? fs : ps;
 
             switch (anchor.align[axis]) {
@@ -408,7 +408,7 @@ void AdvancedGridLayout::perform_layout(NVGcontext *ctx, Widget *widget) const {
             size[axis] = target_size;
             w->set_position(pos);
             w->set_size(size);
-            w->perform_layout(ctx);
+            w->update_layout(ctx);
         }
     }
 }
@@ -442,7 +442,7 @@ void AdvancedGridLayout::compute_layout(NVGcontext *ctx, const Widget *widget,
                 const Anchor &anchor = pair.second;
                 if ((anchor.size[axis] == 1) != (phase == 0))
                     continue;
-                int ps = w->preferred_size(ctx)[axis], fs = w->fixed_size()[axis];
+                int ps = w->preferred_size_cached(ctx)[axis], fs = w->fixed_size()[axis];
                 int target_size = fs ? fs : ps;
 
                 if (anchor.pos[axis] + anchor.size[axis] > (int) grid.size())
@@ -1,4 +1,7 @@
 #include <nanogui/opengl.h>
+#include "opengl_state.h"
+#include "opengl_check.h"
+#include <cstring>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -56,4 +59,352 @@ bool nanogui_check_glerror(const char *cmd) {
     return true;
 }
 
+/// Maximum number of texture units whose bindings are cached
+static constexpr GLuint gl_state_texture_units = 32;
+
+/// Sentinel value for unknown state
+static constexpr GLuint gl_unknown = (GLuint) -1;
+
+/// Shadow copy of the OpenGL state, 'gl_unknown'/-1 denotes unknown values
+static struct GLStateCache {
+    /// Context whose state is tracked (the cache is discarded when another one becomes current)
+    GLFWwindow *context;
+    GLuint program;
+    GLuint vertex_array;
+    GLuint read_framebuffer;
+    GLuint draw_framebuffer;
+    GLuint active_texture;
+    GLuint texture[gl_state_texture_units];
+    int8_t enabled[5];
+    GLenum blend_src, blend_dst;
+    GLenum depth_func;
+    int8_t depth_mask;
+    GLenum cull_face;
+    GLint viewport[4];
+    GLint scissor[4];
+    bool viewport_valid;
+    bool scissor_valid;
+} gl_state;
+
+static GLStateStats gl_stats;
+
+static bool gl_state_initialized = false;
+
+void invalidate_gl_state() {
+    gl_state.program = gl_state.vertex_array = gl_unknown;
+    gl_state.read_framebuffer = gl_state.draw_framebuffer = gl_unknown;
+    gl_state.active_texture = gl_unknown;
+    for (GLuint i = 0; i < gl_state_texture_units; ++i)
+        gl_state.texture[i] = gl_unknown;
+    for (int i = 0; i < 5; ++i)
+        gl_state.enabled[i] = -1;
+    gl_state.blend_src = gl_state.blend_dst = 0;
+    gl_state.depth_func = 0;
+    gl_state.depth_mask = -1;
+    gl_state.cull_face = 0;
+    gl_state.viewport_valid = gl_state.scissor_valid = false;
+    gl_state.context = glfwGetCurrentContext();
+    gl_state_initialized = true;
+}
+
+GLStateStats gl_state_stats() {
+    return gl_stats;
+}
+
+void reset_gl_state_stats() {
+    gl_stats = GLStateStats();
+}
+
+/// Discard the cache if it is uninitialized or describes another context
+static void gl_state_check() {
+    if (!gl_state_initialized || gl_state.context != glfwGetCurrentContext())
+        invalidate_gl_state();
+}
+
+/// Record whether a state change is issued or skipped, returns 'true' if issued
+static bool gl_state_update(bool changed) {
+    if (changed)
+        gl_stats.issued++;
+    else
+        gl_stats.skipped++;
+    return changed;
+}
+
+void gl_use_program(GLuint program) {
+    gl_state_check();
+    if (gl_state_update(gl_state.program != program)) {
+        CHK(glUseProgram(program));
+        gl_state.program = program;
+    }
+}
+
+#if defined(NANOGUI_USE_OPENGL)
+void gl_bind_vertex_array(GLuint array) {
+    gl_state_check();
+    if (gl_state_update(gl_state.vertex_array != array)) {
+        CHK(glBindVertexArray(array));
+        gl_state.vertex_array = array;
+    }
+}
+#endif
+
+void gl_bind_framebuffer(GLenum target, GLuint framebuffer) {
+    gl_state_check();
+#if defined(NANOGUI_USE_GLES) && NANOGUI_GLES_VERSION == 2
+    bool read = true, draw = true;
+#else
+    bool read = target == GL_FRAMEBUFFER || target == GL_READ_FRAMEBUFFER,
+         draw = target == GL_FRAMEBUFFER || target == GL_DRAW_FRAMEBUFFER;
+#endif
+
+    bool changed = (read && gl_state.read_framebuffer != framebuffer) ||
+                   (draw && gl_state.draw_framebuffer != framebuffer);
+
+    if (gl_state_update(changed)) {
+        CHK(glBindFramebuffer(target, framebuffer));
+        if (read)
+            gl_state.read_framebuffer = framebuffer;
+        if (draw)
+            gl_state.draw_framebuffer = framebuffer;
+    }
+}
+
+void gl_active_texture(GLuint unit) {
+    gl_state_check();
+    if (gl_state_update(gl_state.active_texture != unit)) {
+        CHK(glActiveTexture(GL_TEXTURE0 + unit));
+        gl_state.active_texture = unit;
+    }
+}
+
+void gl_bind_texture(GLenum target, GLuint texture) {
+    gl_state_check();
+    GLuint unit = gl_state.active_texture;
+    if (target != GL_TEXTURE_2D || unit >= gl_state_texture_units) {
+        gl_state_update(true);
+        CHK(glBindTexture(target, texture));
+        return;
+    }
+
+    if (gl_state_update(gl_state.texture[unit] != texture)) {
+        CHK(glBindTexture(GL_TEXTURE_2D, texture));
+        gl_state.texture[unit] = texture;
+    }
+}
+
+/// Map a capability to its slot in 'GLStateCache::enabled' (or -1)
+static int gl_cap_index(GLenum cap) {
+    switch (cap) {
+        case GL_BLEND:        return 0;
+        case GL_DEPTH_TEST:   return 1;
+        case GL_CULL_FACE:    return 2;
+        case GL_SCISSOR_TEST: return 3;
+#if defined(NANOGUI_USE_OPENGL)
+        case GL_PROGRAM_POINT_SIZE: return 4;
+#endif
+        default: return -1;
+    }
+}
+
+void gl_set_enabled(GLenum cap, bool value) {
+    gl_state_check();
+    int index = gl_cap_index(cap);
+    if (gl_state_update(index < 0 || gl_state.enabled[index] != (int8_t) value)) {
+        if (value)
+            CHK(glEnable(cap));
+        else
+            CHK(glDisable(cap));
+        if (index >= 0)
+            gl_state.enabled[index] = (int8_t) value;
+    }
+}
+
+bool gl_is_enabled(GLenum cap) {
+    int index = gl_cap_index(cap);
+    gl_state_check();
+    if (index >= 0 && gl_state.enabled[index] >= 0) {
+        gl_stats.skipped++;
+        return gl_state.enabled[index] == 1;
+    }
+    gl_stats.issued++;
+    bool value = glIsEnabled(cap) == GL_TRUE;
+    if (index >= 0)
+        gl_state.enabled[index] = (int8_t) value;
+    return value;
+}
+
+void gl_blend_func(GLenum src, GLenum dst) {
+    gl_state_check();
+    if (gl_state_update(gl_state.blend_src != src || gl_state.blend_dst != dst)) {
+        CHK(glBlendFunc(src, dst));
+        gl_state.blend_src = src;
+        gl_state.blend_dst = dst;
+    }
+}
+
+void gl_depth_func(GLenum func) {
+    gl_state_check();
+    if (gl_state_update(gl_state.depth_func != func)) {
+        CHK(glDepthFunc(func));
+        gl_state.depth_func = func;
+    }
+}
+
+void gl_depth_mask(bool value) {
+    gl_state_check();
+    if (gl_state_update(gl_state.depth_mask != (int8_t) value)) {
+        CHK(glDepthMask(value ? GL_TRUE : GL_FALSE));
+        gl_state.depth_mask = (int8_t) value;
+    }
+}
+
+bool gl_depth_mask() {
+    gl_state_check();
+    if (gl_state.depth_mask >= 0) {
+        gl_stats.skipped++;
+        return gl_state.depth_mask == 1;
+    }
+    gl_stats.issued++;
+    GLboolean value;
+    CHK(glGetBooleanv(GL_DEPTH_WRITEMASK, &value));
+    gl_state.depth_mask = value ? 1 : 0;
+    return value;
+}
+
+void gl_cull_face(GLenum mode) {
+    gl_state_check();
+    if (gl_state_update(gl_state.cull_face != mode)) {
+        CHK(glCullFace(mode));
+        gl_state.cull_face = mode;
+    }
+}
+
+static bool gl_rect_equal(const GLint *a, GLint x, GLint y, GLsizei w, GLsizei h) {
+    return a[0] == x && a[1] == y && a[2] == (GLint) w && a[3] == (GLint) h;
+}
+
+void gl_viewport(GLint x, GLint y, GLsizei w, GLsizei h) {
+    gl_state_check();
+    if (gl_state_update(!gl_state.viewport_valid ||
+                        !gl_rect_equal(gl_state.viewport, x, y, w, h))) {
+        CHK(glViewport(x, y, w, h));
+        gl_state.viewport[0] = x; gl_state.viewport[1] = y;
+        gl_state.viewport[2] = (GLint) w; gl_state.viewport[3] = (GLint) h;
+        gl_state.viewport_valid = true;
+    }
+}
+
+void gl_get_viewport(GLint *value) {
+    gl_state_check();
+    if (!gl_state_update(!gl_state.viewport_valid)) {
+        memcpy(value, gl_state.viewport, sizeof(GLint) * 4);
+        return;
+    }
+    CHK(glGetIntegerv(GL_VIEWPORT, gl_state.viewport));
+    gl_state.viewport_valid = true;
+    memcpy(value, gl_state.viewport, sizeof(GLint) * 4);
+}
+
+void gl_scissor(GLint x, GLint y, GLsizei w, GLsizei h) {
+    gl_state_check();
+    if (gl_state_update(!gl_state.scissor_valid ||
+                        !gl_rect_equal(gl_state.scissor, x, y, w, h))) {
+        CHK(glScissor(x, y, w, h));
+        gl_state.scissor[0] = x; gl_state.scissor[1] = y;
+        gl_state.scissor[2] = (GLint) w; gl_state.scissor[3] = (GLint) h;
+        gl_state.scissor_valid = true;
+    }
+}
+
+void gl_get_scissor(GLint *value) {
+    gl_state_check();
+    if (!gl_state_update(!gl_state.scissor_valid)) {
+        memcpy(value, gl_state.scissor, sizeof(GLint) * 4);
+        return;
+    }
+    CHK(glGetIntegerv(GL_SCISSOR_BOX, gl_state.scissor));
+    gl_state.scissor_valid = true;
+    memcpy(value, gl_state.scissor, sizeof(GLint) * 4);
+}
+
+/* Deleting a bound object reverts the binding to zero, and its name may be
+   reused by a new object. Hence, forget such bindings. */
+
+void gl_forget_program(GLuint program) {
+    if (gl_state.program == program)
+        gl_state.program = gl_unknown;
+}
+
+#if defined(NANOGUI_USE_OPENGL)
+void gl_forget_vertex_array(GLuint array) {
+    if (gl_state.vertex_array == array)
+        gl_state.vertex_array = gl_unknown;
+}
+#endif
+
+void gl_forget_framebuffer(GLuint framebuffer) {
+    if (gl_state.read_framebuffer == framebuffer)
+        gl_state.read_framebuffer = gl_unknown;
+    if (gl_state.draw_framebuffer == framebuffer)
+        gl_state.draw_framebuffer = gl_unknown;
+}
+
+void gl_forget_texture(GLuint texture) {
+    for (GLuint i = 0; i < gl_state_texture_units; ++i) {
+        if (gl_state.texture[i] == texture)
+            gl_state.texture[i] = gl_unknown;
+    }
+}
+
+/* Original NanoVG backend callbacks, these are the same for all contexts */
+static int (*nvg_create_texture)(void *, int, int, int, int, const unsigned char *) = nullptr;
+static int (*nvg_delete_texture)(void *, int) = nullptr;
+static int (*nvg_update_texture)(void *, int, int, int, int, int, const unsigned char *) = nullptr;
+static void (*nvg_flush)(void *) = nullptr;
+
+/// Forget the binding of the active texture unit, which NanoVG uses for uploads
+static void gl_forget_active_texture() {
+    if (gl_state.active_texture < gl_state_texture_units)
+        gl_state.texture[gl_state.active_texture] = gl_unknown;
+    else
+        invalidate_gl_state();
+}
+
+void gl_state_hook_nanovg(NVGcontext *ctx) {
+    NVGparams *params = nvgInternalParams(ctx);
+    if (params->renderFlush == nvg_flush)
+        return;
+
+    nvg_create_texture = params->renderCreateTexture;
+    nvg_delete_texture = params->renderDeleteTexture;
+    nvg_update_texture = params->renderUpdateTexture;
+    nvg_flush = params->renderFlush;
+
+    params->renderCreateTexture = [](void *uptr, int type, int w, int h,
+                                     int image_flags, const unsigned char *data) {
+        int result = nvg_create_texture(uptr, type, w, h, image_flags, data);
+        gl_forget_active_texture();
+        return result;
+    };
+
+    params->renderDeleteTexture = [](void *uptr, int image) {
+        int result = nvg_delete_texture(uptr, image);
+        for (GLuint i = 0; i < gl_state_texture_units; ++i)
+            gl_state.texture[i] = gl_unknown;
+        return result;
+    };
+
+    params->renderUpdateTexture = [](void *uptr, int image, int x, int y, int w,
+                                     int h, const unsigned char *data) {
+        int result = nvg_update_texture(uptr, image, x, y, w, h, data);
+        gl_forget_active_texture();
+        return result;
+    };
+
+    params->renderFlush = [](void *uptr) {
+        nvg_flush(uptr);
+        invalidate_gl_state();
+    };
+}
+
 NAMESPACE_END(nanogui)
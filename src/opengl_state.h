@@ -0,0 +1,58 @@
+/*
+    src/opengl_state.h -- Cache of OpenGL state that skips redundant changes
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+
+#pragma once
+
+#include <nanogui/opengl.h>
+
+NAMESPACE_BEGIN(nanogui)
+
+/*
+ * The following functions mirror the corresponding OpenGL calls, but only
+ * forward them to the driver when they change the current state. All
+ * OpenGL code in NanoGUI routes state changes through these functions.
+ * Code that changes state behind their back (e.g. NanoVG, or user code)
+ * must call invalidate_gl_state() afterwards. The cache tracks the state of
+ * a single context and is discarded whenever another context is current.
+ */
+
+extern void gl_use_program(GLuint program);
+#if defined(NANOGUI_USE_OPENGL)
+extern void gl_bind_vertex_array(GLuint array);
+#endif
+extern void gl_bind_framebuffer(GLenum target, GLuint framebuffer);
+extern void gl_active_texture(GLuint unit);
+/// Bind a texture to the active texture unit (only GL_TEXTURE_2D is cached)
+extern void gl_bind_texture(GLenum target, GLuint texture);
+extern void gl_set_enabled(GLenum cap, bool value);
+extern bool gl_is_enabled(GLenum cap);
+extern void gl_blend_func(GLenum src, GLenum dst);
+extern void gl_depth_func(GLenum func);
+extern void gl_depth_mask(bool value);
+extern bool gl_depth_mask();
+extern void gl_cull_face(GLenum mode);
+extern void gl_viewport(GLint x, GLint y, GLsizei w, GLsizei h);
+extern void gl_get_viewport(GLint *value);
+extern void gl_scissor(GLint x, GLint y, GLsizei w, GLsizei h);
+extern void gl_get_scissor(GLint *value);
+
+/// Forget cached bindings that refer to deleted objects
+extern void gl_forget_program(GLuint program);
+#if defined(NANOGUI_USE_OPENGL)
+extern void gl_forget_vertex_array(GLuint array);
+#endif
+extern void gl_forget_framebuffer(GLuint framebuffer);
+extern void gl_forget_texture(GLuint texture);
+
+/// Invalidate the cache whenever NanoVG issues OpenGL commands
+extern void gl_state_hook_nanovg(NVGcontext *ctx);
+
+NAMESPACE_END(nanogui)
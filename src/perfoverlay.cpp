@@ -0,0 +1,121 @@
+/*
+    src/perfoverlay.cpp -- Widget that displays frame time statistics
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+
+#include <nanogui/perfoverlay.h>
+#include <nanogui/screen.h>
+#include <nanogui/opengl.h>
+#include <algorithm>
+
+NAMESPACE_BEGIN(nanogui)
+
+PerfOverlay::PerfOverlay(Widget *parent)
+    : Widget(parent), m_frame_count(120) {
+    m_background_color = Color(20, 200);
+    m_text_color = Color(240, 192);
+}
+
+Vector2i PerfOverlay::preferred_size(NVGcontext *) const {
+    return Vector2i(230, 100);
+}
+
+/// Return the 'p'-th percentile of 'values' (which are reordered in the process)
+static float percentile(std::vector<float> &values, float p) {
+    size_t index = std::min((size_t) (p * values.size()), values.size() - 1);
+    std::nth_element(values.begin(), values.begin() + index, values.end());
+    return values[index];
+}
+
+void PerfOverlay::draw(NVGcontext *ctx) {
+    nvgBeginPath(ctx);
+    nvgRect(ctx, m_pos.x(), m_pos.y(), m_size.x(), m_size.y());
+    nvgFillColor(ctx, m_background_color);
+    nvgFill(ctx);
+
+    Widget::draw(ctx);
+
+    nvgFontFace(ctx, "sans");
+    nvgFontSize(ctx, 14.0f);
+    nvgTextAlign(ctx, NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
+    nvgFillColor(ctx, m_text_color);
+
+    const Screen *screen = this->screen();
+    std::vector<FrameStats> stats;
+    if (screen)
+        stats = screen->frame_stats();
+    if (stats.size() > m_frame_count)
+        stats.erase(stats.begin(), stats.end() - m_frame_count);
+
+    if (!screen || !screen->profiling() || stats.empty()) {
+        nvgText(ctx, m_pos.x() + 3, m_pos.y() + 1,
+                screen && screen->profiling() ? "No frame timings recorded"
+                                              : "Profiling is disabled", nullptr);
+        return;
+    }
+
+    std::vector<float> total(stats.size()), setup(stats.size()),
+        contents(stats.size()), widgets(stats.size()), flush(stats.size()),
+        teardown(stats.size());
+
+    for (size_t i = 0; i < stats.size(); ++i) {
+        total[i] = stats[i].total;
+        setup[i] = stats[i].setup;
+        contents[i] = stats[i].contents;
+        widgets[i] = stats[i].widgets;
+        flush[i] = stats[i].flush;
+        teardown[i] = stats[i].teardown;
+    }
+
+    std::vector<float> sorted = total;
+    float p50 = percentile(sorted, .5f), p90 = percentile(sorted, .9f),
+          p99 = percentile(sorted, .99f),
+          max_value = *std::max_element(total.begin(), total.end());
+
+    char buf[128];
+    snprintf(buf, sizeof(buf), "Frame time (%zu frames)", stats.size());
+    nvgText(ctx, m_pos.x() + 3, m_pos.y() + 1, buf, nullptr);
+    snprintf(buf, sizeof(buf), "p50 %.2f  p90 %.2f  p99 %.2f ms", p50, p90, p99);
+    nvgText(ctx, m_pos.x() + 3, m_pos.y() + 17, buf, nullptr);
+
+    nvgFontSize(ctx, 12.0f);
+    snprintf(buf, sizeof(buf), "setup %.2f  contents %.2f  widgets %.2f",
+             percentile(setup, .5f), percentile(contents, .5f),
+             percentile(widgets, .5f));
+    nvgText(ctx, m_pos.x() + 3, m_pos.y() + 34, buf, nullptr);
+    snprintf(buf, sizeof(buf), "flush %.2f  teardown %.2f  (median, ms)",
+             percentile(flush, .5f), percentile(teardown, .5f));
+    nvgText(ctx, m_pos.x() + 3, m_pos.y() + 48, buf, nullptr);
+
+    /* Plot the frame times of the most recent frames */
+    float plot_y = m_pos.y() + 64.f,
+          plot_height = m_size.y() - 66.f,
+          scale = max_value > 0.f ? plot_height / max_value : 0.f;
+
+    if (plot_height > 0 && total.size() > 1) {
+        nvgBeginPath(ctx);
+        for (size_t i = 0; i < total.size(); ++i) {
+            float x = m_pos.x() + 2 + i * (m_size.x() - 4) / (float) (m_frame_count - 1),
+                  y = plot_y + plot_height - total[i] * scale;
+            if (i == 0)
+                nvgMoveTo(ctx, x, y);
+            else
+                nvgLineTo(ctx, x, y);
+        }
+        nvgStrokeColor(ctx, Color(255, 192, 0, 255));
+        nvgStroke(ctx);
+    }
+
+    nvgBeginPath(ctx);
+    nvgRect(ctx, m_pos.x(), m_pos.y(), m_size.x(), m_size.y());
+    nvgStrokeColor(ctx, Color(100, 255));
+    nvgStroke(ctx);
+}
+
+NAMESPACE_END(nanogui)
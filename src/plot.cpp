@@ -0,0 +1,297 @@
+/*
+    src/plot.cpp -- Widget for plotting large data series on the GPU
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+
+#include <nanogui/plot.h>
+#include <nanogui/renderpass.h>
+#include <nanogui/screen.h>
+#include <nanogui/theme.h>
+#include <nanogui/opengl.h>
+#include <nanogui_resources.h>
+#include <cmath>
+
+NAMESPACE_BEGIN(nanogui)
+
+/// Return a spacing of 1, 2, or 5 times a power of ten that yields about 'count' ticks
+static float tick_spacing(float range, int count) {
+    float step = range / count,
+          base = std::pow(10.f, std::floor(std::log10(step))),
+          rel  = step / base;
+    return base * (rel < 1.5f ? 1.f : rel < 3.5f ? 2.f : rel < 7.5f ? 5.f : 10.f);
+}
+
+Plot::Plot(Widget *parent)
+    : Canvas(parent, 1, false, false, true), m_view_min(0.f), m_view_max(1.f) {
+    render_pass()->set_clear_color(0, Color(0.3f, 0.3f, 0.32f, 1.f));
+    m_axis_color = m_theme->m_text_color;
+    m_grid_color = Color(255, 30);
+}
+
+Plot::Series &Plot::series(size_t index) {
+    if (index >= m_series.size())
+        throw std::runtime_error("Plot::series(): index out of bounds!");
+    return m_series[index];
+}
+
+const Plot::Series &Plot::series(size_t index) const {
+    return const_cast<Plot *>(this)->series(index);
+}
+
+size_t Plot::add_series(const std::string &name, const Color &color,
+                        SeriesType type) {
+    Series s;
+    s.name = name;
+    s.color = color;
+    s.type = type;
+    s.shader = new Shader(
+        render_pass(),
+        /* An identifying name */
+        "plot_series",
+        NANOGUI_SHADER(plot_vertex),
+        NANOGUI_SHADER(plot_fragment),
+        Shader::BlendMode::AlphaBlend
+    );
+    m_series.push_back(std::move(s));
+    return m_series.size() - 1;
+}
+
+void Plot::clear() {
+    m_series.clear();
+}
+
+void Plot::append(size_t index, const float *xy, size_t count) {
+    Series &s = series(index);
+    if (count == 0)
+        return;
+
+    if (s.count == 0) {
+        s.bbox_min = Vector2f(xy[0], xy[1]);
+        s.bbox_max = s.bbox_min;
+    }
+    for (size_t i = 0; i < count; ++i) {
+        Vector2f p(xy[2 * i], xy[2 * i + 1]);
+        s.bbox_min = min(s.bbox_min, p);
+        s.bbox_max = max(s.bbox_max, p);
+    }
+
+    size_t shape[2] = { count, 2 };
+    if (s.shader->buffer_rows("position") == 0)
+        s.shader->set_buffer("position", VariableType::Float32, 2, shape, xy);
+    else
+        s.shader->update_buffer("position", VariableType::Float32, s.count, 2,
+                                shape, xy);
+    s.count += count;
+}
+
+void Plot::clear_series(size_t index) {
+    series(index).count = 0;
+}
+
+void Plot::set_view(const Vector2f &view_min, const Vector2f &view_max) {
+    if (!(view_min.x() < view_max.x() && view_min.y() < view_max.y()))
+        throw std::runtime_error("Plot::set_view(): the view region is empty!");
+    m_view_min = view_min;
+    m_view_max = view_max;
+}
+
+void Plot::fit() {
+    bool found = false;
+    Vector2f lo, hi;
+    for (const Series &s : m_series) {
+        if (!s.visible || s.count == 0)
+            continue;
+        lo = found ? min(lo, s.bbox_min) : s.bbox_min;
+        hi = found ? max(hi, s.bbox_max) : s.bbox_max;
+        found = true;
+    }
+    if (!found)
+        return;
+
+    /* Leave a small margin, and avoid an empty region for constant data */
+    Vector2f extent = hi - lo;
+    for (int i = 0; i < 2; ++i) {
+        if (!(extent[i] > 0.f))
+            extent[i] = std::max(std::abs(lo[i]), 1.f);
+    }
+    m_view_min = lo - extent * .05f;
+    m_view_max = hi + extent * .05f;
+}
+
+Vector2f Plot::data_to_pos(const Vector2f &p) const {
+    Vector2f origin(m_draw_border ? 1.f : 0.f),
+             size = Vector2f(m_size) - 2.f * origin,
+             t = (p - m_view_min) / (m_view_max - m_view_min);
+    return origin + Vector2f(t.x() * size.x(), (1.f - t.y()) * size.y());
+}
+
+Vector2f Plot::pos_to_data(const Vector2f &p) const {
+    Vector2f origin(m_draw_border ? 1.f : 0.f),
+             size = Vector2f(m_size) - 2.f * origin,
+             t = (p - origin) / size;
+    return m_view_min + Vector2f(t.x(), 1.f - t.y()) * (m_view_max - m_view_min);
+}
+
+bool Plot::keyboard_event(int key, int /* scancode */, int action, int /* modifiers */) {
+    if (!m_enabled)
+        return false;
+
+    if (action == GLFW_PRESS && key == GLFW_KEY_R) {
+        fit();
+        return true;
+    }
+    return false;
+}
+
+bool Plot::mouse_drag_event(const Vector2i & /* p */, const Vector2i &rel,
+                            int /* button */, int /* modifiers */) {
+    if (!m_enabled)
+        return false;
+
+    Vector2f delta = pos_to_data(Vector2f(0.f)) - pos_to_data(Vector2f(rel));
+    m_view_min += delta;
+    m_view_max += delta;
+    return true;
+}
+
+bool Plot::scroll_event(const Vector2i &p, const Vector2f &rel) {
+    if (!m_enabled)
+        return false;
+
+    /* Zoom while keeping the data point below the cursor in place */
+    Vector2f center = pos_to_data(Vector2f(p - m_pos));
+    float factor = std::pow(1.1f, -rel.y());
+    Vector2f view_min = center + (m_view_min - center) * factor,
+             view_max = center + (m_view_max - center) * factor;
+
+    // Stop before running out of floating point precision
+    for (int i = 0; i < 2; ++i) {
+        float scale = std::max(std::abs(view_min[i]), std::abs(view_max[i]));
+        if (!(view_max[i] - view_min[i] > scale * 1e-5f))
+            return true;
+    }
+
+    m_view_min = view_min;
+    m_view_max = view_max;
+    return true;
+}
+
+void Plot::draw_axes(NVGcontext *ctx) {
+    char buf[32];
+    nvgFontFace(ctx, "sans");
+    nvgFontSize(ctx, 13.f);
+    nvgStrokeWidth(ctx, 1.f);
+
+    for (int axis = 0; axis < 2; ++axis) {
+        float lo = m_view_min[axis], hi = m_view_max[axis];
+        int count = std::max(2, m_size[axis] / (axis == 0 ? 80 : 40));
+        float step = tick_spacing(hi - lo, count);
+        if (!(step > 0.f) || !std::isfinite(step))
+            continue;
+
+        nvgTextAlign(ctx, axis == 0 ? (NVG_ALIGN_CENTER | NVG_ALIGN_BOTTOM)
+                                    : (NVG_ALIGN_LEFT | NVG_ALIGN_MIDDLE));
+
+        int64_t first = (int64_t) std::ceil(lo / step),
+                last = std::min((int64_t) std::floor(hi / step), first + 100);
+        for (int64_t i = first; i <= last; ++i) {
+            float value = (float) (i * (double) step);
+            Vector2f p = Vector2f(m_pos) +
+                data_to_pos(axis == 0 ? Vector2f(value, m_view_min.y())
+                                      : Vector2f(m_view_min.x(), value));
+
+            nvgBeginPath(ctx);
+            if (axis == 0) {
+                nvgMoveTo(ctx, p.x(), m_pos.y());
+                nvgLineTo(ctx, p.x(), m_pos.y() + m_size.y());
+            } else {
+                nvgMoveTo(ctx, m_pos.x(), p.y());
+                nvgLineTo(ctx, m_pos.x() + m_size.x(), p.y());
+            }
+            nvgStrokeColor(ctx, i == 0 ? m_axis_color : m_grid_color);
+            nvgStroke(ctx);
+
+            snprintf(buf, sizeof(buf), "%g", i == 0 ? 0.0 : (double) value);
+            nvgFillColor(ctx, m_axis_color);
+            if (axis == 0)
+                nvgText(ctx, p.x(), m_pos.y() + m_size.y() - 3, buf, nullptr);
+            else
+                nvgText(ctx, m_pos.x() + 4, p.y(), buf, nullptr);
+        }
+    }
+
+    nvgFontSize(ctx, 15.f);
+    nvgFillColor(ctx, m_axis_color);
+    if (!m_x_label.empty()) {
+        nvgTextAlign(ctx, NVG_ALIGN_RIGHT | NVG_ALIGN_BOTTOM);
+        nvgText(ctx, m_pos.x() + m_size.x() - 4, m_pos.y() + m_size.y() - 18,
+                m_x_label.c_str(), nullptr);
+    }
+    if (!m_y_label.empty()) {
+        nvgTextAlign(ctx, NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
+        nvgText(ctx, m_pos.x() + 4, m_pos.y() + 4, m_y_label.c_str(), nullptr);
+    }
+}
+
+void Plot::draw(NVGcontext *ctx) {
+    Canvas::draw(ctx);
+
+    nvgSave(ctx);
+    nvgIntersectScissor(ctx, m_pos.x(), m_pos.y(), m_size.x(), m_size.y());
+
+    draw_axes(ctx);
+
+    /* Legend */
+    nvgFontSize(ctx, 15.f);
+    nvgTextAlign(ctx, NVG_ALIGN_RIGHT | NVG_ALIGN_MIDDLE);
+    float y = m_pos.y() + 12.f;
+    for (const Series &s : m_series) {
+        if (!s.visible || s.name.empty())
+            continue;
+        float x = m_pos.x() + m_size.x() - 8.f;
+        nvgFillColor(ctx, m_axis_color);
+        float bounds[4];
+        nvgTextBounds(ctx, x, y, s.name.c_str(), nullptr, bounds);
+        nvgText(ctx, x, y, s.name.c_str(), nullptr);
+
+        nvgBeginPath(ctx);
+        nvgMoveTo(ctx, bounds[0] - 24.f, y);
+        nvgLineTo(ctx, bounds[0] - 6.f, y);
+        nvgStrokeColor(ctx, s.color);
+        nvgStrokeWidth(ctx, 2.f);
+        nvgStroke(ctx);
+        y += 18.f;
+    }
+
+    nvgRestore(ctx);
+}
+
+void Plot::draw_contents() {
+    Matrix4f matrix = Matrix4f::ortho(m_view_min.x(), m_view_max.x(),
+                                      m_view_min.y(), m_view_max.y(), -1.f, 1.f);
+    float point_size = m_point_size * screen()->pixel_ratio();
+
+    for (Series &s : m_series) {
+        if (!s.visible || s.count == 0)
+            continue;
+
+        s.shader->set_uniform("matrix", matrix.T());
+        s.shader->set_uniform("color", s.color);
+        s.shader->set_uniform("point_size", point_size);
+
+        s.shader->begin();
+        s.shader->draw_array(s.type == SeriesType::Line
+                                 ? Shader::PrimitiveType::LineStrip
+                                 : Shader::PrimitiveType::Point,
+                             0, s.count, false);
+        s.shader->end();
+    }
+}
+
+NAMESPACE_END(nanogui)
@@ -13,6 +13,7 @@
 #include <nanogui/popup.h>
 #include <nanogui/theme.h>
 #include <nanogui/opengl.h>
+#include <nanogui/screen.h>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -26,7 +27,7 @@ void Popup::perform_layout(NVGcontext *ctx) {
     } else {
         m_children[0]->set_position(Vector2i(0));
         m_children[0]->set_size(m_size);
-        m_children[0]->perform_layout(ctx);
+        m_children[0]->update_layout(ctx);
     }
     if (m_side == Side::Left)
         m_anchor_pos[0] -= size()[0];
@@ -37,7 +38,7 @@ void Popup::refresh_relative_placement() {
         return;
     m_parent_window->refresh_relative_placement();
     m_visible &= m_parent_window->visible_recursive();
-    m_pos = m_parent_window->position() + m_anchor_pos - Vector2i(0, m_anchor_offset);
+    set_position(m_parent_window->position() + m_anchor_pos - Vector2i(0, m_anchor_offset));
 }
 
 void Popup::draw(NVGcontext* ctx) {
@@ -50,7 +51,11 @@ void Popup::draw(NVGcontext* ctx) {
         cr = m_theme->m_window_corner_radius;
 
     nvgSave(ctx);
-    nvgResetScissor(ctx);
+    /* Only a screen knows about the damage region of partial redraws */
+    if (Screen *screen = this->screen())
+        screen->nvg_reset_scissor();
+    else
+        nvgResetScissor(ctx);
 
     /* Draw a drop shadow */
     NVGpaint shadow_paint = nvgBoxGradient(
@@ -13,6 +13,7 @@
 #include <nanogui/theme.h>
 #include <nanogui/screen.h>
 #include <nanogui/opengl.h>
+#include <nanogui/textmetrics.h>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -46,12 +47,11 @@ void PopupButton::draw(NVGcontext* ctx) {
         NVGcolor text_color =
             m_text_color.w() == 0 ? m_theme->m_text_color : m_text_color;
 
-        nvgFontSize(ctx, (m_font_size < 0 ? m_theme->m_button_font_size : m_font_size) * icon_scale());
-        nvgFontFace(ctx, "icons");
         nvgFillColor(ctx, m_enabled ? text_color : NVGcolor(m_theme->m_disabled_text_color));
-        nvgTextAlign(ctx, NVG_ALIGN_LEFT | NVG_ALIGN_MIDDLE);
 
-        float iw = nvgTextBounds(ctx, 0, 0, icon.data(), nullptr, nullptr);
+        float iw = text_bounds(ctx, "icons",
+            (m_font_size < 0 ? m_theme->m_button_font_size : m_font_size) * icon_scale(),
+            icon.data(), nullptr, NVG_ALIGN_LEFT | NVG_ALIGN_MIDDLE);
         Vector2f icon_pos(0, m_pos.y() + m_size.y() * 0.5f - 1);
 
         if (m_popup->side() == Popup::Right)
@@ -6,6 +6,7 @@ DECLARE_WIDGET(Label);
 DECLARE_WIDGET(Popup);
 DECLARE_WIDGET(MessageDialog);
 DECLARE_WIDGET(VScrollPanel);
+DECLARE_WIDGET(VirtualList);
 DECLARE_WIDGET(ComboBox);
 DECLARE_WIDGET(ProgressBar);
 DECLARE_WIDGET(Slider);
@@ -64,6 +65,31 @@ void register_basics(nb::module_ &m) {
         .def("scroll", &VScrollPanel::scroll, D(VScrollPanel, scroll))
         .def("set_scroll", &VScrollPanel::set_scroll, D(VScrollPanel, set_scroll));
 
+    nb::class_<VirtualList, Widget, PyVirtualList>(m, "VirtualList", D(VirtualList))
+        .def(nb::init<Widget *>(), "parent"_a, D(VirtualList, VirtualList))
+        .def("item_count", &VirtualList::item_count, D(VirtualList, item_count))
+        .def("set_item_count", &VirtualList::set_item_count, D(VirtualList, set_item_count))
+        .def("columns", &VirtualList::columns, D(VirtualList, columns))
+        .def("set_columns", &VirtualList::set_columns, D(VirtualList, set_columns))
+        .def("row_count", &VirtualList::row_count, D(VirtualList, row_count))
+        .def("row_height", nb::overload_cast<>(&VirtualList::row_height, nb::const_),
+             D(VirtualList, row_height))
+        .def("row_height", nb::overload_cast<size_t>(&VirtualList::row_height, nb::const_),
+             "row"_a, D(VirtualList, row_height, 2))
+        .def("set_row_height", &VirtualList::set_row_height, D(VirtualList, set_row_height))
+        .def("row_offset", &VirtualList::row_offset, D(VirtualList, row_offset))
+        .def("row_at", &VirtualList::row_at, D(VirtualList, row_at))
+        .def("create_callback", &VirtualList::create_callback, D(VirtualList, create_callback))
+        .def("set_create_callback", &VirtualList::set_create_callback, D(VirtualList, set_create_callback))
+        .def("bind_callback", &VirtualList::bind_callback, D(VirtualList, bind_callback))
+        .def("set_bind_callback", &VirtualList::set_bind_callback, D(VirtualList, set_bind_callback))
+        .def("height_callback", &VirtualList::height_callback, D(VirtualList, height_callback))
+        .def("set_height_callback", &VirtualList::set_height_callback, D(VirtualList, set_height_callback))
+        .def("update_row_height", &VirtualList::update_row_height, D(VirtualList, update_row_height))
+        .def("refresh", &VirtualList::refresh, D(VirtualList, refresh))
+        .def("scroll_to", &VirtualList::scroll_to, D(VirtualList, scroll_to))
+        .def("visible_range", &VirtualList::visible_range, D(VirtualList, visible_range));
+
     nb::class_<ComboBox, Widget, PyComboBox>(m, "ComboBox", D(ComboBox))
         .def(nb::init<Widget *>(), "parent"_a, D(ComboBox, ComboBox))
         .def(nb::init<Widget *, const std::vector<std::string> &>(),
@@ -0,0 +1,44 @@
+# Hit testing benchmark: measure the cost of Widget.find_widget() for
+# containers with an increasing number of children, with and without
+# a spatial index (see Widget.set_spatial_index())
+
+import sys
+sys.path.append('python')
+import nanogui as ng
+import random
+import time
+
+ng.init()
+
+s = ng.Screen([1024, 1024], "Unnamed")
+random.seed(0)
+queries = [(random.randrange(1024), random.randrange(1024))
+           for i in range(10000)]
+
+print('%10s %16s %16s' % ('children', 'linear (us)', 'indexed (us)'))
+
+for count in [10, 100, 1000, 10000, 50000]:
+    container = ng.Widget(s)
+    container.set_size((1024, 1024))
+
+    # Grid of small widgets, as e.g. in a large image gallery
+    cols = int(count ** .5) + 1
+    size = max(1024 // cols, 1)
+    for i in range(count):
+        w = ng.Widget(container)
+        w.set_position(((i % cols) * size, (i // cols) * size))
+        w.set_size((size, size))
+
+    timings = []
+    for indexed in [False, True]:
+        container.set_spatial_index(indexed)
+        s.find_widget(queries[0])  # Build the index
+        start = time.perf_counter()
+        for q in queries:
+            s.find_widget(q)
+        timings.append((time.perf_counter() - start) / len(queries) * 1e6)
+
+    print('%10i %16.3f %16.3f' % (count, timings[0], timings[1]))
+    s.remove_child(container)
+
+ng.shutdown()
@@ -2,6 +2,7 @@
 
 #include "python.h"
 #include <nanobind/stl/array.h>
+#include <nanobind/ndarray.h>
 
 class PyCanvas : public Canvas {
 public:
@@ -21,6 +22,47 @@ public:
     }
 };
 
+class PyPlot : public Plot {
+public:
+    NANOGUI_WIDGET_OVERLOADS(Plot);
+
+    void draw_contents() override {
+        NB_OVERRIDE(draw_contents);
+    }
+};
+
+using ImageArray = nb::ndarray<const uint8_t, nb::device::cpu>;
+
+/// Create a tiled image that reads from a (possibly memory-mapped) array
+static void tiled_image_init(TiledImage *t, ImageArray array, int tile_size,
+                             size_t capacity, int threads) {
+    if (array.ndim() != 2 && array.ndim() != 3)
+        throw std::runtime_error("TiledImage::TiledImage(): expected an array with 2 or 3 dimensions!");
+
+    int channels = array.ndim() == 3 ? (int) array.shape(2) : 1;
+    if (array.ndim() == 3 && array.stride(2) != 1)
+        throw std::runtime_error("TiledImage::TiledImage(): the channels of a pixel must be contiguous!");
+    Vector2i size((int) array.shape(1), (int) array.shape(0));
+    /* Strides are given in elements, which coincide with bytes for uint8 */
+    TiledImage::TileCallback callback = TiledImage::array_callback(
+        array.data(), size, channels, array.stride(1), array.stride(0));
+
+    /* Keep the array alive while tiles are being produced, and release it
+       while holding the GIL (the tiled image may be destroyed anywhere) */
+    std::shared_ptr<ImageArray> keep_alive(new ImageArray(array), [](ImageArray *a) {
+        nb::gil_scoped_acquire guard;
+        delete a;
+    });
+
+    new (t) TiledImage(
+        size,
+        [callback, keep_alive](const Vector2i &offset, const Vector2i &extent,
+                               uint8_t *data) {
+            callback(offset, extent, data);
+        },
+        tile_size, capacity, threads);
+}
+
 void register_canvas(nb::module_ &m) {
     nb::class_<Canvas, Widget, PyCanvas>(m, "Canvas", D(Canvas))
         .def(nb::init<Widget *, uint8_t, bool, bool, bool>(),
@@ -40,6 +82,9 @@ void register_canvas(nb::module_ &m) {
         .def(nb::init<Widget *>(), D(ImageView, ImageView))
         .def("image", nb::overload_cast<>(&ImageView::image, nb::const_), D(ImageView, image))
         .def("set_image", &ImageView::set_image, D(ImageView, set_image))
+        .def("tiled_image", nb::overload_cast<>(&ImageView::tiled_image, nb::const_), D(ImageView, tiled_image))
+        .def("set_tiled_image", &ImageView::set_tiled_image, D(ImageView, set_tiled_image))
+        .def("image_size", &ImageView::image_size, D(ImageView, image_size))
         .def("reset", &ImageView::reset, D(ImageView, reset))
         .def("center", &ImageView::center, D(ImageView, center))
         .def("offset", &ImageView::offset, D(ImageView, offset))
@@ -58,6 +103,58 @@ void register_canvas(nb::module_ &m) {
                 });
              },
              D(ImageView, set_pixel_callback));
+
+    nb::class_<TiledImage, Object>(m, "TiledImage", D(TiledImage))
+        .def("__init__", &tiled_image_init, "array"_a.noconvert(), "tile_size"_a = 256,
+             "capacity"_a = 256, "threads"_a = 0, D(TiledImage, TiledImage))
+        .def("size", &TiledImage::size, D(TiledImage, size))
+        .def("tile_size", &TiledImage::tile_size, D(TiledImage, tile_size))
+        .def("level_count", &TiledImage::level_count, D(TiledImage, level_count))
+        .def("level_size", &TiledImage::level_size, D(TiledImage, level_size))
+        .def("tile_count", &TiledImage::tile_count, D(TiledImage, tile_count))
+        .def("capacity", &TiledImage::capacity, D(TiledImage, capacity))
+        .def("set_capacity", &TiledImage::set_capacity, D(TiledImage, set_capacity))
+        .def("cached_tiles", &TiledImage::cached_tiles, D(TiledImage, cached_tiles))
+        .def("clear", &TiledImage::clear, D(TiledImage, clear));
+
+    nb::class_<Plot, Canvas, PyPlot> plot(m, "Plot", D(Plot));
+    plot
+        .def(nb::init<Widget *>(), "parent"_a, D(Plot, Plot))
+        .def("add_series", &Plot::add_series, "name"_a, "color"_a,
+             "type"_a = Plot::SeriesType::Line, D(Plot, add_series))
+        .def("series_count", &Plot::series_count, D(Plot, series_count))
+        .def("clear", &Plot::clear, D(Plot, clear))
+        .def("series_name", &Plot::series_name, D(Plot, series_name))
+        .def("series_color", &Plot::series_color, D(Plot, series_color))
+        .def("set_series_color", &Plot::set_series_color, D(Plot, set_series_color))
+        .def("series_type", &Plot::series_type, D(Plot, series_type))
+        .def("set_series_type", &Plot::set_series_type, D(Plot, set_series_type))
+        .def("series_visible", &Plot::series_visible, D(Plot, series_visible))
+        .def("set_series_visible", &Plot::set_series_visible, D(Plot, set_series_visible))
+        .def("point_count", &Plot::point_count, D(Plot, point_count))
+        .def("append",
+             [](Plot &plot, size_t index,
+                nb::ndarray<const float, nb::shape<-1, 2>, nb::device::cpu,
+                            nb::c_contig> xy) {
+                 plot.append(index, xy.data(), xy.shape(0));
+             }, "index"_a, "xy"_a, D(Plot, append))
+        .def("clear_series", &Plot::clear_series, D(Plot, clear_series))
+        .def("point_size", &Plot::point_size, D(Plot, point_size))
+        .def("set_point_size", &Plot::set_point_size, D(Plot, set_point_size))
+        .def("view_min", &Plot::view_min, D(Plot, view_min))
+        .def("view_max", &Plot::view_max, D(Plot, view_max))
+        .def("set_view", &Plot::set_view, D(Plot, set_view))
+        .def("fit", &Plot::fit, D(Plot, fit))
+        .def("x_label", &Plot::x_label, D(Plot, x_label))
+        .def("set_x_label", &Plot::set_x_label, D(Plot, set_x_label))
+        .def("y_label", &Plot::y_label, D(Plot, y_label))
+        .def("set_y_label", &Plot::set_y_label, D(Plot, set_y_label))
+        .def("pos_to_data", &Plot::pos_to_data, D(Plot, pos_to_data))
+        .def("data_to_pos", &Plot::data_to_pos, D(Plot, data_to_pos));
+
+    nb::enum_<Plot::SeriesType>(plot, "SeriesType", D(Plot, SeriesType))
+        .value("Line", Plot::SeriesType::Line, D(Plot, SeriesType, Line))
+        .value("Scatter", Plot::SeriesType::Scatter, D(Plot, SeriesType, Scatter));
 }
 
 #endif
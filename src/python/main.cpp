@@ -80,7 +80,7 @@ NB_MODULE(nanogui_ext, m_) {
     m.attr("api") = "metal";
 #endif
 
-    m.def("init", &nanogui::init, D(init));
+    m.def("init", &nanogui::init, "headless"_a = false, D(init));
     m.def("shutdown", &nanogui::shutdown, D(shutdown));
 
     m.def("mainloop", [](float refresh) {
@@ -117,6 +117,48 @@ NB_MODULE(nanogui_ext, m_) {
     #endif
     m.def("utf8", [](int c) { return std::string(utf8(c).data()); }, D(utf8));
     m.def("load_image_directory", &nanogui::load_image_directory, D(load_image_directory));
+    m.def("list_image_directory", &nanogui::list_image_directory, D(list_image_directory));
+
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+    nb::class_<GLStateStats>(m, "GLStateStats", D(GLStateStats))
+        .def_ro("issued", &GLStateStats::issued, D(GLStateStats, issued))
+        .def_ro("skipped", &GLStateStats::skipped, D(GLStateStats, skipped))
+        .def("__repr__", [](const GLStateStats &s) {
+            return "GLStateStats[issued=" + std::to_string(s.issued) +
+                   ", skipped=" + std::to_string(s.skipped) + "]";
+        });
+
+    m.def("gl_state_stats", &nanogui::gl_state_stats, D(gl_state_stats));
+    m.def("reset_gl_state_stats", &nanogui::reset_gl_state_stats, D(reset_gl_state_stats));
+    m.def("invalidate_gl_state", &nanogui::invalidate_gl_state, D(invalidate_gl_state));
+#endif
+
+    nb::class_<TextMetricsStats>(m, "TextMetricsStats", D(TextMetricsStats))
+        .def_ro("hits", &TextMetricsStats::hits, D(TextMetricsStats, hits))
+        .def_ro("misses", &TextMetricsStats::misses, D(TextMetricsStats, misses))
+        .def_ro("evictions", &TextMetricsStats::evictions, D(TextMetricsStats, evictions))
+        .def("__repr__", [](const TextMetricsStats &s) {
+            return "TextMetricsStats[hits=" + std::to_string(s.hits) +
+                   ", misses=" + std::to_string(s.misses) +
+                   ", evictions=" + std::to_string(s.evictions) + "]";
+        });
+
+    m.def("text_bounds",
+          [](NVGcontext *ctx, const char *font, float size,
+             const std::string &text, int align, float spacing) {
+              float bounds[4];
+              float advance = text_bounds(ctx, font, size, text, bounds,
+                                          align, spacing);
+              return std::make_pair(advance,
+                                    std::vector<float>(bounds, bounds + 4));
+          }, "ctx"_a, "font"_a, "size"_a, "text"_a, "align"_a = 0,
+          "spacing"_a = 0.f, D(text_bounds));
+    m.def("invalidate_text_metrics", &nanogui::invalidate_text_metrics,
+          "ctx"_a = nullptr, D(invalidate_text_metrics));
+    m.def("text_metrics_capacity", &nanogui::text_metrics_capacity, D(text_metrics_capacity));
+    m.def("set_text_metrics_capacity", &nanogui::set_text_metrics_capacity, D(set_text_metrics_capacity));
+    m.def("text_metrics_stats", &nanogui::text_metrics_stats, D(text_metrics_stats));
+    m.def("reset_text_metrics_stats", &nanogui::reset_text_metrics_stats, D(reset_text_metrics_stats));
 
     nb::enum_<Cursor>(m, "Cursor", D(Cursor))
         .value("Arrow", Cursor::Arrow)
@@ -2,12 +2,25 @@
 
 #include "python.h"
 #include <nanobind/stl/pair.h>
+#include <nanobind/ndarray.h>
 
 DECLARE_WIDGET(ColorWheel);
 DECLARE_WIDGET(ColorPicker);
 DECLARE_WIDGET(Graph);
+DECLARE_WIDGET(PerfOverlay);
 DECLARE_WIDGET(ImagePanel);
 
+/// Copy of the values displayed by a graph in chronological order
+static nb::ndarray<nb::numpy, float, nb::ndim<1>> graph_data(const Graph &graph) {
+    size_t size = graph.size();
+    float *data = new float[size];
+    for (size_t i = 0; i < size; ++i)
+        data[i] = graph.value(i);
+    nb::capsule owner(data, [](void *p) noexcept { delete[] (float *) p; });
+    size_t shape[1] = { size };
+    return nb::ndarray<nb::numpy, float, nb::ndim<1>>(data, 1, shape, owner);
+}
+
 void register_misc(nb::module_ &m) {
     nb::class_<ColorWheel, Widget, PyColorWheel>(m, "ColorWheel", D(ColorWheel))
         .def(nb::init<Widget *>(), "parent"_a, D(ColorWheel, ColorWheel))
@@ -45,14 +58,49 @@ void register_misc(nb::module_ &m) {
         .def("text_color", &Graph::text_color, D(Graph, text_color))
         .def("set_text_color", &Graph::set_text_color, D(Graph, set_text_color))
         .def("values", (std::vector<float> &(Graph::*)(void)) &Graph::values, D(Graph, values))
-        .def("set_values", &Graph::set_values, D(Graph, set_values));
+        .def("set_values", &Graph::set_values, D(Graph, set_values))
+        .def("capacity", &Graph::capacity, D(Graph, capacity))
+        .def("set_capacity", &Graph::set_capacity, D(Graph, set_capacity))
+        .def("size", &Graph::size, D(Graph, size))
+        .def("data", &graph_data, D(Graph, data))
+        .def("value", &Graph::value, "index"_a, D(Graph, value))
+        .def("push",
+             [](Graph &graph, nb::ndarray<const float, nb::ndim<1>, nb::device::cpu,
+                                          nb::c_contig> values) {
+                 graph.push(values.data(), values.shape(0));
+             }, "values"_a, D(Graph, push))
+        .def("push", nb::overload_cast<float>(&Graph::push), "value"_a, D(Graph, push, 2));
+
+    nb::class_<PerfOverlay, Widget, PyPerfOverlay>(m, "PerfOverlay", D(PerfOverlay))
+        .def(nb::init<Widget *>(), "parent"_a, D(PerfOverlay, PerfOverlay))
+        .def("frame_count", &PerfOverlay::frame_count, D(PerfOverlay, frame_count))
+        .def("set_frame_count", &PerfOverlay::set_frame_count, D(PerfOverlay, set_frame_count))
+        .def("background_color", &PerfOverlay::background_color, D(PerfOverlay, background_color))
+        .def("set_background_color", &PerfOverlay::set_background_color, D(PerfOverlay, set_background_color))
+        .def("text_color", &PerfOverlay::text_color, D(PerfOverlay, text_color))
+        .def("set_text_color", &PerfOverlay::set_text_color, D(PerfOverlay, set_text_color));
 
     nb::class_<ImagePanel, Widget, PyImagePanel>(m, "ImagePanel", D(ImagePanel))
         .def(nb::init<Widget *>(), "parent"_a, D(ImagePanel, ImagePanel))
         .def("images", &ImagePanel::images, D(ImagePanel, images))
         .def("set_images", &ImagePanel::set_images, D(ImagePanel, set_images))
+        .def("thumbnail_cache", nb::overload_cast<>(&ImagePanel::thumbnail_cache), D(ImagePanel, thumbnail_cache))
+        .def("set_thumbnail_cache", &ImagePanel::set_thumbnail_cache, D(ImagePanel, set_thumbnail_cache))
         .def("callback", &ImagePanel::callback, D(ImagePanel, callback))
         .def("set_callback", &ImagePanel::set_callback, D(ImagePanel, set_callback));
+
+    nb::class_<ThumbnailCache, Object>(m, "ThumbnailCache", D(ThumbnailCache))
+        .def(nb::init<int, size_t, int>(), "thumbnail_size"_a = 128,
+             "capacity"_a = 1024, "threads"_a = 0, D(ThumbnailCache, ThumbnailCache))
+        .def("thumbnail_size", &ThumbnailCache::thumbnail_size, D(ThumbnailCache, thumbnail_size))
+        .def("capacity", &ThumbnailCache::capacity, D(ThumbnailCache, capacity))
+        .def("set_capacity", &ThumbnailCache::set_capacity, D(ThumbnailCache, set_capacity))
+        .def("size", &ThumbnailCache::size, D(ThumbnailCache, size))
+        .def("image", &ThumbnailCache::image, D(ThumbnailCache, image))
+        .def("upload", &ThumbnailCache::upload, "ctx"_a, "frame"_a, "max_count"_a = 16,
+             D(ThumbnailCache, upload))
+        .def("clear", &ThumbnailCache::clear, D(ThumbnailCache, clear))
+        .def("clear_failed", &ThumbnailCache::clear_failed, D(ThumbnailCache, clear_failed));
 }
 
 #endif
@@ -1008,10 +1008,49 @@ static const char *__doc_nanogui_FormHelper_widget_font_size = R"doc(The size of
 
 static const char *__doc_nanogui_FormHelper_window = R"doc(Access the currently active Window instance)doc";
 
+static const char *__doc_nanogui_FrameStats =
+R"doc(CPU timings of the phases of a single frame rendered by
+Screen::draw_all()
+
+All durations are specified in milliseconds. Since the GPU executes
+commands asynchronously, time spent waiting for the GPU (e.g. due to
+vertical synchronization) is mostly attributed to ``teardown``, which
+presents the frame.
+
+See also:
+    Screen::set_profiling())doc";
+
+static const char *__doc_nanogui_FrameStats_contents = R"doc(Time spent in Screen::draw_contents())doc";
+
+static const char *__doc_nanogui_FrameStats_culled =
+R"doc(Number of widgets that were not drawn because they were clipped)doc";
+
+static const char *__doc_nanogui_FrameStats_flush =
+R"doc(Time spent submitting the NanoVG geometry (``nvgEndFrame()``))doc";
+
+static const char *__doc_nanogui_FrameStats_setup = R"doc(Time spent in Screen::draw_setup())doc";
+
+static const char *__doc_nanogui_FrameStats_teardown = R"doc(Time spent in Screen::draw_teardown())doc";
+
+static const char *__doc_nanogui_FrameStats_timestamp =
+R"doc(Time at which the frame started (in the units of ``glfwGetTime()``))doc";
+
+static const char *__doc_nanogui_FrameStats_total = R"doc(Total duration of the frame)doc";
+
+static const char *__doc_nanogui_FrameStats_widgets = R"doc(Time spent drawing widgets and tooltips via NanoVG)doc";
+
 static const char *__doc_nanogui_GLFramebuffer = R"doc()doc";
 
 static const char *__doc_nanogui_GLShader = R"doc()doc";
 
+static const char *__doc_nanogui_GLStateStats =
+R"doc(Number of OpenGL state changes and queries issued to the driver or
+skipped by the state cache)doc";
+
+static const char *__doc_nanogui_GLStateStats_issued = R"doc()doc";
+
+static const char *__doc_nanogui_GLStateStats_skipped = R"doc()doc";
+
 static const char *__doc_nanogui_Graph =
 R"doc(\class Graph graph.h nanogui/graph.h
 
@@ -1021,8 +1060,14 @@ static const char *__doc_nanogui_Graph_Graph = R"doc()doc";
 
 static const char *__doc_nanogui_Graph_background_color = R"doc()doc";
 
+static const char *__doc_nanogui_Graph_capacity =
+R"doc(Return the number of values that are retained in streaming mode (0: streaming mode is disabled))doc";
+
 static const char *__doc_nanogui_Graph_caption = R"doc()doc";
 
+static const char *__doc_nanogui_Graph_data =
+R"doc(Return a copy of the size() values that are displayed, in chronological order.)doc";
+
 static const char *__doc_nanogui_Graph_draw = R"doc()doc";
 
 static const char *__doc_nanogui_Graph_fill_color = R"doc()doc";
@@ -1049,8 +1094,17 @@ static const char *__doc_nanogui_Graph_m_values = R"doc()doc";
 
 static const char *__doc_nanogui_Graph_preferred_size = R"doc()doc";
 
+static const char *__doc_nanogui_Graph_push =
+R"doc(Append ``count`` values (dropping the oldest ones in streaming mode))doc";
+
+static const char *__doc_nanogui_Graph_push_2 =
+R"doc(Append a single value (dropping the oldest one in streaming mode))doc";
+
 static const char *__doc_nanogui_Graph_set_background_color = R"doc()doc";
 
+static const char *__doc_nanogui_Graph_set_capacity =
+R"doc(Enable streaming mode and retain the most recent ``capacity`` values, or disable it when ``capacity`` is zero. The most recent values that fit are preserved in either case.)doc";
+
 static const char *__doc_nanogui_Graph_set_caption = R"doc()doc";
 
 static const char *__doc_nanogui_Graph_set_fill_color = R"doc()doc";
@@ -1065,10 +1119,18 @@ static const char *__doc_nanogui_Graph_set_text_color = R"doc()doc";
 
 static const char *__doc_nanogui_Graph_set_values = R"doc()doc";
 
+static const char *__doc_nanogui_Graph_size = R"doc(Return the number of values that are displayed)doc";
+
 static const char *__doc_nanogui_Graph_stroke_color = R"doc()doc";
 
 static const char *__doc_nanogui_Graph_text_color = R"doc()doc";
 
+static const char *__doc_nanogui_Graph_value =
+R"doc(Return the value with the given index (in chronological order) among the size() values that are displayed)doc";
+
+static const char *__doc_nanogui_Graph_value_range =
+R"doc(Return the minimum and maximum of the values ``value(first..last-1)``)doc";
+
 static const char *__doc_nanogui_Graph_values = R"doc()doc";
 
 static const char *__doc_nanogui_Graph_values_2 = R"doc()doc";
@@ -1266,6 +1328,87 @@ static const char *__doc_nanogui_ImagePanel_set_callback = R"doc()doc";
 
 static const char *__doc_nanogui_ImagePanel_set_images = R"doc()doc";
 
+static const char *__doc_nanogui_ImagePanel_set_thumbnail_cache =
+R"doc(Set the cache that provides thumbnails for entries without an image handle)doc";
+
+static const char *__doc_nanogui_ImagePanel_thumbnail_cache =
+R"doc(Return the cache that provides thumbnails for entries without an image handle)doc";
+
+static const char *__doc_nanogui_ImagePanel_thumbnail_cache_2 =
+R"doc(Return the cache that provides thumbnails for entries without an image handle)doc";
+
+static const char *__doc_nanogui_ImageStats =
+R"doc(Computes the luminance range, mean, and histogram of a texture on
+the GPU
+
+compute() reduces the texture by a sequence of render passes that each
+shrink the image by a factor of 4 along both axes, keeping track of the
+minimum, maximum, sum, and number of finite luminance values (or of
+the first channel for textures with fewer than three channels). The
+histogram of the luminance of the individual pixels is computed in two
+more passes. Only the final statistics and the histogram (a few hundred
+bytes) are transferred back to the CPU, asynchronously where
+supported.
+
+The intermediate textures use the ``Float32`` format, hence rendering
+to such textures must be supported (this excludes GLES 2). Since
+render passes cannot be nested, compute() must be called outside of
+any other render pass.)doc";
+
+static const char *__doc_nanogui_ImageStats_ImageStats =
+R"doc(Create the reduction state
+
+Parameter ``bins``:
+    Number of histogram bins (a positive multiple of 4)
+
+Parameter ``log_histogram``:
+    Space the bins uniformly in terms of the base-2 logarithm of the
+    luminance (as appropriate for HDR images) instead of linearly)doc";
+
+static const char *__doc_nanogui_ImageStats_bins = R"doc(Return the number of histogram bins)doc";
+
+static const char *__doc_nanogui_ImageStats_compute =
+R"doc(Issue the GPU passes computing the statistics of ``texture``
+
+The results become available via fetch(). Raises an exception if the
+results of a previous call have not been fetched yet, or if the texture
+cannot be sampled as floating point values (32-bit integer component
+formats and depth textures). 8 and 16-bit integer formats are
+interpreted as normalized values in [0, 1] (or [-1, 1]).)doc";
+
+static const char *__doc_nanogui_ImageStats_fetch =
+R"doc(Fetch the results of the last compute()
+
+When ``wait`` is ``False`` and the results are not ready() yet, the
+function returns immediately. Returns ``True`` if new results were
+fetched.)doc";
+
+static const char *__doc_nanogui_ImageStats_histogram = R"doc(Return the number of pixels (with a finite luminance) per histogram bin)doc";
+
+static const char *__doc_nanogui_ImageStats_histogram_range =
+R"doc(Return the interval covered by the histogram bins
+
+This is the range of the luminance, or of its base-2 logarithm if
+log_histogram() is ``True``.)doc";
+
+static const char *__doc_nanogui_ImageStats_log_histogram =
+R"doc(Return whether the bins are spaced uniformly in log2(luminance))doc";
+
+static const char *__doc_nanogui_ImageStats_maximum = R"doc(Return the largest finite luminance value)doc";
+
+static const char *__doc_nanogui_ImageStats_mean = R"doc(Return the mean of the finite luminance values)doc";
+
+static const char *__doc_nanogui_ImageStats_minimum = R"doc(Return the smallest finite luminance value)doc";
+
+static const char *__doc_nanogui_ImageStats_pending =
+R"doc(Was compute() called without fetching the results afterwards?)doc";
+
+static const char *__doc_nanogui_ImageStats_percentile =
+R"doc(Estimate a luminance percentile (``q`` in [0, 1]) from the histogram)doc";
+
+static const char *__doc_nanogui_ImageStats_ready =
+R"doc(Can the results of the last compute() be fetched without stalling?)doc";
+
 static const char *__doc_nanogui_ImageView = R"doc()doc";
 
 static const char *__doc_nanogui_ImageView_2 =
@@ -1282,10 +1425,22 @@ static const char *__doc_nanogui_ImageView_draw = R"doc()doc";
 
 static const char *__doc_nanogui_ImageView_draw_contents = R"doc()doc";
 
+static const char *__doc_nanogui_ImageView_draw_texture =
+R"doc(Draw a texture covering the given region of the image (in image
+pixels)
+
+Only the fraction ``uv_extent`` of the texture (starting at its top
+left corner) is mapped onto the region.)doc";
+
+static const char *__doc_nanogui_ImageView_draw_tiles = R"doc(Draw the visible tiles of the active tiled image)doc";
+
 static const char *__doc_nanogui_ImageView_image = R"doc(Return the currently active image)doc";
 
 static const char *__doc_nanogui_ImageView_image_2 = R"doc(Return the currently active image (const version))doc";
 
+static const char *__doc_nanogui_ImageView_image_size =
+R"doc(Return the size of the active (regular or tiled) image in pixels)doc";
+
 static const char *__doc_nanogui_ImageView_keyboard_event = R"doc()doc";
 
 static const char *__doc_nanogui_ImageView_m_draw_image_border = R"doc()doc";
@@ -1332,6 +1487,12 @@ components)doc";
 
 static const char *__doc_nanogui_ImageView_set_scale = R"doc(Set the current magnification of the image)doc";
 
+static const char *__doc_nanogui_ImageView_set_tiled_image = R"doc(Display a tiled image instead of a single texture)doc";
+
+static const char *__doc_nanogui_ImageView_tiled_image = R"doc(Return the currently active tiled image)doc";
+
+static const char *__doc_nanogui_ImageView_tiled_image_2 = R"doc(Return the currently active tiled image (const version))doc";
+
 static const char *__doc_nanogui_IntBox =
 R"doc(\class IntBox textbox.h nanogui/textbox.h
 
@@ -1518,6 +1679,135 @@ static const char *__doc_nanogui_Orientation_Horizontal = R"doc(< Layout expands
 
 static const char *__doc_nanogui_Orientation_Vertical = R"doc(< Layout expands on vertical axis.)doc";
 
+static const char *__doc_nanogui_PerfOverlay =
+R"doc(Widget that displays frame time percentiles and a plot of recent
+frame times.
+
+The statistics are computed from the timings recorded by the
+enclosing Screen, which must have profiling enabled (see
+Screen::set_profiling()). The overlay shows the frames that were
+rendered before the current one and does not request any redraws by
+itself.)doc";
+
+static const char *__doc_nanogui_PerfOverlay_PerfOverlay = R"doc()doc";
+
+static const char *__doc_nanogui_PerfOverlay_background_color = R"doc()doc";
+
+static const char *__doc_nanogui_PerfOverlay_draw = R"doc()doc";
+
+static const char *__doc_nanogui_PerfOverlay_frame_count =
+R"doc(Return the number of recent frames used to compute the statistics)doc";
+
+static const char *__doc_nanogui_PerfOverlay_m_background_color = R"doc()doc";
+
+static const char *__doc_nanogui_PerfOverlay_m_frame_count = R"doc()doc";
+
+static const char *__doc_nanogui_PerfOverlay_m_text_color = R"doc()doc";
+
+static const char *__doc_nanogui_PerfOverlay_preferred_size = R"doc()doc";
+
+static const char *__doc_nanogui_PerfOverlay_set_background_color = R"doc()doc";
+
+static const char *__doc_nanogui_PerfOverlay_set_frame_count =
+R"doc(Set the number of recent frames used to compute the statistics)doc";
+
+static const char *__doc_nanogui_PerfOverlay_set_text_color = R"doc()doc";
+
+static const char *__doc_nanogui_PerfOverlay_text_color = R"doc()doc";
+
+static const char *__doc_nanogui_Plot =
+R"doc(A widget for plotting, panning, and zooming large data series.
+
+Each series stores its points in a GPU vertex buffer that only grows by
+appending (append()), and is rendered as a line strip or as points by a
+Shader. Panning (mouse drag) and zooming (scroll wheel) only change the
+transformation passed to the shader as a uniform, hence the data is
+never uploaded again. Axes, tick labels, and the legend are drawn using
+NanoVG on top of the series. Pressing 'R' fits the view to the data.)doc";
+
+static const char *__doc_nanogui_Plot_Plot = R"doc(Initialize the widget)doc";
+
+static const char *__doc_nanogui_Plot_SeriesType = R"doc(How the points of a series are rendered)doc";
+
+static const char *__doc_nanogui_Plot_SeriesType_Line = R"doc(Connect consecutive points by lines)doc";
+
+static const char *__doc_nanogui_Plot_SeriesType_Scatter = R"doc(Draw each point separately (see set_point_size()))doc";
+
+static const char *__doc_nanogui_Plot_add_series = R"doc(Add a new (empty) series and return its index)doc";
+
+static const char *__doc_nanogui_Plot_append =
+R"doc(Append ``count`` points to a series
+
+``xy`` contains the interleaved coordinates of the points (i.e. ``2 * count``
+values), which are copied into the vertex buffer of the series without
+re-uploading the existing points.)doc";
+
+static const char *__doc_nanogui_Plot_clear = R"doc(Remove all series)doc";
+
+static const char *__doc_nanogui_Plot_clear_series =
+R"doc(Remove the points of a series (its GPU storage is retained for reuse))doc";
+
+static const char *__doc_nanogui_Plot_data_to_pos = R"doc(Convert data coordinates to a position within the widget)doc";
+
+static const char *__doc_nanogui_Plot_draw = R"doc()doc";
+
+static const char *__doc_nanogui_Plot_draw_axes = R"doc(Draw the grid, ticks, and labels of both axes)doc";
+
+static const char *__doc_nanogui_Plot_draw_contents = R"doc()doc";
+
+static const char *__doc_nanogui_Plot_fit =
+R"doc(Set the displayed region to the bounding box of all visible series)doc";
+
+static const char *__doc_nanogui_Plot_keyboard_event = R"doc()doc";
+
+static const char *__doc_nanogui_Plot_mouse_drag_event = R"doc()doc";
+
+static const char *__doc_nanogui_Plot_point_count = R"doc(Return the number of points of a series)doc";
+
+static const char *__doc_nanogui_Plot_point_size = R"doc(Return the size of scatter plot points in pixels)doc";
+
+static const char *__doc_nanogui_Plot_pos_to_data = R"doc(Convert a position within the widget to data coordinates)doc";
+
+static const char *__doc_nanogui_Plot_scroll_event = R"doc()doc";
+
+static const char *__doc_nanogui_Plot_series = R"doc(Look up a series and check the index)doc";
+
+static const char *__doc_nanogui_Plot_series_2 = R"doc(Look up a series and check the index)doc";
+
+static const char *__doc_nanogui_Plot_series_color = R"doc(Return the color of a series)doc";
+
+static const char *__doc_nanogui_Plot_series_count = R"doc(Return the number of series)doc";
+
+static const char *__doc_nanogui_Plot_series_name = R"doc(Return the name of a series)doc";
+
+static const char *__doc_nanogui_Plot_series_type = R"doc(Return how the points of a series are rendered)doc";
+
+static const char *__doc_nanogui_Plot_series_visible = R"doc(Return whether a series is drawn)doc";
+
+static const char *__doc_nanogui_Plot_set_point_size = R"doc(Set the size of scatter plot points in pixels)doc";
+
+static const char *__doc_nanogui_Plot_set_series_color = R"doc(Set the color of a series)doc";
+
+static const char *__doc_nanogui_Plot_set_series_type = R"doc(Set how the points of a series are rendered)doc";
+
+static const char *__doc_nanogui_Plot_set_series_visible = R"doc(Set whether a series is drawn)doc";
+
+static const char *__doc_nanogui_Plot_set_view = R"doc(Set the displayed region in data coordinates)doc";
+
+static const char *__doc_nanogui_Plot_set_x_label = R"doc(Set the label of the horizontal axis)doc";
+
+static const char *__doc_nanogui_Plot_set_y_label = R"doc(Set the label of the vertical axis)doc";
+
+static const char *__doc_nanogui_Plot_view_max =
+R"doc(Return the upper right corner of the displayed region in data coordinates)doc";
+
+static const char *__doc_nanogui_Plot_view_min =
+R"doc(Return the lower left corner of the displayed region in data coordinates)doc";
+
+static const char *__doc_nanogui_Plot_x_label = R"doc(Return the label of the horizontal axis)doc";
+
+static const char *__doc_nanogui_Plot_y_label = R"doc(Return the label of the vertical axis)doc";
+
 static const char *__doc_nanogui_Popup = R"doc()doc";
 
 static const char *__doc_nanogui_Popup_2 =
@@ -1834,7 +2124,17 @@ Parameter ``gl_minor``:
     gl_major to 4 for a forward compatible core OpenGL 4.1 profile.
     Requesting an invalid profile will result in no context (and
     therefore no GUI) being created. This attribute is ignored when
-    targeting OpenGL ES 2 or Metal.)doc";
+    targeting OpenGL ES 2 or Metal.
+
+Parameter ``headless``:
+    Create an offscreen screen that is never shown and never presents
+    its contents. Such screens are not drawn by mainloop(); instead, the
+    application renders frames on demand via draw_all() or capture(). If
+    no window system context can be created, an OSMesa context is used
+    instead. Combined with init() in headless mode, this makes it
+    possible to render on machines without display or GPU (e.g. using
+    Mesa's llvmpipe driver). Headless rendering is not supported by the
+    Metal backend.)doc";
 
 static const char *__doc_nanogui_Screen_Screen_2 =
 R"doc(Default constructor
@@ -1850,8 +2150,21 @@ the appropriate callback event handlers below)doc";
 
 static const char *__doc_nanogui_Screen_background = R"doc(Return the screen's background color)doc";
 
+static const char *__doc_nanogui_Screen_buffer_age =
+R"doc(Return the assumed age of the back buffer (see set_buffer_age()))doc";
+
 static const char *__doc_nanogui_Screen_caption = R"doc(Get the window title bar caption)doc";
 
+static const char *__doc_nanogui_Screen_capture =
+R"doc(Render a frame and return the contents of the framebuffer
+
+This function forces a full redraw via draw_all() and reads back the
+resulting framebuffer before it is presented. The result has the shape
+``framebuffer_size().y() x framebuffer_size().x() x 4`` (8-bit RGBA,
+top row first). This is mainly useful in combination with headless
+screens, e.g. for automated testing. Not supported by the Metal
+backend.)doc";
+
 static const char *__doc_nanogui_Screen_center_window = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_char_callback_event = R"doc()doc";
@@ -1864,12 +2177,23 @@ You typically won't need to call this function yourself, as it is
 called by the default implementation of draw_contents() (which is
 called by draw_all()))doc";
 
+static const char *__doc_nanogui_Screen_clear_frame_stats = R"doc(Discard all recorded frame timings)doc";
+
 static const char *__doc_nanogui_Screen_component_format = R"doc(Return the component format underlying the screen)doc";
 
+static const char *__doc_nanogui_Screen_culled_widgets =
+R"doc(Return the number of widgets that were skipped in the most recently
+rendered frame because they lay entirely outside of the clip region of
+their parent (e.g. a VScrollPanel))doc";
+
 static const char *__doc_nanogui_Screen_cursor_pos_callback_event = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_depth_stencil_texture = R"doc(Return the associated depth/stencil texture)doc";
 
+static const char *__doc_nanogui_Screen_dispatch_cursor_pos = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_dispatch_scroll = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_dispose_window = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_draw_all =
@@ -1910,6 +2234,28 @@ static const char *__doc_nanogui_Screen_drop_callback_event = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_drop_event = R"doc(Handle a file drop event)doc";
 
+static const char *__doc_nanogui_Screen_event_coalescing =
+R"doc(Return whether mouse motion and scroll events are coalesced (see
+set_event_coalescing()))doc";
+
+static const char *__doc_nanogui_Screen_flush_events =
+R"doc(Dispatch mouse motion and scroll events held back by
+set_event_coalescing())doc";
+
+static const char *__doc_nanogui_Screen_frame_index =
+R"doc(Return the number of frames drawn so far
+
+The counter is incremented once per frame by draw_all(). Caches that
+are updated from several widgets can use this value to perform per-
+frame work only once.)doc";
+
+static const char *__doc_nanogui_Screen_frame_stats =
+R"doc(Return the timings of recently rendered frames (oldest frame first)
+
+In Python, this function returns a dictionary mapping the fields of
+the ``FrameStats`` structure (``timestamp``, ``setup``, ``contents``,
+``widgets``, ``flush``, ``teardown``, and ``total``) to NumPy arrays.)doc";
+
 static const char *__doc_nanogui_Screen_framebuffer_size =
 R"doc(Return the framebuffer size (potentially larger than size() on high-
 DPI screens))doc";
@@ -1922,8 +2268,19 @@ static const char *__doc_nanogui_Screen_has_float_buffer = R"doc(Does the frameb
 
 static const char *__doc_nanogui_Screen_has_stencil_buffer = R"doc(Does the framebuffer have a stencil buffer)doc";
 
+static const char *__doc_nanogui_Screen_headless = R"doc(Is this an offscreen screen without a visible window?)doc";
+
 static const char *__doc_nanogui_Screen_initialize = R"doc(Initialize the Screen)doc";
 
+static const char *__doc_nanogui_Screen_invalidate_rect =
+R"doc(Mark a rectangular region of the screen as needing to be redrawn
+
+The position and size are specified in screen coordinates. Damaged
+regions accumulate until the next call to draw_all(). When partial
+redraws are enabled (see set_partial_redraw()), only the affected
+portion of the framebuffer is repainted. Otherwise, this function is
+equivalent to redraw().)doc";
+
 static const char *__doc_nanogui_Screen_key_callback_event = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_keyboard_character_event = R"doc(Text input event handler: codepoint is native endian UTF-32 format)doc";
@@ -1932,12 +2289,32 @@ static const char *__doc_nanogui_Screen_keyboard_event = R"doc(Default keyboard
 
 static const char *__doc_nanogui_Screen_m_background = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_buffer_age = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_caption = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_capture_target = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_culled_widgets = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_culled_widgets_last = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_cursor = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_cursor_pending = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_cursors = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_damage = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_damage_clip = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_damage_clip_active = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_damage_fbsize = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_damage_history = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_depth_buffer = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_m_depth_stencil_texture = R"doc()doc";
@@ -1946,16 +2323,38 @@ static const char *__doc_nanogui_Screen_m_drag_active = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_m_drag_widget = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_draw_clip = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_drawing_layer = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_event_coalescing = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_fbsize = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_m_float_buffer = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_flush_time = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_focus_path = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_frame_stats = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_frame_stats_pos = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_frame_stats_size = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_fullscreen = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_m_glfw_window = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_glyph_prewarm = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_headless = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_hover_raw_input = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_last_frame = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_last_interaction = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_m_metal_drawable = R"doc()doc";
@@ -1970,18 +2369,38 @@ static const char *__doc_nanogui_Screen_m_mouse_state = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_m_nvg_context = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_partial_redraw = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_pending_cursor = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_pending_scroll = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_pixel_ratio = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_m_process_events = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_profile_stack = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_profiling = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_redraw = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_redraw_deadline = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_resize_callback = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_scroll_pending = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_m_shutdown_glfw = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_m_stencil_buffer = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_m_target_fps = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_tooltip_visible = R"doc()doc";
+
+static const char *__doc_nanogui_Screen_m_widget_profiling = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_metal_layer = R"doc(Return the associated CAMetalLayer object)doc";
 
 static const char *__doc_nanogui_Screen_metal_texture = R"doc(Return the texure of the currently active Metal drawable (or NULL))doc";
@@ -1992,10 +2411,38 @@ static const char *__doc_nanogui_Screen_mouse_pos = R"doc(Return the last observ
 
 static const char *__doc_nanogui_Screen_move_window_to_front = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_next_frame_time =
+R"doc(Return the time (in the units of ``glfwGetTime()``) at which the next
+frame should be drawn
+
+Returns zero if a redraw is pending and the frame rate limit permits
+drawing immediately, and infinity if no redraw is needed. This is used
+by mainloop() to determine how long it can sleep.)doc";
+
 static const char *__doc_nanogui_Screen_nvg_context = R"doc(Return a pointer to the underlying NanoVG draw context)doc";
 
 static const char *__doc_nanogui_Screen_nvg_flush = R"doc(Flush all queued up NanoVG rendering commands)doc";
 
+static const char *__doc_nanogui_Screen_nvg_image_from_texture =
+R"doc(Create a NanoVG image that references the given texture
+
+The texture is not owned by the returned image handle and must
+outlive it. The image should be released using ``nvgDeleteImage()``.
+This is currently only supported by the OpenGL and GLES backends.
+
+Parameter ``flags``:
+    A combination of NanoVG image flags (e.g. ``NVG_IMAGE_FLIPY``))doc";
+
+static const char *__doc_nanogui_Screen_nvg_reset_scissor =
+R"doc(Reset the NanoVG scissor region
+
+Unlike ``nvgResetScissor()``, this keeps drawing operations confined
+to the region that is currently being repainted during partial
+redraws.)doc";
+
+static const char *__doc_nanogui_Screen_partial_redraw =
+R"doc(Return whether the screen only repaints damaged regions when possible)doc";
+
 static const char *__doc_nanogui_Screen_perform_layout = R"doc(Compute the layout of all widgets)doc";
 
 static const char *__doc_nanogui_Screen_pixel_format = R"doc(Return the pixel format underlying the screen)doc";
@@ -2004,6 +2451,23 @@ static const char *__doc_nanogui_Screen_pixel_ratio =
 R"doc(Return the ratio between pixel and device coordinates (e.g. >= 2 on
 Mac Retina displays))doc";
 
+static const char *__doc_nanogui_Screen_prewarm_glyphs =
+R"doc(Rasterize glyphs into NanoVG's font atlas ahead of time
+
+NanoVG rasterizes glyphs the first time that they are drawn, which
+causes frame time spikes when a large amount of new text appears,
+e.g. when a window opens. This function queues the code points
+``[first, last]`` of the font face ``font`` to be rasterized at
+each of the specified font sizes at the beginning of the next frame.
+Any resulting growth of the atlas also takes place at that point.
+
+Typical usage right after creating the screen is
+``prewarm_glyphs("sans", { 16, 20 })``.)doc";
+
+static const char *__doc_nanogui_Screen_profiling = R"doc(Return whether frame timings are being recorded)doc";
+
+static const char *__doc_nanogui_Screen_raw_input_target = R"doc()doc";
+
 static const char *__doc_nanogui_Screen_redraw =
 R"doc(Send an event that will cause the screen to be redrawn at the next
 event loop iteration)doc";
@@ -2014,26 +2478,107 @@ static const char *__doc_nanogui_Screen_resize_callback_event = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_resize_event = R"doc(Window resize event handler)doc";
 
+static const char *__doc_nanogui_Screen_schedule_redraw =
+R"doc(Request that the screen is redrawn after ``delay`` seconds
+
+This schedules a deadline for the next frame. In contrast to
+redraw(), the main loop does not wake up before the deadline expires.
+Multiple requests are merged, keeping the earliest deadline.
+
+Animated widgets should call ``screen()->schedule_redraw()`` from
+their Widget::draw() implementation for as long as the animation is
+running. The resulting frame rate is limited by set_target_fps(), and
+the application does not wake up at all once all animations have
+stopped. This function may be called from any thread.)doc";
+
 static const char *__doc_nanogui_Screen_scroll_callback_event = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_set_background = R"doc(Set the screen's background color)doc";
 
+static const char *__doc_nanogui_Screen_set_buffer_age =
+R"doc(Set the assumed age of the back buffer
+
+This specifies how many frames ago the back buffer was last rendered
+when a new frame starts, which depends on the swap behavior of the
+windowing system. The default value of 2 corresponds to double
+buffering with page flipping, 1 indicates that the back buffer is
+preserved, and 0 that its contents are undefined (which disables
+partial redraws).)doc";
+
 static const char *__doc_nanogui_Screen_set_caption = R"doc(Set the window title bar caption)doc";
 
+static const char *__doc_nanogui_Screen_set_event_coalescing =
+R"doc(Merge high-rate mouse motion, drag, and scroll events
+
+High-rate mice and trackpads can report hundreds of events per second,
+each of which is normally dispatched to the widget hierarchy right
+away. When coalescing is enabled, consecutive motion and drag events
+are merged into a single event (whose relative motion is the sum of
+the merged events), and scroll deltas are accumulated. The merged
+events are dispatched once per frame at the beginning of draw_all(),
+or earlier when another kind of input event arrives, so that the
+relative order of events is preserved.
+
+Widgets that need every sample (e.g. a painting canvas) can opt out
+via Widget::set_raw_input(), which affects events targeting them or
+their descendants.)doc";
+
+static const char *__doc_nanogui_Screen_set_partial_redraw =
+R"doc(Only repaint damaged regions when possible?
+
+When enabled, frames that were requested exclusively via
+invalidate_rect() or Widget::mark_dirty() only repaint the affected
+part of the framebuffer, which is scissored accordingly.
+draw_contents() is invoked once per damaged region in this case.
+Everything else (redraw(), input events, resizing, tooltips) triggers
+a full redraw.
+
+This relies on the contents of the back buffer being retained between
+frames (see set_buffer_age()). Partial redraws are not supported by
+the Metal backend and are disabled by default.)doc";
+
+static const char *__doc_nanogui_Screen_set_profiling =
+R"doc(Record the timings of recently rendered frames?
+
+When enabled, draw_all() measures the duration of each phase of a
+frame and stores it in a ring buffer holding the ``history`` most
+recent frames, which can be queried using frame_stats(). The overhead
+is negligible when profiling is disabled (the default).)doc";
+
 static const char *__doc_nanogui_Screen_set_resize_callback = R"doc()doc";
 
 static const char *__doc_nanogui_Screen_set_shutdown_glfw = R"doc(Shut down GLFW when the window is closed?)doc";
 
 static const char *__doc_nanogui_Screen_set_size = R"doc(Set window size)doc";
 
+static const char *__doc_nanogui_Screen_set_target_fps =
+R"doc(Limit the frame rate of this screen
+
+The main loop will not redraw the screen more than ``fps`` times per
+second, regardless of how frequently redraws are requested. A value of
+zero (the default) removes this limit, in which case the frame rate is
+only bounded by the display's vertical synchronization.)doc";
+
 static const char *__doc_nanogui_Screen_set_visible = R"doc(Set the top-level window visibility (no effect on full-screen windows))doc";
 
+static const char *__doc_nanogui_Screen_set_widget_profiling =
+R"doc(Record the time spent in the Widget::draw() and
+Widget::perform_layout() methods of individual widgets?
+
+The results can be queried using Widget::draw_time(),
+Widget::layout_time(), and their exclusive counterparts. This adds a
+small overhead per widget and is disabled by default.)doc";
+
 static const char *__doc_nanogui_Screen_shutdown_glfw = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_target_fps = R"doc(Return the maximum frame rate of this screen (0: unlimited))doc";
+
 static const char *__doc_nanogui_Screen_tooltip_fade_in_progress = R"doc(Is a tooltip currently fading in?)doc";
 
 static const char *__doc_nanogui_Screen_update_focus = R"doc()doc";
 
+static const char *__doc_nanogui_Screen_widget_profiling = R"doc(Return whether per-widget timings are being recorded)doc";
+
 static const char *__doc_nanogui_Serializer = R"doc()doc";
 
 static const char *__doc_nanogui_Shader = R"doc()doc";
@@ -2070,8 +2615,12 @@ static const char *__doc_nanogui_Shader_BufferType_VertexTexture = R"doc()doc";
 
 static const char *__doc_nanogui_Shader_Buffer_buffer = R"doc()doc";
 
+static const char *__doc_nanogui_Shader_Buffer_capacity = R"doc()doc";
+
 static const char *__doc_nanogui_Shader_Buffer_dirty = R"doc()doc";
 
+static const char *__doc_nanogui_Shader_Buffer_divisor = R"doc()doc";
+
 static const char *__doc_nanogui_Shader_Buffer_dtype = R"doc()doc";
 
 static const char *__doc_nanogui_Shader_Buffer_index = R"doc()doc";
@@ -2098,6 +2647,18 @@ static const char *__doc_nanogui_Shader_PrimitiveType_Triangle = R"doc()doc";
 
 static const char *__doc_nanogui_Shader_PrimitiveType_TriangleStrip = R"doc()doc";
 
+static const char *__doc_nanogui_Shader_ProgramCacheStats =
+R"doc(Statistics of the on-disk program binary cache (see set_program_cache_dir()))doc";
+
+static const char *__doc_nanogui_Shader_ProgramCacheStats_hits = R"doc(Number of programs that were loaded from the cache)doc";
+
+static const char *__doc_nanogui_Shader_ProgramCacheStats_misses = R"doc(Number of programs that had to be compiled from source)doc";
+
+static const char *__doc_nanogui_Shader_ProgramCacheStats_rejected =
+R"doc(Number of cache entries that were stale or rejected by the driver)doc";
+
+static const char *__doc_nanogui_Shader_ProgramCacheStats_stores = R"doc(Number of program binaries that were written to the cache)doc";
+
 static const char *__doc_nanogui_Shader_Shader =
 R"doc(Initialize the shader using the specified source strings.
 
@@ -2112,7 +2673,17 @@ Parameter ``vertex_shader``:
     The source of the vertex shader as a string.
 
 Parameter ``fragment_shader``:
-    The source of the fragment shader as a string.)doc";
+    The source of the fragment shader as a string.
+
+Parameter ``async_compile``:
+    Only submit the sources to the driver and return immediately
+    (OpenGL/GLES). Compilation and linking then proceed in the
+    background when the driver supports
+    ``GL_KHR_parallel_shader_compile``, and errors are reported upon
+    first use. Any method that needs the program (set_buffer(),
+    begin(), etc.) waits for it to finish, hence the benefit is
+    greatest when all shaders are created up front. Use ready() to
+    check without blocking.)doc";
 
 static const char *__doc_nanogui_Shader_begin =
 R"doc(Begin drawing using this shader
@@ -2126,6 +2697,28 @@ statement.)doc";
 
 static const char *__doc_nanogui_Shader_blend_mode = R"doc(Return the blending mode of this shader)doc";
 
+static const char *__doc_nanogui_Shader_buffer_divisor =
+R"doc(Return the per-instance divisor of a vertex buffer (see set_buffer_divisor()))doc";
+
+static const char *__doc_nanogui_Shader_buffer_rows =
+R"doc(Return the number of rows of the buffer associated with a named shader parameter)doc";
+
+static const char *__doc_nanogui_Shader_check_buffer =
+R"doc(Look up a buffer and check that 'dtype' and the trailing dimensions of 'shape' match)doc";
+
+static const char *__doc_nanogui_Shader_clamp_count =
+R"doc(Clamp the arguments of \ref draw_array() to the valid range of the buffers)doc";
+
+static const char *__doc_nanogui_Shader_clamp_instance_count =
+R"doc(Clamp the instance count of \ref draw_array() to the rows of the per-instance buffers)doc";
+
+static const char *__doc_nanogui_Shader_default_program_cache_dir =
+R"doc(Return a suitable per-user cache directory for set_program_cache_dir()
+
+This is ``%LOCALAPPDATA%\nanogui`` on Windows,
+``~/Library/Caches/nanogui`` on macOS, and
+``$XDG_CACHE_HOME/nanogui`` or ``~/.cache/nanogui`` otherwise.)doc";
+
 static const char *__doc_nanogui_Shader_draw_array =
 R"doc(Render geometry arrays, either directly or using an index array.
 
@@ -2136,22 +2729,43 @@ Parameter ``offset``:
     First index to render. Must be a multiple of 2 or 3 for lines and
     triangles, respectively (unless specified using strips).
 
-Parameter ``offset``:
+Parameter ``count``:
     Number of indices to render. Must be a multiple of 2 or 3 for
     lines and triangles, respectively (unless specified using strips).
+    The count is clamped to the entries that have been uploaded to the
+    index buffer (if ``indexed`` is true) or, on OpenGL, to the rows of
+    all per-vertex buffers. Hence, ``(size_t) -1`` renders the complete
+    valid range.
 
 Parameter ``indexed``:
     Render indexed geometry? In this case, an ``uint32_t`` valued
-    buffer with name ``indices`` must have been uploaded using set().)doc";
+    buffer with name ``indices`` must have been uploaded using set().
+
+Parameter ``instance_count``:
+    Number of instances to render. Vertex buffers with a nonzero
+    divisor (see set_buffer_divisor()) advance per instance. The count
+    is clamped to the instances covered by the rows of these buffers
+    (i.e. ``rows * divisor``). Requires GLES 3 on GLES.)doc";
 
 static const char *__doc_nanogui_Shader_end = R"doc(End drawing using this shader)doc";
 
+static const char *__doc_nanogui_Shader_finalize =
+R"doc(Wait for asynchronous compilation to finish and query the shader interface)doc";
+
 static const char *__doc_nanogui_Shader_m_blend_mode = R"doc()doc";
 
 static const char *__doc_nanogui_Shader_m_buffers = R"doc()doc";
 
+static const char *__doc_nanogui_Shader_m_cache_path = R"doc()doc";
+
+static const char *__doc_nanogui_Shader_m_compiling = R"doc()doc";
+
 static const char *__doc_nanogui_Shader_m_name = R"doc()doc";
 
+static const char *__doc_nanogui_Shader_m_pending = R"doc()doc";
+
+static const char *__doc_nanogui_Shader_m_pending_shaders = R"doc()doc";
+
 static const char *__doc_nanogui_Shader_m_pipeline_state = R"doc()doc";
 
 static const char *__doc_nanogui_Shader_m_render_pass = R"doc()doc";
@@ -2160,8 +2774,23 @@ static const char *__doc_nanogui_Shader_name = R"doc(Return the name of this sha
 
 static const char *__doc_nanogui_Shader_pipeline_state = R"doc()doc";
 
+static const char *__doc_nanogui_Shader_program_cache_dir =
+R"doc(Return the directory of the program binary cache (empty if disabled))doc";
+
+static const char *__doc_nanogui_Shader_program_cache_stats = R"doc(Return hit/miss statistics of the program binary cache)doc";
+
+static const char *__doc_nanogui_Shader_ready =
+R"doc(Check whether the shader has finished compiling without blocking
+
+Always true unless the shader was created with ``async_compile``. If
+the driver cannot report the compilation status in the background,
+this function waits for the compilation to finish and returns true.
+Compilation errors are raised as exceptions.)doc";
+
 static const char *__doc_nanogui_Shader_render_pass = R"doc(Return the render pass associated with this shader)doc";
 
+static const char *__doc_nanogui_Shader_reset_program_cache_stats = R"doc(Reset the statistics returned by program_cache_stats())doc";
+
 static const char *__doc_nanogui_Shader_set_buffer =
 R"doc(Upload a buffer (e.g. vertex positions) that will be associated with a
 named shader parameter.
@@ -2171,10 +2800,35 @@ Note that this function should be used both for 'varying' and
 the right endpoint. Matrices should be specified in column-major
 order.
 
-The buffer will be replaced if it is already present.)doc";
+The buffer will be replaced if it is already present. Vertex and index
+buffers keep their GPU storage when the new contents fit, and grow
+geometrically otherwise.)doc";
 
 static const char *__doc_nanogui_Shader_set_buffer_2 = R"doc()doc";
 
+static const char *__doc_nanogui_Shader_set_buffer_divisor =
+R"doc(Turn a vertex buffer into a per-instance attribute
+
+With a nonzero ``divisor``, the attribute advances once per ``divisor``
+instances instead of once per vertex when rendering with
+``instance_count > 1`` (see draw_array()). A divisor of zero
+restores per-vertex behavior. On Metal, which has no fixed-function
+vertex fetch in NanoGUI, the shader should instead index such buffers
+via ``[[instance_id]]``; the divisor then only affects the clamping
+performed by draw_array(). Requires GLES 3 on GLES.)doc";
+
+static const char *__doc_nanogui_Shader_set_program_cache_dir =
+R"doc(Enable the on-disk cache of linked shader programs
+
+When set to a nonempty path, the OpenGL backend stores program
+binaries (via ``glGetProgramBinary``) in this directory and reuses them
+when a shader with the same name and sources is created again on the
+same driver, which skips compilation and linking. Entries that the
+driver rejects (e.g. following a driver update) are recompiled and
+replaced automatically. The directory is created if needed. An empty
+string (the default) disables the cache. Has no effect on GLES 2 and
+Metal, where shaders are precompiled.)doc";
+
 static const char *__doc_nanogui_Shader_set_texture =
 R"doc(Associate a texture with a named shader parameter
 
@@ -2184,6 +2838,18 @@ static const char *__doc_nanogui_Shader_set_uniform =
 R"doc(Upload a uniform variable (e.g. a vector or matrix) that will be
 associated with a named shader parameter.)doc";
 
+static const char *__doc_nanogui_Shader_update_buffer =
+R"doc(Overwrite or append a range of rows of a vertex or index buffer
+
+Copies ``shape[0]`` rows to the buffer starting at row ``offset``,
+leaving the remaining contents intact. The trailing dimensions and the
+dtype must match the current buffer. When ``offset + shape[0]``
+exceeds the number of rows, the buffer is extended; its storage grows
+geometrically so that repeated appends take amortized constant time.
+``offset`` may not exceed the current number of rows.)doc";
+
+static const char *__doc_nanogui_Shader_update_buffer_2 = R"doc()doc";
+
 static const char *__doc_nanogui_Slider = R"doc()doc";
 
 static const char *__doc_nanogui_Slider_2 =
@@ -2444,30 +3110,53 @@ Multi-line read-only text widget, ideal for displaying log messages
 etc.
 
 Appended text can use different colors, but the font size is fixed for
-the entire widget.)doc";
+the entire widget.
+
+When used as a live log viewer, call set_max_lines() to bound the
+number of retained lines (see the documentation of this function for
+details), and prefer append_lines() over repeated calls to
+append_line().)doc";
 
-static const char *__doc_nanogui_TextArea_Block = R"doc()doc";
+static const char *__doc_nanogui_TextArea_Block = R"doc(A contiguous run of text with a single color (at most one line))doc";
 
 static const char *__doc_nanogui_TextArea_Block_color = R"doc()doc";
 
-static const char *__doc_nanogui_TextArea_Block_offset = R"doc()doc";
+static const char *__doc_nanogui_TextArea_Block_line = R"doc(Index of the line containing this block (see m_first_line))doc";
 
-static const char *__doc_nanogui_TextArea_Block_text = R"doc()doc";
+static const char *__doc_nanogui_TextArea_Block_text_offset = R"doc(Position of the text in m_text (offset by m_text_base))doc";
+
+static const char *__doc_nanogui_TextArea_Block_text_size = R"doc()doc";
 
 static const char *__doc_nanogui_TextArea_Block_width = R"doc()doc";
 
+static const char *__doc_nanogui_TextArea_Block_x = R"doc(Horizontal offset and width (-1 until the block is measured))doc";
+
 static const char *__doc_nanogui_TextArea_TextArea = R"doc()doc";
 
 static const char *__doc_nanogui_TextArea_append = R"doc(Append text at the end of the widget)doc";
 
 static const char *__doc_nanogui_TextArea_append_line = R"doc(Append a line of text at the bottom)doc";
 
+static const char *__doc_nanogui_TextArea_append_lines =
+R"doc(Append several lines of text at the bottom
+
+This is equivalent to calling append_line() for each entry, but the
+enclosing VScrollPanel (if any) is only laid out once.)doc";
+
+static const char *__doc_nanogui_TextArea_append_text = R"doc(Append text without updating the layout)doc";
+
 static const char *__doc_nanogui_TextArea_background_color = R"doc(Return the widget's background color (a global property))doc";
 
+static const char *__doc_nanogui_TextArea_block_offset = R"doc(Return the position of a block relative to the text origin)doc";
+
+static const char *__doc_nanogui_TextArea_block_text = R"doc(Return a pointer to the text of a block)doc";
+
 static const char *__doc_nanogui_TextArea_block_to_position = R"doc()doc";
 
 static const char *__doc_nanogui_TextArea_clear = R"doc(Clear all current contents)doc";
 
+static const char *__doc_nanogui_TextArea_discard_lines = R"doc(Discard the oldest lines when exceeding m_max_lines)doc";
+
 static const char *__doc_nanogui_TextArea_draw = R"doc()doc";
 
 static const char *__doc_nanogui_TextArea_font = R"doc(Return the used font)doc";
@@ -2478,17 +3167,24 @@ static const char *__doc_nanogui_TextArea_is_selectable = R"doc(Return whether t
 
 static const char *__doc_nanogui_TextArea_keyboard_event = R"doc()doc";
 
+static const char *__doc_nanogui_TextArea_line_count = R"doc(Return the number of lines currently stored in the widget)doc";
+
 static const char *__doc_nanogui_TextArea_m_background_color = R"doc()doc";
 
 static const char *__doc_nanogui_TextArea_m_blocks = R"doc()doc";
 
+static const char *__doc_nanogui_TextArea_m_first_line =
+R"doc(Index of the first retained line, and of the line being appended to)doc";
+
 static const char *__doc_nanogui_TextArea_m_font = R"doc()doc";
 
 static const char *__doc_nanogui_TextArea_m_foreground_color = R"doc()doc";
 
-static const char *__doc_nanogui_TextArea_m_max_size = R"doc()doc";
+static const char *__doc_nanogui_TextArea_m_line = R"doc()doc";
+
+static const char *__doc_nanogui_TextArea_m_max_lines = R"doc()doc";
 
-static const char *__doc_nanogui_TextArea_m_offset = R"doc()doc";
+static const char *__doc_nanogui_TextArea_m_max_width = R"doc()doc";
 
 static const char *__doc_nanogui_TextArea_m_padding = R"doc()doc";
 
@@ -2500,6 +3196,18 @@ static const char *__doc_nanogui_TextArea_m_selection_end = R"doc()doc";
 
 static const char *__doc_nanogui_TextArea_m_selection_start = R"doc()doc";
 
+static const char *__doc_nanogui_TextArea_m_text = R"doc(Storage for the text of all blocks)doc";
+
+static const char *__doc_nanogui_TextArea_m_text_base =
+R"doc(Number of characters that were discarded from the front of m_text)doc";
+
+static const char *__doc_nanogui_TextArea_max_lines =
+R"doc(Return the maximum number of retained lines (0 means unlimited))doc";
+
+static const char *__doc_nanogui_TextArea_measure_blocks =
+R"doc(Measure the blocks [begin, end) along with their predecessors on the
+same line)doc";
+
 static const char *__doc_nanogui_TextArea_mouse_button_event = R"doc()doc";
 
 static const char *__doc_nanogui_TextArea_mouse_drag_event = R"doc()doc";
@@ -2518,6 +3226,14 @@ static const char *__doc_nanogui_TextArea_set_font = R"doc(Set the used font)doc
 
 static const char *__doc_nanogui_TextArea_set_foreground_color = R"doc(Set the foreground color (applies to all subsequently added text))doc";
 
+static const char *__doc_nanogui_TextArea_set_max_lines =
+R"doc(Set the maximum number of retained lines (log mode)
+
+When nonzero, the oldest lines are discarded once the widget contains
+more than ``max_lines`` lines. Furthermore, text is then only measured
+when it is first displayed, hence the preferred width of the widget
+only accounts for lines that have already been visible.)doc";
+
 static const char *__doc_nanogui_TextArea_set_padding = R"doc(Set the amount of padding to add around the text)doc";
 
 static const char *__doc_nanogui_TextArea_set_selectable = R"doc(Set whether the text can be selected using the mouse)doc";
@@ -2679,8 +3395,60 @@ static const char *__doc_nanogui_TextBox_update_cursor = R"doc()doc";
 
 static const char *__doc_nanogui_TextBox_value = R"doc()doc";
 
+static const char *__doc_nanogui_TextMetricsStats = R"doc(Hit/miss counters of the text metrics cache)doc";
+
+static const char *__doc_nanogui_TextMetricsStats_evictions = R"doc(Number of entries discarded because the cache was full)doc";
+
+static const char *__doc_nanogui_TextMetricsStats_hits = R"doc(Number of measurements answered from the cache)doc";
+
+static const char *__doc_nanogui_TextMetricsStats_misses = R"doc(Number of measurements that required shaping the string)doc";
+
 static const char *__doc_nanogui_Texture = R"doc()doc";
 
+static const char *__doc_nanogui_TextureDownload =
+R"doc(Handle to a pending asynchronous texture download
+
+See also:
+    Texture::download_async())doc";
+
+static const char *__doc_nanogui_TextureDownload_TextureDownload = R"doc()doc";
+
+static const char *__doc_nanogui_TextureDownload_check = R"doc(Throw an exception if the staging buffer was reused)doc";
+
+static const char *__doc_nanogui_TextureDownload_m_sequence = R"doc()doc";
+
+static const char *__doc_nanogui_TextureDownload_m_size = R"doc()doc";
+
+static const char *__doc_nanogui_TextureDownload_m_slot = R"doc()doc";
+
+static const char *__doc_nanogui_TextureDownload_m_texture = R"doc()doc";
+
+static const char *__doc_nanogui_TextureDownload_read =
+R"doc(Wait for the download to complete and copy the packed pixel data into
+``data``
+
+The destination buffer must hold size() bytes and can be reused across
+downloads. Render targets are flipped vertically while copying, as in
+Texture::download().
+
+Throws an exception if the staging buffer has already been reused by a
+subsequent call to Texture::download_async().)doc";
+
+static const char *__doc_nanogui_TextureDownload_ready =
+R"doc(Has the GPU finished copying the texture contents? (never blocks))doc";
+
+static const char *__doc_nanogui_TextureDownload_size =
+R"doc(Return the number of bytes that will be written by read()
+
+Like ready() and read(), this throws an exception if the staging
+buffer has already been reused.)doc";
+
+static const char *__doc_nanogui_TextureDownload_texture = R"doc(Return the texture being downloaded)doc";
+
+static const char *__doc_nanogui_TextureDownload_texture_size =
+R"doc(Return the size of the texture at the time when the download was
+issued)doc";
+
 static const char *__doc_nanogui_Texture_2 = R"doc()doc";
 
 static const char *__doc_nanogui_Texture_3 = R"doc()doc";
@@ -2763,12 +3531,38 @@ static const char *__doc_nanogui_Texture_component_format = R"doc(Return the com
 
 static const char *__doc_nanogui_Texture_download = R"doc(Download packed pixel data from the GPU to the CPU)doc";
 
+static const char *__doc_nanogui_Texture_download_async =
+R"doc(Start downloading packed pixel data from the GPU to the CPU without
+blocking
+
+This function issues a copy of the texture into one of two internal
+staging buffers (pixel buffer objects on OpenGL) and returns
+immediately. The returned handle can be used to check whether the copy
+has completed, and to retrieve the data. Since the staging buffers are
+used in alternation, the data of a download must be retrieved before
+the next-but-one call to this function, which is a natural fit for
+per-frame readback with one frame of latency.
+
+Not supported on GLES.)doc";
+
 static const char *__doc_nanogui_Texture_flags = R"doc(Return a combination of flags (from Texture::TextureFlags))doc";
 
 static const char *__doc_nanogui_Texture_init = R"doc(Initialize the texture handle)doc";
 
 static const char *__doc_nanogui_Texture_m_component_format = R"doc()doc";
 
+static const char *__doc_nanogui_Texture_m_download_buffer = R"doc()doc";
+
+static const char *__doc_nanogui_Texture_m_download_command_buffer = R"doc()doc";
+
+static const char *__doc_nanogui_Texture_m_download_fence = R"doc()doc";
+
+static const char *__doc_nanogui_Texture_m_download_sequence = R"doc()doc";
+
+static const char *__doc_nanogui_Texture_m_download_size = R"doc()doc";
+
+static const char *__doc_nanogui_Texture_m_download_slot = R"doc()doc";
+
 static const char *__doc_nanogui_Texture_m_flags = R"doc()doc";
 
 static const char *__doc_nanogui_Texture_m_mag_interpolation_mode = R"doc()doc";
@@ -2789,10 +3583,32 @@ static const char *__doc_nanogui_Texture_m_wrap_mode = R"doc()doc";
 
 static const char *__doc_nanogui_Texture_mag_interpolation_mode = R"doc(Return the interpolation mode for minimization)doc";
 
+static const char *__doc_nanogui_Texture_map_upload =
+R"doc(Map a staging buffer for streaming packed pixel data to the GPU
+
+Returns a pointer to \ref bytes_per_pixel() <tt>* size().x() *
+size().y()</tt> bytes of write-only memory that receives the next
+frame. Afterwards, \ref unmap_upload() must be called to update the
+texture from the staging buffer. This avoids the stall of \ref
+upload() and is intended for textures that change every frame (e.g.
+video). The staging buffers are organized as a ring, and the
+function only blocks if the GPU is still reading the buffer that
+was submitted three uploads ago.
+
+On OpenGL 4.4 and newer, the staging buffers are persistently mapped
+pixel buffer objects. Not supported on GLES.
+
+The memory must not be accessed after \ref unmap_upload(). In Python,
+this function returns an array that refers to the staging buffer, and
+\ref unmap_upload() raises an exception until this array and any views
+of it have been deleted.)doc";
+
 static const char *__doc_nanogui_Texture_min_interpolation_mode = R"doc(Return the interpolation mode for minimization)doc";
 
 static const char *__doc_nanogui_Texture_pixel_format = R"doc(Return the pixel format)doc";
 
+static const char *__doc_nanogui_Texture_release_upload_buffers = R"doc(Release the staging buffers used by \ref map_upload())doc";
+
 static const char *__doc_nanogui_Texture_resize = R"doc(Resize the texture (discards the current contents))doc";
 
 static const char *__doc_nanogui_Texture_sampler_state_handle = R"doc()doc";
@@ -2803,6 +3619,9 @@ static const char *__doc_nanogui_Texture_size = R"doc(Return the size of this te
 
 static const char *__doc_nanogui_Texture_texture_handle = R"doc()doc";
 
+static const char *__doc_nanogui_Texture_unmap_upload =
+R"doc(Update the texture from the staging buffer returned by \ref map_upload())doc";
+
 static const char *__doc_nanogui_Texture_upload = R"doc(Upload packed pixel data from the CPU to the GPU)doc";
 
 static const char *__doc_nanogui_Texture_upload_origin = R"doc(Upload packed pixel data to a rectangular sub-region of the texture from the CPU to the GPU)doc";
@@ -2811,12 +3630,62 @@ static const char *__doc_nanogui_Texture_generate_mipmap = R"doc(Generates the m
 
 static const char *__doc_nanogui_Texture_wrap_mode = R"doc(Return the wrap mode)doc";
 
+static const char *__doc_nanogui_TexturedQuad_auto_exposure =
+R"doc(Get whether the exposure is chosen automatically
+
+Returns:
+    True if automatic exposure is enabled)doc";
+
+static const char *__doc_nanogui_TexturedQuad_auto_exposure_percentile =
+R"doc(Get the luminance percentile that auto-exposure maps to 1
+
+Returns:
+    Current percentile)doc";
+
+static const char *__doc_nanogui_TexturedQuad_image_stats =
+R"doc(Get the image statistics used by auto-exposure
+
+Returns:
+    The statistics, or ``None`` if auto-exposure is disabled)doc";
+
+static const char *__doc_nanogui_TexturedQuad_set_auto_exposure =
+R"doc(Set whether the exposure is chosen automatically
+
+When enabled, update_auto_exposure() computes the luminance statistics
+of the texture on the GPU and sets the exposure so that the luminance
+percentile auto_exposure_percentile() maps to 1. Default is false.
+
+Parameter ``enabled``:
+    True to enable automatic exposure)doc";
+
+static const char *__doc_nanogui_TexturedQuad_set_auto_exposure_percentile =
+R"doc(Set the luminance percentile that auto-exposure maps to 1
+
+Parameter ``percentile``:
+    Percentile between 0 and 1 (default 0.95))doc";
+
+static const char *__doc_nanogui_TexturedQuad_update_auto_exposure =
+R"doc(Update the automatic exposure
+
+Applies the statistics of the last computation (if they are available
+by now) to the exposure, and starts computing the statistics of the
+current texture. The results are fetched asynchronously, hence the
+exposure lags a frame or so behind. Does nothing unless auto-exposure
+is enabled. Must be called outside of any render pass, e.g. once per
+frame before rendering the quad.)doc";
+
 static const char *__doc_nanogui_Theme = R"doc()doc";
 
 static const char *__doc_nanogui_Theme_2 =
 R"doc(\class Theme theme.h nanogui/theme.h
 
-Storage class for basic theme-related properties.)doc";
+Storage class for basic theme-related properties.
+
+Widgets memoize their preferred size, which depends on the font sizes
+and metrics stored here. After modifying the fields of a theme that is
+already in use, call Widget::invalidate_layout() with ``recursive`` set
+to ``True`` on the screen (or on the affected widgets) before the next
+call to Widget::perform_layout().)doc";
 
 static const char *__doc_nanogui_Theme_Theme = R"doc()doc";
 
@@ -3017,6 +3886,101 @@ static const char *__doc_nanogui_Theme_m_window_title_unfocused =
 R"doc(The title color for a Window that is not in focus (default:
 intensity=``220``, alpha=``160``; see nanogui::Color::Color(int,int)).)doc";
 
+static const char *__doc_nanogui_ThumbnailCache =
+R"doc(Asynchronously decoded image thumbnails with a bounded cache of NanoVG images.)doc";
+
+static const char *__doc_nanogui_ThumbnailCache_ThumbnailCache = R"doc(Create a thumbnail cache)doc";
+
+static const char *__doc_nanogui_ThumbnailCache_capacity = R"doc(Return the maximum number of NanoVG images to keep around)doc";
+
+static const char *__doc_nanogui_ThumbnailCache_clear = R"doc(Release all NanoVG images and discard pending requests)doc";
+
+static const char *__doc_nanogui_ThumbnailCache_clear_failed =
+R"doc(Forget the files that could not be decoded, so that they are decoded
+again when requested (e.g. after they were modified))doc";
+
+static const char *__doc_nanogui_ThumbnailCache_image =
+R"doc(Return the NanoVG image containing the thumbnail of the given file. Returns 0 when the thumbnail is not available yet, in which case it is scheduled for decoding, and -1 when the file could not be decoded.)doc";
+
+static const char *__doc_nanogui_ThumbnailCache_set_capacity = R"doc(Set the maximum number of NanoVG images to keep around)doc";
+
+static const char *__doc_nanogui_ThumbnailCache_size = R"doc(Return the number of NanoVG images that are currently cached)doc";
+
+static const char *__doc_nanogui_ThumbnailCache_thumbnail_size =
+R"doc(Return the length of the shorter side of the thumbnails in pixels)doc";
+
+static const char *__doc_nanogui_ThumbnailCache_upload =
+R"doc(Create NanoVG images for up to ``max_count`` decoded thumbnails and evict the least recently used ones that exceed the capacity. Should be called by every widget drawing thumbnails of this cache, passing Screen.frame_index() as ``frame``. Returns ``True`` when thumbnails are still being decoded.)doc";
+
+static const char *__doc_nanogui_ThumbnailCache_worker = R"doc(Body of the worker threads)doc";
+
+static const char *__doc_nanogui_TiledImage =
+R"doc(Very large image that is streamed to the GPU in tiles at multiple levels of detail.
+
+The image is organized as a pyramid: level 0 has the full resolution, and
+each subsequent level halves the resolution until the image fits into a
+single tile. The pixels of the tiles of level 0 are produced on demand on
+a pool of worker threads (e.g. reading from a memory-mapped array). A tile
+of a coarser level averages 2x2 blocks of the tiles of the next finer
+level. Only a bounded number of tiles is kept around, except for those of
+the three coarsest levels, which are never evicted.)doc";
+
+static const char *__doc_nanogui_TiledImage_TiledImage = R"doc(Create a tiled image)doc";
+
+static const char *__doc_nanogui_TiledImage_array_callback =
+R"doc(Return a TileCallback that reads from a strided 8-bit array with 1 (gray), 2 (gray + alpha), 3 (RGB), or 4 (RGBA) channels. Strides are specified in bytes. The array must outlive the tiled image.)doc";
+
+static const char *__doc_nanogui_TiledImage_cached_tiles = R"doc(Return the number of tiles that are currently cached)doc";
+
+static const char *__doc_nanogui_TiledImage_capacity =
+R"doc(Return the maximum number of tiles to keep around (see TiledImage()))doc";
+
+static const char *__doc_nanogui_TiledImage_clear = R"doc(Release all tile textures and discard pending requests)doc";
+
+static const char *__doc_nanogui_TiledImage_discard =
+R"doc(Discard (or mark as failed) a queued tile and the tiles waiting for it)doc";
+
+static const char *__doc_nanogui_TiledImage_evict = R"doc(Evict the least recently used tiles that exceed the capacity)doc";
+
+static const char *__doc_nanogui_TiledImage_key = R"doc(Pack a tile position into a key of 'm_entries')doc";
+
+static const char *__doc_nanogui_TiledImage_key_index = R"doc(Return the tile index of a key of 'm_entries')doc";
+
+static const char *__doc_nanogui_TiledImage_key_level = R"doc(Return the level of detail of a key of 'm_entries')doc";
+
+static const char *__doc_nanogui_TiledImage_level_count = R"doc(Return the number of levels of detail)doc";
+
+static const char *__doc_nanogui_TiledImage_level_size = R"doc(Return the size of the image at the given level of detail)doc";
+
+static const char *__doc_nanogui_TiledImage_parent_key =
+R"doc(Return the key of the tile of the next coarser level covering tile ``k``)doc";
+
+static const char *__doc_nanogui_TiledImage_pinned = R"doc(Are the tiles of the given level exempt from eviction?)doc";
+
+static const char *__doc_nanogui_TiledImage_reduce =
+R"doc(Compute a tile by averaging 2x2 blocks of the tiles of the next finer level)doc";
+
+static const char *__doc_nanogui_TiledImage_request_tick =
+R"doc(Return the largest request tick of a tile and of the tiles waiting for it)doc";
+
+static const char *__doc_nanogui_TiledImage_set_capacity =
+R"doc(Set the maximum number of tiles to keep around (see TiledImage()))doc";
+
+static const char *__doc_nanogui_TiledImage_size = R"doc(Return the size of the image (at level 0) in pixels)doc";
+
+static const char *__doc_nanogui_TiledImage_tile =
+R"doc(Return the texture of a tile, or None if it is not available yet. Unless ``request`` is False, a missing tile is scheduled to be produced by the worker threads.)doc";
+
+static const char *__doc_nanogui_TiledImage_tile_count =
+R"doc(Return the number of tiles along each axis at the given level of detail)doc";
+
+static const char *__doc_nanogui_TiledImage_tile_size = R"doc(Return the width and height of the tiles in pixels)doc";
+
+static const char *__doc_nanogui_TiledImage_upload =
+R"doc(Create textures for up to ``max_count`` finished tiles and evict the least recently used ones that exceed the capacity. Returns True when tiles are still being produced.)doc";
+
+static const char *__doc_nanogui_TiledImage_worker = R"doc(Body of the worker threads)doc";
+
 static const char *__doc_nanogui_ToolButton = R"doc()doc";
 
 static const char *__doc_nanogui_ToolButton_2 =
@@ -3092,6 +4056,112 @@ static const char *__doc_nanogui_VariableType_UInt64 = R"doc()doc";
 
 static const char *__doc_nanogui_VariableType_UInt8 = R"doc()doc";
 
+static const char *__doc_nanogui_VirtualList =
+R"doc(List or grid of items that only instantiates widgets for the visible
+items.
+
+A VirtualList does not store any items. Instead, it maintains a small
+pool of row widgets, which it obtains from the create_callback(), and
+assigns them to the items that are currently visible by invoking the
+bind_callback(). Widgets that scroll out of view are recycled for
+other items.
+
+The list is meant to be placed into a VScrollPanel, which provides the
+scroll bar and determines the visible region.
+
+When columns() is larger than one, consecutive items are arranged into
+rows of a grid with equally wide cells. Rows either have a fixed height
+(set_row_height()), or a variable height specified by the
+height_callback(). In the latter case, the row offsets are stored in a
+Fenwick tree, so that locating the rows visible at any scroll position
+takes logarithmic time.)doc";
+
+static const char *__doc_nanogui_VirtualList_VirtualList = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_bind_callback = R"doc(Return the callback that displays an item in a row widget)doc";
+
+static const char *__doc_nanogui_VirtualList_columns = R"doc(Return the number of items per row (default: 1))doc";
+
+static const char *__doc_nanogui_VirtualList_create_callback = R"doc(Return the callback that creates row widgets)doc";
+
+static const char *__doc_nanogui_VirtualList_draw = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_height_callback = R"doc(Return the callback that specifies variable row heights)doc";
+
+static const char *__doc_nanogui_VirtualList_item_count = R"doc(Return the number of items)doc";
+
+static const char *__doc_nanogui_VirtualList_m_bind_callback = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_m_columns = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_m_create_callback = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_m_height_callback = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_m_heights =
+R"doc(Fenwick tree of row heights (only used with a height callback))doc";
+
+static const char *__doc_nanogui_VirtualList_m_item_count = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_m_pool = R"doc(Pool of row widgets, and the item displayed by each one)doc";
+
+static const char *__doc_nanogui_VirtualList_m_pool_items = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_m_row_height = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_m_visible_first = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_m_visible_last = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_perform_layout = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_preferred_size = R"doc()doc";
+
+static const char *__doc_nanogui_VirtualList_refresh =
+R"doc(Rebind all visible items, e.g. after the underlying data changed)doc";
+
+static const char *__doc_nanogui_VirtualList_row_at = R"doc(Return the row at the given vertical offset within the list)doc";
+
+static const char *__doc_nanogui_VirtualList_row_count = R"doc(Return the number of rows)doc";
+
+static const char *__doc_nanogui_VirtualList_row_height =
+R"doc(Return the row height that is used when no height_callback() is
+specified (default: 25))doc";
+
+static const char *__doc_nanogui_VirtualList_row_height_2 = R"doc(Return the height of the given row)doc";
+
+static const char *__doc_nanogui_VirtualList_row_offset = R"doc(Return the vertical offset of the given row within the list)doc";
+
+static const char *__doc_nanogui_VirtualList_scroll_to =
+R"doc(Scroll the parent VScrollPanel so that the given item is at the top)doc";
+
+static const char *__doc_nanogui_VirtualList_set_bind_callback = R"doc(Set the callback that displays an item in a row widget)doc";
+
+static const char *__doc_nanogui_VirtualList_set_columns = R"doc(Set the number of items per row)doc";
+
+static const char *__doc_nanogui_VirtualList_set_create_callback = R"doc(Set the callback that creates row widgets)doc";
+
+static const char *__doc_nanogui_VirtualList_set_height_callback =
+R"doc(Set the callback that specifies variable row heights (queried for every
+row))doc";
+
+static const char *__doc_nanogui_VirtualList_set_item_count =
+R"doc(Set the number of items (this also rebinds all visible items))doc";
+
+static const char *__doc_nanogui_VirtualList_set_row_height =
+R"doc(Set the row height that is used when no height_callback() is specified)doc";
+
+static const char *__doc_nanogui_VirtualList_update_heights = R"doc(Rebuild the Fenwick tree of row heights)doc";
+
+static const char *__doc_nanogui_VirtualList_update_row_height =
+R"doc(Query the height_callback() again after the height of a row changed)doc";
+
+static const char *__doc_nanogui_VirtualList_update_rows = R"doc(Assign the pooled row widgets to the visible items)doc";
+
+static const char *__doc_nanogui_VirtualList_visible_range =
+R"doc(Return the range ``[first, last)`` of items that are currently
+displayed)doc";
+
 static const char *__doc_nanogui_Widget = R"doc()doc";
 
 static const char *__doc_nanogui_Widget_2 =
@@ -3128,12 +4198,35 @@ static const char *__doc_nanogui_Widget_child_index = R"doc(Returns the index of
 
 static const char *__doc_nanogui_Widget_children = R"doc(Return the list of child widgets of the current widget)doc";
 
+static const char *__doc_nanogui_Widget_children_changed =
+R"doc(Invalidate the state derived from m_children after children were
+added, removed, or reordered
+
+This marks the offscreen layer and the spatial index as out of date,
+and, unless ``layout`` is ``False`` (e.g. when only the order of the
+children changed), the layout as well.)doc";
+
 static const char *__doc_nanogui_Widget_contains = R"doc(Check if the widget contains a certain position)doc";
 
 static const char *__doc_nanogui_Widget_cursor = R"doc(Return a pointer to the cursor of the widget)doc";
 
 static const char *__doc_nanogui_Widget_draw = R"doc(Draw the widget (and all child widgets))doc";
 
+static const char *__doc_nanogui_Widget_draw_layer =
+R"doc(Render the widget into its offscreen layer (if needed) and composite it)doc";
+
+static const char *__doc_nanogui_Widget_draw_time =
+R"doc(Return the time (in milliseconds) spent in the most recent call to
+draw(), including descendants
+
+Only available when per-widget profiling is enabled (see
+Screen::set_widget_profiling()), and only for widgets that are drawn
+by the default draw() implementation of their parent.)doc";
+
+static const char *__doc_nanogui_Widget_draw_time_exclusive =
+R"doc(Return the time spent in the most recent call to draw(), excluding
+descendants)doc";
+
 static const char *__doc_nanogui_Widget_enabled = R"doc(Return whether or not this widget is currently enabled)doc";
 
 static const char *__doc_nanogui_Widget_find_widget = R"doc(Determine the widget located at the given position value (recursive))doc";
@@ -3174,18 +4267,73 @@ Remark:
     nanogui::Widget::m_icon_extra_scale. This tiered scaling strategy
     may not be appropriate with fonts other than ``entypo.ttf``.)doc";
 
+static const char *__doc_nanogui_Widget_invalidate_layer =
+R"doc(Discard the cached layer contents of this widget and of all ancestors
+that use layers)doc";
+
+static const char *__doc_nanogui_Widget_invalidate_layout =
+R"doc(Mark the layout of this widget as out of date
+
+This discards the memoized preferred size (see preferred_size_cached())
+of this widget and its ancestors, which will then be laid out again by
+the next call to perform_layout() on any of them. This happens
+automatically when children are added or removed, and when the
+visibility, size, fixed size, font size, icon scale, theme, or layout
+generator of a widget change. The standard widgets also invalidate
+their layout when their caption or other content affecting their
+preferred size changes. Custom widgets should do the same.
+
+Invalidations issued while a layout is being computed only affect the
+widget itself, since the ancestor performing the layout accounts for
+them. When ``recursive`` is ``True``, all descendants are invalidated
+as well. This is required after modifying the fields of a Theme in
+place, e.g. via ``screen.invalidate_layout(True)``, since widgets
+cannot observe such changes and would keep using stale sizes.)doc";
+
+static const char *__doc_nanogui_Widget_invalidate_spatial_index =
+R"doc(Mark the spatial index (see set_spatial_index()) as out of date)doc";
+
 static const char *__doc_nanogui_Widget_keyboard_character_event = R"doc(Handle text input (UTF-32 format) (default implementation: do nothing))doc";
 
 static const char *__doc_nanogui_Widget_keyboard_event = R"doc(Handle a keyboard event (default implementation: do nothing))doc";
 
+static const char *__doc_nanogui_Widget_layer =
+R"doc(Return whether this widget is rendered via a cached offscreen layer)doc";
+
 static const char *__doc_nanogui_Widget_layout = R"doc(Return the used Layout generator)doc";
 
 static const char *__doc_nanogui_Widget_layout_2 = R"doc(Return the used Layout generator)doc";
 
+static const char *__doc_nanogui_Widget_layout_count =
+R"doc(Return the number of perform_layout() calls (of all widgets) since the last reset)doc";
+
+static const char *__doc_nanogui_Widget_layout_dirty =
+R"doc(Return whether the layout of this widget or of one of its descendants is out of date)doc";
+
+static const char *__doc_nanogui_Widget_layout_time =
+R"doc(Return the time (in milliseconds) spent in the most recent call to
+perform_layout(), including descendants
+
+Only available when per-widget profiling is enabled (see
+Screen::set_widget_profiling()), and only for widgets whose
+perform_layout() implementation invokes the one of this class.)doc";
+
+static const char *__doc_nanogui_Widget_layout_time_exclusive =
+R"doc(Return the time spent in the most recent call to perform_layout(),
+excluding descendants)doc";
+
 static const char *__doc_nanogui_Widget_m_children = R"doc()doc";
 
 static const char *__doc_nanogui_Widget_m_cursor = R"doc()doc";
 
+static const char *__doc_nanogui_Widget_m_draw_time =
+R"doc(Timings of the most recent draw() and perform_layout() calls (see
+draw_time()))doc";
+
+static const char *__doc_nanogui_Widget_m_draw_time_exclusive =
+R"doc(Timings of the most recent draw() and perform_layout() calls (see
+draw_time()))doc";
+
 static const char *__doc_nanogui_Widget_m_enabled =
 R"doc(Whether or not this Widget is currently enabled. Various different
 kinds of derived types use this to determine whether or not user input
@@ -3225,16 +4373,40 @@ declared `mIcon` if (nvgIsFontIcon(mIcon)) { ih *= icon_scale();
 nvgFontFace(ctx, "icons"); nvgFontSize(ctx, ih); /// remaining drawing
 code (see button.cpp for more) } } \endrst)doc";
 
+static const char *__doc_nanogui_Widget_m_layer = R"doc(Offscreen layer state (see set_layer()))doc";
+
+static const char *__doc_nanogui_Widget_m_layer_ctx = R"doc(NanoVG context that owns 'm_layer_image')doc";
+
+static const char *__doc_nanogui_Widget_m_layer_dirty = R"doc(Offscreen layer state (see set_layer()))doc";
+
+static const char *__doc_nanogui_Widget_m_layer_image = R"doc()doc";
+
+static const char *__doc_nanogui_Widget_m_layer_pass = R"doc()doc";
+
+static const char *__doc_nanogui_Widget_m_layer_texture = R"doc()doc";
+
 static const char *__doc_nanogui_Widget_m_layout = R"doc()doc";
 
+static const char *__doc_nanogui_Widget_m_layout_time = R"doc()doc";
+
+static const char *__doc_nanogui_Widget_m_layout_time_exclusive = R"doc()doc";
+
 static const char *__doc_nanogui_Widget_m_mouse_focus = R"doc()doc";
 
 static const char *__doc_nanogui_Widget_m_parent = R"doc()doc";
 
 static const char *__doc_nanogui_Widget_m_pos = R"doc()doc";
 
+static const char *__doc_nanogui_Widget_m_raw_input = R"doc()doc";
+
+static const char *__doc_nanogui_Widget_m_screen = R"doc(Screen containing this widget (cached, see set_parent()))doc";
+
 static const char *__doc_nanogui_Widget_m_size = R"doc()doc";
 
+static const char *__doc_nanogui_Widget_m_spatial_index = R"doc()doc";
+
+static const char *__doc_nanogui_Widget_m_spatial_index_dirty = R"doc()doc";
+
 static const char *__doc_nanogui_Widget_m_theme = R"doc()doc";
 
 static const char *__doc_nanogui_Widget_m_tooltip = R"doc()doc";
@@ -3243,6 +4415,16 @@ static const char *__doc_nanogui_Widget_m_visible =
 R"doc(Whether or not this Widget is currently visible. When a Widget is not
 currently visible, no time is wasted executing its drawing method.)doc";
 
+static const char *__doc_nanogui_Widget_mark_dirty =
+R"doc(Mark the region covered by this widget as needing to be redrawn
+
+This forwards the widget's bounding rectangle (in screen coordinates)
+to Screen::invalidate_rect(). When the parent screen performs partial
+redraws, only the damaged portion of the framebuffer will be repainted
+during the next frame. Widgets that draw outside of their bounds
+should call Screen::invalidate_rect() with a suitably enlarged region
+instead.)doc";
+
 static const char *__doc_nanogui_Widget_mouse_button_event =
 R"doc(Handle a mouse button event (default implementation: propagate to
 children))doc";
@@ -3269,15 +4451,35 @@ static const char *__doc_nanogui_Widget_position = R"doc(Return the position rel
 
 static const char *__doc_nanogui_Widget_preferred_size = R"doc(Compute the preferred size of the widget)doc";
 
+static const char *__doc_nanogui_Widget_preferred_size_cached =
+R"doc(Return the preferred size of the widget, memoizing the result of
+preferred_size() until invalidate_layout() is called
+
+Layout generators and containers use this function to query the
+preferred size of their children.)doc";
+
+static const char *__doc_nanogui_Widget_profile_begin = R"doc(Start timing a method of this widget (see draw_time()))doc";
+
+static const char *__doc_nanogui_Widget_profile_end =
+R"doc(Stop timing and store the inclusive and exclusive durations in
+milliseconds)doc";
+
+static const char *__doc_nanogui_Widget_raw_input =
+R"doc(Return whether this widget receives raw input events (see set_raw_input()))doc";
+
+static const char *__doc_nanogui_Widget_release_layer = R"doc(Release the resources associated with the offscreen layer)doc";
+
 static const char *__doc_nanogui_Widget_remove_child = R"doc(Remove a child widget by value)doc";
 
 static const char *__doc_nanogui_Widget_remove_child_at = R"doc(Remove a child widget by index)doc";
 
 static const char *__doc_nanogui_Widget_request_focus = R"doc(Request the focus to be moved to this widget)doc";
 
-static const char *__doc_nanogui_Widget_screen = R"doc(Walk up the hierarchy and return the parent screen)doc";
+static const char *__doc_nanogui_Widget_reset_layout_count = R"doc(Reset the counter returned by layout_count())doc";
 
-static const char *__doc_nanogui_Widget_screen_2 = R"doc(Walk up the hierarchy and return the parent screen (const version))doc";
+static const char *__doc_nanogui_Widget_screen = R"doc(Return the screen containing this widget (or ``None`` if it is not attached to one))doc";
+
+static const char *__doc_nanogui_Widget_screen_2 = R"doc(Return the screen containing this widget (const version))doc";
 
 static const char *__doc_nanogui_Widget_scroll_event =
 R"doc(Handle a mouse scroll event (default implementation: propagate to
@@ -3310,15 +4512,64 @@ static const char *__doc_nanogui_Widget_set_icon_extra_scale =
 R"doc(Sets the amount of extra scaling applied to *icon* fonts. See
 nanogui::Widget::m_icon_extra_scale.)doc";
 
+static const char *__doc_nanogui_Widget_set_layer =
+R"doc(Render this widget and its descendants via a cached offscreen layer
+
+When enabled, the widget subtree is rendered once into an offscreen
+texture, which is then composited as a single image until the layer
+is invalidated. This greatly reduces the per-frame cost of large
+static widget hierarchies (e.g. forms created using FormHelper).
+
+The layer is invalidated automatically when descendants change their
+size, position, visibility, theme, or layout, when they handle input
+events, when they are marked via mark_dirty(), and by the value
+setters of the standard widgets. Custom widgets whose appearance
+depends on other state should call invalidate_layer().
+
+Layers take effect when the widget is drawn by the default draw()
+implementation of its parent. Subtrees containing a Canvas cannot be
+cached. This feature is currently only supported by the OpenGL and
+GLES backends; it has no effect when using Metal.)doc";
+
 static const char *__doc_nanogui_Widget_set_layout = R"doc(Set the used Layout generator)doc";
 
 static const char *__doc_nanogui_Widget_set_parent = R"doc(Set the parent widget)doc";
 
 static const char *__doc_nanogui_Widget_set_position = R"doc(Set the position relative to the parent widget)doc";
 
+static const char *__doc_nanogui_Widget_set_raw_input =
+R"doc(Opt out of input event coalescing
+
+When event coalescing is enabled (see Screen::set_event_coalescing()),
+mouse motion, drag, and scroll events targeting this widget or its
+descendants are nevertheless dispatched individually.)doc";
+
+static const char *__doc_nanogui_Widget_set_screen =
+R"doc(Update the cached screen pointer of this widget and its descendants)doc";
+
 static const char *__doc_nanogui_Widget_set_size = R"doc(set the size of the widget)doc";
 
-static const char *__doc_nanogui_Widget_set_theme = R"doc(Set the Theme used to draw this widget)doc";
+static const char *__doc_nanogui_Widget_set_spatial_index =
+R"doc(Accelerate find_widget() using a spatial index of the children of this
+widget
+
+By default, hit testing visits the children in reverse order until it
+encounters one that contains the cursor, which becomes slow for
+containers with thousands of children. When enabled, the children are
+additionally binned into a uniform grid, so that only the few children
+overlapping the cell below the cursor need to be tested. The result is
+identical (the topmost visible child wins).
+
+The grid is rebuilt lazily upon the next query whenever children are
+added, removed, moved, or resized (e.g. by perform_layout()). Widgets
+that modify the position or size of their children without using
+set_position() or set_size() must call invalidate_spatial_index().)doc";
+
+static const char *__doc_nanogui_Widget_set_theme =
+R"doc(Set the Theme used to draw this widget and its children
+
+This invalidates the layout. Modifying the current theme in place
+does not, see invalidate_layout().)doc";
 
 static const char *__doc_nanogui_Widget_set_tooltip = R"doc()doc";
 
@@ -3330,12 +4581,25 @@ static const char *__doc_nanogui_Widget_set_width = R"doc(Set the width of the w
 
 static const char *__doc_nanogui_Widget_size = R"doc(Return the size of the widget)doc";
 
+static const char *__doc_nanogui_Widget_spatial_index =
+R"doc(Return whether find_widget() uses a spatial index of the children)doc";
+
 static const char *__doc_nanogui_Widget_theme = R"doc(Return the Theme used to draw this widget)doc";
 
 static const char *__doc_nanogui_Widget_theme_2 = R"doc(Return the Theme used to draw this widget)doc";
 
 static const char *__doc_nanogui_Widget_tooltip = R"doc()doc";
 
+static const char *__doc_nanogui_Widget_topmost_child =
+R"doc(Return the topmost visible child containing the given position (relative to this widget))doc";
+
+static const char *__doc_nanogui_Widget_update_layout =
+R"doc(Invoke perform_layout() if the layout of this widget or of one of its
+descendants is out of date
+
+Layout generators call this function on their children, so that a
+relayout only touches the affected subtrees.)doc";
+
 static const char *__doc_nanogui_Widget_visible =
 R"doc(Return whether or not the widget is currently visible (assuming all
 parents are visible))doc";
@@ -3537,6 +4801,8 @@ Parameter ``multiple``:
 
 static const char *__doc_nanogui_get_type = R"doc(Convert from a C++ type to an element of VariableType)doc";
 
+static const char *__doc_nanogui_gl_state_stats = R"doc(Return the counters of the OpenGL state cache)doc";
+
 static const char *__doc_nanogui_init =
 R"doc(Static initialization; should be called once before invoking **any**
 NanoGUI functions **if** you are having NanoGUI manage OpenGL / GLFW.
@@ -3545,12 +4811,40 @@ are managing OpenGL / GLFW on your own *do not call this method*.
 
 \rst Refer to :ref:`nanogui_example_3` for how you might go about
 managing OpenGL and GLFW on your own, while still using NanoGUI's
-classes. \endrst)doc";
+classes. \endrst
+
+Parameter ``headless``:
+    Initialize GLFW without connecting to a window system, which is
+    useful for rendering on servers without a display. Only headless
+    screens (see Screen::Screen()) can be created in this case. This
+    requires GLFW's "null" platform (GLFW 3.4 or newer) and has no
+    effect otherwise.)doc";
+
+static const char *__doc_nanogui_invalidate_gl_state =
+R"doc(Discard NanoGUI's cached copy of the OpenGL state
+
+NanoGUI skips redundant state changes (bound programs, vertex arrays,
+framebuffers and textures, blending, depth and culling modes, the
+viewport and scissor rectangle) by tracking the current state. Code that
+changes this state via raw OpenGL calls, e.g. in Screen::draw_contents(),
+must call this function afterwards. The cached state belongs to the
+context that was current when it was recorded and is discarded
+automatically when another context becomes current.)doc";
+
+static const char *__doc_nanogui_invalidate_text_metrics =
+R"doc(Discard cached text measurements
+
+This must be called when fonts are added to a NanoVG context (including
+fallback fonts), or when its pixel ratio changes. When ``ctx`` is
+``nullptr``, the measurements of all contexts are discarded.)doc";
 
 static const char *__doc_nanogui_leave =
 R"doc(Request the application main loop to terminate (e.g. if you detached
 mainloop).)doc";
 
+static const char *__doc_nanogui_list_image_directory =
+R"doc(List the PNG images in a directory without loading them. Returns pairs of an empty image handle (0) and the full filename.)doc";
+
 static const char *__doc_nanogui_load_image_directory =
 R"doc(Load a directory of PNG images and upload them to the GPU (suitable
 for use with ImagePanel))doc";
@@ -3558,11 +4852,18 @@ for use with ImagePanel))doc";
 static const char *__doc_nanogui_mainloop =
 R"doc(Enter the application main loop
 
+The main loop sleeps until an keyboard/mouse/.. event is received or
+until the next redraw deadline requested via Screen::schedule_redraw()
+expires, whichever comes first. When no screen is animating, the
+application therefore does not wake up at all. The frame rate of each
+screen can be limited using Screen::set_target_fps().
+
 Parameter ``refresh``:
     NanoGUI issues a redraw call whenever an keyboard/mouse/.. event
     is received. In the absence of any external events, it enforces a
     redraw once every ``refresh`` milliseconds. To disable the refresh
-    timer, specify a negative value here.
+    timer, specify a negative value here. Animations should preferably
+    use Screen::schedule_redraw() instead.
 
 Parameter ``detach``:
     This parameter only exists in the Python bindings. When the active
@@ -3726,6 +5027,14 @@ static const char *__doc_nanogui_ref_ref_3 = R"doc(Copy constructor)doc";
 
 static const char *__doc_nanogui_ref_ref_4 = R"doc(Move constructor)doc";
 
+static const char *__doc_nanogui_reset_gl_state_stats = R"doc(Reset the counters returned by gl_state_stats())doc";
+
+static const char *__doc_nanogui_reset_text_metrics_stats = R"doc(Reset the counters returned by text_metrics_stats())doc";
+
+static const char *__doc_nanogui_set_text_metrics_capacity =
+R"doc(Set the maximum number of cached measurements, evicting the least
+recently used ones)doc";
+
 static const char *__doc_nanogui_shutdown = R"doc(Static shutdown; should be called before the application terminates.)doc";
 
 static const char *__doc_nanogui_squared_norm = R"doc()doc";
@@ -3744,6 +5053,30 @@ Returns:
     A ``std::pair`` with two boolean values. The first indicates
     10-bit color support, and the second indicates EDR support.)doc";
 
+static const char *__doc_nanogui_text_bounds =
+R"doc(Cached version of ``nvgTextBounds()``
+
+Selects the given font face, size, alignment (a combination of
+``NVGalign`` flags, where ``0`` corresponds to NanoVG's default) and
+letter spacing in ``ctx`` and returns the horizontal advance of ``text``.
+When ``bounds`` is specified, it receives the bounding box
+``[xmin, ymin, xmax, ymax]`` of the text when drawn at the origin.
+
+The text state remains selected in ``ctx`` afterwards, so that the caller
+can go on to draw the string.)doc";
+
+static const char *__doc_nanogui_text_box_bounds =
+R"doc(Cached version of ``nvgTextBoxBounds()``
+
+Like text_bounds(), but breaks ``text`` into rows that are at most
+``break_width`` wide and stores the bounding box of the resulting
+paragraph (drawn at the origin) in ``bounds``.)doc";
+
+static const char *__doc_nanogui_text_metrics_capacity =
+R"doc(Return the maximum number of cached measurements (default: 4096))doc";
+
+static const char *__doc_nanogui_text_metrics_stats = R"doc(Return the counters of the text metrics cache)doc";
+
 static const char *__doc_nanogui_type_name =
 R"doc(Return the name (e.g. "uint8") associated with a specific variable
 type)doc";
@@ -25,6 +25,20 @@ void register_quad(nb::module_ &m) {
              "exposure"_a)
         .def("texture_exposure", &TexturedQuad::texture_exposure,
              D(TexturedQuad, texture_exposure))
+        .def("set_auto_exposure", &TexturedQuad::set_auto_exposure,
+             D(TexturedQuad, set_auto_exposure),
+             "enabled"_a)
+        .def("auto_exposure", &TexturedQuad::auto_exposure,
+             D(TexturedQuad, auto_exposure))
+        .def("set_auto_exposure_percentile", &TexturedQuad::set_auto_exposure_percentile,
+             D(TexturedQuad, set_auto_exposure_percentile),
+             "percentile"_a)
+        .def("auto_exposure_percentile", &TexturedQuad::auto_exposure_percentile,
+             D(TexturedQuad, auto_exposure_percentile))
+        .def("update_auto_exposure", &TexturedQuad::update_auto_exposure,
+             D(TexturedQuad, update_auto_exposure))
+        .def("image_stats", &TexturedQuad::image_stats,
+             D(TexturedQuad, image_stats))
         .def("draw", &TexturedQuad::draw,
              D(TexturedQuad, draw));
 }
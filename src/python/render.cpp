@@ -1,6 +1,7 @@
 #ifdef NANOGUI_PYTHON
 
 #include <nanobind/ndarray.h>
+#include <unordered_map>
 
 #include "python.h"
 
@@ -62,7 +63,27 @@ shader_set_buffer(Shader &shader, const std::string &name,
     shader.set_buffer(name, dtype, array.ndim(), dim, array.data());
 }
 
-static nb::ndarray<nb::numpy> texture_download(Texture &texture) {
+static void
+shader_update_buffer(Shader &shader, const std::string &name, size_t offset,
+                     nb::ndarray<nb::device::cpu, nb::c_contig> array) {
+    if (array.ndim() > 3)
+        throw nb::type_error("Shader::update_buffer(): number of array dimensions must be < 3!");
+
+    VariableType dtype = interpret_dlpack_dtype(array.dtype());
+
+    if (dtype == VariableType::Invalid)
+        throw nb::type_error("Shader::update_buffer(): unsupported array dtype!");
+
+    size_t dim[3] {
+        array.ndim() > 0 ? (size_t) array.shape(0) : 1,
+        array.ndim() > 1 ? (size_t) array.shape(1) : 1,
+        array.ndim() > 2 ? (size_t) array.shape(2) : 1
+    };
+
+    shader.update_buffer(name, dtype, offset, array.ndim(), dim, array.data());
+}
+
+static nb::dlpack::dtype texture_dtype(const Texture &texture) {
     nb::dlpack::dtype dt;
 
     switch (texture.component_format()) {
@@ -77,9 +98,16 @@ static nb::ndarray<nb::numpy> texture_download(Texture &texture) {
         default: throw std::runtime_error("Invalid component format");
     }
 
+    return dt;
+}
+
+/// Allocate an array that can hold the contents of 'texture'
+static nb::ndarray<nb::numpy> texture_array(const Texture &texture, const Vector2i &size) {
+    nb::dlpack::dtype dt = texture_dtype(texture);
+
     // Dynamically allocate 'data'
-    size_t shape[3] = { (size_t) texture.size().y(),
-                        (size_t) texture.size().x(),
+    size_t shape[3] = { (size_t) size.y(),
+                        (size_t) size.x(),
                         (size_t) texture.channels() };
     uint8_t *ptr = new uint8_t[shape[0] * shape[1] * shape[2] * dt.bits / 8];
 
@@ -88,11 +116,96 @@ static nb::ndarray<nb::numpy> texture_download(Texture &texture) {
        delete[] (uint8_t *) p;
     });
 
-    texture.download(ptr);
-
     return nb::ndarray<nb::numpy>(ptr, 3, shape, owner, nullptr, dt);
 }
 
+/// Check that a caller-provided array can receive 'size' bytes of texture data
+static void check_download_target(const char *name, const Texture &texture, size_t size,
+                                  const nb::ndarray<nb::device::cpu, nb::c_contig> &array) {
+    nb::dlpack::dtype dt = texture_dtype(texture);
+    size_t array_size = array.dtype().bits / 8;
+    for (size_t i = 0; i < array.ndim(); ++i)
+        array_size *= (size_t) array.shape(i);
+
+    if (!(array.dtype() == dt))
+        throw std::runtime_error(std::string(name) +
+                                 "(): dtype of array does not match the texture!");
+    else if (array_size != size)
+        throw std::runtime_error(std::string(name) +
+                                 "(): array size does not match the texture!");
+}
+
+static nb::ndarray<nb::numpy> texture_download(Texture &texture) {
+    nb::ndarray<nb::numpy> result = texture_array(texture, texture.size());
+    texture.download((uint8_t *) result.data());
+    return result;
+}
+
+static void texture_download_into(Texture &texture,
+                                  nb::ndarray<nb::device::cpu, nb::c_contig> out) {
+    check_download_target("Texture::download", texture,
+                          texture.bytes_per_pixel() * texture.size().x() *
+                              texture.size().y(), out);
+    texture.download((uint8_t *) out.data());
+}
+
+static nb::ndarray<nb::numpy> texture_download_read(TextureDownload &download) {
+    nb::ndarray<nb::numpy> result = texture_array(*download.texture(), download.texture_size());
+    download.read((uint8_t *) result.data());
+    return result;
+}
+
+static void texture_download_read_into(TextureDownload &download,
+                                       nb::ndarray<nb::device::cpu, nb::c_contig> out) {
+    check_download_target("TextureDownload::read", *download.texture(),
+                          download.size(), out);
+    download.read((uint8_t *) out.data());
+}
+
+static nb::ndarray<nb::numpy, float, nb::ndim<1>> image_stats_histogram(const ImageStats &stats) {
+    const std::vector<float> &histogram = stats.histogram();
+    float *data = new float[histogram.size()];
+    std::copy(histogram.begin(), histogram.end(), data);
+    nb::capsule owner(data, [](void *p) noexcept { delete[] (float *) p; });
+    size_t shape[1] = { histogram.size() };
+    return nb::ndarray<nb::numpy, float, nb::ndim<1>>(data, 1, shape, owner);
+}
+
+/// Number of live arrays returned by map_upload() per texture (protected by the GIL)
+static std::unordered_map<const Texture *, size_t> texture_upload_views;
+
+static nb::ndarray<nb::numpy> texture_map_upload(Texture &texture) {
+    nb::dlpack::dtype dt = texture_dtype(texture);
+    size_t shape[3] = { (size_t) texture.size().y(),
+                        (size_t) texture.size().x(),
+                        (size_t) texture.channels() };
+
+    uint8_t *data = texture.map_upload();
+
+    /* The mapped memory is owned by the texture. Keep the texture alive, and
+       track the array (and views derived from it) so that unmap_upload()
+       can refuse to invalidate the memory while it is still referenced */
+    texture.inc_ref();
+    texture_upload_views[&texture]++;
+    nb::capsule owner(&texture, [](void *p) noexcept {
+        Texture *texture = (Texture *) p;
+        auto it = texture_upload_views.find(texture);
+        if (--it->second == 0)
+            texture_upload_views.erase(it);
+        texture->dec_ref();
+    });
+
+    return nb::ndarray<nb::numpy>(data, 3, shape, owner, nullptr, dt);
+}
+
+static void texture_unmap_upload(Texture &texture) {
+    if (texture_upload_views.find(&texture) != texture_upload_views.end())
+        throw std::runtime_error(
+            "Texture::unmap_upload(): the array returned by map_upload() is "
+            "still referenced, delete it (and any views of it) first!");
+    texture.unmap_upload();
+}
+
 static void texture_upload(Texture &texture,
                            nb::ndarray<nb::device::cpu, nb::c_contig> array) {
     size_t n_channels          = array.ndim() == 3 ? array.shape(2) : 1;
@@ -220,7 +333,11 @@ void register_render(nb::module_ &m) {
         .def("bytes_per_pixel", &Texture::bytes_per_pixel, D(Texture, bytes_per_pixel))
         .def("channels", &Texture::channels, D(Texture, channels))
         .def("download", &texture_download, D(Texture, download))
+        .def("download", &texture_download_into, "out"_a, D(Texture, download))
+        .def("download_async", &Texture::download_async, D(Texture, download_async))
         .def("upload", &texture_upload, D(Texture, upload))
+        .def("map_upload", &texture_map_upload, D(Texture, map_upload))
+        .def("unmap_upload", &texture_unmap_upload, D(Texture, unmap_upload))
         .def("upload_sub_region", &texture_upload_sub_region, D(Texture, upload, origin))
         .def("generate_mipmap", &Texture::generate_mipmap, D(Texture, generate_mipmap))
         .def("resize", &Texture::resize, D(Texture, resize))
@@ -232,6 +349,30 @@ void register_render(nb::module_ &m) {
 #endif
         ;
 
+    nb::class_<TextureDownload, Object>(m, "TextureDownload", D(TextureDownload))
+        .def("texture", &TextureDownload::texture, D(TextureDownload, texture))
+        .def("texture_size", &TextureDownload::texture_size, D(TextureDownload, texture_size))
+        .def("size", &TextureDownload::size, D(TextureDownload, size))
+        .def("ready", &TextureDownload::ready, D(TextureDownload, ready))
+        .def("read", &texture_download_read, D(TextureDownload, read))
+        .def("read", &texture_download_read_into, "out"_a, D(TextureDownload, read));
+
+    nb::class_<ImageStats, Object>(m, "ImageStats", D(ImageStats))
+        .def(nb::init<size_t, bool>(), D(ImageStats, ImageStats),
+             "bins"_a = 64, "log_histogram"_a = true)
+        .def("bins", &ImageStats::bins, D(ImageStats, bins))
+        .def("log_histogram", &ImageStats::log_histogram, D(ImageStats, log_histogram))
+        .def("compute", &ImageStats::compute, D(ImageStats, compute), "texture"_a)
+        .def("pending", &ImageStats::pending, D(ImageStats, pending))
+        .def("ready", &ImageStats::ready, D(ImageStats, ready))
+        .def("fetch", &ImageStats::fetch, D(ImageStats, fetch), "wait"_a = true)
+        .def("minimum", &ImageStats::minimum, D(ImageStats, minimum))
+        .def("maximum", &ImageStats::maximum, D(ImageStats, maximum))
+        .def("mean", &ImageStats::mean, D(ImageStats, mean))
+        .def("histogram", &image_stats_histogram, D(ImageStats, histogram))
+        .def("histogram_range", &ImageStats::histogram_range, D(ImageStats, histogram_range))
+        .def("percentile", &ImageStats::percentile, D(ImageStats, percentile), "q"_a);
+
     auto shader = nb::class_<Shader, Object>(m, "Shader", D(Shader));
 
     nb::enum_<BlendMode>(shader, "BlendMode", D(Shader, BlendMode))
@@ -240,20 +381,39 @@ void register_render(nb::module_ &m) {
 
     shader
         .def(nb::init<RenderPass *, const std::string &,
-                      const std::string &, const std::string &, Shader::BlendMode>(),
+                      const std::string &, const std::string &, Shader::BlendMode, bool>(),
              D(Shader, Shader), "render_pass"_a, "name"_a, "vertex_shader"_a,
-             "fragment_shader"_a, "blend_mode"_a = BlendMode::None)
+             "fragment_shader"_a, "blend_mode"_a = BlendMode::None,
+             "async_compile"_a = false)
         .def("name", &Shader::name, D(Shader, name))
         .def("blend_mode", &Shader::blend_mode, D(Shader, blend_mode))
+        .def("ready", &Shader::ready, D(Shader, ready))
         .def("set_buffer", &shader_set_buffer, D(Shader, set_buffer))
+        .def("update_buffer", &shader_update_buffer, D(Shader, update_buffer),
+             "name"_a, "offset"_a, "array"_a)
+        .def("buffer_rows", &Shader::buffer_rows, D(Shader, buffer_rows))
+        .def("set_buffer_divisor", &Shader::set_buffer_divisor,
+             D(Shader, set_buffer_divisor), "name"_a, "divisor"_a)
+        .def("buffer_divisor", &Shader::buffer_divisor, D(Shader, buffer_divisor))
         .def("set_texture", &Shader::set_texture, D(Shader, set_texture))
         .def("begin", &Shader::begin, D(Shader, begin))
         .def("end", &Shader::end, D(Shader, end))
         .def("__enter__", &Shader::begin)
         .def("__exit__", [](Shader &s, nb::handle, nb::handle, nb::handle) { s.end(); },
              "type"_a.none(), "value"_a.none(), "traceback"_a.none())
+        .def_static("set_program_cache_dir", &Shader::set_program_cache_dir,
+                    D(Shader, set_program_cache_dir))
+        .def_static("program_cache_dir", &Shader::program_cache_dir,
+                    D(Shader, program_cache_dir))
+        .def_static("default_program_cache_dir", &Shader::default_program_cache_dir,
+                    D(Shader, default_program_cache_dir))
+        .def_static("program_cache_stats", &Shader::program_cache_stats,
+                    D(Shader, program_cache_stats))
+        .def_static("reset_program_cache_stats", &Shader::reset_program_cache_stats,
+                    D(Shader, reset_program_cache_stats))
         .def("draw_array", &Shader::draw_array, D(Shader, draw_array),
-             "primitive_type"_a, "offset"_a, "count"_a, "indexed"_a = false)
+             "primitive_type"_a, "offset"_a, "count"_a, "indexed"_a = false,
+             "instance_count"_a = 1)
 #if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
         .def("shader_handle", &Shader::shader_handle)
 #elif defined(NANOGUI_USE_METAL)
@@ -264,6 +424,23 @@ void register_render(nb::module_ &m) {
 #endif
         ;
 
+    nb::class_<Shader::ProgramCacheStats>(shader, "ProgramCacheStats",
+                                          D(Shader, ProgramCacheStats))
+        .def_ro("hits", &Shader::ProgramCacheStats::hits,
+                D(Shader, ProgramCacheStats, hits))
+        .def_ro("misses", &Shader::ProgramCacheStats::misses,
+                D(Shader, ProgramCacheStats, misses))
+        .def_ro("rejected", &Shader::ProgramCacheStats::rejected,
+                D(Shader, ProgramCacheStats, rejected))
+        .def_ro("stores", &Shader::ProgramCacheStats::stores,
+                D(Shader, ProgramCacheStats, stores))
+        .def("__repr__", [](const Shader::ProgramCacheStats &s) {
+            return "ProgramCacheStats[hits=" + std::to_string(s.hits) +
+                   ", misses=" + std::to_string(s.misses) +
+                   ", rejected=" + std::to_string(s.rejected) +
+                   ", stores=" + std::to_string(s.stores) + "]";
+        });
+
     nb::enum_<PrimitiveType>(shader, "PrimitiveType", D(Shader, PrimitiveType))
         .value("Point", PrimitiveType::Point, D(Shader, PrimitiveType, Point))
         .value("Line", PrimitiveType::Line, D(Shader, PrimitiveType, Line))
@@ -21,6 +21,10 @@ void register_textarea(nb::module_ &m) {
         .def("is_selectable", &TextArea::is_selectable, D(TextArea, is_selectable))
         .def("append", &TextArea::append, D(TextArea, append))
         .def("append_line", &TextArea::append_line, D(TextArea, append_line))
+        .def("append_lines", &TextArea::append_lines, D(TextArea, append_lines))
+        .def("set_max_lines", &TextArea::set_max_lines, D(TextArea, set_max_lines))
+        .def("max_lines", &TextArea::max_lines, D(TextArea, max_lines))
+        .def("line_count", &TextArea::line_count, D(TextArea, line_count))
         .def("clear", &TextArea::clear, D(TextArea, clear));
 }
 
@@ -2,6 +2,7 @@
 
 #include "python.h"
 #include <nanobind/make_iterator.h>
+#include <nanobind/ndarray.h>
 
 DECLARE_WIDGET(Widget);
 DECLARE_SCREEN(Screen);
@@ -90,6 +91,51 @@ int widget_tp_clear(PyObject *self) {
     return 0;
 }
 
+/// Render a frame and return its contents as a NumPy array
+static nb::ndarray<nb::numpy, uint8_t> screen_capture(Screen &screen) {
+    std::vector<uint8_t> *data = new std::vector<uint8_t>(screen.capture());
+    size_t shape[3] = { (size_t) screen.framebuffer_size().y(),
+                        (size_t) screen.framebuffer_size().x(), 4 };
+
+    // Delete 'data' when the 'owner' capsule expires
+    nb::capsule owner(data, [](void *p) noexcept {
+        delete (std::vector<uint8_t> *) p;
+    });
+
+    return nb::ndarray<nb::numpy, uint8_t>(data->data(), 3, shape, owner);
+}
+
+/// Convert the frame timings of a screen into a dictionary of NumPy arrays
+static nb::dict screen_frame_stats(const Screen &screen) {
+    std::vector<FrameStats> stats = screen.frame_stats();
+    size_t shape[1] = { stats.size() };
+
+    auto make_array = [&](auto getter) {
+        using T = std::decay_t<decltype(getter(stats[0]))>;
+        T *ptr = new T[stats.size()];
+        for (size_t i = 0; i < stats.size(); ++i)
+            ptr[i] = getter(stats[i]);
+
+        // Delete 'ptr' when the 'owner' capsule expires
+        nb::capsule owner(ptr, [](void *p) noexcept {
+            delete[] (T *) p;
+        });
+
+        return nb::ndarray<nb::numpy, T>(ptr, 1, shape, owner);
+    };
+
+    nb::dict result;
+    result["timestamp"] = make_array([](const FrameStats &s) { return s.timestamp; });
+    result["setup"] = make_array([](const FrameStats &s) { return s.setup; });
+    result["contents"] = make_array([](const FrameStats &s) { return s.contents; });
+    result["widgets"] = make_array([](const FrameStats &s) { return s.widgets; });
+    result["flush"] = make_array([](const FrameStats &s) { return s.flush; });
+    result["teardown"] = make_array([](const FrameStats &s) { return s.teardown; });
+    result["total"] = make_array([](const FrameStats &s) { return s.total; });
+    result["culled"] = make_array([](const FrameStats &s) { return s.culled; });
+    return result;
+}
+
 void register_widget(nb::module_ &m) {
     object_init_py(
         [](PyObject *o) noexcept {
@@ -158,6 +204,14 @@ void register_widget(nb::module_ &m) {
         .def("focused", &Widget::focused, D(Widget, focused))
         .def("set_focused", &Widget::set_focused, D(Widget, set_focused))
         .def("request_focus", &Widget::request_focus, D(Widget, request_focus))
+        .def("mark_dirty", &Widget::mark_dirty, D(Widget, mark_dirty))
+        .def("layer", &Widget::layer, D(Widget, layer))
+        .def("set_layer", &Widget::set_layer, D(Widget, set_layer))
+        .def("invalidate_layer", &Widget::invalidate_layer, D(Widget, invalidate_layer))
+        .def("draw_time", &Widget::draw_time, D(Widget, draw_time))
+        .def("draw_time_exclusive", &Widget::draw_time_exclusive, D(Widget, draw_time_exclusive))
+        .def("layout_time", &Widget::layout_time, D(Widget, layout_time))
+        .def("layout_time_exclusive", &Widget::layout_time_exclusive, D(Widget, layout_time_exclusive))
         .def("tooltip", &Widget::tooltip, D(Widget, tooltip))
         .def("set_tooltip", &Widget::set_tooltip, D(Widget, set_tooltip))
         .def("font_size", &Widget::font_size, D(Widget, font_size))
@@ -166,6 +220,11 @@ void register_widget(nb::module_ &m) {
         .def("cursor", &Widget::cursor, D(Widget, cursor))
         .def("set_cursor", &Widget::set_cursor, D(Widget, set_cursor))
         .def("find_widget", (Widget *(Widget::*)(const Vector2i &)) &Widget::find_widget, D(Widget, find_widget))
+        .def("spatial_index", &Widget::spatial_index, D(Widget, spatial_index))
+        .def("set_spatial_index", &Widget::set_spatial_index, D(Widget, set_spatial_index))
+        .def("raw_input", &Widget::raw_input, D(Widget, raw_input))
+        .def("set_raw_input", &Widget::set_raw_input, D(Widget, set_raw_input))
+        .def("invalidate_spatial_index", &Widget::invalidate_spatial_index, D(Widget, invalidate_spatial_index))
         .def("contains", &Widget::contains, D(Widget, contains))
         .def("mouse_button_event", &Widget::mouse_button_event, "p"_a, "button"_a,
              "down"_a, "modifiers"_a, D(Widget, mouse_button_event))
@@ -184,6 +243,13 @@ void register_widget(nb::module_ &m) {
              D(Widget, keyboard_character_event))
         .def("preferred_size", &Widget::preferred_size, D(Widget, preferred_size))
         .def("perform_layout", &Widget::perform_layout, D(Widget, perform_layout))
+        .def("preferred_size_cached", &Widget::preferred_size_cached, D(Widget, preferred_size_cached))
+        .def("update_layout", &Widget::update_layout, D(Widget, update_layout))
+        .def("invalidate_layout", &Widget::invalidate_layout, "recursive"_a = false,
+             D(Widget, invalidate_layout))
+        .def("layout_dirty", &Widget::layout_dirty, D(Widget, layout_dirty))
+        .def_static("layout_count", &Widget::layout_count, D(Widget, layout_count))
+        .def_static("reset_layout_count", &Widget::reset_layout_count, D(Widget, reset_layout_count))
         .def("screen", nb::overload_cast<>(&Widget::screen, nb::const_), D(Widget, screen))
         .def("window", nb::overload_cast<>(&Widget::window, nb::const_), D(Widget, window))
         .def("draw", &Widget::draw, D(Widget, draw));
@@ -201,10 +267,11 @@ void register_widget(nb::module_ &m) {
 
     nb::class_<Screen, Widget, PyScreen>(m, "Screen", D(Screen))
         .def(nb::init<const Vector2i &, const std::string &, bool, bool, bool,
-                      bool, bool, unsigned int, unsigned int>(),
+                      bool, bool, unsigned int, unsigned int, bool>(),
             "size"_a, "caption"_a = "Unnamed", "resizable"_a = true, "fullscreen"_a = false,
             "depth_buffer"_a = true, "stencil_buffer"_a = true,
-            "float_buffer"_a = false, "gl_major"_a = 3, "gl_minor"_a = 2, D(Screen, Screen))
+            "float_buffer"_a = false, "gl_major"_a = 3, "gl_minor"_a = 2,
+            "headless"_a = false, D(Screen, Screen))
         .def("caption", &Screen::caption, D(Screen, caption))
         .def("set_caption", &Screen::set_caption, D(Screen, set_caption))
         .def("background", &Screen::background, D(Screen, background))
@@ -214,6 +281,12 @@ void register_widget(nb::module_ &m) {
         .def("framebuffer_size", &Screen::framebuffer_size, D(Screen, framebuffer_size))
         .def("perform_layout", (void(Screen::*)(void)) &Screen::perform_layout, D(Screen, perform_layout))
         .def("redraw", &Screen::redraw, D(Screen, redraw))
+        .def("invalidate_rect", &Screen::invalidate_rect, "pos"_a, "size"_a,
+             D(Screen, invalidate_rect))
+        .def("partial_redraw", &Screen::partial_redraw, D(Screen, partial_redraw))
+        .def("set_partial_redraw", &Screen::set_partial_redraw, D(Screen, set_partial_redraw))
+        .def("buffer_age", &Screen::buffer_age, D(Screen, buffer_age))
+        .def("set_buffer_age", &Screen::set_buffer_age, D(Screen, set_buffer_age))
         .def("clear", &Screen::clear, D(Screen, clear))
         .def("draw_all", &Screen::draw_all, D(Screen, draw_all))
         .def("draw_contents", &Screen::draw_contents, D(Screen, draw_contents))
@@ -233,6 +306,30 @@ void register_widget(nb::module_ &m) {
         .def("pixel_format", &Screen::pixel_format, D(Screen, pixel_format))
         .def("component_format", &Screen::component_format, D(Screen, component_format))
         .def("nvg_flush", &Screen::nvg_flush, D(Screen, nvg_flush))
+        .def("nvg_reset_scissor", &Screen::nvg_reset_scissor, D(Screen, nvg_reset_scissor))
+        .def("nvg_image_from_texture", &Screen::nvg_image_from_texture,
+             "texture"_a, "flags"_a = 0, D(Screen, nvg_image_from_texture))
+        .def("schedule_redraw", &Screen::schedule_redraw, "delay"_a = 0.0,
+             D(Screen, schedule_redraw))
+        .def("target_fps", &Screen::target_fps, D(Screen, target_fps))
+        .def("set_target_fps", &Screen::set_target_fps, D(Screen, set_target_fps))
+        .def("event_coalescing", &Screen::event_coalescing, D(Screen, event_coalescing))
+        .def("set_event_coalescing", &Screen::set_event_coalescing, D(Screen, set_event_coalescing))
+        .def("flush_events", &Screen::flush_events, D(Screen, flush_events))
+        .def("prewarm_glyphs", &Screen::prewarm_glyphs, "font"_a, "sizes"_a,
+             "first"_a = 32, "last"_a = 126, D(Screen, prewarm_glyphs))
+        .def("next_frame_time", &Screen::next_frame_time, D(Screen, next_frame_time))
+        .def("frame_index", &Screen::frame_index, D(Screen, frame_index))
+        .def("profiling", &Screen::profiling, D(Screen, profiling))
+        .def("set_profiling", &Screen::set_profiling, "profiling"_a,
+             "history"_a = 256, D(Screen, set_profiling))
+        .def("widget_profiling", &Screen::widget_profiling, D(Screen, widget_profiling))
+        .def("set_widget_profiling", &Screen::set_widget_profiling, D(Screen, set_widget_profiling))
+        .def("frame_stats", &screen_frame_stats, D(Screen, frame_stats))
+        .def("culled_widgets", &Screen::culled_widgets, D(Screen, culled_widgets))
+        .def("clear_frame_stats", &Screen::clear_frame_stats, D(Screen, clear_frame_stats))
+        .def("headless", &Screen::headless, D(Screen, headless))
+        .def("capture", &screen_capture, D(Screen, capture))
 #if defined(NANOGUI_USE_METAL)
         .def("metal_layer", &Screen::metal_layer)
         .def("metal_texture", &Screen::metal_texture)
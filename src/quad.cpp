@@ -9,6 +9,7 @@
 
 #include <nanogui/quad.h>
 #include <nanogui/opengl.h>
+#include <cmath>
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -184,6 +185,7 @@ TexturedQuad::TexturedQuad(RenderPass *render_pass, BlendMode blend_mode)
 }
 
 void TexturedQuad::set_texture(Texture *texture) {
+    m_texture = texture;
     Shader::set_texture("texture_sampler", texture);
 }
 
@@ -201,6 +203,28 @@ void TexturedQuad::set_texture_exposure(float exposure) {
     set_uniform("texture_exposure", exposure);
 }
 
+void TexturedQuad::set_auto_exposure(bool enabled) {
+    m_auto_exposure = enabled;
+    if (!enabled)
+        m_image_stats = nullptr;
+}
+
+void TexturedQuad::update_auto_exposure() {
+    if (!m_auto_exposure || !m_texture)
+        return;
+    if (!m_image_stats)
+        m_image_stats = new ImageStats();
+
+    if (m_image_stats->fetch(false)) {
+        float value = m_image_stats->percentile(m_auto_exposure_percentile);
+        if (value > 0.f && std::isfinite(value))
+            set_texture_exposure(1.f / value);
+    }
+
+    if (!m_image_stats->pending())
+        m_image_stats->compute(m_texture);
+}
+
 void TexturedQuad::draw() {
     begin();
     draw_array(PrimitiveType::Triangle, 0, 6, true);
@@ -3,6 +3,7 @@
 #include <nanogui/opengl.h>
 #include <nanogui/texture.h>
 #include "opengl_check.h"
+#include "opengl_state.h"
 
 NAMESPACE_BEGIN(nanogui)
 
@@ -40,7 +41,7 @@ RenderPass::RenderPass(const std::vector<Object *> &color_targets,
     }
 
     CHK(glGenFramebuffers(1, &m_framebuffer_handle));
-    CHK(glBindFramebuffer(GL_FRAMEBUFFER, m_framebuffer_handle));
+    gl_bind_framebuffer(GL_FRAMEBUFFER, m_framebuffer_handle);
 
 #if defined(NANOGUI_USE_OPENGL)
     std::vector<GLenum> draw_buffers;
@@ -86,6 +87,7 @@ RenderPass::RenderPass(const std::vector<Object *> &color_targets,
     m_viewport_size = m_framebuffer_size;
 
     if (has_screen && !has_texture) {
+        gl_forget_framebuffer(m_framebuffer_handle);
         CHK(glDeleteFramebuffers(1, &m_framebuffer_handle));
         m_framebuffer_handle = 0;
     } else {
@@ -141,7 +143,7 @@ RenderPass::RenderPass(const std::vector<Object *> &color_targets,
         }
     }
 
-    CHK(glBindFramebuffer(GL_FRAMEBUFFER, 0));
+    gl_bind_framebuffer(GL_FRAMEBUFFER, 0);
 }
 
 RenderPass::~RenderPass() {
@@ -150,6 +152,7 @@ RenderPass::~RenderPass() {
             m_targets[i]->dec_ref();
     }
 
+    gl_forget_framebuffer(m_framebuffer_handle);
     CHK(glDeleteFramebuffers(1, &m_framebuffer_handle));
 }
 
@@ -160,18 +163,16 @@ void RenderPass::begin() {
 #endif
     m_active = true;
 
-    CHK(glGetIntegerv(GL_VIEWPORT, m_viewport_backup));
-    CHK(glGetIntegerv(GL_SCISSOR_BOX, m_scissor_backup));
-    GLboolean depth_write;
-    CHK(glGetBooleanv(GL_DEPTH_WRITEMASK, &depth_write));
-    m_depth_write_backup = depth_write;
+    gl_get_viewport(m_viewport_backup);
+    gl_get_scissor(m_scissor_backup);
+    m_depth_write_backup = gl_depth_mask();
 
-    m_depth_test_backup = glIsEnabled(GL_DEPTH_TEST);
-    m_scissor_test_backup = glIsEnabled(GL_SCISSOR_TEST);
-    m_cull_face_backup = glIsEnabled(GL_CULL_FACE);
-    m_blend_backup = glIsEnabled(GL_BLEND);
+    m_depth_test_backup = gl_is_enabled(GL_DEPTH_TEST);
+    m_scissor_test_backup = gl_is_enabled(GL_SCISSOR_TEST);
+    m_cull_face_backup = gl_is_enabled(GL_CULL_FACE);
+    m_blend_backup = gl_is_enabled(GL_BLEND);
 
-    CHK(glBindFramebuffer(GL_FRAMEBUFFER, m_framebuffer_handle));
+    gl_bind_framebuffer(GL_FRAMEBUFFER, m_framebuffer_handle);
     set_viewport(m_viewport_offset, m_viewport_size);
 
     if (m_clear) {
@@ -210,8 +211,7 @@ void RenderPass::begin() {
     set_depth_test(m_depth_test, m_depth_write);
     set_cull_mode(m_cull_mode);
 
-    if (m_blend_backup)
-        CHK(glDisable(GL_BLEND));
+    gl_set_enabled(GL_BLEND, false);
 }
 
 void RenderPass::end() {
@@ -220,36 +220,20 @@ void RenderPass::end() {
         throw std::runtime_error("RenderPass::end(): render pass is not active!");
 #endif
 
-    CHK(glBindFramebuffer(GL_FRAMEBUFFER, 0));
+    gl_bind_framebuffer(GL_FRAMEBUFFER, 0);
     if (m_blit_target)
         blit_to(Vector2i(0, 0), m_framebuffer_size, m_blit_target, Vector2i(0, 0));
 
-    CHK(glViewport(m_viewport_backup[0], m_viewport_backup[1],
-                   m_viewport_backup[2], m_viewport_backup[3]));
-    CHK(glScissor(m_scissor_backup[0], m_scissor_backup[1],
-                  m_scissor_backup[2], m_scissor_backup[3]));
+    gl_viewport(m_viewport_backup[0], m_viewport_backup[1],
+                m_viewport_backup[2], m_viewport_backup[3]);
+    gl_scissor(m_scissor_backup[0], m_scissor_backup[1],
+               m_scissor_backup[2], m_scissor_backup[3]);
 
-    if (m_depth_test_backup)
-        CHK(glEnable(GL_DEPTH_TEST));
-    else
-        CHK(glDisable(GL_DEPTH_TEST));
-
-    CHK(glDepthMask(m_depth_write_backup));
-
-    if (m_scissor_test_backup)
-        CHK(glEnable(GL_SCISSOR_TEST));
-    else
-        CHK(glDisable(GL_SCISSOR_TEST));
-
-    if (m_cull_face_backup)
-        CHK(glEnable(GL_CULL_FACE));
-    else
-        CHK(glDisable(GL_CULL_FACE));
-
-    if (m_blend_backup)
-        CHK(glEnable(GL_BLEND));
-    else
-        CHK(glDisable(GL_BLEND));
+    gl_set_enabled(GL_DEPTH_TEST, m_depth_test_backup);
+    gl_depth_mask(m_depth_write_backup);
+    gl_set_enabled(GL_SCISSOR_TEST, m_scissor_test_backup);
+    gl_set_enabled(GL_CULL_FACE, m_cull_face_backup);
+    gl_set_enabled(GL_BLEND, m_blend_backup);
 
     m_active = false;
 }
@@ -283,16 +267,14 @@ void RenderPass::set_viewport(const Vector2i &offset, const Vector2i &size) {
 
     if (m_active) {
         int ypos = m_framebuffer_size.y() - m_viewport_size.y() - m_viewport_offset.y();
-        CHK(glViewport(m_viewport_offset.x(), ypos,
-                       m_viewport_size.x(), m_viewport_size.y()));
-        CHK(glScissor(m_viewport_offset.x(), ypos,
-                      m_viewport_size.x(), m_viewport_size.y()));
-
-        if (m_viewport_offset == Vector2i(0, 0) &&
-            m_viewport_size == m_framebuffer_size)
-            CHK(glDisable(GL_SCISSOR_TEST));
-        else
-            CHK(glEnable(GL_SCISSOR_TEST));
+        gl_viewport(m_viewport_offset.x(), ypos,
+                    m_viewport_size.x(), m_viewport_size.y());
+        gl_scissor(m_viewport_offset.x(), ypos,
+                   m_viewport_size.x(), m_viewport_size.y());
+
+        gl_set_enabled(GL_SCISSOR_TEST,
+                       m_viewport_offset != Vector2i(0, 0) ||
+                       m_viewport_size != m_framebuffer_size);
     }
 }
 
@@ -314,12 +296,12 @@ void RenderPass::set_depth_test(DepthTest depth_test, bool depth_write) {
                 default:
                     throw std::runtime_error("Shader::set_depth_test(): invalid depth test mode!");
             }
-            CHK(glEnable(GL_DEPTH_TEST));
-            CHK(glDepthFunc(func));
+            gl_set_enabled(GL_DEPTH_TEST, true);
+            gl_depth_func(func);
         } else {
-            CHK(glDisable(GL_DEPTH_TEST));
+            gl_set_enabled(GL_DEPTH_TEST, false);
         }
-        CHK(glDepthMask(depth_write ? GL_TRUE : GL_FALSE));
+        gl_depth_mask(depth_write);
     }
 }
 
@@ -328,13 +310,13 @@ void RenderPass::set_cull_mode(CullMode cull_mode) {
 
     if (m_active) {
         if (cull_mode == CullMode::Disabled) {
-            CHK(glDisable(GL_CULL_FACE));
+            gl_set_enabled(GL_CULL_FACE, false);
         } else {
-            CHK(glEnable(GL_CULL_FACE));
+            gl_set_enabled(GL_CULL_FACE, true);
             if (cull_mode == CullMode::Front)
-                CHK(glCullFace(GL_FRONT));
+                gl_cull_face(GL_FRONT);
             else if (cull_mode == CullMode::Back)
-                CHK(glCullFace(GL_BACK));
+                gl_cull_face(GL_BACK);
             else
                 throw std::runtime_error("Shader::set_cull_mode(): invalid cull mode!");
         }
@@ -378,8 +360,8 @@ void RenderPass::blit_to(const Vector2i &src_offset,
         what = GL_COLOR_BUFFER_BIT;
     #endif
 
-    CHK(glBindFramebuffer(GL_READ_FRAMEBUFFER, m_framebuffer_handle));
-    CHK(glBindFramebuffer(GL_DRAW_FRAMEBUFFER, target_id));
+    gl_bind_framebuffer(GL_READ_FRAMEBUFFER, m_framebuffer_handle);
+    gl_bind_framebuffer(GL_DRAW_FRAMEBUFFER, target_id);
 
     if (target_id == 0) {
         #if defined(NANOGUI_USE_OPENGL)
@@ -399,7 +381,7 @@ void RenderPass::blit_to(const Vector2i &src_offset,
                           (GLsizei) dst_end.x(), (GLsizei) dst_end.y(),
                           what, GL_NEAREST));
 
-    CHK(glBindFramebuffer(GL_FRAMEBUFFER, 0));
+    gl_bind_framebuffer(GL_FRAMEBUFFER, 0);
 #endif
 }
 
@@ -17,9 +17,15 @@
 #include <nanogui/window.h>
 #include <nanogui/popup.h>
 #include <nanogui/metal.h>
+#include <nanogui/textmetrics.h>
 #include <map>
+#include <limits>
 #include <iostream>
 
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+#  include "opengl_state.h"
+#endif
+
 #if defined(EMSCRIPTEN)
 #  include <emscripten/emscripten.h>
 #  include <emscripten/html5.h>
@@ -112,7 +118,9 @@ Screen::Screen()
     : Widget(nullptr), m_glfw_window(nullptr), m_nvg_context(nullptr),
       m_cursor(Cursor::Arrow), m_background(0.3f, 0.3f, 0.32f, 1.f),
       m_shutdown_glfw(false), m_fullscreen(false), m_depth_buffer(false),
-      m_stencil_buffer(false), m_float_buffer(false), m_redraw(false) {
+      m_stencil_buffer(false), m_float_buffer(false), m_redraw(false),
+      m_redraw_deadline(std::numeric_limits<double>::infinity()) {
+    m_screen = this;
     memset(m_cursors, 0, sizeof(GLFWcursor *) * (size_t) Cursor::CursorCount);
 #if defined(NANOGUI_USE_OPENGL)
     GLint n_stencil_bits = 0, n_depth_bits = 0;
@@ -130,13 +138,24 @@ Screen::Screen()
 
 Screen::Screen(const Vector2i &size, const std::string &caption, bool resizable,
                bool fullscreen, bool depth_buffer, bool stencil_buffer,
-               bool float_buffer, unsigned int gl_major, unsigned int gl_minor)
+               bool float_buffer, unsigned int gl_major, unsigned int gl_minor,
+               bool headless)
     : Widget(nullptr), m_glfw_window(nullptr), m_nvg_context(nullptr),
       m_cursor(Cursor::Arrow), m_background(0.3f, 0.3f, 0.32f, 1.f), m_caption(caption),
-      m_shutdown_glfw(false), m_fullscreen(fullscreen), m_depth_buffer(depth_buffer),
-      m_stencil_buffer(stencil_buffer), m_float_buffer(float_buffer), m_redraw(false) {
+      m_shutdown_glfw(false), m_fullscreen(fullscreen && !headless), m_depth_buffer(depth_buffer),
+      m_stencil_buffer(stencil_buffer), m_float_buffer(float_buffer), m_redraw(false),
+      m_headless(headless),
+      m_redraw_deadline(std::numeric_limits<double>::infinity()) {
+    m_screen = this;
     memset(m_cursors, 0, sizeof(GLFWcursor *) * (int) Cursor::CursorCount);
 
+#if defined(NANOGUI_USE_METAL)
+    if (headless)
+        throw std::runtime_error(
+            "Screen::Screen(): headless mode is not supported by the Metal backend!");
+#endif
+    fullscreen = m_fullscreen;
+
 #if defined(NANOGUI_USE_OPENGL)
     glfwWindowHint(GLFW_CLIENT_API, GLFW_OPENGL_API);
 
@@ -187,7 +206,7 @@ Screen::Screen(const Vector2i &size, const std::string &caption, bool resizable,
 
     glfwWindowHint(GLFW_VISIBLE, GL_FALSE);
     glfwWindowHint(GLFW_RESIZABLE, resizable ? GL_TRUE : GL_FALSE);
-    glfwWindowHint(GLFW_SCALE_TO_MONITOR, GLFW_TRUE);
+    glfwWindowHint(GLFW_SCALE_TO_MONITOR, headless ? GLFW_FALSE : GLFW_TRUE);
 
     for (int i = 0; i < 2; ++i) {
         if (fullscreen) {
@@ -211,6 +230,16 @@ Screen::Screen(const Vector2i &size, const std::string &caption, bool resizable,
         }
     }
 
+#if defined(NANOGUI_USE_OPENGL)
+    if (!m_glfw_window && headless) {
+        /* Fall back to software rendering without a window system */
+        glfwWindowHint(GLFW_CONTEXT_CREATION_API, GLFW_OSMESA_CONTEXT_API);
+        m_glfw_window = glfwCreateWindow(size.x(), size.y(), caption.c_str(),
+                                         nullptr, nullptr);
+        glfwWindowHint(GLFW_CONTEXT_CREATION_API, GLFW_NATIVE_CONTEXT_API);
+    }
+#endif
+
     if (!m_glfw_window) {
         (void) gl_major; (void) gl_minor;
 #if defined(NANOGUI_USE_OPENGL)
@@ -227,6 +256,7 @@ Screen::Screen(const Vector2i &size, const std::string &caption, bool resizable,
 
 #if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
     glfwMakeContextCurrent(m_glfw_window);
+    invalidate_gl_state();
 #endif
 
     glfwSetInputMode(m_glfw_window, GLFW_CURSOR, GLFW_CURSOR_NORMAL);
@@ -254,7 +284,7 @@ Screen::Screen(const Vector2i &size, const std::string &caption, bool resizable,
     glfwGetFramebufferSize(m_glfw_window, &m_fbsize[0], &m_fbsize[1]);
 
 #if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
-    CHK(glViewport(0, 0, m_fbsize[0], m_fbsize[1]));
+    gl_viewport(0, 0, m_fbsize[0], m_fbsize[1]);
     CHK(glClearColor(m_background[0], m_background[1],
                      m_background[2], m_background[3]));
     CHK(glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT |
@@ -383,8 +413,12 @@ Screen::Screen(const Vector2i &size, const std::string &caption, bool resizable,
             if (it == __nanogui_screens.end())
                 return;
             Screen* s = it->second;
+            if (s->m_headless)
+                return;
 
             s->m_pixel_ratio = get_pixel_ratio(w);
+            invalidate_text_metrics(s->m_nvg_context);
+            s->invalidate_layout(true);
             s->resize_callback_event(s->m_size.x(), s->m_size.y());
         }
     );
@@ -414,7 +448,8 @@ void Screen::initialize(GLFWwindow *window, bool shutdown_glfw) {
     glfwGetWindowSize(m_glfw_window, &m_size[0], &m_size[1]);
     glfwGetFramebufferSize(m_glfw_window, &m_fbsize[0], &m_fbsize[1]);
 
-    m_pixel_ratio = get_pixel_ratio(window);
+    /* Headless screens render at a fixed resolution */
+    m_pixel_ratio = m_headless ? 1.f : get_pixel_ratio(window);
 
 #if defined(EMSCRIPTEN)
     double w, h;
@@ -473,6 +508,10 @@ void Screen::initialize(GLFWwindow *window, bool shutdown_glfw) {
     if (!m_nvg_context)
         throw std::runtime_error("Could not initialize NanoVG!");
 
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+    gl_state_hook_nanovg(m_nvg_context);
+#endif
+
     m_visible = glfwGetWindowAttrib(window, GLFW_VISIBLE) != 0;
     set_theme(new Theme(m_nvg_context));
     m_mouse_pos = Vector2i(0);
@@ -499,6 +538,9 @@ Screen::~Screen() {
     }
 
     if (m_nvg_context) {
+        /* Layer images of the widget hierarchy refer to the context */
+        release_layer(true);
+        invalidate_text_metrics(m_nvg_context);
 #if defined(NANOGUI_USE_OPENGL)
         nvgDeleteGL3(m_nvg_context);
 #elif defined(NANOGUI_USE_GLES)
@@ -516,7 +558,9 @@ void Screen::set_visible(bool visible) {
     if (m_visible != visible) {
         m_visible = visible;
 
-        if (visible)
+        if (m_headless)
+            return;
+        else if (visible)
             glfwShowWindow(m_glfw_window);
         else
             glfwHideWindow(m_glfw_window);
@@ -552,7 +596,9 @@ void Screen::clear() {
 
 void Screen::draw_setup() {
 #if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+    /* Other code may have changed the state of this context since the last frame */
     glfwMakeContextCurrent(m_glfw_window);
+    invalidate_gl_state();
 #elif defined(NANOGUI_USE_METAL)
     void *nswin = glfwGetCocoaWindow(m_glfw_window);
     metal_window_set_size(nswin, m_fbsize);
@@ -574,21 +620,27 @@ void Screen::draw_setup() {
     m_size = Vector2i(Vector2f(m_size) / m_pixel_ratio);
 #else
     /* Recompute pixel ratio on OSX */
-    if (m_size[0])
-        m_pixel_ratio = (float) m_fbsize[0] / (float) m_size[0];
+    if (m_size[0]) {
+        float pixel_ratio = (float) m_fbsize[0] / (float) m_size[0];
+        if (pixel_ratio != m_pixel_ratio)
+            invalidate_text_metrics(m_nvg_context);
+        m_pixel_ratio = pixel_ratio;
+    }
 #if defined(NANOGUI_USE_METAL)
     metal_window_set_content_scale(nswin, m_pixel_ratio);
 #endif
 #endif
 
 #if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
-    CHK(glViewport(0, 0, m_fbsize[0], m_fbsize[1]));
+    gl_viewport(0, 0, m_fbsize[0], m_fbsize[1]);
 #endif
 }
 
 void Screen::draw_teardown() {
 #if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
-    glfwSwapBuffers(m_glfw_window);
+    /* Headless screens keep the rendered frame in the back buffer */
+    if (!m_headless)
+        glfwSwapBuffers(m_glfw_window);
 #elif defined(NANOGUI_USE_METAL)
     mnvgSetColorTexture(m_nvg_context, nullptr);
     metal_present_and_release_drawable(m_metal_drawable);
@@ -597,25 +649,212 @@ void Screen::draw_teardown() {
 #endif
 }
 
+/// Add a rectangle to a list of damaged regions, merging it with overlapping entries
+static void damage_add(std::vector<Vector4i> &regions, Vector4i rect) {
+    bool merged;
+    do {
+        merged = false;
+        for (auto it = regions.begin(); it != regions.end(); ++it) {
+            const Vector4i &r = *it;
+            if (rect[0] > r[2] || r[0] > rect[2] || rect[1] > r[3] || r[1] > rect[3])
+                continue;
+            rect = Vector4i(std::min(rect[0], r[0]), std::min(rect[1], r[1]),
+                            std::max(rect[2], r[2]), std::max(rect[3], r[3]));
+            regions.erase(it);
+            merged = true;
+            break;
+        }
+    } while (merged);
+    regions.push_back(rect);
+}
+
 void Screen::draw_all() {
+    /* Dispatch coalesced input events once per frame */
+    flush_events();
+
     std::lock_guard<std::mutex> guard(m_redraw_mutex);
-    if (m_redraw) {
+
+    /* Turn an expired deadline (see schedule_redraw()) into a redraw */
+    double deadline = m_redraw_deadline.load(),
+           now = glfwGetTime();
+    if (deadline <= now) {
+        m_redraw_deadline.compare_exchange_strong(
+            deadline, std::numeric_limits<double>::infinity());
+        m_redraw = true;
+    }
+
+    if (m_redraw || !m_damage.empty()) {
+        m_last_frame = now;
+
+        /* Count frames here, draw_widgets() runs once per damaged region */
+        m_frame_index++;
+
+        FrameStats stats;
+        stats.timestamp = now;
+        m_culled_widgets = 0;
+        double time = now;
+        m_flush_time = 0.f;
+
+        /* Attribute the time elapsed since the last call to a phase */
+        auto lap = [&](float &phase) {
+            if (!m_profiling)
+                return;
+            double t = glfwGetTime();
+            phase += float((t - time) * 1000.0);
+            time = t;
+        };
+
 #if defined(NANOGUI_USE_METAL)
         void *pool = autorelease_init();
 #endif
 
         draw_setup();
-        draw_contents();
-        draw_widgets();
+        lap(stats.setup);
+
+        /* Fall back to a full redraw unless the back buffer is known
+           to hold the contents of a sufficiently recent frame */
+        bool full = m_redraw || !m_partial_redraw || m_buffer_age == 0 ||
+                    m_fbsize != m_damage_fbsize || m_tooltip_visible ||
+                    (int) m_damage_history.size() < m_buffer_age - 1;
+
+        if (!full) {
+            double elapsed = glfwGetTime() - m_last_interaction;
+            const Widget *widget =
+                elapsed > 0.5f ? find_widget(m_mouse_pos) : nullptr;
+            full = widget && !widget->tooltip().empty();
+        }
+
+        std::vector<Vector4i> regions;
+        if (!full) {
+            /* Also repaint regions that changed since the
+               back buffer was last rendered */
+            regions = m_damage;
+            for (const auto &frame : m_damage_history)
+                for (const Vector4i &r : frame)
+                    damage_add(regions, r);
+
+            if (regions.size() > 4) {
+                Vector4i bbox = regions[0];
+                for (const Vector4i &r : regions)
+                    bbox = Vector4i(std::min(bbox[0], r[0]), std::min(bbox[1], r[1]),
+                                    std::max(bbox[2], r[2]), std::max(bbox[3], r[3]));
+                regions = { bbox };
+            }
+
+            int64_t area = 0;
+            for (const Vector4i &r : regions)
+                area += (int64_t) (r[2] - r[0]) * (r[3] - r[1]);
+            full = area * 2 > (int64_t) m_size.x() * m_size.y();
+        }
+
+        if (full) {
+            draw_contents();
+            lap(stats.contents);
+            draw_widgets();
+            lap(stats.widgets);
+        } else {
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+            for (const Vector4i &r : regions) {
+                int x0 = (int) std::floor(r[0] * m_pixel_ratio),
+                    y0 = (int) std::floor(r[1] * m_pixel_ratio),
+                    x1 = (int) std::ceil(r[2] * m_pixel_ratio),
+                    y1 = (int) std::ceil(r[3] * m_pixel_ratio);
+
+                /* NanoVG disables the scissor test when flushing, hence
+                   it must be re-enabled for every region */
+                gl_set_enabled(GL_SCISSOR_TEST, true);
+                gl_scissor(x0, m_fbsize.y() - y1, x1 - x0, y1 - y0);
+
+                m_damage_clip = r;
+                m_damage_clip_active = true;
+                draw_contents();
+                lap(stats.contents);
+                draw_widgets();
+                lap(stats.widgets);
+                m_damage_clip_active = false;
+            }
+            gl_set_enabled(GL_SCISSOR_TEST, false);
+#endif
+        }
+
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+        if (m_capture_target) {
+            /* Read back the frame before it is presented (see capture()) */
+            size_t row_size = (size_t) m_fbsize.x() * 4;
+            std::vector<uint8_t> &data = *m_capture_target;
+            data.resize(row_size * m_fbsize.y());
+
+            gl_bind_framebuffer(GL_FRAMEBUFFER, 0);
+            CHK(glPixelStorei(GL_PACK_ALIGNMENT, 1));
+            CHK(glReadPixels(0, 0, m_fbsize.x(), m_fbsize.y(), GL_RGBA,
+                             GL_UNSIGNED_BYTE, data.data()));
+
+            /* OpenGL returns the bottom row first */
+            for (int y = 0; y < m_fbsize.y() / 2; ++y)
+                std::swap_ranges(data.begin() + y * row_size,
+                                 data.begin() + (y + 1) * row_size,
+                                 data.begin() + (m_fbsize.y() - 1 - y) * row_size);
+        }
+#endif
+
         draw_teardown();
 
 #if defined(NANOGUI_USE_METAL)
         autorelease_release(pool);
 #endif
+
+        lap(stats.teardown);
+
+        m_culled_widgets_last = m_culled_widgets;
+
+        if (m_profiling) {
+            stats.culled = m_culled_widgets;
+            stats.flush = m_flush_time;
+            stats.widgets -= m_flush_time;
+            stats.total = float((time - now) * 1000.0);
+            m_frame_stats[m_frame_stats_pos] = stats;
+            m_frame_stats_pos = (m_frame_stats_pos + 1) % m_frame_stats.size();
+            m_frame_stats_size = std::min(m_frame_stats_size + 1, m_frame_stats.size());
+        }
+
+        /* Remember what changed in this frame for the next 'm_buffer_age - 1' frames */
+        if (m_partial_redraw && m_buffer_age > 1) {
+            if (full)
+                m_damage = { Vector4i(0, 0, m_size.x(), m_size.y()) };
+            m_damage_history.push_back(std::move(m_damage));
+            if ((int) m_damage_history.size() > m_buffer_age - 1)
+                m_damage_history.erase(m_damage_history.begin());
+        }
+
+        m_damage.clear();
+        m_damage_fbsize = m_fbsize;
         m_redraw = false;
     }
 }
 
+std::vector<uint8_t> Screen::capture() {
+#if defined(NANOGUI_USE_METAL)
+    throw std::runtime_error("Screen::capture(): not supported by the Metal backend!");
+#else
+    std::vector<uint8_t> result;
+    {
+        std::lock_guard<std::mutex> guard(m_redraw_mutex);
+        m_redraw = true;
+    }
+
+    m_capture_target = &result;
+    try {
+        draw_all();
+    } catch (...) {
+        m_capture_target = nullptr;
+        throw;
+    }
+    m_capture_target = nullptr;
+
+    return result;
+#endif
+}
+
 void Screen::draw_contents() {
     clear();
 }
@@ -626,14 +865,84 @@ void Screen::nvg_flush() {
     params->renderViewport(params->userPtr, m_size[0], m_size[1], m_pixel_ratio);
 }
 
+void Screen::nvg_reset_scissor() {
+    nvgResetScissor(m_nvg_context);
+    if (!m_damage_clip_active)
+        return;
+
+    /* Scissor regions are specified in the current coordinate system */
+    float xform[6];
+    nvgCurrentTransform(m_nvg_context, xform);
+    nvgResetTransform(m_nvg_context);
+    nvgScissor(m_nvg_context, m_damage_clip[0], m_damage_clip[1],
+               m_damage_clip[2] - m_damage_clip[0],
+               m_damage_clip[3] - m_damage_clip[1]);
+    nvgTransform(m_nvg_context, xform[0], xform[1], xform[2],
+                 xform[3], xform[4], xform[5]);
+}
+
+int Screen::nvg_image_from_texture(const Texture *texture, int flags) {
+#if defined(NANOGUI_USE_OPENGL)
+    return nvglCreateImageFromHandleGL3(m_nvg_context, texture->texture_handle(),
+                                        texture->size().x(), texture->size().y(),
+                                        flags);
+#elif defined(NANOGUI_USE_GLES)
+    return nvglCreateImageFromHandleGLES2(m_nvg_context, texture->texture_handle(),
+                                          texture->size().x(), texture->size().y(),
+                                          flags);
+#else
+    (void) texture; (void) flags;
+    throw std::runtime_error("Screen::nvg_image_from_texture(): not supported "
+                             "by the Metal backend!");
+#endif
+}
+
+void Screen::prewarm_glyphs(const std::string &font, const std::vector<float> &sizes,
+                            uint32_t first, uint32_t last) {
+    std::string text;
+    for (uint32_t c = first; c <= last && c >= first; ++c)
+        text += utf8(c).data();
+
+    for (float size : sizes)
+        m_glyph_prewarm.emplace_back(font, size, text);
+    redraw();
+}
+
 void Screen::draw_widgets() {
     nvgBeginFrame(m_nvg_context, m_size[0], m_size[1], m_pixel_ratio);
 
+    if (!m_glyph_prewarm.empty()) {
+        /* Drawing invisible text populates the glyph atlas */
+        nvgSave(m_nvg_context);
+        nvgGlobalAlpha(m_nvg_context, 0.f);
+        nvgScissor(m_nvg_context, 0, 0, 0, 0);
+        nvgTextAlign(m_nvg_context, NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
+        for (const auto &[font, size, text] : m_glyph_prewarm) {
+            nvgFontFace(m_nvg_context, font.c_str());
+            nvgFontSize(m_nvg_context, size);
+            nvgText(m_nvg_context, 0, 0, text.c_str(), nullptr);
+        }
+        nvgRestore(m_nvg_context);
+        m_glyph_prewarm.clear();
+    }
+
+    if (m_damage_clip_active)
+        nvg_reset_scissor();
+
+    m_draw_clip = m_damage_clip_active
+        ? Vector4f(m_damage_clip)
+        : Vector4f(0.f, 0.f, (float) m_size.x(), (float) m_size.y());
     draw(m_nvg_context);
 
     double elapsed = glfwGetTime() - m_last_interaction;
+    m_tooltip_visible = false;
 
-    if (elapsed > 0.5f) {
+    if (elapsed <= 0.5f) {
+        /* Wake up once the tooltip (if any) should appear */
+        const Widget *widget = find_widget(m_mouse_pos);
+        if (widget && !widget->tooltip().empty())
+            schedule_redraw(0.5 - elapsed);
+    } else {
         /* Draw tooltips */
         const Widget *widget = find_widget(m_mouse_pos);
         if (widget && !widget->tooltip().empty()) {
@@ -687,10 +996,20 @@ void Screen::draw_widgets() {
             nvgFontBlur(m_nvg_context, 0.0f);
             nvgTextBox(m_nvg_context, pos.x() - h, pos.y(), tooltip_width,
                        widget->tooltip().c_str(), nullptr);
+            m_tooltip_visible = true;
+
+            /* Keep redrawing until the tooltip has faded in */
+            if (elapsed < 1.0)
+                schedule_redraw();
         }
     }
 
+    double flush_start = m_profiling ? glfwGetTime() : 0.0;
+
     nvgEndFrame(m_nvg_context);
+
+    if (m_profiling)
+        m_flush_time += float((glfwGetTime() - flush_start) * 1000.0);
 }
 
 bool Screen::keyboard_event(int key, int scancode, int action, int modifiers) {
@@ -730,7 +1049,127 @@ void Screen::redraw() {
     }
 }
 
+void Screen::schedule_redraw(double delay) {
+    double deadline = glfwGetTime() + std::max(delay, 0.0),
+           current = m_redraw_deadline.load();
+
+    /* Keep the earliest deadline. Lock-free, since this is also
+       called by widgets while the screen is being drawn */
+    while (deadline < current) {
+        if (m_redraw_deadline.compare_exchange_weak(current, deadline)) {
+            #if !defined(EMSCRIPTEN)
+                glfwPostEmptyEvent();
+            #endif
+            break;
+        }
+    }
+}
+
+void Screen::set_target_fps(float fps) {
+    if (fps < 0.f)
+        throw std::runtime_error("Screen::set_target_fps(): value must be nonnegative!");
+    m_target_fps = fps;
+}
+
+double Screen::next_frame_time() {
+    double time;
+    {
+        std::lock_guard<std::mutex> guard(m_redraw_mutex);
+        time = (m_redraw || !m_damage.empty() || m_cursor_pending ||
+                m_scroll_pending) ? 0.0 : m_redraw_deadline.load();
+    }
+
+    if (m_target_fps > 0.f && time != std::numeric_limits<double>::infinity())
+        time = std::max(time, m_last_frame + 1.0 / m_target_fps);
+
+    return time;
+}
+
+void Screen::invalidate_rect(const Vector2i &pos, const Vector2i &size) {
+    Vector4i rect(std::max(pos.x(), 0), std::max(pos.y(), 0),
+                  std::min(pos.x() + size.x(), m_size.x()),
+                  std::min(pos.y() + size.y(), m_size.y()));
+    if (rect[0] >= rect[2] || rect[1] >= rect[3])
+        return;
+
+    std::lock_guard<std::mutex> guard(m_redraw_mutex);
+    if (!m_redraw && m_damage.empty()) {
+        #if !defined(EMSCRIPTEN)
+            glfwPostEmptyEvent();
+        #endif
+    }
+
+    if (m_partial_redraw)
+        damage_add(m_damage, rect);
+    else
+        m_redraw = true;
+}
+
+void Screen::set_partial_redraw(bool partial_redraw) {
+#if defined(NANOGUI_USE_METAL) || defined(EMSCRIPTEN)
+    /* Drawables/canvases don't retain their contents between frames */
+    partial_redraw = false;
+#endif
+    std::lock_guard<std::mutex> guard(m_redraw_mutex);
+    m_partial_redraw = partial_redraw;
+    m_damage_history.clear();
+    if (!m_damage.empty()) {
+        m_damage.clear();
+        m_redraw = true;
+    }
+}
+
+void Screen::set_buffer_age(int buffer_age) {
+    if (buffer_age < 0)
+        throw std::runtime_error("Screen::set_buffer_age(): value must be nonnegative!");
+    std::lock_guard<std::mutex> guard(m_redraw_mutex);
+    m_buffer_age = buffer_age;
+    m_damage_history.clear();
+}
+
+void Screen::set_event_coalescing(bool value) {
+    if (!value)
+        flush_events();
+    m_event_coalescing = value;
+}
+
+void Screen::flush_events() {
+    if (m_cursor_pending) {
+        m_cursor_pending = false;
+        dispatch_cursor_pos(m_pending_cursor.x(), m_pending_cursor.y());
+    }
+    if (m_scroll_pending) {
+        m_scroll_pending = false;
+        dispatch_scroll(m_pending_scroll.x(), m_pending_scroll.y());
+        m_pending_scroll = 0;
+    }
+}
+
+bool Screen::raw_input_target() const {
+    if (!m_drag_active)
+        return m_hover_raw_input;
+    for (const Widget *w = m_drag_widget; w; w = w->parent()) {
+        if (w->raw_input())
+            return true;
+    }
+    return false;
+}
+
 void Screen::cursor_pos_callback_event(double x, double y) {
+    if (m_event_coalescing && !raw_input_target()) {
+        /* Preserve the order of motion and scroll events */
+        if (m_scroll_pending)
+            flush_events();
+        m_pending_cursor = Vector2f((float) x, (float) y);
+        m_cursor_pending = true;
+        m_last_interaction = glfwGetTime();
+        return;
+    }
+    flush_events();
+    dispatch_cursor_pos(x, y);
+}
+
+void Screen::dispatch_cursor_pos(double x, double y) {
     Vector2i p((int) x, (int) y);
 
 #if defined(_WIN32) || defined(__linux__) || defined(EMSCRIPTEN)
@@ -742,9 +1181,10 @@ void Screen::cursor_pos_callback_event(double x, double y) {
         p -= Vector2i(1, 2);
 
         bool ret = false;
+        /* Keep the widget alive in case the event handlers below remove it */
+        ref<Widget> widget = m_drag_active ? m_drag_widget : find_widget(p);
         if (!m_drag_active) {
-            Widget *widget = find_widget(p);
-            if (widget != nullptr && widget->cursor() != m_cursor) {
+            if (widget && widget->cursor() != m_cursor) {
                 m_cursor = widget->cursor();
                 glfwSetCursor(m_glfw_window, m_cursors[(int) m_cursor]);
             }
@@ -757,6 +1197,21 @@ void Screen::cursor_pos_callback_event(double x, double y) {
         if (!ret)
             ret = mouse_motion_event(p, p - m_mouse_pos, m_mouse_state, m_modifiers);
 
+        if (!m_drag_active) {
+            m_hover_raw_input = false;
+            for (const Widget *w = widget; w; w = w->parent())
+                m_hover_raw_input |= w->raw_input();
+        }
+        if (ret && widget) {
+            /* The event may have changed the appearance of widgets within layers */
+            widget->invalidate_layer();
+        }
+
+        /* Hide the current tooltip, and show a new one after a delay */
+        ret |= m_tooltip_visible;
+        if (!m_drag_active && widget && !widget->tooltip().empty())
+            schedule_redraw(0.5);
+
         m_mouse_pos = p;
         m_redraw |= ret;
     } catch (const std::exception &e) {
@@ -765,6 +1220,7 @@ void Screen::cursor_pos_callback_event(double x, double y) {
 }
 
 void Screen::mouse_button_callback_event(int button, int action, int modifiers) {
+    flush_events();
     m_modifiers = modifiers;
     m_last_interaction = glfwGetTime();
 
@@ -794,6 +1250,7 @@ void Screen::mouse_button_callback_event(int button, int action, int modifiers)
             m_redraw |= m_drag_widget->mouse_button_event(
                 m_mouse_pos - m_drag_widget->parent()->absolute_position(), button,
                 false, m_modifiers);
+            m_drag_widget->invalidate_layer();
         }
 
         if (drop_widget != nullptr && drop_widget->cursor() != m_cursor) {
@@ -815,32 +1272,44 @@ void Screen::mouse_button_callback_event(int button, int action, int modifiers)
             m_drag_widget = nullptr;
         }
 
-        m_redraw |= mouse_button_event(m_mouse_pos, button,
-                                       action == GLFW_PRESS, m_modifiers);
+        bool ret = mouse_button_event(m_mouse_pos, button,
+                                      action == GLFW_PRESS, m_modifiers);
+        if (ret && drop_widget)
+            drop_widget->invalidate_layer();
+        m_redraw |= ret;
     } catch (const std::exception &e) {
         std::cerr << "Caught exception in event handler: " << e.what() << std::endl;
     }
 }
 
 void Screen::key_callback_event(int key, int scancode, int action, int mods) {
+    flush_events();
     m_last_interaction = glfwGetTime();
     try {
-        m_redraw |= keyboard_event(key, scancode, action, mods);
+        bool ret = keyboard_event(key, scancode, action, mods);
+        if (ret && !m_focus_path.empty())
+            m_focus_path.front()->invalidate_layer();
+        m_redraw |= ret;
     } catch (const std::exception &e) {
         std::cerr << "Caught exception in event handler: " << e.what() << std::endl;
     }
 }
 
 void Screen::char_callback_event(unsigned int codepoint) {
+    flush_events();
     m_last_interaction = glfwGetTime();
     try {
-        m_redraw |= keyboard_character_event(codepoint);
+        bool ret = keyboard_character_event(codepoint);
+        if (ret && !m_focus_path.empty())
+            m_focus_path.front()->invalidate_layer();
+        m_redraw |= ret;
     } catch (const std::exception &e) {
         std::cerr << "Caught exception in event handler: " << e.what() << std::endl;
     }
 }
 
 void Screen::drop_callback_event(int count, const char **filenames) {
+    flush_events();
     std::vector<std::string> arg(count);
     for (int i = 0; i < count; ++i)
         arg[i] = filenames[i];
@@ -848,6 +1317,20 @@ void Screen::drop_callback_event(int count, const char **filenames) {
 }
 
 void Screen::scroll_callback_event(double x, double y) {
+    if (m_event_coalescing && !raw_input_target()) {
+        /* Preserve the order of motion and scroll events */
+        if (m_cursor_pending)
+            flush_events();
+        m_pending_scroll += Vector2f((float) x, (float) y);
+        m_scroll_pending = true;
+        m_last_interaction = glfwGetTime();
+        return;
+    }
+    flush_events();
+    dispatch_scroll(x, y);
+}
+
+void Screen::dispatch_scroll(double x, double y) {
     m_last_interaction = glfwGetTime();
     try {
         if (m_focus_path.size() > 1) {
@@ -858,7 +1341,13 @@ void Screen::scroll_callback_event(double x, double y) {
                     return;
             }
         }
-        m_redraw |= scroll_event(m_mouse_pos, Vector2f(x, y));
+        bool ret = scroll_event(m_mouse_pos, Vector2f(x, y));
+        if (ret) {
+            Widget *widget = find_widget(m_mouse_pos);
+            if (widget)
+                widget->invalidate_layer();
+        }
+        m_redraw |= ret;
     } catch (const std::exception &e) {
         std::cerr << "Caught exception in event handler: " << e.what() << std::endl;
     }
@@ -926,8 +1415,8 @@ void Screen::dispose_window(Window *window) {
 
 void Screen::center_window(Window *window) {
     if (window->size() == 0) {
-        window->set_size(window->preferred_size(m_nvg_context));
-        window->perform_layout(m_nvg_context);
+        window->set_size(window->preferred_size_cached(m_nvg_context));
+        window->update_layout(m_nvg_context);
     }
     window->set_position((m_size - window->size()) / 2);
 }
@@ -935,6 +1424,7 @@ void Screen::center_window(Window *window) {
 void Screen::move_window_to_front(Window *window) {
     m_children.erase(std::remove(m_children.begin(), m_children.end(), window), m_children.end());
     m_children.push_back(window);
+    children_changed(false);
     /* Brute force topological sort (no problem for a few windows..) */
     bool changed = false;
     do {
@@ -954,6 +1444,40 @@ void Screen::move_window_to_front(Window *window) {
     } while (changed);
 }
 
+void Screen::set_profiling(bool profiling, size_t history) {
+    if (history == 0)
+        throw std::runtime_error("Screen::set_profiling(): history must be nonzero!");
+    m_profiling = profiling;
+    if (history != m_frame_stats.size()) {
+        std::vector<FrameStats> stats = frame_stats();
+        if (stats.size() > history)
+            stats.erase(stats.begin(), stats.end() - history);
+        m_frame_stats_size = stats.size();
+        m_frame_stats_pos = m_frame_stats_size % history;
+        stats.resize(history);
+        m_frame_stats = std::move(stats);
+    }
+}
+
+void Screen::set_widget_profiling(bool widget_profiling) {
+    m_widget_profiling = widget_profiling;
+    m_profile_stack.clear();
+}
+
+std::vector<FrameStats> Screen::frame_stats() const {
+    std::vector<FrameStats> result;
+    result.reserve(m_frame_stats_size);
+    size_t start = (m_frame_stats_pos + m_frame_stats.size() - m_frame_stats_size) %
+                   std::max(m_frame_stats.size(), (size_t) 1);
+    for (size_t i = 0; i < m_frame_stats_size; ++i)
+        result.push_back(m_frame_stats[(start + i) % m_frame_stats.size()]);
+    return result;
+}
+
+void Screen::clear_frame_stats() {
+    m_frame_stats_size = m_frame_stats_pos = 0;
+}
+
 bool Screen::tooltip_fade_in_progress() const {
     double elapsed = glfwGetTime() - m_last_interaction;
     if (elapsed < 0.25f || elapsed > 1.25f)
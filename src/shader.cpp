@@ -1,7 +1,33 @@
 #include <nanogui/shader.h>
+#include <algorithm>
+#include <cstdlib>
 
 NAMESPACE_BEGIN(nanogui)
 
+std::string Shader::default_program_cache_dir() {
+    auto env = [](const char *name) -> std::string {
+        const char *value = getenv(name);
+        return value ? value : "";
+    };
+
+#if defined(_WIN32)
+    std::string base = env("LOCALAPPDATA");
+    return base.empty() ? std::string() : base + "\\nanogui";
+#elif defined(__APPLE__)
+    std::string home = env("HOME");
+    return home.empty() ? std::string() : home + "/Library/Caches/nanogui";
+#else
+    std::string base = env("XDG_CACHE_HOME");
+    if (base.empty()) {
+        std::string home = env("HOME");
+        if (home.empty())
+            return std::string();
+        base = home + "/.cache";
+    }
+    return base + "/nanogui";
+#endif
+}
+
 std::string Shader::Buffer::to_string() const {
     std::string result = "Buffer[type=";
     switch (type) {
@@ -23,4 +49,99 @@ std::string Shader::Buffer::to_string() const {
     return result;
 }
 
+Shader::Buffer &Shader::check_buffer(const char *method, const std::string &name,
+                                     VariableType dtype, size_t ndim,
+                                     const size_t *shape) {
+    finalize();
+    auto it = m_buffers.find(name);
+    if (it == m_buffers.end())
+        throw std::runtime_error(std::string("Shader::") + method +
+                                 "(): could not find argument named \"" + name + "\"");
+
+    Buffer &buf = it->second;
+
+    bool mismatch = ndim != buf.ndim || dtype != buf.dtype;
+    for (size_t i = (buf.type == UniformBuffer ? 0 : 1); i < ndim; ++i)
+        mismatch |= shape[i] != buf.shape[i];
+
+    if (mismatch) {
+        Buffer arg;
+        arg.type = buf.type;
+        arg.ndim = ndim;
+        for (size_t i = 0; i < 3; ++i)
+            arg.shape[i] = i < arg.ndim ? shape[i] : 1;
+        arg.dtype = dtype;
+        throw std::runtime_error(std::string("Buffer::") + method + "(\"" + name +
+                                 "\"): shape/dtype mismatch: expected " + buf.to_string() +
+                                 ", got " + arg.to_string());
+    }
+
+    return buf;
+}
+
+size_t Shader::buffer_rows(const std::string &name) const {
+    const_cast<Shader *>(this)->finalize();
+    auto it = m_buffers.find(name);
+    if (it == m_buffers.end())
+        throw std::runtime_error(
+            "Shader::buffer_rows(): could not find argument named \"" + name + "\"");
+    return it->second.buffer ? it->second.shape[0] : 0;
+}
+
+void Shader::set_buffer_divisor(const std::string &name, size_t divisor) {
+    finalize();
+    auto it = m_buffers.find(name);
+    if (it == m_buffers.end())
+        throw std::runtime_error(
+            "Shader::set_buffer_divisor(): could not find argument named \"" + name + "\"");
+    Buffer &buf = it->second;
+    if (buf.type != VertexBuffer)
+        throw std::runtime_error("Shader::set_buffer_divisor(): argument named \"" +
+                                 name + "\" is not a vertex buffer!");
+#if defined(NANOGUI_USE_GLES) && NANOGUI_GLES_VERSION == 2
+    if (divisor != 0)
+        throw std::runtime_error("Shader::set_buffer_divisor(): instancing requires GLES 3!");
+#endif
+    if (buf.divisor != divisor) {
+        buf.divisor = divisor;
+        buf.dirty = true;
+    }
+}
+
+size_t Shader::buffer_divisor(const std::string &name) const {
+    const_cast<Shader *>(this)->finalize();
+    auto it = m_buffers.find(name);
+    if (it == m_buffers.end())
+        throw std::runtime_error(
+            "Shader::buffer_divisor(): could not find argument named \"" + name + "\"");
+    return it->second.divisor;
+}
+
+size_t Shader::clamp_count(size_t offset, size_t count, bool indexed) const {
+    size_t rows = (size_t) -1;
+    for (const auto &[key, buf] : m_buffers) {
+        if (!buf.buffer)
+            continue;
+        if (indexed && buf.type == IndexBuffer)
+            rows = buf.shape[0] * buf.shape[1] * buf.shape[2];
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+        /* On Metal, uniforms are also stored in vertex buffers */
+        else if (!indexed && buf.type == VertexBuffer && buf.divisor == 0)
+            rows = std::min(rows, buf.shape[0]);
+#endif
+    }
+
+    if (rows == (size_t) -1)
+        return count;
+    return offset < rows ? std::min(count, rows - offset) : 0;
+}
+
+size_t Shader::clamp_instance_count(size_t instance_count) const {
+    for (const auto &[key, buf] : m_buffers) {
+        if (buf.buffer && buf.type == VertexBuffer && buf.divisor != 0)
+            instance_count = std::min(instance_count, buf.shape[0] * buf.divisor);
+    }
+    return instance_count;
+}
+
 NAMESPACE_END(nanogui)
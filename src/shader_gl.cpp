@@ -1,19 +1,230 @@
 #include <nanogui/shader.h>
+
+#if defined(_WIN32)
+#  ifndef NOMINMAX
+#  define NOMINMAX 1
+#  endif
+#  include <windows.h>
+#endif
+
 #include <nanogui/opengl.h>
 #include <nanogui/screen.h>
 #include <nanogui/texture.h>
 #include <nanogui/renderpass.h>
 #include "opengl_check.h"
+#include "opengl_state.h"
+#include <cstdio>
+#include <cstring>
+#include <random>
+
+#if defined(_WIN32)
+#  include <direct.h>
+#  include <process.h>
+#else
+#  include <sys/stat.h>
+#  include <unistd.h>
+#endif
 
 #if !defined(GL_HALF_FLOAT)
 #  define GL_HALF_FLOAT 0x140B
 #endif
 
+#if !defined(NANOGUI_USE_GLES) || NANOGUI_GLES_VERSION >= 3
+#  define NANOGUI_PROGRAM_CACHE
+#endif
+
 NAMESPACE_BEGIN(nanogui)
 
-static GLuint compile_gl_shader(GLenum type,
-                                const std::string &name,
-                                const std::string &shader_string) {
+static std::string program_cache_dir_value;
+static Shader::ProgramCacheStats program_cache_stats_value;
+
+void Shader::set_program_cache_dir(const std::string &dir) {
+    program_cache_dir_value = dir;
+}
+
+const std::string &Shader::program_cache_dir() {
+    return program_cache_dir_value;
+}
+
+Shader::ProgramCacheStats Shader::program_cache_stats() {
+    return program_cache_stats_value;
+}
+
+void Shader::reset_program_cache_stats() {
+    program_cache_stats_value = ProgramCacheStats();
+}
+
+#if defined(NANOGUI_PROGRAM_CACHE)
+/// Magic number and version of program binary cache entries
+static const char program_cache_magic[8] = { 'N', 'G', 'P', 'R', 'O', 'G', '0', '1' };
+
+/// FNV-1a hash, used to derive the file name of program binary cache entries
+static uint64_t fnv1a(uint64_t hash, const void *data, size_t size) {
+    const uint8_t *ptr = (const uint8_t *) data;
+    for (size_t i = 0; i < size; ++i) {
+        hash ^= ptr[i];
+        hash *= 0x100000001b3ull;
+    }
+    return hash;
+}
+
+/// Return the cache file for a program, or an empty string if caching is unavailable
+static std::string program_cache_path(const std::string &name,
+                                      const std::string &vertex_shader,
+                                      const std::string &fragment_shader) {
+    if (program_cache_dir_value.empty())
+        return std::string();
+
+    /* Older contexts without ARB_get_program_binary report an invalid enum */
+    GLint format_count = 0;
+    glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS, &format_count);
+    if (format_count <= 0) {
+        while (glGetError() != GL_NO_ERROR)
+            ;
+        return std::string();
+    }
+
+    uint64_t hash = 0xcbf29ce484222325ull;
+    auto add = [&](const char *str) {
+        // Include the terminating zero to separate consecutive strings
+        if (str)
+            hash = fnv1a(hash, str, strlen(str) + 1);
+    };
+
+    add(name.c_str());
+    add(vertex_shader.c_str());
+    add(fragment_shader.c_str());
+    add((const char *) glGetString(GL_VENDOR));
+    add((const char *) glGetString(GL_RENDERER));
+    add((const char *) glGetString(GL_VERSION));
+
+    char fname[32];
+    snprintf(fname, sizeof(fname), "%016llx.bin", (unsigned long long) hash);
+
+#if defined(_WIN32)
+    return program_cache_dir_value + "\\" + fname;
+#else
+    return program_cache_dir_value + "/" + fname;
+#endif
+}
+
+/// Try to initialize 'program' from a cache entry
+static bool program_cache_load(GLuint program, const std::string &path) {
+    FILE *f = fopen(path.c_str(), "rb");
+    if (!f)
+        return false;
+
+    char magic[sizeof(program_cache_magic)];
+    uint32_t format = 0;
+    std::vector<uint8_t> binary;
+    bool valid =
+        fread(magic, sizeof(magic), 1, f) == 1 &&
+        memcmp(magic, program_cache_magic, sizeof(magic)) == 0 &&
+        fread(&format, sizeof(uint32_t), 1, f) == 1;
+
+    if (valid) {
+        long start = ftell(f);
+        fseek(f, 0, SEEK_END);
+        long end = ftell(f);
+        fseek(f, start, SEEK_SET);
+        valid = end > start;
+        if (valid) {
+            binary.resize((size_t) (end - start));
+            valid = fread(binary.data(), binary.size(), 1, f) == 1;
+        }
+    }
+    fclose(f);
+
+    if (valid) {
+        /* The driver may reject the binary (e.g. after an update); this is
+           reported via the link status, clear any GL error it may raise */
+        glProgramBinary(program, (GLenum) format, binary.data(), (GLsizei) binary.size());
+        while (glGetError() != GL_NO_ERROR)
+            ;
+        GLint status = GL_FALSE;
+        CHK(glGetProgramiv(program, GL_LINK_STATUS, &status));
+        valid = status == GL_TRUE;
+    }
+
+    if (!valid) {
+        program_cache_stats_value.rejected++;
+        remove(path.c_str());
+    }
+
+    return valid;
+}
+
+/// Create the directory 'path' including its parents
+static void create_directories(const std::string &path) {
+    for (size_t i = 1; i <= path.size(); ++i) {
+        if (i < path.size() && path[i] != '/' && path[i] != '\\')
+            continue;
+        std::string prefix = path.substr(0, i);
+#if defined(_WIN32)
+        _mkdir(prefix.c_str());
+#else
+        mkdir(prefix.c_str(), 0755);
+#endif
+    }
+}
+
+/// Write the binary of a linked program to the cache
+static void program_cache_store(GLuint program, const std::string &path) {
+    GLint size = 0;
+    CHK(glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH, &size));
+    if (size <= 0)
+        return;
+
+    std::vector<uint8_t> binary((size_t) size);
+    GLenum format = 0;
+    CHK(glGetProgramBinary(program, size, &size, &format, binary.data()));
+    if (size <= 0)
+        return;
+
+    create_directories(program_cache_dir_value);
+
+    /* Write to a temporary file first so that concurrent processes never
+       observe a partially written entry. The name is unique per process and
+       store, so that concurrent writers never share a temporary file. */
+#if defined(_WIN32)
+    unsigned long pid = (unsigned long) _getpid();
+#else
+    unsigned long pid = (unsigned long) getpid();
+#endif
+    static std::mt19937 rng{ std::random_device{}() };
+    char suffix[48];
+    snprintf(suffix, sizeof(suffix), ".%lu-%08x.tmp", pid, (unsigned) rng());
+    std::string tmp_path = path + suffix;
+    FILE *f = fopen(tmp_path.c_str(), "wb");
+    if (!f)
+        return;
+
+    uint32_t format_u32 = (uint32_t) format;
+    bool success =
+        fwrite(program_cache_magic, sizeof(program_cache_magic), 1, f) == 1 &&
+        fwrite(&format_u32, sizeof(uint32_t), 1, f) == 1 &&
+        fwrite(binary.data(), (size_t) size, 1, f) == 1;
+    success &= fclose(f) == 0;
+
+    /* Atomically replace any existing entry (e.g. one stored concurrently by
+       another process for the same program) */
+    if (success) {
+#if defined(_WIN32)
+        success = MoveFileExA(tmp_path.c_str(), path.c_str(),
+                              MOVEFILE_REPLACE_EXISTING) != 0;
+#else
+        success = rename(tmp_path.c_str(), path.c_str()) == 0;
+#endif
+    }
+
+    if (success)
+        program_cache_stats_value.stores++;
+    else
+        remove(tmp_path.c_str());
+}
+#endif
+
+static GLuint compile_gl_shader(GLenum type, const std::string &shader_string) {
     if (shader_string.empty())
         return (GLuint) 0;
 
@@ -22,6 +233,14 @@ static GLuint compile_gl_shader(GLenum type,
     CHK(glShaderSource(id, 1, &shader_string_const, nullptr));
     CHK(glCompileShader(id));
 
+    return id;
+}
+
+/// Raise an exception if a shader submitted via compile_gl_shader() failed to compile
+static void check_gl_shader(GLenum type, const std::string &name, GLuint id) {
+    if (id == 0)
+        return;
+
     GLint status;
     CHK(glGetShaderiv(id, GL_COMPILE_STATUS, &status));
 
@@ -45,36 +264,145 @@ static GLuint compile_gl_shader(GLenum type,
                           type_str + " \"" + name + "\":\n\n" + error_shader;
         throw std::runtime_error(msg);
     }
+}
 
-    return id;
+/// Does the driver compile shaders in the background? (KHR/ARB_parallel_shader_compile)
+static bool parallel_shader_compile() {
+    static int supported = -1;
+    if (supported < 0) {
+        supported = glfwExtensionSupported("GL_KHR_parallel_shader_compile") ||
+                    glfwExtensionSupported("GL_ARB_parallel_shader_compile");
+        if (supported) {
+            /* Let the driver use as many threads as it likes */
+            using MaxThreadsFn = void (*)(GLuint);
+            MaxThreadsFn max_threads =
+                (MaxThreadsFn) glfwGetProcAddress("glMaxShaderCompilerThreadsKHR");
+            if (!max_threads)
+                max_threads = (MaxThreadsFn) glfwGetProcAddress("glMaxShaderCompilerThreadsARB");
+            if (max_threads)
+                max_threads(0xFFFFFFFFu);
+        }
+    }
+    return supported == 1;
 }
 
 Shader::Shader(RenderPass *render_pass,
                const std::string &name,
                const std::string &vertex_shader,
                const std::string &fragment_shader,
-               BlendMode blend_mode)
+               BlendMode blend_mode,
+               bool async_compile)
     : m_render_pass(render_pass), m_name(name), m_blend_mode(blend_mode), m_shader_handle(0) {
 
-    GLuint vertex_shader_handle   = compile_gl_shader(GL_VERTEX_SHADER,   name, vertex_shader),
-           fragment_shader_handle = compile_gl_shader(GL_FRAGMENT_SHADER, name, fragment_shader);
+    bool cached = false;
+#if defined(NANOGUI_PROGRAM_CACHE)
+    std::string cache_path = program_cache_path(name, vertex_shader, fragment_shader);
+    if (!cache_path.empty()) {
+        m_shader_handle = glCreateProgram();
+        cached = program_cache_load(m_shader_handle, cache_path);
+        if (cached) {
+            program_cache_stats_value.hits++;
+        } else {
+            program_cache_stats_value.misses++;
+            // Start over with a fresh program object after a rejected binary
+            CHK(glDeleteProgram(m_shader_handle));
+            m_shader_handle = 0;
+            m_cache_path = cache_path;
+        }
+    }
+#endif
 
-    m_shader_handle = glCreateProgram();
+    if (!cached) {
+        /* Only submit the work here, the status is checked in finalize() */
+        m_pending_shaders[0] = compile_gl_shader(GL_VERTEX_SHADER,   vertex_shader);
+        m_pending_shaders[1] = compile_gl_shader(GL_FRAGMENT_SHADER, fragment_shader);
 
-    GLint status;
-    CHK(glAttachShader(m_shader_handle, vertex_shader_handle));
-    CHK(glAttachShader(m_shader_handle, fragment_shader_handle));
-    CHK(glLinkProgram(m_shader_handle));
-    CHK(glDeleteShader(vertex_shader_handle));
-    CHK(glDeleteShader(fragment_shader_handle));
-    CHK(glGetProgramiv(m_shader_handle, GL_LINK_STATUS, &status));
+        m_shader_handle = glCreateProgram();
 
-    if (status != GL_TRUE) {
-        char error_shader[4096];
-        CHK(glGetProgramInfoLog(m_shader_handle, sizeof(error_shader), nullptr, error_shader));
-        m_shader_handle = 0;
-        throw std::runtime_error("Shader::Shader(name=\"" + name +
-                                 "\"): unable to link shader!\n\n" + error_shader);
+        CHK(glAttachShader(m_shader_handle, m_pending_shaders[0]));
+        CHK(glAttachShader(m_shader_handle, m_pending_shaders[1]));
+#if defined(NANOGUI_PROGRAM_CACHE)
+        if (!m_cache_path.empty())
+            CHK(glProgramParameteri(m_shader_handle, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE));
+#endif
+        CHK(glLinkProgram(m_shader_handle));
+        m_compiling = true;
+    }
+
+    m_pending = true;
+
+#if defined(NANOGUI_USE_OPENGL)
+    CHK(glGenVertexArrays(1, &m_vertex_array_handle));
+
+    m_uses_point_size = vertex_shader.find("gl_PointSize") != std::string::npos;
+#endif
+
+    if (!async_compile)
+        finalize();
+}
+
+bool Shader::ready() {
+    if (!m_pending && m_error.empty())
+        return true;
+
+    if (m_compiling && parallel_shader_compile()) {
+        GLint status = GL_FALSE;
+        CHK(glGetProgramiv(m_shader_handle, 0x91B1 /* GL_COMPLETION_STATUS_KHR */, &status));
+        if (status != GL_TRUE)
+            return false;
+    }
+
+    finalize();
+    return true;
+}
+
+void Shader::finalize() {
+    if (!m_error.empty())
+        throw std::runtime_error(m_error);
+    if (!m_pending)
+        return;
+    m_pending = false;
+
+    try {
+        init_program();
+    } catch (const std::exception &e) {
+        /* Report the original error on every later use of the shader */
+        m_error = e.what();
+        throw;
+    }
+}
+
+void Shader::init_program() {
+    if (m_compiling) {
+        m_compiling = false;
+        GLint status;
+        try {
+            check_gl_shader(GL_VERTEX_SHADER,   m_name, m_pending_shaders[0]);
+            check_gl_shader(GL_FRAGMENT_SHADER, m_name, m_pending_shaders[1]);
+        } catch (...) {
+            CHK(glDeleteShader(m_pending_shaders[0]));
+            CHK(glDeleteShader(m_pending_shaders[1]));
+            m_pending_shaders[0] = m_pending_shaders[1] = 0;
+            throw;
+        }
+
+        CHK(glDeleteShader(m_pending_shaders[0]));
+        CHK(glDeleteShader(m_pending_shaders[1]));
+        m_pending_shaders[0] = m_pending_shaders[1] = 0;
+        CHK(glGetProgramiv(m_shader_handle, GL_LINK_STATUS, &status));
+
+        if (status != GL_TRUE) {
+            char error_shader[4096];
+            CHK(glGetProgramInfoLog(m_shader_handle, sizeof(error_shader), nullptr, error_shader));
+            m_shader_handle = 0;
+            throw std::runtime_error("Shader::Shader(name=\"" + m_name +
+                                     "\"): unable to link shader!\n\n" + error_shader);
+        }
+
+#if defined(NANOGUI_PROGRAM_CACHE)
+        if (!m_cache_path.empty())
+            program_cache_store(m_shader_handle, m_cache_path);
+#endif
     }
 
     GLint attribute_count, uniform_count;
@@ -245,17 +573,27 @@ Shader::Shader(RenderPass *render_pass,
     buf.shape[1] = buf.shape[2] = 1;
     buf.type = IndexBuffer;
     buf.dtype = VariableType::UInt32;
-
-#if defined(NANOGUI_USE_OPENGL)
-    CHK(glGenVertexArrays(1, &m_vertex_array_handle));
-
-    m_uses_point_size = vertex_shader.find("gl_PointSize") != std::string::npos;
-#endif
 }
 
 Shader::~Shader() {
+    for (int i = 0; i < 2; ++i) {
+        if (m_pending_shaders[i])
+            CHK(glDeleteShader(m_pending_shaders[i]));
+    }
+    for (auto &[key, buf] : m_buffers) {
+        if (!buf.buffer)
+            continue;
+        if (buf.type == UniformBuffer) {
+            delete[] (uint8_t *) buf.buffer;
+        } else if (buf.type == VertexBuffer || buf.type == IndexBuffer) {
+            GLuint buffer_id = (GLuint) ((uintptr_t) buf.buffer);
+            CHK(glDeleteBuffers(1, &buffer_id));
+        }
+    }
+    gl_forget_program(m_shader_handle);
     CHK(glDeleteProgram(m_shader_handle));
 #if defined(NANOGUI_USE_OPENGL)
+    gl_forget_vertex_array(m_vertex_array_handle);
     CHK(glDeleteVertexArrays(1, &m_vertex_array_handle));
 #endif
 }
@@ -265,28 +603,7 @@ void Shader::set_buffer(const std::string &name,
                         size_t ndim,
                         const size_t *shape,
                         const void *data) {
-    auto it = m_buffers.find(name);
-    if (it == m_buffers.end())
-        throw std::runtime_error(
-            "Shader::set_buffer(): could not find argument named \"" + name + "\"");
-
-    Buffer &buf = m_buffers[name];
-
-    bool mismatch = ndim != buf.ndim || dtype != buf.dtype;
-    for (size_t i = (buf.type == UniformBuffer ? 0 : 1); i < ndim; ++i)
-        mismatch |= shape[i] != buf.shape[i];
-
-    if (mismatch) {
-        Buffer arg;
-        arg.type = buf.type;
-        arg.ndim = ndim;
-        for (size_t i = 0; i < 3; ++i)
-            arg.shape[i] = i < arg.ndim ? shape[i] : 1;
-        arg.dtype = dtype;
-        throw std::runtime_error("Buffer::set_buffer(\"" + name +
-                                 "\"): shape/dtype mismatch: expected " + buf.to_string() +
-                                 ", got " + arg.to_string());
-    }
+    Buffer &buf = check_buffer("set_buffer", name, dtype, ndim, shape);
 
     size_t size = type_size(dtype);
     for (size_t i = 0; i < 3; ++i) {
@@ -309,11 +626,30 @@ void Shader::set_buffer(const std::string &name,
         } else {
             CHK(glGenBuffers(1, &buffer_id));
             buf.buffer = (void *) ((uintptr_t) buffer_id);
+            buf.capacity = 0;
         }
         GLenum buf_type = (name == "indices")
             ? GL_ELEMENT_ARRAY_BUFFER : GL_ARRAY_BUFFER;
+#if defined(NANOGUI_USE_OPENGL)
+        /* The index buffer binding is part of the vertex array state */
+        if (buf_type == GL_ELEMENT_ARRAY_BUFFER)
+            gl_bind_vertex_array(m_vertex_array_handle);
+#endif
         CHK(glBindBuffer(buf_type, buffer_id));
-        CHK(glBufferData(buf_type, size, data, GL_DYNAMIC_DRAW));
+
+        /* Reuse the existing storage unless it is too small or much too large */
+        if (size > buf.capacity || size < buf.capacity / 4) {
+            size_t capacity = size > buf.capacity ? std::max(size, buf.capacity * 2) : size;
+            if (capacity == size) {
+                CHK(glBufferData(buf_type, (GLsizeiptr) size, data, GL_DYNAMIC_DRAW));
+            } else {
+                CHK(glBufferData(buf_type, (GLsizeiptr) capacity, nullptr, GL_DYNAMIC_DRAW));
+                CHK(glBufferSubData(buf_type, 0, (GLsizeiptr) size, data));
+            }
+            buf.capacity = capacity;
+        } else if (size > 0) {
+            CHK(glBufferSubData(buf_type, 0, (GLsizeiptr) size, data));
+        }
     }
 
     buf.dtype = dtype;
@@ -322,7 +658,78 @@ void Shader::set_buffer(const std::string &name,
     buf.dirty = true;
 }
 
+void Shader::update_buffer(const std::string &name,
+                           VariableType dtype,
+                           size_t offset,
+                           size_t ndim,
+                           const size_t *shape,
+                           const void *data) {
+    Buffer &buf = check_buffer("update_buffer", name, dtype, ndim, shape);
+    if (buf.type != VertexBuffer && buf.type != IndexBuffer)
+        throw std::runtime_error("Shader::update_buffer(): argument named \"" + name +
+                                 "\" is not a vertex or index buffer!");
+
+    size_t rows = buf.buffer ? buf.shape[0] : 0;
+    if (offset > rows)
+        throw std::runtime_error("Shader::update_buffer(): offset exceeds the size of "
+                                 "buffer \"" + name + "\"!");
+
+    size_t row_size = type_size(dtype) * (ndim > 1 ? shape[1] : 1) *
+                      (ndim > 2 ? shape[2] : 1),
+           count    = ndim > 0 ? shape[0] : 1;
+
+    if (!buf.buffer) {
+        set_buffer(name, dtype, ndim, shape, data);
+        return;
+    }
+
+    GLenum buf_type = (name == "indices")
+        ? GL_ELEMENT_ARRAY_BUFFER : GL_ARRAY_BUFFER;
+    GLuint buffer_id = (GLuint) ((uintptr_t) buf.buffer);
+
+    rows = std::max(rows, offset + count);
+    size_t size = rows * row_size;
+
+    if (size > buf.capacity) {
+#if defined(NANOGUI_USE_GLES) && NANOGUI_GLES_VERSION == 2
+        throw std::runtime_error("Shader::update_buffer(): growing a buffer "
+                                 "requires GLES 3!");
+#else
+        /* Reallocate with geometric growth and copy over the old contents */
+        size_t capacity = std::max(size, buf.capacity * 2);
+        GLuint new_id = 0;
+        CHK(glGenBuffers(1, &new_id));
+        CHK(glBindBuffer(GL_COPY_WRITE_BUFFER, new_id));
+        CHK(glBufferData(GL_COPY_WRITE_BUFFER, (GLsizeiptr) capacity, nullptr,
+                         GL_DYNAMIC_DRAW));
+        CHK(glBindBuffer(GL_COPY_READ_BUFFER, buffer_id));
+        CHK(glCopyBufferSubData(GL_COPY_READ_BUFFER, GL_COPY_WRITE_BUFFER, 0, 0,
+                                (GLsizeiptr) (offset * row_size)));
+        CHK(glBindBuffer(GL_COPY_READ_BUFFER, 0));
+        CHK(glBindBuffer(GL_COPY_WRITE_BUFFER, 0));
+        CHK(glDeleteBuffers(1, &buffer_id));
+
+        buffer_id = new_id;
+        buf.buffer = (void *) ((uintptr_t) buffer_id);
+        buf.capacity = capacity;
+        buf.dirty = true;
+#endif
+    }
+
+#if defined(NANOGUI_USE_OPENGL)
+    if (buf_type == GL_ELEMENT_ARRAY_BUFFER)
+        gl_bind_vertex_array(m_vertex_array_handle);
+#endif
+    CHK(glBindBuffer(buf_type, buffer_id));
+    CHK(glBufferSubData(buf_type, (GLintptr) (offset * row_size),
+                        (GLsizeiptr) (count * row_size), data));
+
+    buf.shape[0] = rows;
+    buf.size = size;
+}
+
 void Shader::set_texture(const std::string &name, Texture *texture) {
+    finalize();
     auto it = m_buffers.find(name);
     if (it == m_buffers.end())
         throw std::runtime_error(
@@ -339,10 +746,12 @@ void Shader::set_texture(const std::string &name, Texture *texture) {
 void Shader::begin() {
     int texture_unit = 0;
 
-    CHK(glUseProgram(m_shader_handle));
+    finalize();
+
+    gl_use_program(m_shader_handle);
 
 #if defined(NANOGUI_USE_OPENGL)
-    CHK(glBindVertexArray(m_vertex_array_handle));
+    gl_bind_vertex_array(m_vertex_array_handle);
 #endif
 
     for (auto &[key, buf] : m_buffers) {
@@ -395,12 +804,15 @@ void Shader::begin() {
 
                 CHK(glVertexAttribPointer(buf.index, (GLint) buf.shape[1],
                                           gl_type, GL_FALSE, 0, nullptr));
+#if !defined(NANOGUI_USE_GLES) || NANOGUI_GLES_VERSION >= 3
+                CHK(glVertexAttribDivisor(buf.index, (GLuint) buf.divisor));
+#endif
                 break;
 
             case VertexTexture:
             case FragmentTexture:
-                CHK(glActiveTexture(GL_TEXTURE0 + texture_unit));
-                CHK(glBindTexture(GL_TEXTURE_2D, (GLuint) ((uintptr_t) buf.buffer)));
+                gl_active_texture((GLuint) texture_unit);
+                gl_bind_texture(GL_TEXTURE_2D, (GLuint) ((uintptr_t) buf.buffer));
                 if (buf.dirty)
                     CHK(glUniform1i(buf.index, texture_unit));
                 texture_unit++;
@@ -506,37 +918,32 @@ void Shader::begin() {
         buf.dirty = false;
     }
 
-    if (m_blend_mode == BlendMode::AlphaBlend) {
-        CHK(glEnable(GL_BLEND));
-        CHK(glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA));
-    }
+    /* Set the complete state, since end() leaves it in place */
+    gl_set_enabled(GL_BLEND, m_blend_mode == BlendMode::AlphaBlend);
+    if (m_blend_mode == BlendMode::AlphaBlend)
+        gl_blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA);
 
 #if defined(NANOGUI_USE_OPENGL)
-    if (m_uses_point_size)
-        CHK(glEnable(GL_PROGRAM_POINT_SIZE));
+    gl_set_enabled(GL_PROGRAM_POINT_SIZE, m_uses_point_size);
 #endif
 }
 
 void Shader::end() {
-    if (m_blend_mode == BlendMode::AlphaBlend)
-        CHK(glDisable(GL_BLEND));
-#if defined(NANOGUI_USE_OPENGL)
-    if (m_uses_point_size)
-        CHK(glDisable(GL_PROGRAM_POINT_SIZE));
-    CHK(glBindVertexArray(0));
-#else
+    /* The program, vertex array, and blend state remain bound so that
+       consecutive draws with the same shader skip redundant changes.
+       State that other code depends on is restored by RenderPass::end(). */
+#if !defined(NANOGUI_USE_OPENGL)
     for (const auto &[key, buf] : m_buffers) {
         if (buf.type != VertexBuffer)
             continue;
         CHK(glDisableVertexAttribArray(buf.index));
     }
 #endif
-    CHK(glUseProgram(0));
 }
 
 void Shader::draw_array(PrimitiveType primitive_type,
                         size_t offset, size_t count,
-                        bool indexed) {
+                        bool indexed, size_t instance_count) {
     GLenum primitive_type_gl;
     switch (primitive_type) {
         case PrimitiveType::Point:         primitive_type_gl = GL_POINTS;         break;
@@ -547,11 +954,31 @@ void Shader::draw_array(PrimitiveType primitive_type,
         default: throw std::runtime_error("Shader::draw_array(): invalid primitive type!");
     }
 
-    if (!indexed)
-        CHK(glDrawArrays(primitive_type_gl, (GLint) offset, (GLsizei) count));
-    else
-        CHK(glDrawElements(primitive_type_gl, (GLsizei) count, GL_UNSIGNED_INT,
-                           (const void *) (offset * sizeof(uint32_t))));
+    count = clamp_count(offset, count, indexed);
+    instance_count = clamp_instance_count(instance_count);
+    if (count == 0 || instance_count == 0)
+        return;
+
+    if (instance_count == 1) {
+        if (!indexed)
+            CHK(glDrawArrays(primitive_type_gl, (GLint) offset, (GLsizei) count));
+        else
+            CHK(glDrawElements(primitive_type_gl, (GLsizei) count, GL_UNSIGNED_INT,
+                               (const void *) (offset * sizeof(uint32_t))));
+    } else {
+#if defined(NANOGUI_USE_GLES) && NANOGUI_GLES_VERSION == 2
+        throw std::runtime_error("Shader::draw_array(): instancing requires GLES 3!");
+#else
+        if (!indexed)
+            CHK(glDrawArraysInstanced(primitive_type_gl, (GLint) offset,
+                                      (GLsizei) count, (GLsizei) instance_count));
+        else
+            CHK(glDrawElementsInstanced(primitive_type_gl, (GLsizei) count,
+                                        GL_UNSIGNED_INT,
+                                        (const void *) (offset * sizeof(uint32_t)),
+                                        (GLsizei) instance_count));
+#endif
+    }
 }
 
 NAMESPACE_END(nanogui)
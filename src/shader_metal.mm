@@ -58,7 +58,8 @@ Shader::Shader(RenderPass *render_pass,
                const std::string &name,
                const std::string &vertex_shader,
                const std::string &fragment_shader,
-               BlendMode blend_mode)
+               BlendMode blend_mode,
+               bool /* async_compile */)
     : m_render_pass(render_pass), m_name(name), m_blend_mode(blend_mode), m_pipeline_state(nullptr) {
     id<MTLDevice> device = (__bridge id<MTLDevice>) metal_device();
     id<MTLFunction> vertex_func   = compile_metal_shader(device, name, "vertex", vertex_shader),
@@ -189,6 +190,59 @@ Shader::Shader(RenderPass *render_pass,
     buf.type = IndexBuffer;
 }
 
+/* Metal shaders are precompiled, hence the program cache is never used */
+static std::string program_cache_dir_value;
+
+void Shader::set_program_cache_dir(const std::string &dir) {
+    program_cache_dir_value = dir;
+}
+
+const std::string &Shader::program_cache_dir() {
+    return program_cache_dir_value;
+}
+
+Shader::ProgramCacheStats Shader::program_cache_stats() {
+    return ProgramCacheStats();
+}
+
+void Shader::reset_program_cache_stats() { }
+
+/* Metal libraries are precompiled, shaders are always ready */
+bool Shader::ready() { return true; }
+
+void Shader::finalize() { }
+
+/// Copy 'size' bytes from the CPU into a private Metal buffer
+static void metal_copy_to_buffer(id<MTLBuffer> buffer, size_t offset,
+                                 const void *data, size_t size) {
+    if (size == 0)
+        return;
+
+    /* Procedure recommended by Apple: create a temporary shared buffer and
+       blit into a private GPU-only buffer */
+    id<MTLDevice> device = (__bridge id<MTLDevice>) metal_device();
+    id<MTLBuffer> temp_buffer =
+        [device newBufferWithBytes: data
+                            length: size
+                           options: MTLResourceStorageModeShared];
+
+    id<MTLCommandQueue> command_queue =
+        (__bridge id<MTLCommandQueue>) metal_command_queue();
+    id<MTLCommandBuffer> command_buffer = [command_queue commandBuffer];
+    id<MTLBlitCommandEncoder> blit_encoder =
+        [command_buffer blitCommandEncoder];
+
+    [blit_encoder copyFromBuffer: temp_buffer
+                    sourceOffset: 0
+                        toBuffer: buffer
+               destinationOffset: offset
+                            size: size];
+
+    [blit_encoder endEncoding];
+    [command_buffer commit];
+    [command_buffer waitUntilCompleted];
+}
+
 Shader::~Shader() {
     for (const auto &[key, buf] : m_buffers) {
         if (!buf.buffer)
@@ -196,7 +250,7 @@ Shader::~Shader() {
         if (buf.type == VertexBuffer ||
             buf.type == FragmentBuffer ||
             buf.type == IndexBuffer) {
-            if (buf.size <= NANOGUI_BUFFER_THRESHOLD)
+            if (buf.capacity <= NANOGUI_BUFFER_THRESHOLD && key != "indices")
                 delete[] (uint8_t *) buf.buffer;
             else
                 (void) (__bridge_transfer id<MTLBuffer>) buf.buffer;
@@ -233,58 +287,136 @@ void Shader::set_buffer(const std::string &name,
         buf.shape[i] = i < ndim ? shape[i] : 1;
 
     size_t size = type_size(dtype) * buf.shape[0] * buf.shape[1] * buf.shape[2];
-    if (buf.buffer && buf.size != size) {
-        if (buf.size <= NANOGUI_BUFFER_THRESHOLD)
+    bool host = size <= NANOGUI_BUFFER_THRESHOLD && name != "indices",
+         was_host = buf.capacity <= NANOGUI_BUFFER_THRESHOLD && name != "indices";
+
+    /* Reuse the existing storage unless it is too small or much too large */
+    size_t capacity = buf.capacity;
+    if (buf.buffer && (host != was_host || size > buf.capacity ||
+                       size < buf.capacity / 4)) {
+        if (was_host)
             delete[] (uint8_t *) buf.buffer;
         else
             (void) (__bridge_transfer id<MTLBuffer>) buf.buffer;
         buf.buffer = nullptr;
+        if (host || size < buf.capacity)
+            capacity = size;
+        else
+            capacity = std::max(size, buf.capacity * 2);
+    } else if (!buf.buffer) {
+        capacity = size;
     }
 
-    if (size <= NANOGUI_BUFFER_THRESHOLD && name != "indices") {
+    if (host) {
         if (!buf.buffer)
-            buf.buffer = new uint8_t[size];
+            buf.buffer = new uint8_t[capacity];
         memcpy(buf.buffer, data, size);
     } else {
-        /* Procedure recommended by Apple: create a temporary shared buffer and
-           blit into a private GPU-only buffer */
-        id<MTLDevice> device = (__bridge id<MTLDevice>) metal_device();
         id<MTLBuffer> mtl_buffer;
 
-        if (buf.buffer)
+        if (buf.buffer) {
             mtl_buffer = (__bridge_transfer id<MTLBuffer>) buf.buffer;
-        else
+        } else {
+            id<MTLDevice> device = (__bridge id<MTLDevice>) metal_device();
             mtl_buffer =
-                [device newBufferWithLength: size
+                [device newBufferWithLength: capacity
                                     options: MTLResourceStorageModePrivate];
+        }
+
+        metal_copy_to_buffer(mtl_buffer, 0, data, size);
+        buf.buffer = (__bridge_retained void *) mtl_buffer;
+    }
+
+    buf.dtype    = dtype;
+    buf.ndim     = ndim;
+    buf.size     = size;
+    buf.capacity = capacity;
+}
+
+void Shader::update_buffer(const std::string &name,
+                           VariableType dtype,
+                           size_t offset,
+                           size_t ndim,
+                           const size_t *shape,
+                           const void *data) {
+    auto it = m_buffers.find(name);
+    if (it == m_buffers.end())
+        throw std::runtime_error(
+            "Shader::update_buffer(): could not find argument named \"" + name + "\"");
+    Buffer &buf = it->second;
+    if (!(buf.type == VertexBuffer || buf.type == IndexBuffer))
+        throw std::runtime_error("Shader::update_buffer(): argument named \"" + name +
+                                 "\" is not a vertex or index buffer!");
+
+    if (!buf.buffer) {
+        if (offset != 0)
+            throw std::runtime_error("Shader::update_buffer(): offset exceeds the size of "
+                                     "buffer \"" + name + "\"!");
+        set_buffer(name, dtype, ndim, shape, data);
+        return;
+    }
 
-        id<MTLBuffer> temp_buffer =
-            [device newBufferWithBytes: data
-                                length: size
-                               options: MTLResourceStorageModeShared];
+    check_buffer("update_buffer", name, dtype, ndim, shape);
 
-        id<MTLCommandQueue> command_queue =
-            (__bridge id<MTLCommandQueue>) metal_command_queue();
-        id<MTLCommandBuffer> command_buffer = [command_queue commandBuffer];
-        id<MTLBlitCommandEncoder> blit_encoder =
-            [command_buffer blitCommandEncoder];
+    size_t rows = buf.shape[0];
+    if (offset > rows)
+        throw std::runtime_error("Shader::update_buffer(): offset exceeds the size of "
+                                 "buffer \"" + name + "\"!");
 
-        [blit_encoder copyFromBuffer: temp_buffer
-                        sourceOffset: 0
-                            toBuffer: mtl_buffer
-                   destinationOffset: 0
-                                size: size];
+    size_t row_size = type_size(dtype) * buf.shape[1] * buf.shape[2],
+           count    = ndim > 0 ? shape[0] : 1;
 
-        [blit_encoder endEncoding];
-        [command_buffer commit];
-        [command_buffer waitUntilCompleted];
+    rows = std::max(rows, offset + count);
+    size_t size = rows * row_size;
+    bool was_host = buf.capacity <= NANOGUI_BUFFER_THRESHOLD && name != "indices";
+
+    if (was_host && size <= NANOGUI_BUFFER_THRESHOLD) {
+        if (size > buf.capacity) {
+            uint8_t *buffer = new uint8_t[size];
+            memcpy(buffer, buf.buffer, offset * row_size);
+            delete[] (uint8_t *) buf.buffer;
+            buf.buffer = buffer;
+            buf.capacity = size;
+        }
+        memcpy((uint8_t *) buf.buffer + offset * row_size, data, count * row_size);
+    } else {
+        id<MTLBuffer> mtl_buffer;
+        if (was_host || size > buf.capacity) {
+            /* Reallocate with geometric growth and copy over the old contents */
+            size_t capacity = std::max(size, buf.capacity * 2);
+            id<MTLDevice> device = (__bridge id<MTLDevice>) metal_device();
+            mtl_buffer = [device newBufferWithLength: capacity
+                                             options: MTLResourceStorageModePrivate];
+
+            if (was_host) {
+                metal_copy_to_buffer(mtl_buffer, 0, buf.buffer, offset * row_size);
+                delete[] (uint8_t *) buf.buffer;
+            } else {
+                id<MTLBuffer> old_buffer = (__bridge_transfer id<MTLBuffer>) buf.buffer;
+                id<MTLCommandQueue> command_queue =
+                    (__bridge id<MTLCommandQueue>) metal_command_queue();
+                id<MTLCommandBuffer> command_buffer = [command_queue commandBuffer];
+                id<MTLBlitCommandEncoder> blit_encoder =
+                    [command_buffer blitCommandEncoder];
+                [blit_encoder copyFromBuffer: old_buffer
+                                sourceOffset: 0
+                                    toBuffer: mtl_buffer
+                           destinationOffset: 0
+                                        size: offset * row_size];
+                [blit_encoder endEncoding];
+                [command_buffer commit];
+            }
+            buf.capacity = capacity;
+        } else {
+            mtl_buffer = (__bridge_transfer id<MTLBuffer>) buf.buffer;
+        }
 
+        metal_copy_to_buffer(mtl_buffer, offset * row_size, data, count * row_size);
         buf.buffer = (__bridge_retained void *) mtl_buffer;
     }
 
-    buf.dtype = dtype;
-    buf.ndim  = ndim;
-    buf.size  = size;
+    buf.shape[0] = rows;
+    buf.size = size;
 }
 
 void Shader::set_texture(const std::string &name, Texture *texture) {
@@ -371,7 +503,7 @@ void Shader::begin() {
                 break;
 
             default:
-                if (buf.size <= NANOGUI_BUFFER_THRESHOLD && !indices) {
+                if (buf.capacity <= NANOGUI_BUFFER_THRESHOLD && !indices) {
                     if (buf.type == VertexBuffer)
                         [command_enc setVertexBytes: buf.buffer
                                              length: buf.size
@@ -404,7 +536,7 @@ void Shader::end() {
 
 void Shader::draw_array(PrimitiveType primitive_type,
                         size_t offset, size_t count,
-                        bool indexed) {
+                        bool indexed, size_t instance_count) {
     MTLPrimitiveType primitive_type_mtl;
     switch (primitive_type) {
         case PrimitiveType::Point:         primitive_type_mtl = MTLPrimitiveTypePoint;         break;
@@ -415,13 +547,19 @@ void Shader::draw_array(PrimitiveType primitive_type,
         default: throw std::runtime_error("Shader::draw_array(): invalid primitive type!");
     }
 
+    count = clamp_count(offset, count, indexed);
+    instance_count = clamp_instance_count(instance_count);
+    if (count == 0 || instance_count == 0)
+        return;
+
     id<MTLRenderCommandEncoder> command_enc =
         (__bridge id<MTLRenderCommandEncoder>) m_render_pass->command_encoder();
 
     if (!indexed) {
         [command_enc drawPrimitives: primitive_type_mtl
                         vertexStart: offset
-                        vertexCount: count];
+                        vertexCount: count
+                      instanceCount: instance_count];
     } else {
         id<MTLBuffer> index_buffer =
             (__bridge id<MTLBuffer>) m_buffers["indices"].buffer;
@@ -429,7 +567,8 @@ void Shader::draw_array(PrimitiveType primitive_type,
                                 indexCount: count
                                  indexType: MTLIndexTypeUInt32
                                indexBuffer: index_buffer
-                         indexBufferOffset: offset * 4];
+                         indexBufferOffset: offset * 4
+                             instanceCount: instance_count];
     }
 }
 
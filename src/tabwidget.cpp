@@ -17,6 +17,7 @@
 #include <nanogui/layout.h>
 #include <nanogui/button.h>
 #include <nanogui/opengl.h>
+#include <nanogui/textmetrics.h>
 #include <nanogui/icons.h>
 
 NAMESPACE_BEGIN(nanogui)
@@ -33,6 +34,7 @@ void TabWidgetBase::remove_tab(int id) {
     m_tab_ids.erase(m_tab_ids.begin() + index);
     if (index <= m_active_tab)
         m_active_tab = std::max(0, m_active_tab - 1);
+    invalidate_layout();
     TabWidgetBase::perform_layout(screen()->nvg_context());
     if (m_close_callback)
         m_close_callback(id);
@@ -46,6 +48,7 @@ int TabWidgetBase::insert_tab(int index, const std::string &caption) {
     int id = m_tab_counter++;
     m_tab_captions.insert(m_tab_captions.begin() + index, caption);
     m_tab_ids.insert(m_tab_ids.begin() + index, id);
+    invalidate_layout();
     TabWidgetBase::perform_layout(screen()->nvg_context());
     if (index < m_active_tab)
         m_active_tab++;
@@ -72,16 +75,11 @@ int TabWidgetBase::tab_index(int id) const {
 void TabWidgetBase::update_visibility() { /* No-op */ }
 
 void TabWidgetBase::perform_layout(NVGcontext* ctx) {
-    m_tab_offsets.clear();
-    nvgFontFace(ctx, m_font.c_str());
-    nvgFontSize(ctx, font_size());
-    nvgTextAlign(ctx, NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
-
     m_tab_offsets.clear();
     int width = 0;
-    float unused[4];
     for (const std::string &label : m_tab_captions) {
-        int label_width = nvgTextBounds(ctx, 0, 0, label.c_str(), nullptr, unused);
+        int label_width = text_bounds(ctx, m_font.c_str(), font_size(), label,
+                                      nullptr, NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
         m_tab_offsets.push_back(width);
         width += label_width + 2 * m_theme->m_tab_button_horizontal_padding;
         if (m_tabs_closeable)
@@ -89,20 +87,16 @@ void TabWidgetBase::perform_layout(NVGcontext* ctx) {
     }
     m_tab_offsets.push_back(width);
 
-    nvgFontFace(ctx, "icons");
-    m_close_width =
-        nvgTextBounds(ctx, 0, 0, utf8(FA_TIMES_CIRCLE).data(), nullptr, unused);
+    m_close_width = text_bounds(ctx, "icons", font_size(),
+                                utf8(FA_TIMES_CIRCLE).data(), nullptr,
+                                NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
 }
 
 Vector2i TabWidgetBase::preferred_size(NVGcontext* ctx) const {
-    nvgFontFace(ctx, m_font.c_str());
-    nvgFontSize(ctx, font_size());
-    nvgTextAlign(ctx, NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
-
     int width = 0;
     for (const std::string &label : m_tab_captions) {
-        float unused[4];
-        int label_width = nvgTextBounds(ctx, 0, 0, label.c_str(), nullptr, unused);
+        int label_width = text_bounds(ctx, m_font.c_str(), font_size(), label,
+                                      nullptr, NVG_ALIGN_LEFT | NVG_ALIGN_TOP);
         width += label_width + 2 * m_theme->m_tab_button_horizontal_padding;
         if (m_tabs_closeable)
             width += m_close_width;
@@ -380,7 +374,7 @@ void TabWidget::perform_layout(NVGcontext* ctx) {
     for (Widget *child : m_children) {
         child->set_position(Vector2i(m_padding, m_padding + tab_height + 1));
         child->set_size(m_size - Vector2i(2*m_padding, 2*m_padding + tab_height + 1));
-        child->perform_layout(ctx);
+        child->update_layout(ctx);
     }
 }
 
@@ -398,7 +392,7 @@ Vector2i TabWidget::preferred_size(NVGcontext* ctx) const {
     Vector2i base_size = TabWidgetBase::preferred_size(ctx),
              content_size = Vector2i(0);
     for (Widget *child : m_children)
-        content_size = max(content_size, child->preferred_size(ctx));
+        content_size = max(content_size, child->preferred_size_cached(ctx));
 
     return Vector2i(
         std::max(base_size.x(), content_size.x() + 2 * m_padding),
@@ -12,23 +12,49 @@
 #include <nanogui/textarea.h>
 #include <nanogui/opengl.h>
 #include <nanogui/theme.h>
+#include <nanogui/textmetrics.h>
 #include <nanogui/screen.h>
 #include <nanogui/vscrollpanel.h>
 
 NAMESPACE_BEGIN(nanogui)
 
 TextArea::TextArea(Widget *parent) : Widget(parent),
-  m_foreground_color(Color(0, 0)), m_background_color(Color(0, 0)),
-  m_selection_color(.5f, 1.f), m_font("sans"), m_offset(0),
-  m_max_size(0), m_padding(0), m_selectable(true),
+  m_text_base(0), m_first_line(0), m_line(0), m_max_lines(0),
+  m_max_width(0), m_foreground_color(Color(0, 0)),
+  m_background_color(Color(0, 0)), m_selection_color(.5f, 1.f),
+  m_font("sans"), m_padding(0), m_selectable(true),
   m_selection_start(-1), m_selection_end(-1) { }
 
 void TextArea::append(const std::string &text) {
     NVGcontext *ctx = screen()->nvg_context();
+    append_text(ctx, text);
+    discard_lines();
 
-    nvgFontSize(ctx, font_size());
-    nvgFontFace(ctx, m_font.c_str());
+    invalidate_layout();
+    VScrollPanel *vscroll = dynamic_cast<VScrollPanel *>(m_parent);
+    if (vscroll)
+        vscroll->update_layout(ctx);
+    invalidate_layer();
+    mark_dirty();
+}
+
+void TextArea::append_lines(const std::vector<std::string> &lines) {
+    NVGcontext *ctx = screen()->nvg_context();
+    for (const std::string &line : lines) {
+        append_text(ctx, line);
+        m_line++;
+    }
+    discard_lines();
+
+    invalidate_layout();
+    VScrollPanel *vscroll = dynamic_cast<VScrollPanel *>(m_parent);
+    if (vscroll)
+        vscroll->update_layout(ctx);
+    invalidate_layer();
+    mark_dirty();
+}
 
+void TextArea::append_text(NVGcontext *ctx, const std::string &text) {
     const char *str = text.c_str();
     do {
         const char *begin = str;
@@ -36,29 +62,110 @@ void TextArea::append(const std::string &text) {
         while (*str != 0 && *str != '\n')
             str++;
 
-        std::string line(begin, str);
-        if (line.empty())
-            continue;
-        int width = nvgTextBounds(ctx, 0, 0, line.c_str(), nullptr, nullptr);
-        m_blocks.push_back(Block { m_offset, width, line, m_foreground_color });
-
-        m_offset.x() += width;
-        m_max_size = max(m_max_size, m_offset);
-        if (*str == '\n') {
-            m_offset = Vector2i(0, m_offset.y() + font_size());
-            m_max_size = max(m_max_size, m_offset);
+        if (str != begin) {
+            m_blocks.push_back(Block { m_line, -1, -1, m_text_base + m_text.size(),
+                                       (uint32_t) (str - begin), m_foreground_color });
+            m_text.append(begin, str);
+
+            /* In log mode, text is only measured once it becomes visible */
+            if (m_max_lines == 0)
+                measure_blocks(ctx, m_blocks.size() - 1, m_blocks.size());
         }
+
+        if (*str == '\n')
+            m_line++;
     } while (*str++ != 0);
+}
 
-    VScrollPanel *vscroll = dynamic_cast<VScrollPanel *>(m_parent);
-    if (vscroll)
-        vscroll->perform_layout(ctx);
+void TextArea::measure_blocks(NVGcontext *ctx, size_t begin, size_t end) {
+    if (begin >= end)
+        return;
+
+    /* The horizontal offset of a block depends on its predecessors */
+    while (begin > 0 && m_blocks[begin - 1].width < 0 &&
+           m_blocks[begin - 1].line == m_blocks[begin].line)
+        begin--;
+
+    /* Log lines are rarely measured twice, don't let them evict the
+       measurements of other widgets from the shared cache */
+    bool cached = m_max_lines == 0;
+    if (!cached) {
+        nvgFontFace(ctx, m_font.c_str());
+        nvgFontSize(ctx, font_size());
+        nvgTextLetterSpacing(ctx, 0.f);
+    }
+
+    for (size_t i = begin; i < end; ++i) {
+        Block &block = m_blocks[i];
+        if (block.width >= 0)
+            continue;
+
+        block.x = 0;
+        if (i > 0 && m_blocks[i - 1].line == block.line)
+            block.x = m_blocks[i - 1].x + m_blocks[i - 1].width;
+
+        const char *text = block_text(block);
+        if (cached)
+            block.width = (int) text_bounds(ctx, m_font.c_str(), font_size(),
+                                            std::string(text, block.text_size));
+        else
+            block.width = (int) nvgTextBounds(ctx, 0, 0, text, text + block.text_size,
+                                              nullptr);
+
+        m_max_width = std::max(m_max_width, block.x + block.width);
+    }
+}
+
+void TextArea::discard_lines() {
+    if (m_max_lines == 0 || line_count() <= m_max_lines)
+        return;
+
+    size_t discarded = 0;
+    while (line_count() > m_max_lines) {
+        while (!m_blocks.empty() && m_blocks.front().line == m_first_line) {
+            m_blocks.pop_front();
+            discarded++;
+        }
+        m_first_line++;
+    }
+
+    /* Selections refer to block indices */
+    if (m_selection_start.x() >= (int) discarded &&
+        m_selection_end.x() >= (int) discarded) {
+        m_selection_start.x() -= (int) discarded;
+        m_selection_end.x() -= (int) discarded;
+    } else {
+        m_selection_start = m_selection_end = -1;
+    }
+
+    /* Release the text of discarded blocks once it dominates the storage */
+    size_t unused = m_blocks.empty() ? m_text.size()
+                                     : m_blocks.front().text_offset - m_text_base;
+    if (unused > m_text.size() / 2) {
+        m_text.erase(0, unused);
+        m_text_base += unused;
+    }
+}
+
+void TextArea::set_max_lines(size_t max_lines) {
+    m_max_lines = max_lines;
+    discard_lines();
+    invalidate_layer();
+}
+
+size_t TextArea::line_count() const {
+    bool partial = !m_blocks.empty() && m_blocks.back().line == m_line;
+    return m_line - m_first_line + (partial ? 1 : 0);
 }
 
 void TextArea::clear() {
     m_blocks.clear();
-    m_offset = m_max_size = 0;
+    m_text.clear();
+    m_text_base = m_first_line = m_line = 0;
+    m_max_width = 0;
     m_selection_start = m_selection_end = -1;
+    invalidate_layout();
+    invalidate_layer();
 }
 
 bool TextArea::keyboard_event(int key, int /* scancode */, int action, int modifiers) {
@@ -73,14 +180,16 @@ bool TextArea::keyboard_event(int key, int /* scancode */, int action, int modif
             const int max_glyphs = 1024;
             NVGglyphPosition glyphs[max_glyphs + 1];
             for (int i = start.x(); i <= end.x(); ++i) {
-                if (i > start.x() && m_blocks[i].offset.y() != m_blocks[i-1].offset.y())
+                if (i > start.x() && m_blocks[i].line != m_blocks[i-1].line)
                     str += '\n';
 
                 const Block &block = m_blocks[i];
+                const char *text = block_text(block);
+                Vector2i offset = block_offset(block);
                 NVGcontext *ctx = screen()->nvg_context();
-                int nglyphs = nvgTextGlyphPositions(ctx, block.offset.x(), block.offset.y(),
-                                                    block.text.c_str(), nullptr, glyphs, max_glyphs);
-                glyphs[nglyphs].str = block.text.c_str() + block.text.length();
+                int nglyphs = nvgTextGlyphPositions(ctx, offset.x(), offset.y(), text,
+                                                    text + block.text_size, glyphs, max_glyphs);
+                glyphs[nglyphs].str = text + block.text_size;
 
                 if (i == start.x() && i == end.x())
                     str += std::string(glyphs[start.y()].str, glyphs[end.y()].str);
@@ -89,7 +198,7 @@ bool TextArea::keyboard_event(int key, int /* scancode */, int action, int modif
                 else if (i == end.x())
                     str += std::string(glyphs[0].str, glyphs[end.y()].str);
                 else
-                    str += m_blocks[i].text;
+                    str.append(text, block.text_size);
             }
             glfwSetClipboardString(screen()->glfw_window(), str.c_str());
             return true;
@@ -99,14 +208,15 @@ bool TextArea::keyboard_event(int key, int /* scancode */, int action, int modif
 }
 
 Vector2i TextArea::preferred_size(NVGcontext *) const {
-    return m_max_size + m_padding * 2;
+    return Vector2i(m_max_width, (int) (m_line - m_first_line) * font_size()) +
+           m_padding * 2;
 }
 
 void TextArea::draw(NVGcontext *ctx) {
     VScrollPanel *vscroll = dynamic_cast<VScrollPanel *>(m_parent);
 
-    std::vector<Block>::iterator start_it = m_blocks.begin(),
-                                 end_it = m_blocks.end();
+    std::deque<Block>::iterator start_it = m_blocks.begin(),
+                                end_it = m_blocks.end();
     if (vscroll) {
         int window_offset = -position().y(),
             window_size = vscroll->size().y();
@@ -116,7 +226,7 @@ void TextArea::draw(NVGcontext *ctx) {
             m_blocks.end(),
             window_offset,
             [&](const Block &block, int value) {
-                return block.offset.y() + font_size() < value;
+                return block_offset(block).y() + font_size() < value;
             }
         );
 
@@ -124,12 +234,14 @@ void TextArea::draw(NVGcontext *ctx) {
             m_blocks.begin(),
             m_blocks.end(),
             window_offset + window_size,
-            [](int value, const Block &block) {
-                return value < block.offset.y();
+            [&](int value, const Block &block) {
+                return value < block_offset(block).y();
             }
         );
     }
 
+    measure_blocks(ctx, start_it - m_blocks.begin(), end_it - m_blocks.begin());
+
     if (m_background_color.w() != 0.f) {
         nvgFillColor(ctx, m_background_color);
         nvgBeginPath(ctx);
@@ -184,7 +296,7 @@ void TextArea::draw(NVGcontext *ctx) {
         if (color == Color(0, 0))
             color = m_theme->m_text_color;
 
-        Vector2i offset = block.offset + m_pos + m_padding;
+        Vector2i offset = block_offset(block) + m_pos + m_padding;
 
         if (m_selection_end != Vector2i(-1) && m_selection_end != Vector2i(-1) &&
             offset.y() > selection_start.y() && offset.y() < selection_end.y()) {
@@ -196,8 +308,8 @@ void TextArea::draw(NVGcontext *ctx) {
 
 
         nvgFillColor(ctx, color);
-        nvgText(ctx, offset.x(), offset.y(),
-                block.text.c_str(), nullptr);
+        const char *text = block_text(block);
+        nvgText(ctx, offset.x(), offset.y(), text, text + block.text_size);
     }
 }
 
@@ -229,7 +341,7 @@ Vector2i TextArea::position_to_block(const Vector2i &pos) const {
         m_blocks.end(),
         pos.y(),
         [&](const Block &block, int value) {
-            return block.offset.y() + font_size() < value;
+            return block_offset(block).y() + font_size() < value;
         }
     );
 
@@ -242,16 +354,20 @@ Vector2i TextArea::position_to_block(const Vector2i &pos) const {
             return Vector2i(-1, 1);
         it = m_blocks.end() - 1;
         const Block &block = *it;
-        selection = nvgTextGlyphPositions(ctx, block.offset.x(), block.offset.y(),
-                              block.text.c_str(), nullptr, glyphs, max_glyphs);
+        Vector2i offset = block_offset(block);
+        const char *text = block_text(block);
+        selection = nvgTextGlyphPositions(ctx, offset.x(), offset.y(), text,
+                                          text + block.text_size, glyphs, max_glyphs);
     } else {
-        for (auto it2 = it; it2 != m_blocks.end() && it2->offset.y() == it->offset.y(); ++it2) {
+        for (auto it2 = it; it2 != m_blocks.end() && it2->line == it->line; ++it2) {
             const Block &block = *it2;
+            Vector2i offset = block_offset(block);
+            const char *text = block_text(block);
             nvgFontSize(ctx, font_size());
             nvgFontFace(ctx, m_font.c_str());
             int nglyphs =
-                nvgTextGlyphPositions(ctx, block.offset.x(), block.offset.y(),
-                                      block.text.c_str(), nullptr, glyphs, max_glyphs);
+                nvgTextGlyphPositions(ctx, offset.x(), offset.y(), text,
+                                      text + block.text_size, glyphs, max_glyphs);
 
             for (int i = 0; i < nglyphs; ++i) {
                 if (glyphs[i].minx + glyphs[i].maxx < pos.x() * 2)
@@ -275,15 +391,17 @@ Vector2i TextArea::block_to_position(const Vector2i &pos) const {
     NVGglyphPosition glyphs[max_glyphs];
     nvgFontSize(ctx, font_size());
     nvgFontFace(ctx, m_font.c_str());
+    Vector2i offset = block_offset(block);
+    const char *text = block_text(block);
     int nglyphs =
-        nvgTextGlyphPositions(ctx, block.offset.x(), block.offset.y(),
-                              block.text.c_str(), nullptr, glyphs, max_glyphs);
+        nvgTextGlyphPositions(ctx, offset.x(), offset.y(), text,
+                              text + block.text_size, glyphs, max_glyphs);
     if (pos.y() == nglyphs)
-        return block.offset + Vector2i(glyphs[pos.y() - 1].maxx + 1, 0);
+        return offset + Vector2i(glyphs[pos.y() - 1].maxx + 1, 0);
     else if (pos.y() > nglyphs)
         return Vector2i(-1, -1);
 
-    return block.offset + Vector2i(glyphs[pos.y()].x, 0);
+    return offset + Vector2i(glyphs[pos.y()].x, 0);
 }
 
 NAMESPACE_END(nanogui)
@@ -17,6 +17,7 @@
 #include <nanogui/textbox.h>
 #include <nanogui/opengl.h>
 #include <nanogui/theme.h>
+#include <nanogui/textmetrics.h>
 #include <regex>
 #include <iostream>
 
@@ -54,8 +55,12 @@ void TextBox::set_editable(bool editable) {
 
 void TextBox::set_theme(Theme *theme) {
     Widget::set_theme(theme);
-    if (m_theme)
+    if (m_theme) {
+        if (m_font_size != m_theme->m_text_box_font_size)
+            invalidate_layout();
         m_font_size = m_theme->m_text_box_font_size;
+        invalidate_layer();
+    }
 }
 
 Vector2i TextBox::preferred_size(NVGcontext *ctx) const {
@@ -68,14 +73,14 @@ Vector2i TextBox::preferred_size(NVGcontext *ctx) const {
         float uh = size[1] * 0.4f;
         uw = w * uh / h;
     } else if (!m_units.empty()) {
-        uw = nvgTextBounds(ctx, 0, 0, m_units.c_str(), nullptr, nullptr);
+        uw = text_bounds(ctx, "sans", font_size(), m_units);
     }
     float sw = 0;
     if (m_spinnable) {
         sw = 14.f;
     }
 
-    float ts = nvgTextBounds(ctx, 0, 0, m_value.c_str(), nullptr, nullptr);
+    float ts = text_bounds(ctx, "sans", font_size(), m_value);
     size[0] = size[1] + ts + uw + sw;
     return size;
 }
@@ -136,7 +141,7 @@ void TextBox::draw(NVGcontext* ctx) {
         nvgFill(ctx);
         unit_width += 2;
     } else if (!m_units.empty()) {
-        unit_width = nvgTextBounds(ctx, 0, 0, m_units.c_str(), nullptr, nullptr);
+        unit_width = text_bounds(ctx, "sans", font_size(), m_units);
         nvgFillColor(ctx, Color(255, m_enabled ? 64 : 32));
         nvgTextAlign(ctx, NVG_ALIGN_RIGHT | NVG_ALIGN_MIDDLE);
         nvgText(ctx, m_pos.x() + m_size.x() - x_spacing, draw_pos.y(),
@@ -320,7 +325,7 @@ bool TextBox::mouse_button_event(const Vector2i &p, int button, bool down,
                 double time = glfwGetTime();
                 if (time - m_last_click < 0.25) {
                     /* Double-click: reset to default value */
-                    m_value = m_default_value;
+                    set_value(m_default_value);
                     if (m_callback)
                         m_callback(m_value);
 
@@ -378,13 +383,13 @@ bool TextBox::focus_event(bool focused) {
         } else {
             if (m_valid_format) {
                 if (m_value_temp == "")
-                    m_value = m_default_value;
+                    set_value(m_default_value);
                 else
-                    m_value = m_value_temp;
+                    set_value(m_value_temp);
             }
 
             if (m_callback && !m_callback(m_value))
-                m_value = backup;
+                set_value(backup);
 
             m_valid_format = true;
             m_committed = true;
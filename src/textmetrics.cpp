@@ -0,0 +1,168 @@
+/*
+    src/textmetrics.cpp -- Cache of text measurements shared by all widgets
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+
+#include <nanogui/textmetrics.h>
+#include <nanogui/opengl.h>
+#include <unordered_map>
+#include <functional>
+#include <list>
+#include <algorithm>
+#include <cstring>
+
+NAMESPACE_BEGIN(nanogui)
+
+/// Everything that influences the result of a measurement
+struct TextMetricsKey {
+    NVGcontext *ctx;
+    std::string font;
+    float size;
+    float spacing;
+    float break_width; // < 0 for single-line measurements
+    int align;
+    std::string text;
+
+    bool operator==(const TextMetricsKey &k) const {
+        return ctx == k.ctx && size == k.size && spacing == k.spacing &&
+               break_width == k.break_width && align == k.align &&
+               font == k.font && text == k.text;
+    }
+};
+
+struct TextMetricsKeyHash {
+    size_t operator()(const TextMetricsKey &k) const {
+        size_t h = std::hash<std::string>()(k.text);
+        auto combine = [&h](size_t v) {
+            h ^= v + 0x9e3779b97f4a7c15ull + (h << 6) + (h >> 2);
+        };
+        combine(std::hash<std::string>()(k.font));
+        combine(std::hash<const void *>()(k.ctx));
+        combine(std::hash<float>()(k.size));
+        combine(std::hash<float>()(k.spacing));
+        combine(std::hash<float>()(k.break_width));
+        combine((size_t) k.align);
+        return h;
+    }
+};
+
+struct TextMetricsEntry {
+    float advance;
+    float bounds[4];
+    /// Position in the recency list (most recently used first)
+    std::list<const TextMetricsKey *>::iterator lru;
+};
+
+static std::unordered_map<TextMetricsKey, TextMetricsEntry, TextMetricsKeyHash> text_metrics;
+static std::list<const TextMetricsKey *> text_metrics_lru;
+static size_t text_metrics_max_size = 4096;
+static TextMetricsStats text_metrics_counters;
+
+static void text_metrics_evict(size_t size) {
+    while (text_metrics.size() > size) {
+        const TextMetricsKey *key = text_metrics_lru.back();
+        text_metrics_lru.pop_back();
+        text_metrics.erase(text_metrics.find(*key));
+        text_metrics_counters.evictions++;
+    }
+}
+
+/// Select the text state and look up (or compute) a measurement
+static const TextMetricsEntry &text_metrics_lookup(NVGcontext *ctx, const char *font,
+                                                   float size, float break_width,
+                                                   const std::string &text,
+                                                   int align, float spacing) {
+    nvgFontFace(ctx, font);
+    nvgFontSize(ctx, size);
+    nvgTextAlign(ctx, align);
+    nvgTextLetterSpacing(ctx, spacing);
+
+    TextMetricsKey key { ctx, font, size, spacing, break_width, align, text };
+    auto it = text_metrics.find(key);
+
+    if (it != text_metrics.end()) {
+        text_metrics_counters.hits++;
+        text_metrics_lru.splice(text_metrics_lru.begin(), text_metrics_lru,
+                                it->second.lru);
+        return it->second;
+    }
+
+    text_metrics_counters.misses++;
+    TextMetricsEntry entry;
+    if (break_width < 0.f) {
+        entry.advance = nvgTextBounds(ctx, 0.f, 0.f, text.c_str(), nullptr,
+                                      entry.bounds);
+    } else {
+        nvgTextBoxBounds(ctx, 0.f, 0.f, break_width, text.c_str(), nullptr,
+                         entry.bounds);
+        entry.advance = entry.bounds[2] - entry.bounds[0];
+    }
+
+    if (text_metrics_max_size == 0) {
+        static TextMetricsEntry uncached;
+        uncached = entry;
+        return uncached;
+    }
+
+    text_metrics_evict(text_metrics_max_size - 1);
+    it = text_metrics.emplace(std::move(key), entry).first;
+    text_metrics_lru.push_front(&it->first);
+    it->second.lru = text_metrics_lru.begin();
+    return it->second;
+}
+
+float text_bounds(NVGcontext *ctx, const char *font, float size,
+                  const std::string &text, float *bounds, int align,
+                  float spacing) {
+    const TextMetricsEntry &entry =
+        text_metrics_lookup(ctx, font, size, -1.f, text, align, spacing);
+    if (bounds)
+        memcpy(bounds, entry.bounds, sizeof(float) * 4);
+    return entry.advance;
+}
+
+void text_box_bounds(NVGcontext *ctx, const char *font, float size,
+                     float break_width, const std::string &text,
+                     float *bounds, int align, float spacing) {
+    const TextMetricsEntry &entry =
+        text_metrics_lookup(ctx, font, size, std::max(break_width, 0.f),
+                            text, align, spacing);
+    memcpy(bounds, entry.bounds, sizeof(float) * 4);
+}
+
+void invalidate_text_metrics(NVGcontext *ctx) {
+    for (auto it = text_metrics_lru.begin(); it != text_metrics_lru.end(); ) {
+        const TextMetricsKey *key = *it;
+        if (ctx == nullptr || key->ctx == ctx) {
+            it = text_metrics_lru.erase(it);
+            text_metrics.erase(text_metrics.find(*key));
+        } else {
+            ++it;
+        }
+    }
+}
+
+size_t text_metrics_capacity() {
+    return text_metrics_max_size;
+}
+
+void set_text_metrics_capacity(size_t capacity) {
+    text_metrics_max_size = capacity;
+    text_metrics_evict(capacity);
+}
+
+TextMetricsStats text_metrics_stats() {
+    return text_metrics_counters;
+}
+
+void reset_text_metrics_stats() {
+    text_metrics_counters = TextMetricsStats();
+}
+
+NAMESPACE_END(nanogui)
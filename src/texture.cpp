@@ -94,4 +94,17 @@ size_t Texture::channels() const {
     return result;
 }
 
+size_t TextureDownload::size() const {
+    check("size");
+    return m_texture->m_download_size[m_slot];
+}
+
+void TextureDownload::check(const char *method) const {
+    if (m_texture->m_download_sequence[m_slot] != m_sequence)
+        throw std::runtime_error(
+            std::string("TextureDownload::") + method +
+            "(): the staging buffer was reused by a subsequent call to "
+            "Texture::download_async()!");
+}
+
 NAMESPACE_END(nanogui)
@@ -1,6 +1,7 @@
 #include <nanogui/texture.h>
 #include <nanogui/opengl.h>
 #include "opengl_check.h"
+#include "opengl_state.h"
 #include <memory>
 
 #if !defined(GL_HALF_FLOAT)
@@ -105,7 +106,7 @@ void Texture::init() {
 
     if (m_flags & (uint8_t) TextureFlags::ShaderRead) {
         CHK(glGenTextures(1, &m_texture_handle));
-        CHK(glBindTexture(tex_mode, m_texture_handle));
+        gl_bind_texture(tex_mode, m_texture_handle);
         CHK(glTexParameteri(tex_mode, GL_TEXTURE_MIN_FILTER, interpolation_mode_gl[0]));
         CHK(glTexParameteri(tex_mode, GL_TEXTURE_MAG_FILTER, interpolation_mode_gl[1]));
         CHK(glTexParameteri(tex_mode, GL_TEXTURE_WRAP_S, wrap_mode_gl));
@@ -137,8 +138,17 @@ void Texture::init() {
 }
 
 Texture::~Texture() {
+    gl_forget_texture(m_texture_handle);
     CHK(glDeleteTextures(1, &m_texture_handle));
     CHK(glDeleteRenderbuffers(1, &m_renderbuffer_handle));
+#if defined(NANOGUI_USE_OPENGL)
+    for (int i = 0; i < 2; ++i) {
+        if (m_download_fence[i])
+            CHK(glDeleteSync((GLsync) m_download_fence[i]));
+    }
+    CHK(glDeleteBuffers(2, m_download_buffer));
+#endif
+    release_upload_buffers();
 }
 
 void Texture::upload(const uint8_t *data) {
@@ -157,7 +167,7 @@ void Texture::upload(const uint8_t *data) {
 
     if (m_texture_handle != 0) {
         GLenum tex_mode = m_samples > 1 ? GL_TEXTURE_2D_MULTISAMPLE : GL_TEXTURE_2D;
-        CHK(glBindTexture(tex_mode, m_texture_handle));
+        gl_bind_texture(tex_mode, m_texture_handle);
 
         if (data)
             CHK(glPixelStorei(GL_UNPACK_ALIGNMENT, 1));
@@ -220,7 +230,7 @@ void Texture::upload_sub_region(const uint8_t *data, const Vector2i& origin, con
         throw std::runtime_error("Texture::upload_sub_region(): out of bounds!");
 
     GLenum tex_mode = m_samples > 1 ? GL_TEXTURE_2D_MULTISAMPLE : GL_TEXTURE_2D;
-    CHK(glBindTexture(tex_mode, m_texture_handle));
+    gl_bind_texture(tex_mode, m_texture_handle);
 
     if (data)
         CHK(glPixelStorei(GL_UNPACK_ALIGNMENT, 1));
@@ -262,7 +272,7 @@ void Texture::download(uint8_t *data) {
                           internal_format_gl);
 
     (void) internal_format_gl;
-    CHK(glBindTexture(GL_TEXTURE_2D, m_texture_handle));
+    gl_bind_texture(GL_TEXTURE_2D, m_texture_handle);
     CHK(glGetTexImage(GL_TEXTURE_2D, 0, pixel_format_gl, component_format_gl, data));
 
     if (m_flags & (uint8_t) TextureFlags::RenderTarget) {
@@ -281,6 +291,274 @@ void Texture::download(uint8_t *data) {
 #endif
 }
 
+/// Wait until the GPU has passed 'fence', then delete it
+static void wait_fence(void *&fence, const char *method) {
+#if defined(NANOGUI_USE_OPENGL)
+    if (!fence)
+        return;
+    while (true) {
+        GLenum rv = glClientWaitSync((GLsync) fence, GL_SYNC_FLUSH_COMMANDS_BIT,
+                                     1000000000ull /* 1 second */);
+        if (rv == GL_ALREADY_SIGNALED || rv == GL_CONDITION_SATISFIED)
+            break;
+        else if (rv == GL_WAIT_FAILED)
+            throw std::runtime_error(std::string(method) + "(): glClientWaitSync() failed!");
+    }
+    CHK(glDeleteSync((GLsync) fence));
+    fence = nullptr;
+#else
+    (void) fence; (void) method;
+#endif
+}
+
+uint8_t *Texture::map_upload() {
+#if defined(NANOGUI_USE_GLES)
+    throw std::runtime_error("Texture::map_upload(): not supported on GLES!");
+#else
+    if (m_texture_handle == 0)
+        throw std::runtime_error("Texture::map_upload(): no texture handle!");
+    else if (m_samples > 1)
+        throw std::runtime_error("Texture::map_upload(): only implemented for samples=1!");
+    else if (m_upload_mapped)
+        throw std::runtime_error("Texture::map_upload(): a staging buffer is already mapped!");
+
+    size_t size = bytes_per_pixel() * m_size.x() * m_size.y();
+
+    if (m_upload_size != size) {
+        release_upload_buffers();
+
+        m_upload_persistent = false;
+#if defined(GL_MAP_PERSISTENT_BIT) && !defined(__APPLE__)
+        GLint major = 0, minor = 0;
+        CHK(glGetIntegerv(GL_MAJOR_VERSION, &major));
+        CHK(glGetIntegerv(GL_MINOR_VERSION, &minor));
+        m_upload_persistent = major > 4 || (major == 4 && minor >= 4);
+#endif
+
+        CHK(glGenBuffers(3, m_upload_buffer));
+        for (int i = 0; i < 3; ++i) {
+            CHK(glBindBuffer(GL_PIXEL_UNPACK_BUFFER, m_upload_buffer[i]));
+#if defined(GL_MAP_PERSISTENT_BIT) && !defined(__APPLE__)
+            if (m_upload_persistent) {
+                GLbitfield flags = GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT |
+                                   GL_MAP_COHERENT_BIT;
+                CHK(glBufferStorage(GL_PIXEL_UNPACK_BUFFER, (GLsizeiptr) size,
+                                    nullptr, flags));
+                m_upload_ptr[i] = (uint8_t *) glMapBufferRange(
+                    GL_PIXEL_UNPACK_BUFFER, 0, (GLsizeiptr) size, flags);
+                continue;
+            }
+#endif
+            CHK(glBufferData(GL_PIXEL_UNPACK_BUFFER, (GLsizeiptr) size, nullptr,
+                             GL_STREAM_DRAW));
+        }
+        CHK(glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0));
+        m_upload_size = size;
+    }
+
+    /* Don't overwrite data that the GPU may still be reading */
+    uint8_t slot = m_upload_slot;
+    wait_fence(m_upload_fence[slot], "Texture::map_upload");
+
+    uint8_t *ptr = m_upload_ptr[slot];
+    if (!m_upload_persistent) {
+        CHK(glBindBuffer(GL_PIXEL_UNPACK_BUFFER, m_upload_buffer[slot]));
+        ptr = (uint8_t *) glMapBufferRange(
+            GL_PIXEL_UNPACK_BUFFER, 0, (GLsizeiptr) size,
+            GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT | GL_MAP_UNSYNCHRONIZED_BIT);
+        CHK(glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0));
+    }
+
+    if (!ptr)
+        throw std::runtime_error("Texture::map_upload(): could not map buffer!");
+
+    m_upload_mapped = true;
+    return ptr;
+#endif
+}
+
+void Texture::unmap_upload() {
+#if defined(NANOGUI_USE_GLES)
+    throw std::runtime_error("Texture::unmap_upload(): not supported on GLES!");
+#else
+    if (!m_upload_mapped)
+        throw std::runtime_error("Texture::unmap_upload(): no staging buffer is mapped!");
+    m_upload_mapped = false;
+
+    uint8_t slot = m_upload_slot;
+    m_upload_slot = (slot + 1) % 3;
+
+    CHK(glBindBuffer(GL_PIXEL_UNPACK_BUFFER, m_upload_buffer[slot]));
+    if (!m_upload_persistent)
+        CHK(glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER));
+
+    if (m_upload_size != bytes_per_pixel() * m_size.x() * m_size.y()) {
+        CHK(glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0));
+        throw std::runtime_error("Texture::unmap_upload(): texture was resized while mapped!");
+    }
+
+    GLenum pixel_format_gl,
+           component_format_gl,
+           internal_format_gl;
+
+    gl_map_texture_format(m_pixel_format,
+                          m_component_format,
+                          pixel_format_gl,
+                          component_format_gl,
+                          internal_format_gl);
+
+    (void) internal_format_gl;
+
+    /* Copy from the pixel buffer object, this does not stall */
+    CHK(glPixelStorei(GL_UNPACK_ALIGNMENT, 1));
+    CHK(glPixelStorei(GL_UNPACK_ROW_LENGTH, 0));
+    CHK(glPixelStorei(GL_UNPACK_SKIP_ROWS, 0));
+    CHK(glPixelStorei(GL_UNPACK_SKIP_PIXELS, 0));
+    gl_bind_texture(GL_TEXTURE_2D, m_texture_handle);
+    CHK(glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, (GLsizei) m_size.x(),
+                        (GLsizei) m_size.y(), pixel_format_gl,
+                        component_format_gl, nullptr));
+    CHK(glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0));
+
+    m_upload_fence[slot] = (void *) glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0);
+
+    if (!m_mipmap_manual && (m_min_interpolation_mode == InterpolationMode::Trilinear ||
+        m_mag_interpolation_mode == InterpolationMode::Trilinear))
+        generate_mipmap();
+#endif
+}
+
+void Texture::release_upload_buffers() {
+#if defined(NANOGUI_USE_OPENGL)
+    if (m_upload_size == 0)
+        return;
+
+    for (int i = 0; i < 3; ++i) {
+        if (m_upload_fence[i]) {
+            CHK(glDeleteSync((GLsync) m_upload_fence[i]));
+            m_upload_fence[i] = nullptr;
+        }
+        if (m_upload_ptr[i] || (m_upload_mapped && i == m_upload_slot)) {
+            CHK(glBindBuffer(GL_PIXEL_UNPACK_BUFFER, m_upload_buffer[i]));
+            CHK(glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER));
+            m_upload_ptr[i] = nullptr;
+        }
+    }
+
+    CHK(glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0));
+    CHK(glDeleteBuffers(3, m_upload_buffer));
+    m_upload_buffer[0] = m_upload_buffer[1] = m_upload_buffer[2] = 0;
+    m_upload_size = 0;
+    m_upload_slot = 0;
+    m_upload_mapped = false;
+#endif
+}
+
+ref<TextureDownload> Texture::download_async() {
+#if defined(NANOGUI_USE_GLES)
+    throw std::runtime_error("Texture::download_async(): not supported on GLES!");
+#else
+    if (m_texture_handle == 0)
+        throw std::runtime_error("Texture::download_async(): no texture handle!");
+    else if (m_samples > 1)
+        throw std::runtime_error("Texture::download_async(): only implemented for samples=1!");
+
+    GLenum pixel_format_gl,
+           component_format_gl,
+           internal_format_gl;
+
+    gl_map_texture_format(m_pixel_format,
+                          m_component_format,
+                          pixel_format_gl,
+                          component_format_gl,
+                          internal_format_gl);
+
+    (void) internal_format_gl;
+
+    /* Alternate between two staging buffers so that a new download
+       can be issued while the previous one is still being read */
+    uint8_t slot = m_download_slot;
+    m_download_slot ^= 1;
+
+    size_t size = bytes_per_pixel() * m_size.x() * m_size.y();
+    if (m_download_buffer[slot] == 0)
+        CHK(glGenBuffers(1, &m_download_buffer[slot]));
+
+    CHK(glBindBuffer(GL_PIXEL_PACK_BUFFER, m_download_buffer[slot]));
+    if (m_download_size[slot] != size) {
+        CHK(glBufferData(GL_PIXEL_PACK_BUFFER, (GLsizeiptr) size, nullptr,
+                         GL_STREAM_READ));
+        m_download_size[slot] = size;
+    }
+
+    /* Copy into the pixel buffer object, this does not stall */
+    CHK(glPixelStorei(GL_PACK_ALIGNMENT, 1));
+    gl_bind_texture(GL_TEXTURE_2D, m_texture_handle);
+    CHK(glGetTexImage(GL_TEXTURE_2D, 0, pixel_format_gl, component_format_gl, nullptr));
+    CHK(glBindBuffer(GL_PIXEL_PACK_BUFFER, 0));
+
+    if (m_download_fence[slot])
+        CHK(glDeleteSync((GLsync) m_download_fence[slot]));
+    m_download_fence[slot] = (void *) glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0);
+
+    /* Submit the copy so that ready() eventually returns true */
+    CHK(glFlush());
+
+    return new TextureDownload(this, slot, ++m_download_sequence[slot]);
+#endif
+}
+
+bool TextureDownload::ready() const {
+    check("ready");
+#if defined(NANOGUI_USE_GLES)
+    return false;
+#else
+    GLint status = GL_UNSIGNALED;
+    CHK(glGetSynciv((GLsync) m_texture->m_download_fence[m_slot], GL_SYNC_STATUS,
+                    sizeof(GLint), nullptr, &status));
+    return status == GL_SIGNALED;
+#endif
+}
+
+void TextureDownload::read(uint8_t *data) {
+    check("read");
+#if defined(NANOGUI_USE_GLES)
+    (void) data;
+#else
+    GLsync fence = (GLsync) m_texture->m_download_fence[m_slot];
+    while (true) {
+        GLenum rv = glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT,
+                                     1000000000ull /* 1 second */);
+        if (rv == GL_ALREADY_SIGNALED || rv == GL_CONDITION_SATISFIED)
+            break;
+        else if (rv == GL_WAIT_FAILED)
+            throw std::runtime_error("TextureDownload::read(): glClientWaitSync() failed!");
+    }
+
+    size_t size = m_texture->m_download_size[m_slot];
+    CHK(glBindBuffer(GL_PIXEL_PACK_BUFFER, m_texture->m_download_buffer[m_slot]));
+    const uint8_t *ptr = (const uint8_t *) glMapBufferRange(
+        GL_PIXEL_PACK_BUFFER, 0, (GLsizeiptr) size, GL_MAP_READ_BIT);
+    if (!ptr) {
+        CHK(glBindBuffer(GL_PIXEL_PACK_BUFFER, 0));
+        throw std::runtime_error("TextureDownload::read(): could not map buffer!");
+    }
+
+    if (m_texture->flags() & (uint8_t) Texture::TextureFlags::RenderTarget) {
+        /* Flip render targets while copying out of the mapped buffer */
+        size_t stride = m_texture->bytes_per_pixel() * m_size.x(),
+               rows = (size_t) m_size.y();
+        for (size_t i = 0; i < rows; ++i)
+            memcpy(data + i * stride, ptr + (rows - 1 - i) * stride, stride);
+    } else {
+        memcpy(data, ptr, size);
+    }
+
+    CHK(glUnmapBuffer(GL_PIXEL_PACK_BUFFER));
+    CHK(glBindBuffer(GL_PIXEL_PACK_BUFFER, 0));
+#endif
+}
+
 void Texture::resize(const Vector2i &size) {
     if (m_size == size)
         return;
@@ -290,7 +568,7 @@ void Texture::resize(const Vector2i &size) {
 
 void Texture::generate_mipmap() {
     GLenum tex_mode = m_samples > 1 ? GL_TEXTURE_2D_MULTISAMPLE : GL_TEXTURE_2D;
-    CHK(glBindTexture(tex_mode, m_texture_handle));
+    gl_bind_texture(tex_mode, m_texture_handle);
     CHK(glGenerateMipmap(tex_mode));
 }
 
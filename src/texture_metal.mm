@@ -45,6 +45,11 @@ void Texture::init() {
 Texture::~Texture() {
     (void) (__bridge_transfer id<MTLTexture>) m_texture_handle;
     (void) (__bridge_transfer id<MTLSamplerState>) m_sampler_state_handle;
+    for (int i = 0; i < 2; ++i) {
+        (void) (__bridge_transfer id<MTLBuffer>) m_download_buffer[i];
+        (void) (__bridge_transfer id<MTLCommandBuffer>) m_download_command_buffer[i];
+    }
+    release_upload_buffers();
 }
 
 void Texture::upload(const uint8_t *data) {
@@ -158,6 +163,149 @@ void Texture::download(uint8_t *data) {
     memcpy(data, buffer.contents, img_bytes);
 }
 
+ref<TextureDownload> Texture::download_async() {
+    uint8_t slot = m_download_slot;
+    m_download_slot ^= 1;
+
+    size_t row_bytes = bytes_per_pixel() * m_size.x(),
+           img_bytes = row_bytes * m_size.y();
+
+    id<MTLDevice> device = (__bridge id<MTLDevice>) metal_device();
+    if (m_download_size[slot] != img_bytes) {
+        (void) (__bridge_transfer id<MTLBuffer>) m_download_buffer[slot];
+        id<MTLBuffer> buffer =
+            [device newBufferWithLength: img_bytes
+                                options: MTLResourceStorageModeShared];
+        m_download_buffer[slot] = (__bridge_retained void *) buffer;
+        m_download_size[slot] = img_bytes;
+    }
+
+    id<MTLCommandQueue> command_queue =
+        (__bridge id<MTLCommandQueue>) metal_command_queue();
+    id<MTLCommandBuffer> command_buffer = [command_queue commandBuffer];
+    id<MTLBlitCommandEncoder> command_encoder =
+        [command_buffer blitCommandEncoder];
+    id<MTLTexture> texture = (__bridge id<MTLTexture>) m_texture_handle;
+
+    [command_encoder
+                 copyFromTexture: texture
+                     sourceSlice: 0
+                     sourceLevel: 0
+                    sourceOrigin: MTLOriginMake(0, 0, 0)
+                      sourceSize: MTLSizeMake(texture.width, texture.height, 1)
+                        toBuffer: (__bridge id<MTLBuffer>) m_download_buffer[slot]
+               destinationOffset: 0
+          destinationBytesPerRow: row_bytes
+        destinationBytesPerImage: img_bytes];
+
+    [command_encoder endEncoding];
+    [command_buffer commit];
+
+    (void) (__bridge_transfer id<MTLCommandBuffer>) m_download_command_buffer[slot];
+    m_download_command_buffer[slot] = (__bridge_retained void *) command_buffer;
+
+    return new TextureDownload(this, slot, ++m_download_sequence[slot]);
+}
+
+uint8_t *Texture::map_upload() {
+    if (m_upload_mapped)
+        throw std::runtime_error("Texture::map_upload(): a staging buffer is already mapped!");
+
+    size_t size = bytes_per_pixel() * m_size.x() * m_size.y();
+    if (m_upload_size != size) {
+        release_upload_buffers();
+        id<MTLDevice> device = (__bridge id<MTLDevice>) metal_device();
+        for (int i = 0; i < 3; ++i) {
+            id<MTLBuffer> buffer =
+                [device newBufferWithLength: size
+                                    options: MTLResourceStorageModeShared |
+                                             MTLResourceCPUCacheModeWriteCombined];
+            m_upload_buffer[i] = (__bridge_retained void *) buffer;
+        }
+        m_upload_size = size;
+    }
+
+    /* Don't overwrite data that the GPU may still be reading */
+    uint8_t slot = m_upload_slot;
+    id<MTLCommandBuffer> command_buffer =
+        (__bridge id<MTLCommandBuffer>) m_upload_command_buffer[slot];
+    if (command_buffer)
+        [command_buffer waitUntilCompleted];
+
+    m_upload_mapped = true;
+    return (uint8_t *) ((__bridge id<MTLBuffer>) m_upload_buffer[slot]).contents;
+}
+
+void Texture::unmap_upload() {
+    if (!m_upload_mapped)
+        throw std::runtime_error("Texture::unmap_upload(): no staging buffer is mapped!");
+    m_upload_mapped = false;
+
+    uint8_t slot = m_upload_slot;
+    m_upload_slot = (slot + 1) % 3;
+
+    size_t row_bytes = bytes_per_pixel() * m_size.x();
+    if (m_upload_size != row_bytes * m_size.y())
+        throw std::runtime_error("Texture::unmap_upload(): texture was resized while mapped!");
+
+    id<MTLCommandQueue> command_queue =
+        (__bridge id<MTLCommandQueue>) metal_command_queue();
+    id<MTLCommandBuffer> command_buffer = [command_queue commandBuffer];
+    id<MTLBlitCommandEncoder> command_encoder =
+        [command_buffer blitCommandEncoder];
+    id<MTLTexture> texture = (__bridge id<MTLTexture>) m_texture_handle;
+
+    [command_encoder
+                 copyFromBuffer: (__bridge id<MTLBuffer>) m_upload_buffer[slot]
+                   sourceOffset: 0
+              sourceBytesPerRow: row_bytes
+            sourceBytesPerImage: m_upload_size
+                     sourceSize: MTLSizeMake((NSUInteger) m_size.x(), (NSUInteger) m_size.y(), 1)
+                      toTexture: texture
+               destinationSlice: 0
+               destinationLevel: 0
+              destinationOrigin: MTLOriginMake(0, 0, 0)];
+
+    if (!m_mipmap_manual && m_min_interpolation_mode == InterpolationMode::Trilinear)
+        [command_encoder generateMipmapsForTexture: texture];
+
+    [command_encoder endEncoding];
+    [command_buffer commit];
+
+    (void) (__bridge_transfer id<MTLCommandBuffer>) m_upload_command_buffer[slot];
+    m_upload_command_buffer[slot] = (__bridge_retained void *) command_buffer;
+}
+
+void Texture::release_upload_buffers() {
+    for (int i = 0; i < 3; ++i) {
+        id<MTLCommandBuffer> command_buffer =
+            (__bridge_transfer id<MTLCommandBuffer>) m_upload_command_buffer[i];
+        [command_buffer waitUntilCompleted];
+        (void) (__bridge_transfer id<MTLBuffer>) m_upload_buffer[i];
+        m_upload_buffer[i] = m_upload_command_buffer[i] = nullptr;
+    }
+    m_upload_size = 0;
+    m_upload_slot = 0;
+    m_upload_mapped = false;
+}
+
+bool TextureDownload::ready() const {
+    check("ready");
+    id<MTLCommandBuffer> command_buffer =
+        (__bridge id<MTLCommandBuffer>) m_texture->m_download_command_buffer[m_slot];
+    return command_buffer.status == MTLCommandBufferStatusCompleted;
+}
+
+void TextureDownload::read(uint8_t *data) {
+    check("read");
+    id<MTLCommandBuffer> command_buffer =
+        (__bridge id<MTLCommandBuffer>) m_texture->m_download_command_buffer[m_slot];
+    id<MTLBuffer> buffer =
+        (__bridge id<MTLBuffer>) m_texture->m_download_buffer[m_slot];
+    [command_buffer waitUntilCompleted];
+    memcpy(data, buffer.contents, m_texture->m_download_size[m_slot]);
+}
+
 void Texture::resize(const Vector2i &size) {
     if (m_size == size)
         return;
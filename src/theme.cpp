@@ -14,6 +14,7 @@
 #include <nanogui/theme.h>
 #include <nanogui/opengl.h>
 #include <nanogui/icons.h>
+#include <nanogui/textmetrics.h>
 #include <nanogui_resources.h>
 
 NAMESPACE_BEGIN(nanogui)
@@ -90,6 +91,9 @@ Theme::Theme(NVGcontext *ctx) {
     if (m_font_sans_regular == -1 || m_font_sans_bold == -1 ||
         m_font_icons == -1 || m_font_mono_regular == -1)
         throw std::runtime_error("Could not load fonts!");
+
+    /* Measurements taken with previously loaded fonts may be stale */
+    invalidate_text_metrics(ctx);
 }
 
 NAMESPACE_END(nanogui)
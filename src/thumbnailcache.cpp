@@ -0,0 +1,214 @@
+/*
+    src/thumbnailcache.cpp -- Asynchronously decoded image thumbnails
+    with a bounded cache of NanoVG images
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+
+#include <nanogui/thumbnailcache.h>
+#include <nanogui/opengl.h>
+#include <stb_image.h>
+#include <memory>
+
+NAMESPACE_BEGIN(nanogui)
+
+/// Number of frames after which an unfulfilled request is discarded
+static const uint64_t request_timeout = 4;
+
+/// Load an image and downscale it (using a box filter) so that its shorter side has length 'target'
+static std::vector<uint8_t> decode_thumbnail(const std::string &filename,
+                                             int target, Vector2i &size) {
+    using Holder = std::unique_ptr<uint8_t[], void(*)(void*)>;
+    int n = 0;
+    Holder data(stbi_load(filename.c_str(), &size.x(), &size.y(), &n, 4),
+                stbi_image_free);
+    if (!data || size.x() <= 0 || size.y() <= 0)
+        return { };
+
+    float scale = target / (float) std::min(size.x(), size.y());
+    Vector2i out_size = size;
+    if (scale < 1.f)
+        out_size = max(Vector2i(Vector2f(size) * scale), Vector2i(1));
+
+    std::vector<uint8_t> result((size_t) out_size.x() * out_size.y() * 4);
+    for (int y = 0; y < out_size.y(); ++y) {
+        int y0 = (int) ((int64_t) y * size.y() / out_size.y()),
+            y1 = std::max(y0 + 1, (int) ((int64_t) (y + 1) * size.y() / out_size.y()));
+        for (int x = 0; x < out_size.x(); ++x) {
+            int x0 = (int) ((int64_t) x * size.x() / out_size.x()),
+                x1 = std::max(x0 + 1, (int) ((int64_t) (x + 1) * size.x() / out_size.x()));
+            uint32_t sum[4] = { 0, 0, 0, 0 };
+            for (int yi = y0; yi < y1; ++yi) {
+                const uint8_t *row = data.get() + ((size_t) yi * size.x() + x0) * 4;
+                for (int xi = x0; xi < x1; ++xi, row += 4)
+                    for (int c = 0; c < 4; ++c)
+                        sum[c] += row[c];
+            }
+            uint32_t count = (uint32_t) ((y1 - y0) * (x1 - x0));
+            uint8_t *out = result.data() + ((size_t) y * out_size.x() + x) * 4;
+            for (int c = 0; c < 4; ++c)
+                out[c] = (uint8_t) ((sum[c] + count / 2) / count);
+        }
+    }
+
+    size = out_size;
+    return result;
+}
+
+ThumbnailCache::ThumbnailCache(int thumbnail_size, size_t capacity, int threads)
+    : m_thumbnail_size(thumbnail_size), m_capacity(capacity) {
+    if (thumbnail_size <= 0)
+        throw std::runtime_error("ThumbnailCache::ThumbnailCache(): thumbnail size must be positive!");
+    if (threads <= 0)
+        threads = std::max(1, (int) std::thread::hardware_concurrency());
+    for (int i = 0; i < threads; ++i)
+        m_threads.emplace_back([this]() { worker(); });
+}
+
+ThumbnailCache::~ThumbnailCache() {
+    {
+        std::lock_guard<std::mutex> guard(m_mutex);
+        m_shutdown = true;
+    }
+    m_cond.notify_all();
+    for (std::thread &thread : m_threads)
+        thread.join();
+}
+
+size_t ThumbnailCache::size() const {
+    std::lock_guard<std::mutex> guard(m_mutex);
+    return m_lru.size();
+}
+
+void ThumbnailCache::worker() {
+    while (true) {
+        std::string filename;
+        {
+            std::unique_lock<std::mutex> guard(m_mutex);
+            m_cond.wait(guard, [this]() { return m_shutdown || !m_queue.empty(); });
+            if (m_shutdown)
+                return;
+            filename = std::move(m_queue.front());
+            m_queue.pop_front();
+
+            auto it = m_entries.find(filename);
+            if (it == m_entries.end() || it->second.state != Entry::State::Queued)
+                continue;
+            if (m_tick - it->second.tick > request_timeout) {
+                /* Not requested recently, e.g. scrolled out of view */
+                m_entries.erase(it);
+                continue;
+            }
+            it->second.state = Entry::State::Decoding;
+            m_decoding++;
+        }
+
+        Vector2i size;
+        std::vector<uint8_t> data = decode_thumbnail(filename, m_thumbnail_size, size);
+
+        std::lock_guard<std::mutex> guard(m_mutex);
+        m_decoding--;
+        auto it = m_entries.find(filename);
+        if (it == m_entries.end() || it->second.state != Entry::State::Decoding)
+            continue; // The cache was cleared in the meantime
+        if (data.empty()) {
+            it->second.state = Entry::State::Failed;
+            it->second.image = -1;
+        } else {
+            it->second.state = Entry::State::Decoded;
+            it->second.data = std::move(data);
+            it->second.size = size;
+            m_decoded.push_back(filename);
+        }
+    }
+}
+
+int ThumbnailCache::image(const std::string &filename) {
+    std::lock_guard<std::mutex> guard(m_mutex);
+    auto [it, inserted] = m_entries.try_emplace(filename);
+    Entry &entry = it->second;
+    entry.tick = m_tick;
+
+    if (inserted) {
+        m_queue.push_front(filename);
+        m_cond.notify_one();
+    } else if (entry.state == Entry::State::Ready) {
+        m_lru.splice(m_lru.begin(), m_lru, entry.lru);
+    }
+
+    return entry.image;
+}
+
+bool ThumbnailCache::upload(NVGcontext *ctx, uint64_t frame, size_t max_count) {
+    std::lock_guard<std::mutex> guard(m_mutex);
+    if (frame != m_frame) {
+        m_frame = frame;
+        m_tick++;
+
+        /* Draw calls of the previous frame have been submitted */
+        for (int image : m_released)
+            nvgDeleteImage(ctx, image);
+        m_released.clear();
+    }
+
+    for (size_t count = 0; count < max_count && !m_decoded.empty(); ) {
+        auto it = m_entries.find(m_decoded.front());
+        m_decoded.pop_front();
+        if (it == m_entries.end() || it->second.state != Entry::State::Decoded)
+            continue;
+
+        Entry &entry = it->second;
+        entry.image = nvgCreateImageRGBA(ctx, entry.size.x(), entry.size.y(), 0,
+                                         entry.data.data());
+        entry.data = std::vector<uint8_t>();
+        if (entry.image == 0) {
+            entry.state = Entry::State::Failed;
+            entry.image = -1;
+            continue;
+        }
+        entry.state = Entry::State::Ready;
+        m_lru.push_front(&it->first);
+        entry.lru = m_lru.begin();
+        count++;
+    }
+
+    while (m_lru.size() > m_capacity) {
+        auto it = m_entries.find(*m_lru.back());
+        m_lru.pop_back();
+        /* Widgets may have drawn the image earlier during this frame */
+        m_released.push_back(it->second.image);
+        m_entries.erase(it);
+    }
+
+    return !m_queue.empty() || !m_decoded.empty() || m_decoding > 0;
+}
+
+void ThumbnailCache::clear(NVGcontext *ctx) {
+    std::lock_guard<std::mutex> guard(m_mutex);
+    for (const std::string *key : m_lru)
+        nvgDeleteImage(ctx, m_entries[*key].image);
+    for (int image : m_released)
+        nvgDeleteImage(ctx, image);
+    m_released.clear();
+    m_lru.clear();
+    m_entries.clear();
+    m_queue.clear();
+    m_decoded.clear();
+}
+
+void ThumbnailCache::clear_failed() {
+    std::lock_guard<std::mutex> guard(m_mutex);
+    for (auto it = m_entries.begin(); it != m_entries.end(); ) {
+        if (it->second.state == Entry::State::Failed)
+            it = m_entries.erase(it);
+        else
+            ++it;
+    }
+}
+
+NAMESPACE_END(nanogui)
@@ -0,0 +1,389 @@
+/*
+    src/tiledimage.cpp -- Very large images that are streamed to the GPU
+    in tiles at multiple levels of detail
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+
+#include <nanogui/tiledimage.h>
+
+NAMESPACE_BEGIN(nanogui)
+
+/// Number of calls to upload() after which an unfulfilled request is discarded
+static const uint64_t request_timeout = 4;
+
+/// Number of coarsest levels whose tiles are never evicted
+static const int pinned_levels = 3;
+
+TiledImage::TiledImage(const Vector2i &size, const TileCallback &callback,
+                       int tile_size, size_t capacity, int threads)
+    : m_size(size), m_callback(callback), m_tile_size(tile_size),
+      m_capacity(capacity) {
+    if (size.x() <= 0 || size.y() <= 0)
+        throw std::runtime_error("TiledImage::TiledImage(): image size must be positive!");
+    if (tile_size <= 0)
+        throw std::runtime_error("TiledImage::TiledImage(): tile size must be positive!");
+    if (!callback)
+        throw std::runtime_error("TiledImage::TiledImage(): a tile callback must be specified!");
+
+    /* Add levels until the image fits into a single tile */
+    m_level_count = 1;
+    while (std::max(level_size(m_level_count - 1).x(),
+                    level_size(m_level_count - 1).y()) > tile_size)
+        m_level_count++;
+
+    if (threads <= 0)
+        threads = std::max(1, (int) std::thread::hardware_concurrency());
+    for (int i = 0; i < threads; ++i)
+        m_threads.emplace_back([this]() { worker(); });
+}
+
+TiledImage::~TiledImage() {
+    {
+        std::lock_guard<std::mutex> guard(m_mutex);
+        m_shutdown = true;
+    }
+    m_cond.notify_all();
+    for (std::thread &thread : m_threads)
+        thread.join();
+}
+
+TiledImage::TileCallback TiledImage::array_callback(const uint8_t *data,
+                                                    const Vector2i &size,
+                                                    int channels, int64_t stride_x,
+                                                    int64_t stride_y) {
+    if (channels < 1 || channels > 4)
+        throw std::runtime_error("TiledImage::array_callback(): unsupported number of channels!");
+    if (size.x() <= 0 || size.y() <= 0)
+        throw std::runtime_error("TiledImage::array_callback(): array size must be positive!");
+
+    return [=](const Vector2i &offset, const Vector2i &tile_size, uint8_t *out) {
+        for (int y = 0; y < tile_size.y(); ++y) {
+            const uint8_t *p = data + (int64_t) (offset.y() + y) * stride_y +
+                               (int64_t) offset.x() * stride_x;
+            for (int x = 0; x < tile_size.x(); ++x, p += stride_x, out += 4) {
+                switch (channels) {
+                    case 1: out[0] = out[1] = out[2] = p[0]; out[3] = 255; break;
+                    case 2: out[0] = out[1] = out[2] = p[0]; out[3] = p[1]; break;
+                    case 3: out[0] = p[0]; out[1] = p[1]; out[2] = p[2]; out[3] = 255; break;
+                    default: out[0] = p[0]; out[1] = p[1]; out[2] = p[2]; out[3] = p[3]; break;
+                }
+            }
+        }
+    };
+}
+
+Vector2i TiledImage::level_size(int level) const {
+    int scale = 1 << level;
+    return max((m_size + Vector2i(scale - 1)) / scale, Vector2i(1));
+}
+
+Vector2i TiledImage::tile_count(int level) const {
+    return (level_size(level) + Vector2i(m_tile_size - 1)) / m_tile_size;
+}
+
+size_t TiledImage::cached_tiles() const {
+    std::lock_guard<std::mutex> guard(m_mutex);
+    return m_lru.size() + m_pinned;
+}
+
+bool TiledImage::pinned(int level) const {
+    return level >= m_level_count - pinned_levels;
+}
+
+bool TiledImage::parent_key(uint64_t k, uint64_t &parent) const {
+    int level = key_level(k);
+    if (level + 1 >= m_level_count)
+        return false;
+    parent = key(level + 1, key_index(k) / 2);
+    return true;
+}
+
+uint64_t TiledImage::request_tick(uint64_t k) const {
+    uint64_t tick = 0, parent;
+    auto it = m_entries.find(k);
+    while (it != m_entries.end()) {
+        tick = std::max(tick, it->second.tick);
+        if (!parent_key(k, parent))
+            break;
+        it = m_entries.find(parent);
+        if (it == m_entries.end() || it->second.state != Entry::State::Waiting)
+            break;
+        k = parent;
+    }
+    return tick;
+}
+
+void TiledImage::discard(uint64_t k, bool failed) {
+    while (true) {
+        auto it = m_entries.find(k);
+        if (it == m_entries.end())
+            return;
+        if (failed) {
+            it->second.state = Entry::State::Failed;
+            for (auto &child : it->second.children)
+                child.reset();
+        } else {
+            m_entries.erase(it);
+        }
+
+        /* A coarser tile waiting for this one cannot be completed either */
+        if (!parent_key(k, k))
+            return;
+        it = m_entries.find(k);
+        if (it == m_entries.end() || it->second.state != Entry::State::Waiting)
+            return;
+    }
+}
+
+void TiledImage::evict() {
+    while (m_lru.size() > m_capacity) {
+        auto it = m_entries.find(m_lru.back());
+        /* Textures must be released on the main thread, see upload() */
+        if (it->second.texture)
+            m_released.push_back(std::move(it->second.texture));
+        m_entries.erase(it);
+        m_lru.pop_back();
+    }
+}
+
+void TiledImage::reduce(uint64_t k, const std::shared_ptr<const std::vector<uint8_t>> *children,
+                        uint8_t *out) const {
+    int level = key_level(k);
+    Vector2i offset = key_index(k) * m_tile_size,
+             size = min(level_size(level) - offset, Vector2i(m_tile_size)),
+             /* Region of the next finer level covered by this tile */
+             finer = min(level_size(level - 1) - offset * 2, Vector2i(2 * m_tile_size));
+
+    for (int y = 0; y < size.y(); ++y) {
+        int y0 = 2 * y, y1 = std::min(y0 + 2, finer.y());
+        for (int x = 0; x < size.x(); ++x) {
+            int x0 = 2 * x, x1 = std::min(x0 + 2, finer.x());
+
+            uint32_t sum[4] = { 0, 0, 0, 0 };
+            for (int sy = y0; sy < y1; ++sy) {
+                for (int sx = x0; sx < x1; ++sx) {
+                    int cx = sx / m_tile_size, cy = sy / m_tile_size,
+                        width = std::min(finer.x() - cx * m_tile_size, m_tile_size);
+                    const uint8_t *p = children[cx + 2 * cy]->data() +
+                        4 * ((size_t) (sy - cy * m_tile_size) * width + (sx - cx * m_tile_size));
+                    for (int c = 0; c < 4; ++c)
+                        sum[c] += p[c];
+                }
+            }
+
+            uint32_t count = (uint32_t) ((y1 - y0) * (x1 - x0));
+            for (int c = 0; c < 4; ++c)
+                *out++ = (uint8_t) ((sum[c] + count / 2) / count);
+        }
+    }
+}
+
+void TiledImage::worker() {
+    while (true) {
+        uint64_t k;
+        std::shared_ptr<const std::vector<uint8_t>> children[4];
+        {
+            std::unique_lock<std::mutex> guard(m_mutex);
+            m_cond.wait(guard, [this]() { return m_shutdown || !m_queue.empty(); });
+            if (m_shutdown)
+                return;
+            k = m_queue.front();
+            m_queue.pop_front();
+
+            auto it = m_entries.find(k);
+            if (it == m_entries.end() || it->second.state != Entry::State::Queued)
+                continue;
+            if (m_tick - request_tick(k) > request_timeout) {
+                /* Not requested recently, e.g. panned out of view */
+                discard(k, false);
+                continue;
+            }
+
+            Entry &entry = it->second;
+            int level = key_level(k);
+            if (level > 0) {
+                /* Collect the tiles of the next finer level, producing missing ones first */
+                Vector2i index = key_index(k) * 2, count = tile_count(level - 1);
+                bool failed = false;
+                entry.waiting = 0;
+                for (int j = 0; j < 4; ++j) {
+                    Vector2i child_index = index + Vector2i(j & 1, j >> 1);
+                    if (entry.children[j] || child_index.x() >= count.x() ||
+                        child_index.y() >= count.y())
+                        continue;
+                    uint64_t ck = key(level - 1, child_index);
+                    auto child = m_entries.find(ck);
+                    if (child == m_entries.end()) {
+                        m_entries[ck].tick = entry.tick;
+                        m_queue.push_front(ck);
+                        entry.waiting++;
+                    } else if (child->second.pixels) {
+                        entry.children[j] = child->second.pixels;
+                    } else if (child->second.state == Entry::State::Failed) {
+                        failed = true;
+                    } else {
+                        entry.waiting++; // Will be passed on once produced
+                    }
+                }
+
+                if (failed) {
+                    discard(k, true);
+                    continue;
+                }
+                if (entry.waiting > 0) {
+                    entry.state = Entry::State::Waiting;
+                    m_cond.notify_all();
+                    continue;
+                }
+                for (int j = 0; j < 4; ++j)
+                    children[j] = std::move(entry.children[j]);
+            }
+
+            entry.state = Entry::State::Loading;
+            m_loading++;
+        }
+
+        int level = key_level(k);
+        Vector2i offset = key_index(k) * m_tile_size,
+                 size = min(level_size(level) - offset, Vector2i(m_tile_size));
+
+        auto data = std::make_shared<std::vector<uint8_t>>((size_t) size.x() * size.y() * 4);
+        bool success = true;
+        if (level == 0) {
+            try {
+                m_callback(offset, size, data->data());
+            } catch (const std::exception &e) {
+                fprintf(stderr, "TiledImage::worker(): could not produce tile: %s\n", e.what());
+                success = false;
+            }
+        } else {
+            reduce(k, children, data->data());
+            for (auto &child : children)
+                child.reset();
+        }
+
+        std::lock_guard<std::mutex> guard(m_mutex);
+        m_loading--;
+        auto it = m_entries.find(k);
+        if (it == m_entries.end() || it->second.state != Entry::State::Loading)
+            continue; // The cache was cleared in the meantime
+        if (!success) {
+            discard(k, true);
+            continue;
+        }
+
+        Entry &entry = it->second;
+        entry.state = Entry::State::Loaded;
+        entry.pixels = data;
+        if (entry.display)
+            m_loaded.push_back(k);
+        if (pinned(level)) {
+            m_pinned++;
+        } else {
+            m_lru.push_front(k);
+            entry.lru = m_lru.begin();
+        }
+
+        /* Pass the pixels on to a coarser tile waiting for them */
+        uint64_t parent;
+        if (parent_key(k, parent)) {
+            auto pit = m_entries.find(parent);
+            if (pit != m_entries.end() && pit->second.state == Entry::State::Waiting) {
+                Vector2i index = key_index(k);
+                pit->second.children[(index.x() & 1) + 2 * (index.y() & 1)] = data;
+                if (--pit->second.waiting == 0) {
+                    pit->second.state = Entry::State::Queued;
+                    m_queue.push_front(parent);
+                    m_cond.notify_one();
+                }
+            }
+        }
+
+        evict();
+    }
+}
+
+Texture *TiledImage::tile(int level, const Vector2i &index, bool request) {
+    std::lock_guard<std::mutex> guard(m_mutex);
+    uint64_t k = key(level, index);
+    auto it = m_entries.find(k);
+
+    if (it == m_entries.end()) {
+        if (request) {
+            Entry &entry = m_entries[k];
+            entry.tick = m_tick;
+            entry.display = true;
+            m_queue.push_front(k);
+            m_cond.notify_one();
+        }
+        return nullptr;
+    }
+
+    Entry &entry = it->second;
+    if (request) {
+        entry.tick = m_tick;
+        if (!entry.display) {
+            /* Produced to compute a coarser tile so far, upload it now */
+            entry.display = true;
+            if (entry.state == Entry::State::Loaded)
+                m_loaded.push_back(k);
+        }
+    }
+    if (entry.pixels && !pinned(level))
+        m_lru.splice(m_lru.begin(), m_lru, entry.lru);
+    if (entry.state != Entry::State::Ready)
+        return nullptr;
+    return entry.texture.get();
+}
+
+bool TiledImage::upload(size_t max_count) {
+    std::lock_guard<std::mutex> guard(m_mutex);
+    m_tick++;
+    m_released.clear();
+
+    for (size_t count = 0; count < max_count && !m_loaded.empty(); ) {
+        uint64_t k = m_loaded.front();
+        m_loaded.pop_front();
+        auto it = m_entries.find(k);
+        if (it == m_entries.end() || it->second.state != Entry::State::Loaded)
+            continue;
+
+        Vector2i offset = key_index(k) * m_tile_size,
+                 size = min(level_size(key_level(k)) - offset, Vector2i(m_tile_size));
+
+        Entry &entry = it->second;
+        entry.texture = new Texture(
+            Texture::PixelFormat::RGBA,
+            Texture::ComponentFormat::UInt8,
+            size,
+            Texture::InterpolationMode::Bilinear,
+            Texture::InterpolationMode::Nearest
+        );
+        entry.texture->upload(entry.pixels->data());
+        entry.state = Entry::State::Ready;
+        count++;
+    }
+
+    evict();
+    m_released.clear();
+
+    return !m_queue.empty() || !m_loaded.empty() || m_loading > 0;
+}
+
+void TiledImage::clear() {
+    std::lock_guard<std::mutex> guard(m_mutex);
+    m_lru.clear();
+    m_entries.clear();
+    m_queue.clear();
+    m_loaded.clear();
+    m_released.clear();
+    m_pinned = 0;
+}
+
+NAMESPACE_END(nanogui)
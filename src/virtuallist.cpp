@@ -0,0 +1,217 @@
+/*
+    src/virtuallist.cpp -- List or grid of items that only instantiates
+    widgets for the visible items
+
+    NanoGUI was developed by Wenzel Jakob <wenzel.jakob@epfl.ch>.
+    The widget drawing code is based on the NanoVG demo application
+    by Mikko Mononen.
+
+    All rights reserved. Use of this source code is governed by a
+    BSD-style license that can be found in the LICENSE.txt file.
+*/
+
+#include <nanogui/virtuallist.h>
+#include <nanogui/vscrollpanel.h>
+
+NAMESPACE_BEGIN(nanogui)
+
+static const size_t unbound = (size_t) -1;
+
+VirtualList::VirtualList(Widget *parent)
+    : Widget(parent), m_item_count(0), m_columns(1), m_row_height(25),
+      m_visible_first(0), m_visible_last(0) { }
+
+void VirtualList::set_item_count(size_t count) {
+    m_item_count = count;
+    update_heights();
+    refresh();
+}
+
+void VirtualList::set_columns(int columns) {
+    if (columns < 1)
+        throw std::runtime_error("VirtualList::set_columns(): number of columns must be positive!");
+    m_columns = columns;
+    update_heights();
+    refresh();
+}
+
+void VirtualList::set_row_height(int height) {
+    m_row_height = height;
+    invalidate_layout();
+}
+
+void VirtualList::set_bind_callback(const BindCallback &callback) {
+    m_bind_callback = callback;
+    refresh();
+}
+
+void VirtualList::set_height_callback(const HeightCallback &callback) {
+    m_height_callback = callback;
+    update_heights();
+}
+
+void VirtualList::update_heights() {
+    m_heights.clear();
+    if (m_height_callback) {
+        /* Build the Fenwick tree in linear time */
+        size_t n = row_count();
+        m_heights.resize(n + 1, 0);
+        for (size_t i = 1; i <= n; ++i) {
+            m_heights[i] += m_height_callback(i - 1);
+            size_t j = i + (i & (0 - i));
+            if (j <= n)
+                m_heights[j] += m_heights[i];
+        }
+    }
+    invalidate_layout();
+}
+
+void VirtualList::update_row_height(size_t row) {
+    if (!m_height_callback || row >= row_count())
+        return;
+    int delta = m_height_callback(row) - row_height(row);
+    for (size_t i = row + 1; i < m_heights.size(); i += i & (0 - i))
+        m_heights[i] += delta;
+    invalidate_layout();
+}
+
+int VirtualList::row_offset(size_t row) const {
+    if (!m_height_callback)
+        return (int) row * m_row_height;
+    int offset = 0;
+    for (size_t i = std::min(row, m_heights.size() - 1); i > 0; i -= i & (0 - i))
+        offset += m_heights[i];
+    return offset;
+}
+
+int VirtualList::row_height(size_t row) const {
+    if (!m_height_callback)
+        return m_row_height;
+    return row_offset(row + 1) - row_offset(row);
+}
+
+size_t VirtualList::row_at(int y) const {
+    size_t n = row_count();
+    if (n == 0 || y <= 0)
+        return 0;
+
+    if (!m_height_callback)
+        return std::min((size_t) (y / std::max(m_row_height, 1)), n - 1);
+
+    /* Descend the Fenwick tree to find the number of rows that end at or before 'y' */
+    size_t pos = 0, step = 1;
+    while (step * 2 <= n)
+        step *= 2;
+    for (; step > 0; step /= 2) {
+        if (pos + step <= n && m_heights[pos + step] <= y) {
+            pos += step;
+            y -= m_heights[pos];
+        }
+    }
+    return std::min(pos, n - 1);
+}
+
+void VirtualList::refresh() {
+    for (size_t i = 0; i < m_pool.size(); ++i)
+        m_pool_items[i] = unbound;
+    invalidate_layer();
+    mark_dirty();
+}
+
+void VirtualList::scroll_to(size_t index) {
+    VScrollPanel *vscroll = dynamic_cast<VScrollPanel *>(m_parent);
+    if (!vscroll || m_item_count == 0)
+        return;
+    int content = row_offset(row_count()),
+        offset = row_offset(std::min(index, m_item_count - 1) / m_columns);
+    if (content > vscroll->height())
+        vscroll->set_scroll(std::min(1.f, offset / (float) (content - vscroll->height())));
+    vscroll->mark_dirty();
+}
+
+Vector2i VirtualList::preferred_size(NVGcontext *ctx) const {
+    int width = 0;
+    if (!m_pool.empty())
+        width = m_pool[0]->preferred_size_cached(ctx).x() * m_columns;
+    return Vector2i(width, row_offset(row_count()));
+}
+
+void VirtualList::perform_layout(NVGcontext *ctx) {
+    update_rows(ctx);
+    m_layout_dirty = false;
+}
+
+void VirtualList::update_rows(NVGcontext *ctx) {
+    /* Determine the region that is visible through the parent scroll panel */
+    int y0 = 0, y1 = m_size.y();
+    VScrollPanel *vscroll = dynamic_cast<VScrollPanel *>(m_parent);
+    if (vscroll) {
+        y0 = std::max(0, -m_pos.y());
+        y1 = std::min(y1, y0 + vscroll->height());
+    }
+
+    size_t first = 0, last = 0;
+    if (m_item_count > 0 && y1 > y0) {
+        first = row_at(y0) * m_columns;
+        last = std::min((row_at(y1 - 1) + 1) * m_columns, m_item_count);
+    }
+    m_visible_first = first;
+    m_visible_last = last;
+
+    if (first < last && (!m_create_callback || !m_bind_callback))
+        throw std::runtime_error("VirtualList::update_rows(): create and bind callbacks must be specified!");
+
+    /* Keep widgets that already display a visible item, recycle the rest */
+    std::vector<int> slots(last - first, -1);
+    std::vector<size_t> available;
+    for (size_t i = 0; i < m_pool.size(); ++i) {
+        size_t item = m_pool_items[i];
+        if (item != unbound && item >= first && item < last)
+            slots[item - first] = (int) i;
+        else
+            available.push_back(i);
+    }
+
+    int cell_width = m_size.x() / m_columns;
+    for (size_t item = first; item < last; ++item) {
+        int slot = slots[item - first];
+        if (slot < 0) {
+            if (available.empty()) {
+                Widget *widget = m_create_callback(this);
+                if (!widget || widget->parent() != this)
+                    throw std::runtime_error("VirtualList::update_rows(): the create callback must return a child of the list!");
+                m_pool.push_back(widget);
+                m_pool_items.push_back(unbound);
+                slot = (int) m_pool.size() - 1;
+            } else {
+                slot = (int) available.back();
+                available.pop_back();
+            }
+            m_pool_items[slot] = item;
+            m_bind_callback(m_pool[slot], item);
+        }
+
+        Widget *widget = m_pool[slot];
+        size_t row = item / m_columns;
+        widget->set_visible(true);
+        widget->set_position(Vector2i((int) (item % m_columns) * cell_width,
+                                      row_offset(row)));
+        widget->set_size(Vector2i(cell_width, row_height(row)));
+        widget->update_layout(ctx);
+    }
+
+    for (size_t i : available)
+        m_pool[i]->set_visible(false);
+}
+
+void VirtualList::draw(NVGcontext *ctx) {
+    /* The visible items depend on the scroll position, hence the rows must be
+       updated before every frame. Doing so via update_layout() confines the
+       invalidations caused by moving and rebinding rows to this list instead
+       of marking all ancestors as dirty. */
+    m_layout_dirty = true;
+    update_layout(ctx);
+    Widget::draw(ctx);
+}
+
+NAMESPACE_END(nanogui)
@@ -29,7 +29,7 @@ void VScrollPanel::perform_layout(NVGcontext *ctx) {
         throw std::runtime_error("VScrollPanel should have one child.");
 
     Widget *child = m_children[0];
-    m_child_preferred_height = child->preferred_size(ctx).y();
+    m_child_preferred_height = child->preferred_size_cached(ctx).y();
 
     if (m_child_preferred_height > m_size.y()) {
         child->set_position(Vector2i(0, -m_scroll * (m_child_preferred_height - m_size.y())));
@@ -39,13 +39,13 @@ void VScrollPanel::perform_layout(NVGcontext *ctx) {
         child->set_size(m_size);
         m_scroll = 0;
     }
-    child->perform_layout(ctx);
+    child->update_layout(ctx);
 }
 
 Vector2i VScrollPanel::preferred_size(NVGcontext *ctx) const {
     if (m_children.empty())
         return Vector2i(0);
-    return m_children[0]->preferred_size(ctx) + Vector2i(12, 0);
+    return m_children[0]->preferred_size_cached(ctx) + Vector2i(12, 0);
 }
 
 bool VScrollPanel::mouse_drag_event(const Vector2i &p, const Vector2i &rel,
@@ -122,7 +122,7 @@ void VScrollPanel::draw(NVGcontext *ctx) {
     if (m_child_preferred_height > m_size.y())
         yoffset = -m_scroll*(m_child_preferred_height - m_size.y());
     child->set_position(Vector2i(0, yoffset));
-    m_child_preferred_height = child->preferred_size(ctx).y();
+    m_child_preferred_height = child->preferred_size_cached(ctx).y();
     float scrollh = height() *
         std::min(1.f, height() / (float) m_child_preferred_height);
 
@@ -15,6 +15,10 @@
 #include <nanogui/window.h>
 #include <nanogui/opengl.h>
 #include <nanogui/screen.h>
+#include <nanogui/texture.h>
+#include <nanogui/renderpass.h>
+#include <limits>
+#include <cmath>
 
 /* Uncomment the following definition to draw red bounding
    boxes around widgets (useful for debugging drawing code) */
@@ -24,10 +28,15 @@
 NAMESPACE_BEGIN(nanogui)
 
 Widget::Widget(Widget *parent)
-    : m_parent(nullptr), m_theme(nullptr), m_layout(nullptr),
+    : m_parent(nullptr), m_screen(nullptr), m_theme(nullptr), m_layout(nullptr),
       m_pos(0), m_size(0), m_fixed_size(0), m_visible(true), m_enabled(true),
-      m_focused(false), m_mouse_focus(false), m_tooltip(""), m_font_size(-1.f),
-      m_icon_extra_scale(1.f), m_cursor(Cursor::Arrow) {
+      m_focused(false), m_mouse_focus(false), m_raw_input(false), m_tooltip(""), m_font_size(-1.f),
+      m_icon_extra_scale(1.f), m_cursor(Cursor::Arrow), m_layout_dirty(true),
+      m_preferred_size_valid(false), m_preferred_size(0),
+      m_spatial_index_dirty(true), m_layer(false),
+      m_layer_dirty(true), m_layer_image(-1), m_layer_ctx(nullptr),
+      m_draw_time(0.f), m_draw_time_exclusive(0.f),
+      m_layout_time(0.f), m_layout_time_exclusive(0.f) {
     if (parent)
         parent->add_child(this);
 }
@@ -40,6 +49,7 @@ Widget::~Widget() {
            exceptions. */
         return;
     }
+    release_layer(false);
     for (auto child : m_children) {
         if (child)
             child->dec_ref();
@@ -52,6 +62,18 @@ void Widget::set_theme(Theme *theme) {
     m_theme = theme;
     for (auto child : m_children)
         child->set_theme(theme);
+    invalidate_layer();
+    invalidate_layout();
+}
+
+void Widget::set_size(const Vector2i &size) {
+    if (size == m_size)
+        return;
+    m_size = size;
+    invalidate_layer();
+    invalidate_layout();
+    if (m_parent)
+        m_parent->m_spatial_index_dirty = true;
 }
 
 int Widget::font_size() const {
@@ -65,36 +87,219 @@ Vector2i Widget::preferred_size(NVGcontext *ctx) const {
         return m_size;
 }
 
+/// Number of layouts currently in progress, and total number of layouts
+static int layout_depth = 0;
+static size_t layout_counter = 0;
+
+/// Marks a layout as in progress for the lifetime of the object (also when an exception is raised)
+struct LayoutScope {
+    LayoutScope() { layout_depth++; }
+    ~LayoutScope() { layout_depth--; }
+};
+
+Vector2i Widget::preferred_size_cached(NVGcontext *ctx) const {
+    if (!m_preferred_size_valid) {
+        /* Some widgets temporarily modify their children while computing
+           their preferred size, so mark the result as valid afterwards */
+        Vector2i size;
+        {
+            LayoutScope scope;
+            size = preferred_size(ctx);
+        }
+        m_preferred_size = size;
+        m_preferred_size_valid = true;
+    }
+    return m_preferred_size;
+}
+
 void Widget::perform_layout(NVGcontext *ctx) {
-    if (m_layout) {
-        m_layout->perform_layout(ctx, this);
-    } else {
-        for (auto c : m_children) {
-            Vector2i pref = c->preferred_size(ctx), fix = c->fixed_size();
-            c->set_size(Vector2i(
-                fix[0] ? fix[0] : pref[0],
-                fix[1] ? fix[1] : pref[1]
-            ));
-            c->perform_layout(ctx);
+    Screen *screen = m_screen;
+    bool profile = screen && screen->m_widget_profiling;
+    double start = profile ? profile_begin(screen) : 0.0;
+
+    layout_counter++;
+
+    {
+        LayoutScope scope;
+        if (m_layout) {
+            m_layout->perform_layout(ctx, this);
+        } else {
+            for (auto c : m_children) {
+                Vector2i pref = c->preferred_size_cached(ctx), fix = c->fixed_size();
+                c->set_size(Vector2i(
+                    fix[0] ? fix[0] : pref[0],
+                    fix[1] ? fix[1] : pref[1]
+                ));
+                c->update_layout(ctx);
+            }
         }
     }
+
+    m_layout_dirty = false;
+
+    if (profile)
+        profile_end(screen, start, m_layout_time, m_layout_time_exclusive);
 }
 
-Widget *Widget::find_widget(const Vector2i &p) {
-    for (auto it = m_children.rbegin(); it != m_children.rend(); ++it) {
-        Widget *child = *it;
-        if (child->visible() && child->contains(p - m_pos))
-            return child->find_widget(p - m_pos);
+void Widget::update_layout(NVGcontext *ctx) {
+    if (!m_layout_dirty)
+        return;
+    {
+        LayoutScope scope;
+        perform_layout(ctx);
     }
+    /* Subclasses may adjust their children after invoking the base
+       implementation, so only clear the flag once the layout is complete */
+    m_layout_dirty = false;
+}
+
+void Widget::invalidate_layout(bool recursive) {
+    if (recursive) {
+        for (auto child : m_children)
+            child->invalidate_layout(true);
+    }
+
+    for (Widget *w = this; w; w = w->m_parent) {
+        w->m_layout_dirty = true;
+        w->m_preferred_size_valid = false;
+        /* Changes made while computing a layout are accounted for by the
+           ancestor that performs it */
+        if (layout_depth > 0)
+            break;
+    }
+}
+
+size_t Widget::layout_count() {
+    return layout_counter;
+}
+
+void Widget::reset_layout_count() {
+    layout_counter = 0;
+}
+
+/**
+ * Uniform grid over the bounding box of the children. The children
+ * overlapping each cell are stored in ascending order (i.e. bottom to top)
+ * in the range ``indices[offsets[i]] .. indices[offsets[i + 1] - 1]``.
+ */
+struct Widget::SpatialIndex {
+    Vector2i origin, cell_size, res;
+    std::vector<uint32_t> offsets, indices;
+
+    void build(const std::vector<Widget *> &children) {
+        Vector2i lo(std::numeric_limits<int>::max()),
+                 hi(std::numeric_limits<int>::min());
+        size_t count = 0;
+        for (const Widget *w : children) {
+            if (w->width() <= 0 || w->height() <= 0)
+                continue;
+            lo = min(lo, w->position());
+            hi = max(hi, w->position() + w->size());
+            count++;
+        }
+
+        offsets.clear();
+        indices.clear();
+        if (count == 0) {
+            res = Vector2i(0);
+            return;
+        }
+
+        // Aim for roughly one child per cell
+        int n = std::max(1, std::min(256, (int) std::ceil(std::sqrt((float) count))));
+        origin = lo;
+        res = Vector2i(n);
+        cell_size = max((hi - lo + res - 1) / res, Vector2i(1));
+
+        // Counting sort of the (child, cell) pairs
+        offsets.resize(n * n + 1, 0);
+        for (int pass = 0; pass < 2; ++pass) {
+            for (uint32_t i = 0; i < (uint32_t) children.size(); ++i) {
+                const Widget *w = children[i];
+                if (w->width() <= 0 || w->height() <= 0)
+                    continue;
+                Vector2i c0 = cell(w->position()),
+                         c1 = cell(w->position() + w->size() - 1);
+                for (int y = c0.y(); y <= c1.y(); ++y) {
+                    for (int x = c0.x(); x <= c1.x(); ++x) {
+                        if (pass == 0)
+                            offsets[y * n + x + 1]++;
+                        else
+                            indices[offsets[y * n + x]++] = i;
+                    }
+                }
+            }
+            if (pass == 0) {
+                for (int i = 0; i < n * n; ++i)
+                    offsets[i + 1] += offsets[i];
+                indices.resize(offsets[n * n]);
+            } else {
+                // The fill loop advanced each offset to the start of the next cell
+                for (int i = n * n; i > 0; --i)
+                    offsets[i] = offsets[i - 1];
+                offsets[0] = 0;
+            }
+        }
+    }
+
+    Vector2i cell(const Vector2i &p) const {
+        return min(max((p - origin) / cell_size, Vector2i(0)), res - 1);
+    }
+};
+
+void Widget::set_spatial_index(bool value) {
+    if (value == spatial_index())
+        return;
+    m_spatial_index.reset(value ? new SpatialIndex() : nullptr);
+    m_spatial_index_dirty = true;
+}
+
+Widget *Widget::topmost_child(const Vector2i &p) const {
+    if (!m_spatial_index) {
+        for (auto it = m_children.rbegin(); it != m_children.rend(); ++it) {
+            Widget *child = *it;
+            if (child->visible() && child->contains(p))
+                return child;
+        }
+        return nullptr;
+    }
+
+    SpatialIndex *index = m_spatial_index.get();
+    if (m_spatial_index_dirty) {
+        index->build(m_children);
+        m_spatial_index_dirty = false;
+    }
+
+    if (index->res == Vector2i(0))
+        return nullptr;
+    Vector2i rel = p - index->origin;
+    if (rel.x() < 0 || rel.y() < 0 ||
+        rel.x() >= index->res.x() * index->cell_size.x() ||
+        rel.y() >= index->res.y() * index->cell_size.y())
+        return nullptr;
+
+    Vector2i c = index->cell(p);
+    uint32_t cell = c.y() * index->res.x() + c.x(),
+             start = index->offsets[cell], end = index->offsets[cell + 1];
+    for (uint32_t i = end; i > start; --i) {
+        Widget *child = m_children[index->indices[i - 1]];
+        if (child->visible() && child->contains(p))
+            return child;
+    }
+    return nullptr;
+}
+
+Widget *Widget::find_widget(const Vector2i &p) {
+    Widget *child = topmost_child(p - m_pos);
+    if (child)
+        return child->find_widget(p - m_pos);
     return contains(p) ? this : nullptr;
 }
 
 const Widget *Widget::find_widget(const Vector2i &p) const {
-    for (auto it = m_children.rbegin(); it != m_children.rend(); ++it) {
-        Widget *child = *it;
-        if (child->visible() && child->contains(p - m_pos))
-            return child->find_widget(p - m_pos);
-    }
+    const Widget *child = topmost_child(p - m_pos);
+    if (child)
+        return child->find_widget(p - m_pos);
     return contains(p) ? this : nullptr;
 }
 
@@ -148,11 +353,13 @@ bool Widget::mouse_drag_event(const Vector2i &, const Vector2i &, int, int) {
 
 bool Widget::mouse_enter_event(const Vector2i &, bool enter) {
     m_mouse_focus = enter;
+    invalidate_layer();
     return false;
 }
 
 bool Widget::focus_event(bool focused) {
     m_focused = focused;
+    invalidate_layer();
     return false;
 }
 
@@ -164,12 +371,20 @@ bool Widget::keyboard_character_event(unsigned int) {
     return false;
 }
 
+void Widget::children_changed(bool layout) {
+    invalidate_layer();
+    m_spatial_index_dirty = true;
+    if (layout)
+        invalidate_layout();
+}
+
 void Widget::add_child(int index, Widget * widget) {
     assert(index <= child_count());
     m_children.insert(m_children.begin() + index, widget);
     widget->inc_ref();
     widget->set_parent(this);
     widget->set_theme(m_theme);
+    children_changed();
 }
 
 void Widget::add_child(Widget * widget) {
@@ -182,6 +397,9 @@ void Widget::remove_child(const Widget *widget) {
                      m_children.end());
     if (m_children.size() == child_count)
         throw std::runtime_error("Widget::remove_child(): widget not found!");
+    children_changed();
+    const_cast<Widget *>(widget)->release_layer(true);
+    const_cast<Widget *>(widget)->set_screen(nullptr);
     widget->dec_ref();
 }
 
@@ -190,6 +408,9 @@ void Widget::remove_child_at(int index) {
         throw std::runtime_error("Widget::remove_child_at(): out of bounds!");
     Widget *widget = m_children[index];
     m_children.erase(m_children.begin() + index);
+    children_changed();
+    widget->release_layer(true);
+    widget->set_screen(nullptr);
     widget->dec_ref();
 }
 
@@ -212,19 +433,19 @@ Window *Widget::window() {
     }
 }
 
-Screen *Widget::screen() {
-    Widget *widget = this;
-    while (true) {
-        if (!widget)
-            return nullptr;
-        Screen *screen = dynamic_cast<Screen *>(widget);
-        if (screen)
-            return screen;
-        widget = widget->parent();
-    }
+void Widget::set_parent(Widget *parent) {
+    m_parent = parent;
+    set_screen(parent ? parent->m_screen : nullptr);
+}
+
+void Widget::set_screen(Screen *screen) {
+    if (m_screen == screen)
+        return;
+    m_screen = screen;
+    for (auto child : m_children)
+        child->set_screen(screen);
 }
 
-const Screen *Widget::screen() const { return const_cast<Widget*>(this)->screen(); }
 const Window *Widget::window() const { return const_cast<Widget*>(this)->window(); }
 
 void Widget::request_focus() {
@@ -234,6 +455,180 @@ void Widget::request_focus() {
     ((Screen *) widget)->update_focus(this);
 }
 
+void Widget::mark_dirty() {
+    Screen *screen = this->screen();
+    if (screen)
+        screen->invalidate_rect(absolute_position(), m_size);
+}
+
+void Widget::set_layer(bool layer) {
+    if (layer == m_layer)
+        return;
+    m_layer = layer;
+    if (!layer)
+        release_layer(false);
+    m_layer_dirty = true;
+    if (m_parent)
+        m_parent->invalidate_layer();
+}
+
+void Widget::invalidate_layer() {
+    for (Widget *widget = this; widget; widget = widget->m_parent) {
+        if (widget->m_layer)
+            widget->m_layer_dirty = true;
+    }
+}
+
+void Widget::release_layer(bool recursive) {
+    if (m_layer_image >= 0 && m_layer_ctx)
+        nvgDeleteImage(m_layer_ctx, m_layer_image);
+    m_layer_image = -1;
+    m_layer_ctx = nullptr;
+    m_layer_texture = nullptr;
+    m_layer_pass = nullptr;
+    m_layer_dirty = true;
+
+    if (recursive) {
+        for (auto child : m_children)
+            child->release_layer(true);
+    }
+}
+
+/// Widgets such as windows and popups draw drop shadows and anchors outside of their bounds
+static int overdraw_margin(const Theme *theme) {
+    return theme ? 2 * theme->m_window_drop_shadow_size : 0;
+}
+
+void Widget::draw_layer(NVGcontext *ctx) {
+    Screen *screen = this->screen();
+
+#if defined(NANOGUI_USE_OPENGL) || defined(NANOGUI_USE_GLES)
+    /* Nested layers are drawn directly into the enclosing layer */
+    bool supported = screen && !screen->m_drawing_layer &&
+                     m_size.x() > 0 && m_size.y() > 0;
+#else
+    bool supported = false;
+#endif
+
+    if (!supported) {
+        nvgSave(ctx);
+        nvgIntersectScissor(ctx, m_pos.x(), m_pos.y(), m_size.x(), m_size.y());
+        draw(ctx);
+        nvgRestore(ctx);
+        return;
+    }
+
+    int margin = overdraw_margin(m_theme);
+    float pixel_ratio = screen->pixel_ratio();
+    Vector2i size = m_size + Vector2i(2 * margin),
+             fbsize = Vector2i(Vector2f(size) * pixel_ratio);
+
+    if (!m_layer_texture || m_layer_texture->size() != fbsize) {
+        release_layer(false);
+
+        m_layer_texture = new Texture(
+            Texture::PixelFormat::RGBA,
+            Texture::ComponentFormat::UInt8,
+            fbsize,
+            Texture::InterpolationMode::Bilinear,
+            Texture::InterpolationMode::Bilinear,
+            Texture::WrapMode::ClampToEdge,
+            1,
+            Texture::TextureFlags::ShaderRead |
+            Texture::TextureFlags::RenderTarget
+        );
+
+        /* NanoVG needs a stencil buffer to fill non-convex paths */
+        Texture *depth_stencil = new Texture(
+            Texture::PixelFormat::DepthStencil,
+            Texture::ComponentFormat::Float32,
+            fbsize,
+            Texture::InterpolationMode::Bilinear,
+            Texture::InterpolationMode::Bilinear,
+            Texture::WrapMode::ClampToEdge,
+            1,
+            Texture::TextureFlags::RenderTarget
+        );
+
+        m_layer_pass = new RenderPass({ m_layer_texture.get() }, depth_stencil,
+                                      depth_stencil);
+
+        /* NanoVG renders premultiplied colors and uses a flipped
+           vertical axis relative to OpenGL textures */
+        m_layer_image = screen->nvg_image_from_texture(
+            m_layer_texture, NVG_IMAGE_FLIPY | NVG_IMAGE_PREMULTIPLIED);
+        m_layer_ctx = ctx;
+    }
+
+    if (m_layer_dirty) {
+        /* Submit everything drawn so far before switching render targets */
+        screen->nvg_flush();
+
+        bool damage_clip_active = screen->m_damage_clip_active;
+        screen->m_damage_clip_active = false;
+        screen->m_drawing_layer = true;
+
+        NVGparams *params = nvgInternalParams(ctx);
+        m_layer_pass->begin();
+        params->renderViewport(params->userPtr, size.x(), size.y(), pixel_ratio);
+
+        /* Clip to the layer, whose coordinates are offset by the margin */
+        Vector4f draw_clip = screen->m_draw_clip;
+        screen->m_draw_clip = Vector4f((float) margin, (float) margin,
+                                       (float) (margin + m_size.x()),
+                                       (float) (margin + m_size.y()));
+
+        nvgSave(ctx);
+        nvgReset(ctx);
+        nvgTranslate(ctx, margin - m_pos.x(), margin - m_pos.y());
+        nvgIntersectScissor(ctx, m_pos.x(), m_pos.y(), m_size.x(), m_size.y());
+        draw(ctx);
+        nvgRestore(ctx);
+
+        screen->m_draw_clip = draw_clip;
+
+        params->renderFlush(params->userPtr);
+        m_layer_pass->end();
+        params->renderViewport(params->userPtr, screen->width(),
+                               screen->height(), pixel_ratio);
+
+        screen->m_damage_clip_active = damage_clip_active;
+        screen->m_drawing_layer = false;
+        m_layer_dirty = false;
+    }
+
+    float x = m_pos.x() - margin, y = m_pos.y() - margin;
+    NVGpaint paint = nvgImagePattern(ctx, x, y, size.x(), size.y(), 0.f,
+                                     m_layer_image, 1.f);
+    nvgBeginPath(ctx);
+    nvgRect(ctx, x, y, size.x(), size.y());
+    nvgFillPaint(ctx, paint);
+    nvgFill(ctx);
+}
+
+double Widget::profile_begin(Screen *screen) {
+    screen->m_profile_stack.push_back(0.0);
+    return glfwGetTime();
+}
+
+void Widget::profile_end(Screen *screen, double start, float &inclusive,
+                         float &exclusive) {
+    double elapsed = glfwGetTime() - start, nested = 0.0;
+    std::vector<double> &stack = screen->m_profile_stack;
+
+    if (!stack.empty()) {
+        nested = stack.back();
+        stack.pop_back();
+    }
+
+    /* Charge the elapsed time to the enclosing widget */
+    if (!stack.empty())
+        stack.back() += elapsed;
+
+    inclusive = float(elapsed * 1000.0);
+    exclusive = float((elapsed - nested) * 1000.0);
+}
+
 void Widget::draw(NVGcontext *ctx) {
     #if defined(NANOGUI_SHOW_WIDGET_BOUNDS)
         nvgStrokeWidth(ctx, 1.0f);
@@ -247,21 +642,74 @@ void Widget::draw(NVGcontext *ctx) {
     if (m_children.empty())
         return;
 
+    Screen *screen = m_screen;
+    bool profile = screen && screen->m_widget_profiling;
+
     nvgTranslate(ctx, m_pos.x(), m_pos.y());
+
+    /* Track the clip rectangle (in the coordinates of the render target)
+       to skip children that lie entirely outside of it. This is only
+       possible when the transformation has no rotation component. */
+    float xform[6];
+    nvgCurrentTransform(ctx, xform);
+    bool cull = screen && xform[1] == 0.f && xform[2] == 0.f;
+
+    /* Leave some slack for drop shadows and popup
+       anchors that are drawn outside of widget bounds */
+    int margin = overdraw_margin(m_theme);
+
     for (auto child : m_children) {
         if (!child->visible())
             continue;
-        #if !defined(NANOGUI_SHOW_WIDGET_BOUNDS)
+
+        Vector4f rect(0.f), clip(0.f);
+        if (cull) {
+            clip = screen->m_draw_clip;
+            rect = Vector4f(xform[4] + xform[0] * child->m_pos.x(),
+                            xform[5] + xform[3] * child->m_pos.y(),
+                            xform[4] + xform[0] * (child->m_pos.x() + child->m_size.x()),
+                            xform[5] + xform[3] * (child->m_pos.y() + child->m_size.y()));
+            if (rect[2] + margin <= clip[0] || rect[3] + margin <= clip[1] ||
+                rect[0] - margin >= clip[2] || rect[1] - margin >= clip[3]) {
+                screen->m_culled_widgets++;
+                continue;
+            }
+        }
+
+        double start = profile ? profile_begin(screen) : 0.0;
+
+        if (child->m_layer) {
+            child->draw_layer(ctx);
+        } else {
+            /* Intersecting with a child that covers the clip rectangle has no effect */
+            bool scissor = !cull ||
+                rect[0] > clip[0] || rect[1] > clip[1] ||
+                rect[2] < clip[2] || rect[3] < clip[3];
+
+            #if defined(NANOGUI_SHOW_WIDGET_BOUNDS)
+                scissor = false;
+            #endif
+
             nvgSave(ctx);
-            nvgIntersectScissor(ctx, child->m_pos.x(), child->m_pos.y(),
-                                child->m_size.x(), child->m_size.y());
-        #endif
+            if (scissor) {
+                nvgIntersectScissor(ctx, child->m_pos.x(), child->m_pos.y(),
+                                    child->m_size.x(), child->m_size.y());
+                if (cull)
+                    screen->m_draw_clip = Vector4f(
+                        std::max(rect[0], clip[0]), std::max(rect[1], clip[1]),
+                        std::min(rect[2], clip[2]), std::min(rect[3], clip[3]));
+            }
 
-        child->draw(ctx);
+            child->draw(ctx);
 
-        #if !defined(NANOGUI_SHOW_WIDGET_BOUNDS)
             nvgRestore(ctx);
-        #endif
+            if (cull)
+                screen->m_draw_clip = clip;
+        }
+
+        if (profile)
+            profile_end(screen, start, child->m_draw_time,
+                        child->m_draw_time_exclusive);
     }
     nvgTranslate(ctx, -m_pos.x(), -m_pos.y());
 }
@@ -12,6 +12,7 @@
 #include <nanogui/window.h>
 #include <nanogui/theme.h>
 #include <nanogui/opengl.h>
+#include <nanogui/textmetrics.h>
 #include <nanogui/screen.h>
 #include <nanogui/layout.h>
 
@@ -28,10 +29,8 @@ Vector2i Window::preferred_size(NVGcontext *ctx) const {
     if (m_button_panel)
         m_button_panel->set_visible(true);
 
-    nvgFontSize(ctx, 18.0f);
-    nvgFontFace(ctx, "sans-bold");
     float bounds[4];
-    nvgTextBounds(ctx, 0, 0, m_title.c_str(), nullptr, bounds);
+    text_bounds(ctx, "sans-bold", 18.0f, m_title, bounds);
 
     return Vector2i(
         std::max(result.x(), (int) (bounds[2]-bounds[0] + 20)),
@@ -60,8 +59,8 @@ void Window::perform_layout(NVGcontext *ctx) {
         m_button_panel->set_visible(true);
         m_button_panel->set_size(Vector2i(width(), 22));
         m_button_panel->set_position(Vector2i(
-            width() - (m_button_panel->preferred_size(ctx).x() + 5), 3));
-        m_button_panel->perform_layout(ctx);
+            width() - (m_button_panel->preferred_size_cached(ctx).x() + 5), 3));
+        m_button_panel->update_layout(ctx);
     }
 }
 
@@ -85,7 +84,11 @@ void Window::draw(NVGcontext *ctx) {
         m_theme->m_drop_shadow, m_theme->m_transparent);
 
     nvgSave(ctx);
-    nvgResetScissor(ctx);
+    /* Only a screen knows about the damage region of partial redraws */
+    if (Screen *screen = this->screen())
+        screen->nvg_reset_scissor();
+    else
+        nvgResetScissor(ctx);
     nvgBeginPath(ctx);
     nvgRect(ctx, m_pos.x()-ds,m_pos.y()-ds, m_size.x()+2*ds, m_size.y()+2*ds);
     nvgRoundedRect(ctx, m_pos.x(), m_pos.y(), m_size.x(), m_size.y(), cr);
@@ -165,9 +168,8 @@ bool Window::mouse_enter_event(const Vector2i &p, bool enter) {
 bool Window::mouse_drag_event(const Vector2i &, const Vector2i &rel,
                             int button, int /* modifiers */) {
     if (m_drag && (button & (1 << GLFW_MOUSE_BUTTON_1)) != 0) {
-        m_pos += rel;
-        m_pos = max(m_pos, Vector2i(0));
-        m_pos = min(m_pos, parent()->size() - m_size);
+        set_position(min(max(m_pos + rel, Vector2i(0)),
+                         parent()->size() - m_size));
         return true;
     }
     return false;